@@ -19,6 +19,11 @@ class Item:
     def __str__(self):
         return f"{self.name} ({self.rarity.value})"
 
+# Stats an equipment bonus can raise, in the order of Equipment.bonus_vector.
+BONUS_STATS = ("strength", "dexterity", "intelligence", "constitution", "luck",
+               "max_hp", "max_mp", "attack_power", "defense", "magic_power")
+BONUS_INDEX = {stat: index for index, stat in enumerate(BONUS_STATS)}
+
 class Equipment(Item):
     """
     Represents an item that can be equipped by the player.
@@ -33,6 +38,8 @@ class Equipment(Item):
             raise ValueError(f"Invalid equip_slot: {equip_slot}. Must be one of {self.VALID_EQUIP_SLOTS}")
         self.equip_slot = equip_slot
         self.stat_bonuses = stat_bonuses # e.g., {'strength': 5, 'max_hp': 10}
+        # The same bonuses as a fixed-order vector (BONUS_STATS), so totals are a vector sum
+        self.bonus_vector = [stat_bonuses.get(stat, 0) for stat in BONUS_STATS]
 
     def __str__(self):
         return f"{self.name} ({self.rarity.value}) - Slot: {self.equip_slot}, Bonuses: {self.stat_bonuses}"
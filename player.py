@@ -1,5 +1,5 @@
 import random
-from items import Item, Equipment # Import Item and Equipment
+from items import Item, Equipment, BONUS_STATS, BONUS_INDEX # Import Item and Equipment
 
 class Player:
     """
@@ -32,6 +32,8 @@ class Player:
             "chest": None, "legs": None, "feet": None, 
             "ring": None, "amulet": None
         } # Dict to store equipped Equipment objects
+        # Summed bonus_vector of the equipped items, updated on equip/unequip
+        self._equipment_totals = [0] * len(BONUS_STATS)
 
         # HP and MP are calculated based on stats
         # Current HP/MP should be initialized after max values are known
@@ -40,12 +42,21 @@ class Player:
         self.is_defending = False # For combat defense action
 
     def _get_equipment_bonus(self, stat_name: str) -> int:
-        """Helper to sum stat bonuses from all equipped items for a given stat."""
+        """Helper to get the summed stat bonus of all equipped items for a given stat."""
+        index = BONUS_INDEX.get(stat_name)
+        if index is not None:
+            return self._equipment_totals[index]
+        # Stats outside BONUS_STATS are not tracked in the totals
         total_bonus = 0
         for slot, item in self.equipment.items():
             if item and isinstance(item, Equipment) and stat_name in item.stat_bonuses:
                 total_bonus += item.stat_bonuses[stat_name]
         return total_bonus
+
+    def _apply_equipment_bonuses(self, item: Equipment, sign: int):
+        """Adds (sign=1) or removes (sign=-1) an item's bonus_vector from the equipment totals."""
+        self._equipment_totals = [total + sign * bonus
+                                  for total, bonus in zip(self._equipment_totals, item.bonus_vector)]
     
     def _update_hp_mp_after_stat_change(self, old_max_hp: int, old_max_mp: int):
         """Adjusts current HP/MP proportionally after max HP/MP changes."""
@@ -135,6 +146,7 @@ class Player:
         # Remove from inventory and equip
         self.remove_item_from_inventory(item_to_equip)
         self.equipment[slot] = item_to_equip
+        self._apply_equipment_bonuses(item_to_equip, 1)
         print(f"{item_to_equip.name} equipped to {slot}.")
         
         self._update_hp_mp_after_stat_change(old_max_hp, old_max_mp)
@@ -155,6 +167,7 @@ class Player:
         old_max_mp = self.get_max_mp()
 
         self.equipment[slot_to_unequip] = None
+        self._apply_equipment_bonuses(item, -1)
         print(f"{item.name} unequipped from {slot_to_unequip}.")
 
         if move_to_inventory:
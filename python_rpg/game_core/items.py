@@ -23,6 +23,13 @@ class Item:
     def __repr__(self) -> str:
         return f"Item(name='{self.name}', rarity=Rarity.{self.rarity.name})"
 
+# Stats equipment can raise, in the order of Equipment.bonus_vector: primary stats first,
+# then bonuses added straight to derived stats.
+PRIMARY_BONUS_STATS = ("strength", "dexterity", "agility", "intelligence", "vitality", "luck")
+DERIVED_BONUS_STATS = ("attack", "defense", "magic_attack", "magic_defense", "crit_chance", "dodge",
+                       "discovery", "max_hp")
+BONUS_STATS = PRIMARY_BONUS_STATS + DERIVED_BONUS_STATS
+
 class Equipment(Item):
     def __init__(self, name: str, description: str, rarity: Rarity, value: int, slot: str, stat_bonuses: dict):
         super().__init__(name, description, rarity, value)
@@ -30,6 +37,7 @@ class Equipment(Item):
         if not isinstance(stat_bonuses, dict):
             raise TypeError("stat_bonuses must be a dictionary")
         self.stat_bonuses = stat_bonuses
+        self.bonus_vector = tuple(stat_bonuses.get(stat, 0) for stat in BONUS_STATS)
 
     def __str__(self) -> str:
         # Example: "Rusty Sword (Common) - Slot: Weapon, Bonuses: {'attack_power': 3}, Value: 5 G"
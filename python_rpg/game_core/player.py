@@ -7,7 +7,7 @@ if _PACKAGE_ROOT not in sys.path:
     sys.path.insert(0, _PACKAGE_ROOT)
 
 from game_core.monster import Monster
-from game_core.items import Item, Equipment, Weapon, Armor
+from game_core.items import Item, Equipment, Weapon, Armor, BONUS_STATS, PRIMARY_BONUS_STATS
 from game_core.rarity import Rarity # For test block items
 
 class Player:
@@ -23,6 +23,8 @@ class Player:
         
         self.inventory: list[Item] = []
         self.equipment: dict[str, Equipment | None] = {} 
+        # Summed bonus_vector of the equipped items, updated on equip/unequip
+        self.equipment_totals: list[float] = [0] * len(BONUS_STATS)
 
         # Base Primary Stats
         self.base_strength = 5
@@ -50,24 +52,20 @@ class Player:
         for slot in slots:
             self.equipment[slot] = None
 
+    def _apply_equipment_bonuses(self, item: Equipment, sign: int):
+        """Adds (sign=1) or removes (sign=-1) an item's bonus_vector from the equipment totals."""
+        self.equipment_totals = [total + sign * bonus for total, bonus in zip(self.equipment_totals, item.bonus_vector)]
+
     def _update_derived_stats(self):
         # Calculate Total Primary Stats from base + primary equipment bonuses
-        total_strength = self.base_strength
-        total_dexterity = self.base_dexterity
-        total_agility = self.base_agility
-        total_intelligence = self.base_intelligence
-        total_vitality = self.base_vitality
-        total_luck = self.base_luck
-
-        for item in self.equipment.values():
-            if item and hasattr(item, 'stat_bonuses') and isinstance(item.stat_bonuses, dict):
-                # Primary stat bonuses
-                if 'strength' in item.stat_bonuses: total_strength += item.stat_bonuses['strength']
-                if 'dexterity' in item.stat_bonuses: total_dexterity += item.stat_bonuses['dexterity']
-                if 'agility' in item.stat_bonuses: total_agility += item.stat_bonuses['agility']
-                if 'intelligence' in item.stat_bonuses: total_intelligence += item.stat_bonuses['intelligence']
-                if 'vitality' in item.stat_bonuses: total_vitality += item.stat_bonuses['vitality']
-                if 'luck' in item.stat_bonuses: total_luck += item.stat_bonuses['luck']
+        (bonus_strength, bonus_dexterity, bonus_agility,
+         bonus_intelligence, bonus_vitality, bonus_luck) = self.equipment_totals[:len(PRIMARY_BONUS_STATS)]
+        total_strength = self.base_strength + bonus_strength
+        total_dexterity = self.base_dexterity + bonus_dexterity
+        total_agility = self.base_agility + bonus_agility
+        total_intelligence = self.base_intelligence + bonus_intelligence
+        total_vitality = self.base_vitality + bonus_vitality
+        total_luck = self.base_luck + bonus_luck
         
         # Calculate derived stats from Total Primary Stats
         base_hp_from_level = 20 
@@ -82,17 +80,16 @@ class Player:
         self.discovery = total_luck * 0.003
 
         # Apply direct bonuses from equipment to derived stats
-        for item in self.equipment.values():
-            if item and hasattr(item, 'stat_bonuses') and isinstance(item.stat_bonuses, dict):
-                # Direct bonuses to derived stats
-                if 'attack' in item.stat_bonuses: self.attack += item.stat_bonuses['attack']
-                if 'defense' in item.stat_bonuses: self.defense += item.stat_bonuses['defense']
-                if 'magic_attack' in item.stat_bonuses: self.magic_attack += item.stat_bonuses['magic_attack']
-                if 'magic_defense' in item.stat_bonuses: self.magic_defense += item.stat_bonuses['magic_defense']
-                if 'crit_chance' in item.stat_bonuses: self.crit_chance += item.stat_bonuses['crit_chance']
-                if 'dodge' in item.stat_bonuses: self.dodge += item.stat_bonuses['dodge']
-                if 'discovery' in item.stat_bonuses: self.discovery += item.stat_bonuses['discovery']
-                if 'max_hp' in item.stat_bonuses: self.max_hp += item.stat_bonuses['max_hp']
+        (bonus_attack, bonus_defense, bonus_magic_attack, bonus_magic_defense, bonus_crit_chance,
+         bonus_dodge, bonus_discovery, bonus_max_hp) = self.equipment_totals[len(PRIMARY_BONUS_STATS):]
+        self.attack += bonus_attack
+        self.defense += bonus_defense
+        self.magic_attack += bonus_magic_attack
+        self.magic_defense += bonus_magic_defense
+        self.crit_chance += bonus_crit_chance
+        self.dodge += bonus_dodge
+        self.discovery += bonus_discovery
+        self.max_hp += bonus_max_hp
         
         self.current_hp = min(self.current_hp, self.max_hp)
 
@@ -121,6 +118,7 @@ class Player:
         if self.equipment[target_slot] is not None:
             self.unequip_item(target_slot)
         self.equipment[target_slot] = item_to_equip
+        self._apply_equipment_bonuses(item_to_equip, 1)
         if item_to_equip in self.inventory:
             self.inventory.remove(item_to_equip)
         print(f"'{item_to_equip.name}' equipped to {target_slot} slot.")
@@ -132,6 +130,7 @@ class Player:
             return
         item_to_unequip = self.equipment[slot_to_unequip]
         self.equipment[slot_to_unequip] = None
+        self._apply_equipment_bonuses(item_to_unequip, -1)
         self.inventory.append(item_to_unequip)
         print(f"'{item_to_unequip.name}' unequipped from {slot_to_unequip} slot.")
         self._update_derived_stats() # Automatically update stats
@@ -0,0 +1,34 @@
+"""
+A text-based RPG. Run it with ``python -m rpg_game``.
+
+Subpackages and the most used classes are imported on first access, so
+``import rpg_game`` stays cheap for tools that only need a small part of it.
+"""
+import importlib
+
+_SUBPACKAGES = ("balance", "benchmarks", "core", "data", "net", "ui", "utils", "world")
+
+# Top-level names -> the module that defines them.
+_EXPORTS = {
+    "GameDataManager": "rpg_game.data.game_data_manager",
+    "Player": "rpg_game.core.player",
+    "Enemy": "rpg_game.core.enemy",
+    "run_game_session": "rpg_game.ui.menu",
+}
+
+__all__ = list(_SUBPACKAGES) + list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name in _SUBPACKAGES:
+        return importlib.import_module(f"{__name__}.{name}")
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
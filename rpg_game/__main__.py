@@ -0,0 +1,68 @@
+import argparse
+import sys
+from typing import List, Optional
+
+# Only argparse is imported up front: the game modules are imported once the
+# arguments are parsed, so --help and usage errors return immediately.
+
+DEFAULT_DATA_DIR = "Game Csv Data"
+
+
+def run_without_loop(coroutine):
+    """
+    Runs a game coroutine to completion without an event loop. Console sessions
+    read input with blocking calls and never suspend, so this skips the cost of
+    importing and starting asyncio. Returns the coroutine's result.
+    """
+    try:
+        coroutine.send(None)
+    except StopIteration as done:
+        return done.value
+    coroutine.close()
+    raise RuntimeError("The session waited on the event loop; run it with asyncio.run() instead.")
+
+
+def main(argv: Optional[List[str]] = None, io=None) -> int:
+    """
+    Runs the RPG game: loads the game data (from the compiled data cache when it
+    is up to date) and plays one session.
+
+    Args:
+        argv: Command line arguments; sys.argv[1:] if omitted.
+        io: The GameIO adapter to play over; the console if omitted.
+
+    Returns:
+        The process exit code.
+    """
+    parser = argparse.ArgumentParser(prog="python -m rpg_game", description="Play the RPG game on the console.")
+    parser.add_argument("--data", default=DEFAULT_DATA_DIR, help="Directory containing the game CSV files.")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Parse the CSV files even if the compiled data cache is up to date.")
+    parser.add_argument("--overlay", action="append", default=[], metavar="DIR",
+                        help="Directory of sheet patches applied on top of the data; may be repeated.")
+    args = parser.parse_args(argv)
+
+    from .data.game_data_manager import GameDataManager
+    from .ui.game_io import ConsoleIO
+    from .ui.menu import run_game_session
+    from .utils.output import emit, flush, use_sink
+
+    io = io if io is not None else ConsoleIO()
+    with use_sink(io.sink):
+        emit("Loading all game data, please wait...", "load")
+        data_manager = GameDataManager()
+        data_manager.load_all_data([args.data] + args.overlay, use_cache=not args.no_cache)
+        if not data_manager.enemies or not data_manager.all_items:
+            emit("ERROR: Critical game data (enemies or items) could not be loaded. Exiting.", "warning")
+            flush()
+            return 1
+        emit("Game data loaded successfully!", "load")
+
+    # The menu and combat loops are shared with the network server (see net/server.py);
+    # locally they simply run over the console.
+    run_without_loop(run_game_session(io, data_manager))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,401 @@
+import argparse
+import csv
+import hashlib
+import html
+import json
+import os
+import statistics
+import sys
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    from ..core.combat import simulate_basic_fight
+    from ..core.equipment import Equipment
+    from ..core.loadout import LoadoutTotals, equipped_stats
+    from ..core.player import Player
+    from ..core.enemy_scaling import SCALED_STATS
+    from ..data.game_data_manager import GameDataManager
+    from ..utils.output import NullSink, use_sink
+except ImportError: # Fallback when 'balance' and 'core' are top-level packages
+    from core.combat import simulate_basic_fight
+    from core.equipment import Equipment
+    from core.loadout import LoadoutTotals, equipped_stats
+    from core.player import Player
+    from core.enemy_scaling import SCALED_STATS
+    from data.game_data_manager import GameDataManager
+    from utils.output import NullSink, use_sink
+
+
+# Part of every cache key; bump it when the simulation changes what it measures.
+REPORT_VERSION = 1
+DEFAULT_DATA_DIR = "Game Csv Data"
+DEFAULT_OUTPUT_DIR = "balance_report"
+CACHE_FILE = "balance_cache.json"
+DEFAULT_BAND_SIZE = 10
+DEFAULT_MAX_LEVEL = 50
+# Fights still undecided after this many turns count as deaths (neither side can hurt the other).
+MAX_TURNS = 200
+
+# Outlier thresholds, relative to the other enemies of the same zone and level band.
+SLOW_FACTOR = 2.0 # Mean TTK at least this many times the zone's median
+FAST_FACTOR = 0.5 # Mean TTK at most this fraction of the zone's median
+DEADLY_MARGIN = 0.5 # Death rate at least this much above the zone's median
+
+
+class LevelBand(NamedTuple):
+    """An inclusive range of player levels."""
+    low: int
+    high: int
+
+    @property
+    def label(self) -> str:
+        return f"{self.low}-{self.high}"
+
+    def levels(self) -> range:
+        return range(self.low, self.high + 1)
+
+
+def make_bands(band_size: int = DEFAULT_BAND_SIZE, max_level: int = DEFAULT_MAX_LEVEL) -> List[LevelBand]:
+    """Splits levels 1..max_level into bands of band_size levels (the last one may be shorter)."""
+    return [LevelBand(low, min(low + band_size - 1, max_level)) for low in range(1, max_level + 1, band_size)]
+
+
+def parse_bands(text: str) -> List[LevelBand]:
+    """Parses bands written as "1-10,11-20,21-30" (a single number is a one-level band)."""
+    bands = []
+    for part in text.split(","):
+        low, _, high = part.strip().partition("-")
+        band = LevelBand(int(low), int(high or low))
+        if band.low < 1 or band.high < band.low:
+            raise ValueError(f"Invalid level band: {part.strip()!r}")
+        bands.append(band)
+    return bands
+
+
+class ReferenceBuild(NamedTuple):
+    """
+    The player the enemies are measured against.
+
+    Attributes:
+        name: Shown in the report.
+        stat_bonuses: Primary stat points added on top of the normal growth, e.g. {"strength": 5}.
+        equipment: Names of items whose attack, defense and max HP bonuses (and the modifiers
+                   of their extra increases on those stats) the player has.
+    """
+    name: str = "Reference"
+    stat_bonuses: Dict[str, int] = {}
+    equipment: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_file(cls, path: str) -> "ReferenceBuild":
+        """Reads a build from a JSON file: {"name": ..., "stats": {...}, "equipment": [...]}."""
+        with open(path, encoding="utf-8") as f:
+            spec = json.load(f)
+        return cls(spec.get("name", "Reference"), dict(spec.get("stats", {})), tuple(spec.get("equipment", ())))
+
+
+def make_player(build: ReferenceBuild, level: int, data_manager: GameDataManager) -> Player:
+    """
+    Returns the build's player at a level, at full HP.
+
+    Raises:
+        ValueError: If the build names an unknown stat or item.
+    """
+    player = Player(build.name)
+    for stat, bonus in build.stat_bonuses.items():
+        if stat not in player.stats:
+            raise ValueError(f"Unknown stat in build {build.name!r}: {stat}")
+        player.stats[stat] += bonus
+    player._calculate_derived_stats()
+    if level > 1:
+        with use_sink(NullSink()): # No level-up messages for a simulated player
+            player.gain_xp(player.xp_table.total_for(level))
+    worn = LoadoutTotals()
+    for slot, name in enumerate(build.equipment):
+        item = data_manager.get_item(name)
+        if not isinstance(item, Equipment):
+            raise ValueError(f"Unknown equipment in build {build.name!r}: {name}")
+        worn.equip(str(slot), item)
+    stats = equipped_stats(player, worn)
+    player.derived_stats['attack_power'] = stats['attack_power']
+    player.derived_stats['defense'] = stats['defense']
+    player.max_hp = player.hp = stats['max_hp']
+    return player
+
+
+def _digest(value) -> str:
+    return hashlib.sha1(json.dumps(value, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def build_hash(players: Sequence[Player]) -> str:
+    """
+    Hashes what the simulation sees of a build over one level band: the players'
+    combat stats at each level (so changing the build, its equipment records or
+    the growth rules changes the hash).
+    """
+    return _digest([REPORT_VERSION, MAX_TURNS] +
+                   [[player.hp, player.derived_stats.get('attack_power', 0), player.derived_stats.get('defense', 0)]
+                    for player in players])
+
+
+def enemy_hash(data_manager: GameDataManager, name: str) -> str:
+    """Hashes an enemy record as the simulation sees it: its scaled stats at every level of its range."""
+    table = data_manager.enemy_scaling
+    min_level, max_level = table.level_bounds(name)
+    return _digest([[table.get_stats(name, level)[stat] for stat in SCALED_STATS]
+                    for level in range(min_level, max_level + 1)])
+
+
+class MatchupResult(NamedTuple):
+    """The fights of one enemy against the build over one level band."""
+    zone: str
+    band: str
+    enemy: str
+    fights: int
+    wins: int
+    won_turns: int # Turns summed over the won fights
+    flags: Tuple[str, ...] = ()
+
+    @property
+    def death_rate(self) -> float:
+        return 1 - self.wins / self.fights if self.fights else 0.0
+
+    @property
+    def mean_ttk(self) -> Optional[float]:
+        """Mean turns to kill the enemy in the won fights, or None if none was won."""
+        return self.won_turns / self.wins if self.wins else None
+
+
+class ZoneSummary(NamedTuple):
+    """One heatmap cell: every enemy of a zone over one level band."""
+    zone: str
+    band: str
+    enemies: int
+    mean_ttk: Optional[float] # Mean of the enemies' mean TTK
+    death_rate: float # Over all fights in the cell
+    outliers: int
+
+
+def simulate_matchup(players: Sequence[Player], data_manager: GameDataManager, name: str) -> Tuple[int, int, int]:
+    """
+    Fights an enemy at every level of its range against each player with basic
+    attacks. Returns (fights, wins, turns summed over the wins).
+    """
+    min_level, max_level = data_manager.enemy_scaling.level_bounds(name)
+    enemies = [data_manager.spawn_enemy(name, level) for level in range(min_level, max_level + 1)]
+    fights = wins = won_turns = 0
+    for player in players:
+        for enemy in enemies:
+            result = simulate_basic_fight(player, enemy, max_turns=MAX_TURNS)
+            fights += 1
+            if result.player_won:
+                wins += 1
+                won_turns += result.turns
+    return fights, wins, won_turns
+
+
+def flag_outliers(results: Sequence[MatchupResult]) -> List[MatchupResult]:
+    """
+    Flags the enemies of one zone and band that stand out from the others:
+    "slow" and "fast" for a mean TTK far above or below the median, "deadly"
+    for a death rate well above the median.
+    """
+    ttks = [result.mean_ttk for result in results if result.mean_ttk is not None]
+    median_ttk = statistics.median(ttks) if ttks else None
+    median_death = statistics.median(result.death_rate for result in results) if results else 0.0
+    flagged = []
+    for result in results:
+        flags = []
+        if median_ttk and result.mean_ttk is not None:
+            if result.mean_ttk >= SLOW_FACTOR * median_ttk:
+                flags.append("slow")
+            elif result.mean_ttk <= FAST_FACTOR * median_ttk:
+                flags.append("fast")
+        if result.death_rate >= median_death + DEADLY_MARGIN:
+            flags.append("deadly")
+        flagged.append(result._replace(flags=tuple(flags)))
+    return flagged
+
+
+class BalanceReport:
+    """
+    Simulated matchups of a reference build against every zone's enemies, per
+    player level band.
+
+    Results are cached by (build hash, enemy hash) in a plain dictionary that
+    callers can persist (see load_cache/save_cache), so after a sheet edit only
+    the changed enemies are simulated again.
+    """
+    def __init__(self, data_manager: GameDataManager, build: ReferenceBuild, bands: Sequence[LevelBand],
+                 cache: Optional[Dict[str, List[int]]] = None):
+        self.data_manager: GameDataManager = data_manager
+        self.build: ReferenceBuild = build
+        self.bands: List[LevelBand] = list(bands)
+        self.cache: Dict[str, List[int]] = cache if cache is not None else {}
+        self.used_keys: set = set() # Cache entries this report read or wrote
+        self.simulated: int = 0 # Matchups simulated rather than read from the cache
+        self.results: List[MatchupResult] = []
+        self.summaries: List[ZoneSummary] = []
+
+    def run(self) -> "BalanceReport":
+        """Simulates (or looks up) every matchup and computes the heatmap cells."""
+        data_manager = self.data_manager
+        enemy_hashes: Dict[str, str] = {}
+        for band in self.bands:
+            players = [make_player(self.build, level, data_manager) for level in band.levels()]
+            band_hash = build_hash(players)
+            for zone in data_manager.zones.values():
+                names = [name for name in zone.enemy_names if data_manager.get_enemy(name) is not None]
+                results = []
+                for name in names:
+                    if name not in enemy_hashes:
+                        enemy_hashes[name] = enemy_hash(data_manager, name)
+                    key = f"{band_hash}:{enemy_hashes[name]}"
+                    counts = self.cache.get(key)
+                    if counts is None:
+                        counts = self.cache[key] = list(simulate_matchup(players, data_manager, name))
+                        self.simulated += 1
+                    self.used_keys.add(key)
+                    results.append(MatchupResult(zone.name, band.label, name, *counts))
+                results = flag_outliers(results)
+                self.results.extend(results)
+                if results:
+                    ttks = [result.mean_ttk for result in results if result.mean_ttk is not None]
+                    fights = sum(result.fights for result in results)
+                    deaths = sum(result.fights - result.wins for result in results)
+                    self.summaries.append(ZoneSummary(zone.name, band.label, len(results),
+                                                      statistics.fmean(ttks) if ttks else None,
+                                                      deaths / fights if fights else 0.0,
+                                                      sum(1 for result in results if result.flags)))
+        return self
+
+    @property
+    def outliers(self) -> List[MatchupResult]:
+        return [result for result in self.results if result.flags]
+
+    def write_csv(self, heatmap_path: str, matchups_path: str) -> None:
+        """Writes the heatmap cells and the per-enemy matchups as CSV."""
+        with open(heatmap_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(["Zone", "Level Band", "Enemies", "Mean TTK", "Death Rate", "Outliers"])
+            for cell in self.summaries:
+                writer.writerow([cell.zone, cell.band, cell.enemies, _number(cell.mean_ttk), f"{cell.death_rate:.3f}",
+                                 cell.outliers])
+        with open(matchups_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(["Zone", "Level Band", "Enemy", "Fights", "Wins", "Mean TTK", "Death Rate", "Flags"])
+            for result in self.results:
+                writer.writerow([result.zone, result.band, result.enemy, result.fights, result.wins,
+                                 _number(result.mean_ttk), f"{result.death_rate:.3f}", " ".join(result.flags)])
+
+    def write_html(self, path: str) -> None:
+        """Writes a self-contained HTML page with both heatmaps and the outliers."""
+        cells = {(cell.zone, cell.band): cell for cell in self.summaries}
+        zones = list(dict.fromkeys(cell.zone for cell in self.summaries))
+        ttks = [cell.mean_ttk for cell in self.summaries if cell.mean_ttk is not None]
+        top_ttk = max(ttks) if ttks else 1.0
+
+        def table(title: str, render) -> List[str]:
+            lines = [f"<h2>{html.escape(title)}</h2>", "<table>",
+                     "<tr><th>Zone</th>" + "".join(f"<th>Lv {band.label}</th>" for band in self.bands) + "</tr>"]
+            for zone in zones:
+                row = [f"<th>{html.escape(zone)}</th>"]
+                for band in self.bands:
+                    cell = cells.get((zone, band.label))
+                    row.append(render(cell) if cell is not None else "<td></td>")
+                lines.append("<tr>" + "".join(row) + "</tr>")
+            lines.append("</table>")
+            return lines
+
+        def ttk_cell(cell: ZoneSummary) -> str:
+            if cell.mean_ttk is None:
+                return '<td style="background:#ccc">never won</td>'
+            lightness = 95 - 45 * min(1.0, cell.mean_ttk / top_ttk) # Longer fights are darker
+            return f'<td style="background:hsl(210,70%,{lightness:.0f}%)">{cell.mean_ttk:.1f}</td>'
+
+        def death_cell(cell: ZoneSummary) -> str:
+            hue = 120 * (1 - cell.death_rate) # Green when the build always wins, red when it always dies
+            return f'<td style="background:hsl({hue:.0f},70%,75%)">{cell.death_rate:.0%}</td>'
+
+        lines = ["<!DOCTYPE html>", '<html><head><meta charset="utf-8">',
+                 f"<title>Balance report: {html.escape(self.build.name)}</title>",
+                 "<style>body{font-family:sans-serif}table{border-collapse:collapse;margin-bottom:2em}"
+                 "td,th{border:1px solid #999;padding:4px 8px;text-align:center}</style></head><body>",
+                 f"<h1>Balance report: {html.escape(self.build.name)}</h1>",
+                 f"<p>Basic-attack fights of the build at every level of a band against each zone enemy at every "
+                 f"level of its range. Fights undecided after {MAX_TURNS} turns count as deaths.</p>"]
+        lines += table("Mean turns to kill", ttk_cell)
+        lines += table("Death rate", death_cell)
+        lines += ["<h2>Outliers</h2>", "<table>",
+                  "<tr><th>Zone</th><th>Level Band</th><th>Enemy</th><th>Mean TTK</th><th>Death Rate</th><th>Flags</th></tr>"]
+        for result in self.outliers:
+            lines.append(f"<tr><td>{html.escape(result.zone)}</td><td>{result.band}</td><td>{html.escape(result.enemy)}</td>"
+                         f"<td>{_number(result.mean_ttk) or '-'}</td><td>{result.death_rate:.0%}</td>"
+                         f"<td>{' '.join(result.flags)}</td></tr>")
+        lines += ["</table>", "</body></html>"]
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+
+
+def _number(value: Optional[float]) -> str:
+    return "" if value is None else f"{value:.2f}"
+
+
+def load_cache(path: str) -> Dict[str, List[int]]:
+    """Reads a results cache; a missing, unreadable or outdated file is an empty cache."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            stored = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(stored, dict) or stored.get("version") != REPORT_VERSION:
+        return {}
+    return stored.get("results", {})
+
+
+def save_cache(path: str, results: Dict[str, List[int]]) -> None:
+    """Writes a results cache atomically."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump({"version": REPORT_VERSION, "results": results}, f)
+    os.replace(temp_path, path)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Per-zone balance report: simulated time-to-kill and death rate "
+                                                 "of a reference build against every zone's enemies.")
+    parser.add_argument("--data", default=DEFAULT_DATA_DIR, help="CSV directory.")
+    parser.add_argument("--overlay", action="append", default=[], metavar="DIR",
+                        help="Directory of sheet patches applied on top of the data; may be repeated.")
+    parser.add_argument("--build", help="JSON file describing the reference build (default: a plain player).")
+    parser.add_argument("--bands", help='Player level bands, e.g. "1-10,11-20" (default: --band-size up to --max-level).')
+    parser.add_argument("--band-size", type=int, default=DEFAULT_BAND_SIZE)
+    parser.add_argument("--max-level", type=int, default=DEFAULT_MAX_LEVEL)
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR, help="Where to write the report files.")
+    parser.add_argument("--cache", help=f"Results cache file (default: {CACHE_FILE} in the output directory).")
+    parser.add_argument("--no-cache", action="store_true", help="Simulate every matchup again.")
+    args = parser.parse_args(argv)
+
+    bands = parse_bands(args.bands) if args.bands else make_bands(args.band_size, args.max_level)
+    build = ReferenceBuild.from_file(args.build) if args.build else ReferenceBuild()
+    cache_path = args.cache or os.path.join(args.output_dir, CACHE_FILE)
+    with use_sink(NullSink()):
+        data_manager = GameDataManager()
+        data_manager.load_all_data([args.data] + args.overlay, use_cache=True)
+        cache = {} if args.no_cache else load_cache(cache_path)
+        report = BalanceReport(data_manager, build, bands, cache).run()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    report.write_csv(os.path.join(args.output_dir, "heatmap.csv"), os.path.join(args.output_dir, "matchups.csv"))
+    report.write_html(os.path.join(args.output_dir, "report.html"))
+    # Only the entries of this run are kept, so the cache does not grow with every edit
+    save_cache(cache_path, {key: report.cache[key] for key in report.used_keys})
+    print(f"{len(report.results)} matchups in {len(report.summaries)} zone/band cells: "
+          f"{report.simulated} simulated, {len(report.results) - report.simulated} from the cache.")
+    print(f"{len(report.outliers)} outliers flagged. Wrote the report to {args.output_dir}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,486 @@
+import argparse
+import csv
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+try:
+    from rpg_game.core.combat import award_loot, simulate_basic_fight, simulate_party_fight
+    from rpg_game.core.enemy_ai import ExpectimaxPolicy, GreedyPolicy
+    from rpg_game.core.autoplay import MCTSAutoplayer, rollout_value
+    from rpg_game.core.fight_state import FightSetup
+    from rpg_game.core.formula import battler_params, skill_formula
+    from rpg_game.core.player import Player
+    from rpg_game.data.enemy_loader import load_enemies_from_csv
+    from rpg_game.data.game_data_manager import GameDataManager
+    from rpg_game.data.replay_log import ReplayWriter
+    from rpg_game.data.save_game import SaveFile, load_player
+    from rpg_game.utils.output import NullSink, use_sink
+except ImportError: # Fallback when run from inside the rpg_game directory
+    from core.combat import award_loot, simulate_basic_fight, simulate_party_fight
+    from core.enemy_ai import ExpectimaxPolicy, GreedyPolicy
+    from core.autoplay import MCTSAutoplayer, rollout_value
+    from core.fight_state import FightSetup
+    from core.formula import battler_params, skill_formula
+    from core.player import Player
+    from data.enemy_loader import load_enemies_from_csv
+    from data.game_data_manager import GameDataManager
+    from data.replay_log import ReplayWriter
+    from data.save_game import SaveFile, load_player
+    from utils.output import NullSink, use_sink
+
+
+RESULTS_VERSION = 1
+DEFAULT_DATA_DIR = "Game Csv Data"
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEFAULT_THRESHOLD = 0.25 # Fail when a benchmark is more than 25% slower than the baseline
+DEFAULT_SEED = 1234
+
+
+class BenchContext:
+    """Shared, lazily built inputs for the benchmarks of one run."""
+    def __init__(self, data_dir: str, work_dir: str, seed: int, synthetic_factor: int):
+        self.data_dir: str = data_dir
+        self.work_dir: str = work_dir
+        self.seed: int = seed
+        self.synthetic_factor: int = synthetic_factor
+        self._data_manager: Optional[GameDataManager] = None
+        self._synthetic_dir: Optional[str] = None
+        # Called once every benchmark has run, e.g. to close files kept open by an operation
+        self.cleanup: List[Callable[[], None]] = []
+
+    @property
+    def data_manager(self) -> GameDataManager:
+        if self._data_manager is None:
+            self._data_manager = GameDataManager()
+            self._data_manager.load_all_data(self.data_dir)
+        return self._data_manager
+
+    @property
+    def synthetic_dir(self) -> str:
+        if self._synthetic_dir is None:
+            self._synthetic_dir = os.path.join(self.work_dir, f"synthetic_x{self.synthetic_factor}")
+            make_synthetic_sheets(self.data_dir, self._synthetic_dir, self.synthetic_factor)
+        return self._synthetic_dir
+
+    def rng(self) -> random.Random:
+        return random.Random(self.seed)
+
+    def enter_context(self, manager):
+        """Enters a context manager and exits it once every benchmark has run. Returns what it entered."""
+        value = manager.__enter__()
+        self.cleanup.append(lambda: manager.__exit__(None, None, None))
+        return value
+
+
+# A benchmark's setup returns an operation; each call of the operation does some work
+# and returns how many units (loads, fights, evaluations...) it performed.
+Operation = Callable[[], int]
+
+
+class Benchmark(NamedTuple):
+    name: str
+    unit: str
+    setup: Callable[[BenchContext], Operation]
+
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, unit: str):
+    """Registers a benchmark setup function under `name`."""
+    def register(setup: Callable[[BenchContext], Operation]) -> Callable[[BenchContext], Operation]:
+        BENCHMARKS[name] = Benchmark(name, unit, setup)
+        return setup
+    return register
+
+
+def _has_number(row: List[str]) -> bool:
+    for cell in row:
+        try:
+            float(cell)
+            return True
+        except ValueError:
+            continue
+    return False
+
+
+def make_synthetic_sheets(source_dir: str, target_dir: str, factor: int) -> None:
+    """
+    Writes a copy of the CSV sheets in which every data row appears `factor` times.
+
+    Rows with a numeric cell are treated as data rows and repeated under new names
+    ("Goblin", "Goblin 2", ...); section headers and zone markers are kept once.
+    References to other sheets are not renamed, so linking still finds the originals.
+    """
+    os.makedirs(target_dir, exist_ok=True)
+    for filename in os.listdir(source_dir):
+        if not filename.endswith(".csv"):
+            continue
+        with open(os.path.join(source_dir, filename), newline='', encoding='utf-8') as f:
+            rows = list(csv.reader(f))
+        with open(os.path.join(target_dir, filename), 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            for row_number, row in enumerate(rows):
+                writer.writerow(row)
+                if row_number == 0 or not row or not row[0].strip() or not _has_number(row[1:]):
+                    continue
+                for copy in range(2, factor + 1):
+                    writer.writerow([f"{row[0].strip()} {copy}"] + row[1:])
+
+
+@benchmark("load_all_data_real", "loads/s")
+def _load_real(ctx: BenchContext) -> Operation:
+    def op() -> int:
+        GameDataManager().load_all_data(ctx.data_dir)
+        return 1
+    return op
+
+
+@benchmark("load_all_data_synthetic", "loads/s")
+def _load_synthetic(ctx: BenchContext) -> Operation:
+    data_dir = ctx.synthetic_dir
+    def op() -> int:
+        GameDataManager().load_all_data(data_dir)
+        return 1
+    return op
+
+
+@benchmark("enemy_linking", "enemies/s")
+def _enemy_linking(ctx: BenchContext) -> Operation:
+    data_manager = ctx.data_manager
+    path = os.path.join(ctx.data_dir, "Enemy's Sheet.csv")
+    def op() -> int:
+        enemies, _ = load_enemies_from_csv(path, data_manager.skills, data_manager.all_items)
+        return len(enemies)
+    return op
+
+
+@benchmark("basic_attack_fights", "fights/s")
+def _basic_fights(ctx: BenchContext) -> Operation:
+    data_manager = ctx.data_manager
+    enemies = data_manager.enemy_scaling.spawn_batch(1000, rng=ctx.rng())
+    player = Player("Benchmark")
+    player.level_up() # A few levels so some fights are won
+    player.level_up()
+    def op() -> int:
+        for enemy in enemies:
+            simulate_basic_fight(player, enemy)
+        return len(enemies)
+    return op
+
+
+@benchmark("party_fight_actions", "actions/s")
+def _party_fight_actions(ctx: BenchContext) -> Operation:
+    # Large encounters on the initiative timeline: 50 players against 500 enemies
+    enemies = ctx.data_manager.enemy_scaling.spawn_batch(500, rng=ctx.rng())
+    party = [Player(f"Benchmark {index}") for index in range(50)]
+    for index, player in enumerate(party):
+        player.stats['dexterity'] += index
+        player.hp = player.max_hp = 100000 # Long enough to measure actions rather than setup
+    def op() -> int:
+        return simulate_party_fight(party, enemies, max_actions=20000).actions
+    return op
+
+
+@benchmark("xp_grants", "grants/s")
+def _xp_grants(ctx: BenchContext) -> Operation:
+    # Large rewards that are worth many levels each
+    rng = ctx.rng()
+    grants = [rng.randint(1000, 1000000) for _ in range(1000)]
+    def op() -> int:
+        for amount in grants:
+            Player("Benchmark").gain_xp(amount)
+        return len(grants)
+    return op
+
+
+@benchmark("skill_formula_evals", "evals/s")
+def _formula_evals(ctx: BenchContext) -> Operation:
+    data_manager = ctx.data_manager
+    formulas = [formula for formula in map(skill_formula, data_manager.skills.values()) if formula is not None]
+    targets = [battler_params(enemy) for enemy in data_manager.enemy_scaling.spawn_batch(100, rng=ctx.rng())]
+    user = battler_params(Player("Benchmark"))
+    def op() -> int:
+        for formula in formulas:
+            damage = formula.damage
+            for target in targets:
+                damage(user, target)
+        return len(formulas) * len(targets)
+    return op
+
+
+def _armed_enemies(ctx: BenchContext, count: int) -> List:
+    # Enemies from the sheet rarely link to a skill, so give every spawn the formula skills
+    skills = [skill for skill in ctx.data_manager.skills.values() if skill_formula(skill) is not None]
+    enemies = ctx.data_manager.enemy_scaling.spawn_batch(count, rng=ctx.rng())
+    for enemy in enemies:
+        enemy.abilities_spells = skills
+    return enemies
+
+
+def _enemy_decisions(ctx: BenchContext, policy) -> Operation:
+    enemies = _armed_enemies(ctx, 200)
+    player = Player("Benchmark")
+    rng = ctx.rng()
+    def op() -> int:
+        for enemy in enemies:
+            enemy.hp = rng.randint(1, enemy.max_hp)
+            player.hp = rng.randint(1, player.max_hp)
+            policy.choose(enemy, player)
+        return len(enemies)
+    return op
+
+
+@benchmark("enemy_ai_greedy", "decisions/s")
+def _enemy_ai_greedy(ctx: BenchContext) -> Operation:
+    return _enemy_decisions(ctx, GreedyPolicy())
+
+
+@benchmark("enemy_ai_expectimax", "decisions/s")
+def _enemy_ai_expectimax(ctx: BenchContext) -> Operation:
+    return _enemy_decisions(ctx, ExpectimaxPolicy(depth=2))
+
+
+def _fight_states(ctx: BenchContext, count: int) -> List:
+    player = Player("Benchmark")
+    for skill in sorted((skill for skill in ctx.data_manager.skills.values() if skill_formula(skill) is not None),
+                        key=lambda skill: skill.name)[:4]:
+        player.learn_skill(skill)
+    return [FightSetup(player, enemy).initial_state(seed) for seed, enemy in enumerate(_armed_enemies(ctx, count))]
+
+
+@benchmark("fight_state_rollouts", "rollouts/s")
+def _fight_state_rollouts(ctx: BenchContext) -> Operation:
+    states = _fight_states(ctx, 100)
+    rng = ctx.rng()
+    def op() -> int:
+        for state in states:
+            rollout_value(state, 50, rng)
+        return len(states)
+    return op
+
+
+@benchmark("mcts_rollouts", "rollouts/s")
+def _mcts_rollouts(ctx: BenchContext) -> Operation:
+    states = _fight_states(ctx, 10)
+    autoplayer = MCTSAutoplayer(iterations=100, seed=ctx.seed)
+    def op() -> int:
+        before = autoplayer.rollouts
+        for state in states:
+            autoplayer.choose(state)
+        return autoplayer.rollouts - before
+    return op
+
+
+@benchmark("replay_record_turns", "turns/s")
+def _replay_record_turns(ctx: BenchContext) -> Operation:
+    # Turns recorded per second, on top of playing them with random actions
+    states = _fight_states(ctx, 100)
+    rng = ctx.rng()
+    writer = ReplayWriter(os.path.join(ctx.work_dir, "bench.replay"), ctx.data_manager)
+    ctx.cleanup.append(writer.close)
+    def op() -> int:
+        turns = 0
+        for initial in states:
+            state = initial.clone()
+            recording = writer.begin(state)
+            while not state.is_over():
+                actions = state.legal_actions()
+                state.apply(actions[int(rng.random() * len(actions))])
+                recording.turn(state)
+                turns += 1
+            recording.end(state)
+        return turns
+    return op
+
+
+@benchmark("spawn_rolls", "spawns/s")
+def _spawn_rolls(ctx: BenchContext) -> Operation:
+    table = ctx.data_manager.enemy_scaling
+    rng = ctx.rng()
+    def op() -> int:
+        return len(table.spawn_batch(1000, rng=rng))
+    return op
+
+
+@benchmark("loot_rolls", "drops/s")
+def _loot_rolls(ctx: BenchContext) -> Operation:
+    enemies = [enemy for enemy in ctx.data_manager.enemies.values() if enemy.loot]
+    player = Player("Benchmark")
+    def op() -> int:
+        player.inventory.clear()
+        for enemy in enemies:
+            award_loot(player, enemy)
+        return len(enemies)
+    return op
+
+
+def _saved_player(ctx: BenchContext) -> Player:
+    data_manager = ctx.data_manager
+    player = Player("Benchmark")
+    for name in sorted(data_manager.all_items)[:30]:
+        player.add_item_to_inventory(data_manager.all_items[name])
+    for name in sorted(data_manager.skills)[:10]:
+        player.learn_skill(data_manager.skills[name])
+    return player
+
+
+@benchmark("player_save", "saves/s")
+def _player_save(ctx: BenchContext) -> Operation:
+    player = _saved_player(ctx)
+    save = ctx.enter_context(SaveFile(os.path.join(ctx.work_dir, "bench_save.sav"), ctx.data_manager))
+    def op() -> int:
+        for _ in range(100):
+            player.hp = player.hp - 1 if player.hp > 1 else player.max_hp # One change per turn
+            save.save(player)
+        return 100
+    return op
+
+
+@benchmark("player_load", "loads/s")
+def _player_load(ctx: BenchContext) -> Operation:
+    player = _saved_player(ctx)
+    path = os.path.join(ctx.work_dir, "bench_load.sav")
+    with SaveFile(path, ctx.data_manager, checkpoint_interval=32) as save:
+        for turn in range(100):
+            player.hp = player.max_hp - turn % 50
+            save.save(player)
+    catalog = save.catalog
+    def op() -> int:
+        load_player(path, ctx.data_manager, catalog)
+        return 1
+    return op
+
+
+def measure(op: Operation, min_time: float, repeat: int) -> float:
+    """Returns the best rate (units per second) over `repeat` runs of at least `min_time` seconds."""
+    op() # Warm-up
+    best = 0.0
+    for _ in range(repeat):
+        units = 0
+        start = time.perf_counter()
+        elapsed = 0.0
+        while elapsed < min_time:
+            units += op()
+            elapsed = time.perf_counter() - start
+        best = max(best, units / elapsed)
+    return best
+
+
+def run_benchmarks(data_dir: str = DEFAULT_DATA_DIR, names: Optional[List[str]] = None,
+                   min_time: float = 0.5, repeat: int = 3, seed: int = DEFAULT_SEED,
+                   synthetic_factor: int = 100) -> Dict:
+    """
+    Runs the benchmarks and returns the results document.
+
+    Args:
+        data_dir: The CSV directory used by every benchmark.
+        names: Benchmarks to run; None runs all of them.
+        min_time: Minimum seconds per measurement.
+        repeat: Measurements per benchmark; the best one is kept.
+        seed: Seed for every random choice, so runs are comparable.
+        synthetic_factor: Row multiplier for the synthetic sheets.
+
+    Returns:
+        A JSON-serializable dict with run metadata and one entry per benchmark.
+    """
+    selected = [BENCHMARKS[name] for name in (names or BENCHMARKS)]
+    results: Dict[str, Dict] = {}
+    work_dir = tempfile.mkdtemp(prefix="rpg_bench_")
+    ctx = BenchContext(data_dir, work_dir, seed, synthetic_factor)
+    try:
+        with use_sink(NullSink()):
+            for bench in selected:
+                rate = measure(bench.setup(ctx), min_time, repeat)
+                results[bench.name] = {"value": rate, "unit": bench.unit}
+    finally:
+        for cleanup in ctx.cleanup:
+            cleanup()
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return {
+        "version": RESULTS_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "synthetic_factor": synthetic_factor,
+        "results": results,
+    }
+
+
+class Regression(NamedTuple):
+    name: str
+    baseline: float
+    current: float
+    change: float # Relative change, negative when slower
+
+
+def compare_results(current: Dict, baseline: Dict, threshold: float = DEFAULT_THRESHOLD) -> Tuple[List[Regression], List[str]]:
+    """
+    Compares two results documents. All values are rates, so higher is better.
+
+    Returns:
+        (regressions beyond the threshold, report lines for every shared benchmark)
+    """
+    regressions: List[Regression] = []
+    lines: List[str] = []
+    for name, entry in current["results"].items():
+        base_entry = baseline.get("results", {}).get(name)
+        if not base_entry or base_entry["value"] <= 0:
+            lines.append(f"{name:<26} {entry['value']:>14,.1f} {entry['unit']:<10} (no baseline)")
+            continue
+        change = entry["value"] / base_entry["value"] - 1.0
+        flag = ""
+        if change < -threshold:
+            regressions.append(Regression(name, base_entry["value"], entry["value"], change))
+            flag = "  REGRESSION"
+        lines.append(f"{name:<26} {entry['value']:>14,.1f} {entry['unit']:<10} {change:+7.1%}{flag}")
+    return regressions, lines
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Performance benchmarks for the RPG game.")
+    parser.add_argument("--data", default=DEFAULT_DATA_DIR, help="CSV directory.")
+    parser.add_argument("--output", default="benchmark_results.json", help="Where to write the results.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Results file to compare against.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown as a fraction (0.25 = 25%%).")
+    parser.add_argument("--update-baseline", action="store_true", help="Store this run as the new baseline.")
+    parser.add_argument("--only", nargs="*", choices=sorted(BENCHMARKS), help="Benchmarks to run.")
+    parser.add_argument("--min-time", type=float, default=0.5)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--synthetic-factor", type=int, default=100)
+    args = parser.parse_args()
+
+    current = run_benchmarks(args.data, args.only, args.min_time, args.repeat, args.seed, args.synthetic_factor)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(current, f, indent=2)
+    print(f"Wrote {args.output}")
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    regressions, lines = compare_results(current, baseline, args.threshold)
+    print("\n".join(lines))
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+        print(f"Baseline updated: {args.baseline}")
+    elif regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}.")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
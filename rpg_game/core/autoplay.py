@@ -0,0 +1,135 @@
+import math
+import random
+from typing import Dict, List, Optional
+
+from .combat import FightResult
+from .fight_state import ENEMY_HP, PLAYER_HP, TURN, FightSetup, FightState
+
+
+class _Node:
+    __slots__ = ("children", "visits", "total")
+
+    def __init__(self):
+        self.children: Dict[int, "_Node"] = {}
+        self.visits: int = 0
+        self.total: float = 0.0
+
+
+def rollout_value(state: FightState, max_rounds: int, rng: random.Random) -> float:
+    """
+    Plays random legal actions until the fight ends or `max_rounds` pass, then
+    undoes them. Returns 1 for a win, 0 for a loss, and the share of damage dealt
+    (enemy HP lost relative to player HP lost) when the fight is still going.
+    """
+    values = state.values
+    start_player_hp, start_enemy_hp = values[PLAYER_HP], values[ENEMY_HP]
+    played = 0
+    while not state.is_over() and played < max_rounds:
+        actions = state.legal_actions()
+        state.apply(actions[int(rng.random() * len(actions))])
+        played += 1
+    values = state.values
+    if values[ENEMY_HP] <= 0:
+        value = 1.0 if values[PLAYER_HP] > 0 else 0.0
+    elif values[PLAYER_HP] <= 0:
+        value = 0.0
+    else:
+        dealt = (start_enemy_hp - values[ENEMY_HP]) / max(1, start_enemy_hp)
+        taken = (start_player_hp - values[PLAYER_HP]) / max(1, start_player_hp)
+        value = 0.5 + (dealt - taken) / 2
+    for _ in range(played):
+        state.undo()
+    return value
+
+
+class MCTSAutoplayer:
+    """
+    Chooses the player's actions with Monte Carlo tree search over FightState.
+
+    The search is open-loop: every iteration reseeds a working copy of the state,
+    so the tree averages over the dice rather than trusting one roll. Moves are
+    walked with apply() and taken back with undo(), so one copy serves all iterations.
+
+    Args:
+        iterations: Search iterations (each ends in one rollout) per decision.
+        exploration: UCB1 exploration constant.
+        max_rollout_rounds: Rounds after which a rollout is scored on damage traded.
+        seed: Seed for the search's own random numbers.
+    """
+    def __init__(self, iterations: int = 200, exploration: float = 1.4, max_rollout_rounds: int = 50,
+                 seed: Optional[int] = None):
+        self.iterations: int = iterations
+        self.exploration: float = exploration
+        self.max_rollout_rounds: int = max_rollout_rounds
+        self.rng: random.Random = random.Random(seed)
+        self.rollouts: int = 0
+
+    def choose(self, state: FightState) -> int:
+        """Returns the index (into state.setup.player_actions) of the action to play."""
+        actions = state.legal_actions()
+        if len(actions) == 1:
+            return actions[0]
+        root = _Node()
+        work = state.clone()
+        for _ in range(self.iterations):
+            work.seed = self.rng.getrandbits(63)
+            self._iterate(root, work)
+        return max(actions, key=lambda action: root.children[action].visits if action in root.children else -1)
+
+    def _iterate(self, root: _Node, state: FightState) -> None:
+        path: List[_Node] = [root]
+        node = root
+        depth = 0
+        while not state.is_over():
+            actions = state.legal_actions()
+            untried = [action for action in actions if action not in node.children]
+            if untried:
+                action = untried[int(self.rng.random() * len(untried))]
+                child = node.children[action] = _Node()
+                state.apply(action)
+                depth += 1
+                path.append(child)
+                break
+            log_visits = math.log(node.visits)
+            action = max(actions, key=lambda a: node.children[a].total / node.children[a].visits +
+                         self.exploration * math.sqrt(log_visits / node.children[a].visits))
+            node = node.children[action]
+            state.apply(action)
+            depth += 1
+            path.append(node)
+        value = rollout_value(state, self.max_rollout_rounds, self.rng)
+        self.rollouts += 1
+        for visited in path:
+            visited.visits += 1
+            visited.total += value
+        for _ in range(depth):
+            state.undo()
+
+
+def autoplay(player, enemy, autoplayer: Optional[MCTSAutoplayer] = None, seed: int = 0,
+             max_turns: int = 1000, replay=None) -> FightResult:
+    """
+    Plays a whole fight headlessly with an autoplayer choosing the player's actions.
+    Like simulate_basic_fight, leaves the player and the enemy untouched.
+
+    Args:
+        player: The player (current HP/MP and known skills are used).
+        enemy: The enemy.
+        autoplayer: The autoplayer; an MCTSAutoplayer with default settings if omitted.
+        seed: Seed of the fight's dice.
+        max_turns: Turns after which the fight counts as lost.
+        replay: Optional ReplayWriter (see data.replay_log) the fight is recorded to.
+
+    Returns:
+        A FightResult.
+    """
+    autoplayer = autoplayer or MCTSAutoplayer(seed=seed)
+    state = FightSetup(player, enemy).initial_state(seed)
+    recording = replay.begin(state) if replay is not None else None
+    while not state.is_over() and state.values[TURN] < max_turns:
+        state.apply(autoplayer.choose(state))
+        if recording is not None:
+            recording.turn(state)
+    if recording is not None:
+        recording.end(state)
+    return FightResult(state.player_won(), state.values[TURN], state.values[PLAYER_HP], state.values[ENEMY_HP])
@@ -2,7 +2,28 @@ from .player import Player
 from .enemy import Enemy
 from .item import Item # Added import for Item
 from .skill import Skill, Ability, Spell # Added imports for skill types
+from .formula import HP_DAMAGE, HP_DRAIN, HP_RECOVER, battler_params, hp_effect, skill_formula
+from .initiative import TurnScheduler, agility_of
 import random # Added import for random
+from typing import List, NamedTuple, Optional, Sequence
+try:
+    from ..ui.game_io import GameIO, ConsoleIO
+    from ..utils.output import emit, flush
+    from ..utils.metrics import registry as metrics, TURN_BUCKETS
+except ImportError: # Fallback when 'core' is imported as a top-level package (e.g. from Game.py)
+    from ui.game_io import GameIO, ConsoleIO
+    from utils.output import emit, flush
+    from utils.metrics import registry as metrics, TURN_BUCKETS
+
+# Combat instrumentation; only recorded while metrics are enabled.
+_PHASE_HELP = "Time spent in each combat phase."
+_ACTION_SELECTION = metrics.histogram("rpg_combat_phase_seconds", _PHASE_HELP, phase="action_selection")
+_DAMAGE_RESOLUTION = metrics.histogram("rpg_combat_phase_seconds", _PHASE_HELP, phase="damage_resolution")
+_LOOT_RESOLUTION = metrics.histogram("rpg_combat_phase_seconds", _PHASE_HELP, phase="loot_resolution")
+_FIGHT_TURNS = {mode: metrics.histogram("rpg_fight_turns", "Turns per finished fight.", TURN_BUCKETS, mode=mode)
+                for mode in ("interactive", "headless")}
+_FIGHTS = {(mode, outcome): metrics.counter("rpg_fights_total", "Finished fights.", mode=mode, outcome=outcome)
+           for mode in ("interactive", "headless") for outcome in ("victory", "defeat")}
 
 def calculate_damage(attack_power: int, defense: int) -> int:
     """
@@ -16,37 +37,279 @@ def calculate_damage(attack_power: int, defense: int) -> int:
     return max(1, damage) # Ensures at least 1 damage if attack_power > defense
 
 
-def start_combat(player: Player, enemy: Enemy):
+def player_skill_damage(player: Player, enemy: Enemy, skill: Skill) -> Optional[int]:
+    """
+    Returns the damage a player's skill or spell deals to an enemy before elemental
+    affinities, or None if it deals no damage. Skills with a sheet formula use it
+    when their Dmg Type is Hp Damage or Hp Drain; others get a flat bonus on "Hp Damage"
+    (+3 magic power against magic defense for spells, +5 attack power for abilities).
+    Used by run_combat and the FightState search, so both play by the same rules.
+    """
+    formula = skill_formula(skill)
+    if formula is not None:
+        if hp_effect(skill) in (HP_DAMAGE, HP_DRAIN):
+            return formula.damage(battler_params(player), battler_params(enemy))
+        return None
+    if getattr(skill, 'dmg_type', None) != "Hp Damage":
+        return None
+    if isinstance(skill, Spell):
+        magic_power = player.derived_stats.get('magic_power', player.stats['intelligence'])
+        return calculate_damage(magic_power + 3, getattr(enemy, 'magic_defense', enemy.defense))
+    if isinstance(skill, Ability):
+        return calculate_damage(player.derived_stats.get('attack_power', player.stats['strength']) + 5, enemy.defense)
+    return None
+
+
+def skill_recovery(user, skill: Skill) -> int:
+    """Returns the HP an HP Recover skill restores to its user (its sheet formula), or 0 for other skills."""
+    formula = skill_formula(skill)
+    if formula is None or hp_effect(skill) != HP_RECOVER:
+        return 0
+    params = battler_params(user)
+    return formula.damage(params, params)
+
+
+class FightResult(NamedTuple):
+    """Outcome of a headless fight."""
+    player_won: bool
+    turns: int
+    player_hp: int
+    enemy_hp: int
+
+
+def simulate_basic_fight(player: Player, enemy: Enemy, max_turns: int = 1000) -> FightResult:
+    """
+    Plays out a fight in which both sides only use basic attacks, without any I/O.
+    Follows the same turn order and damage rules as run_combat but leaves both
+    combatants untouched.
+
+    Args:
+        player: The player (current HP is the starting HP).
+        enemy: The enemy (current HP is the starting HP).
+        max_turns: Turns after which the fight counts as lost (e.g. neither side can hurt the other).
+
+    Returns:
+        A FightResult.
+    """
+    player_hp, enemy_hp = player.hp, enemy.hp
+    player_damage = calculate_damage(player.derived_stats.get('attack_power', player.stats['strength']), enemy.defense)
+    enemy_damage = calculate_damage(enemy.attack_power, player.derived_stats.get('defense', 0))
+    turn = 0
+    while player_hp > 0 and enemy_hp > 0 and turn < max_turns:
+        turn += 1
+        enemy_hp -= min(enemy_hp, player_damage)
+        if enemy_hp > 0:
+            player_hp -= min(player_hp, enemy_damage)
+    player_won = player_hp > 0 and enemy_hp <= 0
+    if metrics.enabled:
+        _FIGHT_TURNS["headless"].observe(turn)
+        _FIGHTS["headless", "victory" if player_won else "defeat"].inc()
+    return FightResult(player_won, turn, player_hp, enemy_hp)
+
+
+class PartyFightResult(NamedTuple):
+    """Outcome of a headless party fight; HP lists follow the order the combatants were given in."""
+    party_won: bool
+    actions: int
+    party_hp: List[int]
+    enemy_hp: List[int]
+
+
+def _attack_and_defense(battler) -> tuple:
+    derived = getattr(battler, 'derived_stats', None)
+    if derived is not None: # Player
+        return derived.get('attack_power', battler.stats['strength']), derived.get('defense', 0)
+    return battler.attack_power, battler.defense
+
+
+def simulate_party_fight(party: Sequence[Player], enemies: Sequence[Enemy], max_actions: int = 100000) -> PartyFightResult:
+    """
+    Plays out a fight between any number of players and enemies using basic attacks,
+    without any I/O. Turns follow a TurnScheduler initiative timeline, so each
+    action costs O(log n) however large the fight. Every attacker hits the first
+    opponent still standing. Leaves all combatants untouched.
+
+    Args:
+        party: The players (current HP is the starting HP).
+        enemies: The enemies (current HP is the starting HP). The same Enemy may appear
+                 more than once; each entry is a separate combatant.
+        max_actions: Actions after which the fight counts as lost.
+
+    Returns:
+        A PartyFightResult.
+    """
+    battlers = list(party) + list(enemies)
+    hp = [battler.hp for battler in battlers]
+    stats = [_attack_and_defense(battler) for battler in battlers]
+    party_size = len(party)
+    schedule = TurnScheduler(key=int) # Battlers are scheduled by index, so repeated enemies are distinct
+    for index, battler in enumerate(battlers):
+        if hp[index] > 0:
+            schedule.add(index, agility=agility_of(battler))
+    alive = [sum(1 for value in hp[:party_size] if value > 0), sum(1 for value in hp[party_size:] if value > 0)]
+    # First opponent still standing for each attacking side (targets only ever move forward)
+    first_alive = [next((i for i in range(party_size, len(hp)) if hp[i] > 0), len(hp)),
+                   next((i for i in range(party_size) if hp[i] > 0), party_size)]
+    actions = 0
+    while alive[0] and alive[1] and actions < max_actions:
+        attacker = schedule.next()
+        side = 0 if attacker < party_size else 1 # 0: a party member attacking the enemies
+        target = first_alive[side]
+        hp[target] -= min(hp[target], calculate_damage(stats[attacker][0], stats[target][1]))
+        actions += 1
+        if hp[target] <= 0:
+            schedule.remove(target)
+            alive[1 - side] -= 1
+            end = len(battlers) if side == 0 else party_size
+            while target < end and hp[target] <= 0:
+                target += 1
+            first_alive[side] = target
+    party_won = alive[0] > 0 and alive[1] == 0
+    if metrics.enabled:
+        _FIGHTS["headless", "victory" if party_won else "defeat"].inc()
+    return PartyFightResult(party_won, actions, hp[:party_size], hp[party_size:])
+
+
+def award_loot(player: Player, enemy: Enemy) -> List[Item]:
+    """Gives the player everything a defeated enemy drops. Returns the dropped items."""
+    if not enemy.loot:
+        emit(f"The {enemy.name} dropped nothing.", "loot")
+        return []
+    emit(f"The {enemy.name} dropped:", "loot")
+    for item_obj in enemy.loot:
+        emit(f"- {item_obj.name}", "loot", item=item_obj.name)
+        player.add_item_to_inventory(item_obj) # Assumes player has this method
+    return list(enemy.loot)
+
+
+def _enemy_turn(player: Player, enemy: Enemy, enemy_policy=None, affinities=None) -> None:
+    """Plays one enemy action in run_combat: a skill chosen by the policy (or at random) or a basic attack."""
+    emit(f"\n{enemy.name}'s turn...", "combat")
+    started = metrics.start()
+    chosen_enemy_skill = None
+    if enemy_policy is not None:
+        chosen_enemy_skill = enemy_policy.choose(enemy, player)
+    elif enemy.abilities_spells and random.random() < 0.5: # 50% chance to use a skill if available
+        chosen_enemy_skill = random.choice(enemy.abilities_spells)
+    metrics.stop_and_observe(_ACTION_SELECTION, started)
+    started = metrics.start()
+    if chosen_enemy_skill is not None:
+        emit(f"{enemy.name} uses {chosen_enemy_skill.name}!", "combat")
+        if chosen_enemy_skill.description:
+            emit(f"> {chosen_enemy_skill.description}", "combat")
+
+        # Simplified effect for enemy skill
+        enemy_skill_formula = skill_formula(chosen_enemy_skill)
+        effect = hp_effect(chosen_enemy_skill)
+        if enemy_skill_formula is not None and effect in (HP_DAMAGE, HP_DRAIN): # Damage straight from the sheet formula
+            damage_to_player = enemy_skill_formula.damage(battler_params(enemy), battler_params(player))
+            if affinities is not None:
+                damage_to_player = affinities.scale(damage_to_player, chosen_enemy_skill.element_id, 0)
+            actual_damage_taken = player.take_damage(damage_to_player)
+            emit(f"{chosen_enemy_skill.name} hits {player.name} for {damage_to_player} damage.", "combat")
+            if effect == HP_DRAIN:
+                emit(f"{enemy.name} drains {enemy.heal(actual_damage_taken)} HP.", "combat")
+        elif enemy_skill_formula is not None and effect == HP_RECOVER: # The formula is the HP the enemy restores
+            healed = enemy.heal(skill_recovery(enemy, chosen_enemy_skill))
+            emit(f"{enemy.name} recovers {healed} HP.", "combat")
+        elif enemy_skill_formula is not None: # Buffs, debuffs and other effects leave HP alone
+            emit(f"{chosen_enemy_skill.name} affects {player.name} with a strange power!", "combat")
+        elif isinstance(chosen_enemy_skill, Ability) and hasattr(chosen_enemy_skill, 'dmg_type') and chosen_enemy_skill.dmg_type == "Hp Damage":
+            base_enemy_attack = enemy.magic_attack if hasattr(enemy, 'magic_attack') and enemy.magic_attack > enemy.attack_power else enemy.attack_power
+            # Example: skill adds +2 to enemy base attack
+            enemy_skill_modified_attack = base_enemy_attack + 2
+            damage_to_player = calculate_damage(enemy_skill_modified_attack, player.derived_stats.get('defense', 0))
+            player.take_damage(damage_to_player)
+            emit(f"{chosen_enemy_skill.name} hits {player.name} for {damage_to_player} damage.", "combat")
+        elif isinstance(chosen_enemy_skill, Spell): # Basic placeholder for spells
+            if hasattr(chosen_enemy_skill, 'dmg_type') and chosen_enemy_skill.dmg_type == "Hp Damage":
+                enemy_magic_power = enemy.magic_attack if hasattr(enemy, 'magic_attack') else enemy.attack_power
+                enemy_spell_modified_attack = enemy_magic_power + 2
+                damage_to_player = calculate_damage(enemy_spell_modified_attack, player.derived_stats.get('magic_defense', player.derived_stats.get('defense',0))) # Target MDEF if player has it
+                player.take_damage(damage_to_player)
+                emit(f"{chosen_enemy_skill.name} magically strikes {player.name} for {damage_to_player} damage.", "combat")
+            else:
+                emit(f"{chosen_enemy_skill.name} affects {player.name} with a strange power!", "combat")
+        else:
+            emit(f"{chosen_enemy_skill.name} is used by {enemy.name}!", "combat")
+    else:
+        # Basic attack (existing logic)
+        player_defense = player.derived_stats.get('defense', 0) 
+        damage_to_player = calculate_damage(enemy.attack_power, player_defense)
+        actual_damage_taken = player.take_damage(damage_to_player)
+        emit(f"{enemy.name} attacks {player.name} for {actual_damage_taken} damage.", "combat")
+    metrics.stop_and_observe(_DAMAGE_RESOLUTION, started)
+
+
+def start_combat(player: Player, enemy: Enemy, enemy_policy=None, affinities=None, initiative: bool = False):
     """
-    Manages a combat encounter between the player and an enemy.
+    Manages a combat encounter between the player and an enemy on the console.
 
     Args:
         player: The player object.
         enemy: The enemy object.
+        enemy_policy: Optional EnemyPolicy (see core.enemy_ai) choosing the enemy's actions.
+        affinities: Optional AffinityMatrix (see core.elements) scaling elemental skill damage.
+        initiative: Order turns by agility/dexterity (see core.initiative) instead of alternating.
     """
-    print(f"\nA wild {enemy.name} appears!\n")
+    import asyncio # Only needed here, so importing combat does not pull in the event loop machinery
+    asyncio.run(run_combat(player, enemy, ConsoleIO(), enemy_policy, affinities, initiative))
+
+
+async def run_combat(player: Player, enemy: Enemy, io: GameIO, enemy_policy=None, affinities=None,
+                     initiative: bool = False):
+    """
+    Runs a combat encounter over any GameIO adapter (console or network session).
+    Only waiting for the player's input suspends, so many fights can share one event loop.
+
+    Args:
+        player: The player object.
+        enemy: The enemy object.
+        io: The adapter the player's choices are read from. Output goes to the active sink.
+        enemy_policy: Optional EnemyPolicy (see core.enemy_ai) choosing the enemy's actions.
+                      Without one the enemy uses a random skill half of the time.
+        affinities: Optional AffinityMatrix (see core.elements) scaling skill damage by the
+                    skill's element against the defender's type. Players count as neutral.
+        initiative: Order turns on a TurnScheduler timeline, so the faster side (player
+                    dexterity vs enemy agility) can act first and more often. Without it
+                    the player and the enemy strictly alternate.
+    """
+    emit(f"\nA wild {enemy.name} appears!\n", "combat")
+
+    schedule = None
+    if initiative:
+        schedule = TurnScheduler()
+        schedule.add(player)
+        schedule.add(enemy)
+        if schedule.peek() is enemy:
+            emit(f"The {enemy.name} is quicker!", "combat")
+        while schedule.peek() is enemy and player.hp > 0: # A faster enemy strikes first
+            schedule.next()
+            _enemy_turn(player, enemy, enemy_policy, affinities)
 
     turn = 1
     while player.hp > 0 and enemy.is_alive():
-        print(f"--- Turn {turn} ---")
-        print(f"{player.name}: {player.hp}/{player.max_hp} HP | {enemy.name}: {enemy.hp}/{enemy.max_hp} HP")
+        emit(f"--- Turn {turn} ---", "combat")
+        emit(f"{player.name}: {player.hp}/{player.max_hp} HP | {enemy.name}: {enemy.hp}/{enemy.max_hp} HP", "combat")
 
         # Player's Turn
         player_action_taken = False
         while not player_action_taken:
-            print("\nPlayer's turn. Choose an action:")
-            print("1. Attack (Basic)")
-            print("2. Use Skill/Spell")
-            # print("3. View Inventory (Not implemented in combat)") # Skipping for now
-            print("4. Flee (Not implemented)")
+            emit("\nPlayer's turn. Choose an action:", "combat")
+            emit("1. Attack (Basic)", "combat")
+            emit("2. Use Skill/Spell", "combat")
+            # emit("3. View Inventory (Not implemented in combat)", "combat") # Skipping for now
+            emit("4. Flee (Not implemented)", "combat")
             
-            action_choice = input("Enter your choice: ").lower().strip()
+            action_choice = (await io.read_line("Enter your choice: ")).lower().strip()
 
             if action_choice == "1": # Basic Attack
+                started = metrics.start()
                 player_attack_power = player.derived_stats.get('attack_power', player.stats['strength']) 
                 damage_to_enemy = calculate_damage(player_attack_power, enemy.defense)
                 actual_damage_dealt = enemy.take_damage(damage_to_enemy)
-                print(f"{player.name} attacks {enemy.name} for {actual_damage_dealt} damage.")
+                metrics.stop_and_observe(_DAMAGE_RESOLUTION, started)
+                emit(f"{player.name} attacks {enemy.name} for {actual_damage_dealt} damage.", "combat")
                 player_action_taken = True
             elif action_choice == "2": # Use Skill/Spell
                 all_learnable_skills: list[Skill] = [] # Use base Skill for the list type
@@ -54,130 +317,102 @@ def start_combat(player: Player, enemy: Enemy):
                 all_learnable_skills.extend(player.known_spells)
 
                 if not all_learnable_skills:
-                    print("You don't know any skills or spells!")
+                    emit("You don't know any skills or spells!", "combat")
                     continue # Go back to action choice
 
-                print("\nAvailable Skills/Spells:")
+                emit("\nAvailable Skills/Spells:", "combat")
                 for i, skill in enumerate(all_learnable_skills):
                     skill_type_display = "Ability"
                     if isinstance(skill, Spell):
                         skill_type_display = "Spell"
                     cost_display = skill.cost if hasattr(skill, 'cost') and skill.cost else "N/A"
-                    print(f"{i + 1}. {skill.name} ({skill_type_display}) - Cost: {cost_display}")
+                    emit(f"{i + 1}. {skill.name} ({skill_type_display}) - Cost: {cost_display}", "combat")
                 
-                skill_choice_str = input(f"Choose a skill/spell (1-{len(all_learnable_skills)}) or 0 to go back: ").strip()
+                skill_choice_str = (await io.read_line(f"Choose a skill/spell (1-{len(all_learnable_skills)}) or 0 to go back: ")).strip()
                 try:
                     skill_choice_num = int(skill_choice_str)
                     if skill_choice_num == 0:
                         continue # Go back to action choice
                     if 1 <= skill_choice_num <= len(all_learnable_skills):
                         chosen_skill = all_learnable_skills[skill_choice_num - 1]
-                        print(f"{player.name} uses {chosen_skill.name}!")
+                        emit(f"{player.name} uses {chosen_skill.name}!", "combat")
                         if chosen_skill.description:
-                            print(f"> {chosen_skill.description}")
+                            emit(f"> {chosen_skill.description}", "combat")
                         
-                        # Simulated Effect
-                        if isinstance(chosen_skill, Ability) and hasattr(chosen_skill, 'dmg_type') and chosen_skill.dmg_type == "Hp Damage":
-                            # Simplified damage for skill, can be expanded with formula
-                            player_base_attack = player.derived_stats.get('attack_power', player.stats['strength'])
-                            # Example: skill adds +5 to base attack for calculation, or uses a multiplier
-                            skill_modified_attack = player_base_attack + 5 # Simple modifier
-                            damage = calculate_damage(skill_modified_attack, enemy.defense)
-                            enemy.take_damage(damage)
-                            print(f"{chosen_skill.name} hits {enemy.name} for {damage} damage.")
-                        elif isinstance(chosen_skill, Spell): # Basic placeholder for spells
-                            # Example: Spell uses magic_power, could have different effects
-                            if hasattr(chosen_skill, 'dmg_type') and chosen_skill.dmg_type == "Hp Damage": # Offensive spell
-                                player_magic_power = player.derived_stats.get('magic_power', player.stats['intelligence'])
-                                # Example: spell adds +3 to magic power for calculation
-                                spell_modified_attack = player_magic_power + 3
-                                damage = calculate_damage(spell_modified_attack, enemy.magic_defense if hasattr(enemy, 'magic_defense') else enemy.defense) # Target magic defense if available
-                                enemy.take_damage(damage)
-                                print(f"{chosen_skill.name} magically strikes {enemy.name} for {damage} damage.")
-                            else: # Non-damaging spell or other type
-                                print(f"{chosen_skill.name} affects {enemy.name} with a mystical energy!")
+                        # Simulated Effect (same rules as FightState, see player_skill_damage)
+                        started = metrics.start()
+                        damage = player_skill_damage(player, enemy, chosen_skill)
+                        healing = skill_recovery(player, chosen_skill)
+                        if damage is not None:
+                            if affinities is not None:
+                                damage = affinities.scale(damage, chosen_skill.element_id, enemy.type_id)
+                            actual_damage_dealt = enemy.take_damage(damage)
+                            if isinstance(chosen_skill, Spell):
+                                emit(f"{chosen_skill.name} magically strikes {enemy.name} for {damage} damage.", "combat")
+                            else:
+                                emit(f"{chosen_skill.name} hits {enemy.name} for {damage} damage.", "combat")
+                            if hp_effect(chosen_skill) == HP_DRAIN:
+                                emit(f"{player.name} drains {player.heal(actual_damage_dealt)} HP.", "combat")
+                        elif healing:
+                            emit(f"{player.name} recovers {player.heal(healing)} HP.", "combat")
+                        elif isinstance(chosen_skill, Spell): # Non-damaging spell or other type
+                            emit(f"{chosen_skill.name} affects {enemy.name} with a mystical energy!", "combat")
                         else: # For other skill types or non-damaging abilities
-                            print(f"{chosen_skill.name} is activated!")
+                            emit(f"{chosen_skill.name} is activated!", "combat")
+                        metrics.stop_and_observe(_DAMAGE_RESOLUTION, started)
                         
                         # (MP/TP cost deduction not implemented yet)
                         player_action_taken = True
                     else:
-                        print("Invalid skill choice.")
+                        emit("Invalid skill choice.", "combat")
                 except ValueError:
-                    print("Invalid input. Please enter a number.")
+                    emit("Invalid input. Please enter a number.", "combat")
             elif action_choice == "4": # Flee
-                print("Fleeing is not implemented yet.")
+                emit("Fleeing is not implemented yet.", "combat")
                 # player_action_taken = True # Or set to False to re-prompt if flee fails
             else:
-                print("Invalid action. Choose from the available options.")
+                emit("Invalid action. Choose from the available options.", "combat")
 
             if enemy.is_alive() and player_action_taken: # Check if enemy is still alive after player's action
-                # Enemy's Turn
-                print(f"\n{enemy.name}'s turn...")
-                if enemy.abilities_spells and random.random() < 0.5: # 50% chance to use a skill if available
-                    chosen_enemy_skill = random.choice(enemy.abilities_spells)
-                    print(f"{enemy.name} uses {chosen_enemy_skill.name}!")
-                    if chosen_enemy_skill.description:
-                        print(f"> {chosen_enemy_skill.description}")
-                    
-                    # Simplified effect for enemy skill
-                    if isinstance(chosen_enemy_skill, Ability) and hasattr(chosen_enemy_skill, 'dmg_type') and chosen_enemy_skill.dmg_type == "Hp Damage":
-                        base_enemy_attack = enemy.magic_attack if hasattr(enemy, 'magic_attack') and enemy.magic_attack > enemy.attack_power else enemy.attack_power
-                        # Example: skill adds +2 to enemy base attack
-                        enemy_skill_modified_attack = base_enemy_attack + 2
-                        damage_to_player = calculate_damage(enemy_skill_modified_attack, player.derived_stats.get('defense', 0))
-                        player.take_damage(damage_to_player)
-                        print(f"{chosen_enemy_skill.name} hits {player.name} for {damage_to_player} damage.")
-                    elif isinstance(chosen_enemy_skill, Spell): # Basic placeholder for spells
-                        if hasattr(chosen_enemy_skill, 'dmg_type') and chosen_enemy_skill.dmg_type == "Hp Damage":
-                            enemy_magic_power = enemy.magic_attack if hasattr(enemy, 'magic_attack') else enemy.attack_power
-                            enemy_spell_modified_attack = enemy_magic_power + 2
-                            damage_to_player = calculate_damage(enemy_spell_modified_attack, player.derived_stats.get('magic_defense', player.derived_stats.get('defense',0))) # Target MDEF if player has it
-                            player.take_damage(damage_to_player)
-                            print(f"{chosen_enemy_skill.name} magically strikes {player.name} for {damage_to_player} damage.")
-                        else:
-                            print(f"{chosen_enemy_skill.name} affects {player.name} with a strange power!")
-                    else:
-                        print(f"{chosen_enemy_skill.name} is used by {enemy.name}!")
+                # Enemy's Turn(s)
+                if schedule is None:
+                    _enemy_turn(player, enemy, enemy_policy, affinities)
                 else:
-                    # Basic attack (existing logic)
-                    player_defense = player.derived_stats.get('defense', 0) 
-                    damage_to_player = calculate_damage(enemy.attack_power, player_defense)
-                    actual_damage_taken = player.take_damage(damage_to_player)
-                    print(f"{enemy.name} attacks {player.name} for {actual_damage_taken} damage.")
+                    schedule.next() # The player's action
+                    while schedule.peek() is enemy and enemy.is_alive() and player.hp > 0:
+                        schedule.next()
+                        _enemy_turn(player, enemy, enemy_policy, affinities)
 
         if not enemy.is_alive():
-            print(f"{enemy.name} has been defeated!") # Moved this message to after player's turn if enemy defeated by player
+            emit(f"{enemy.name} has been defeated!", "combat") # Moved this message to after player's turn if enemy defeated by player
             break 
             
         if player.hp <= 0: # Check if player is defeated
-            print(f"{player.name} has been defeated! Game Over.")
+            emit(f"{player.name} has been defeated! Game Over.", "combat")
             break
         
         turn += 1
-        print("-" * 20) # Separator for next turn
+        emit("-" * 20, "combat") # Separator for next turn
+        flush() # Turn boundary
 
     # After combat loop
     if player.hp > 0 and not enemy.is_alive():
-        print(f"\n--- Victory! ---")
+        emit(f"\n--- Victory! ---", "combat")
         # Loot drops logic added here, before XP gain
-        print(f"The {enemy.name} has been defeated!") # Already printed inside loop, but good for clarity here too or remove from loop.
+        emit(f"The {enemy.name} has been defeated!", "combat") # Already printed inside loop, but good for clarity here too or remove from loop.
                                                  # The prompt asked for it here.
-        if enemy.loot:
-            print(f"The {enemy.name} dropped:")
-            for item_obj in enemy.loot:
-                print(f"- {item_obj.name}")
-                player.add_item_to_inventory(item_obj) # Assumes player has this method
-        else:
-            print(f"The {enemy.name} dropped nothing.")
+        started = metrics.start()
+        award_loot(player, enemy)
+        metrics.stop_and_observe(_LOOT_RESOLUTION, started)
 
         xp_gained = 50 # Example: Fixed XP for defeating an enemy
-        print(f"{player.name} gained {xp_gained} XP.")
+        emit(f"{player.name} gained {xp_gained} XP.", "xp", amount=xp_gained)
         player.gain_xp(xp_gained)
         # Player.gain_xp already prints level up message if it happens
     elif player.hp <= 0:
-        print(f"\n--- Defeat ---")
+        emit(f"\n--- Defeat ---", "combat")
         # Game over logic would typically be handled by the main game loop
+    await io.flush()
 
 if __name__ == '__main__':
     # Example Usage (for testing purposes)
@@ -0,0 +1,160 @@
+from array import array
+from typing import Dict, Iterable, List, Tuple
+
+try:
+    from .modifiers import ModifierTotals, modifiers_of
+except ImportError: # Fallback for running this file directly from 'core'
+    from modifiers import ModifierTotals, modifiers_of
+
+
+# Element of attacks and defender type with no affinity. Always ID 0, so entities
+# that were never interned (element_id / type_id default to 0) are neutral.
+NEUTRAL = "Neutral"
+_NEUTRAL_NAMES = {"", "nil", "nil element", "null", "null element", "none", "neutral", "depends on element"}
+
+WEAKNESS = 1.5
+RESISTANCE = 0.5
+
+# (attack element, defender type) -> damage multiplier; every other pair is 1.0.
+DEFAULT_AFFINITIES: Dict[Tuple[str, str], float] = {
+    ("Fire", "Ice"): WEAKNESS, ("Fire", "Nature"): WEAKNESS, ("Fire", "Fire"): RESISTANCE,
+    ("Fire", "Water"): RESISTANCE,
+    ("Water", "Fire"): WEAKNESS, ("Water", "Water"): RESISTANCE,
+    ("Ice", "Nature"): WEAKNESS, ("Ice", "Wind"): WEAKNESS, ("Ice", "Ice"): RESISTANCE,
+    ("Ice", "Fire"): RESISTANCE,
+    ("Thunder", "Water"): WEAKNESS, ("Thunder", "Wind"): WEAKNESS, ("Thunder", "Earth"): RESISTANCE,
+    ("Thunder", "Thunder"): RESISTANCE,
+    ("Earth", "Thunder"): WEAKNESS, ("Earth", "Fire"): WEAKNESS, ("Earth", "Wind"): RESISTANCE,
+    ("Earth", "Earth"): RESISTANCE,
+    ("Wind", "Earth"): WEAKNESS, ("Wind", "Wind"): RESISTANCE,
+    ("Nature", "Water"): WEAKNESS, ("Nature", "Earth"): WEAKNESS, ("Nature", "Fire"): RESISTANCE,
+    ("Nature", "Nature"): RESISTANCE,
+    ("Light", "Darkness"): WEAKNESS, ("Light", "Light"): RESISTANCE,
+    ("Darkness", "Light"): WEAKNESS, ("Darkness", "Darkness"): RESISTANCE,
+}
+
+
+def normalize_element(name: str) -> str:
+    """
+    Returns the canonical spelling of an element or type ("nil element" -> "Neutral",
+    "fire" -> "Fire"). Sheet values that are not elements (e.g. durations) are neutral.
+    """
+    cleaned = " ".join((name or "").split())
+    if cleaned.lower() in _NEUTRAL_NAMES or any(char.isdigit() for char in cleaned):
+        return NEUTRAL
+    return cleaned.title()
+
+
+class AffinityMatrix:
+    """
+    Dense (attack element x defender type) damage multipliers.
+
+    Elements and types share one set of small integer IDs (NEUTRAL is 0). The
+    multipliers live in a flat array, so resolving a hit is values[attack * width + defense].
+
+    Args:
+        elements: Every element and type name seen in the data; they are normalized.
+        affinities: Multipliers for (attack element, defender type) pairs; others are 1.0.
+    """
+    def __init__(self, elements: Iterable[str] = (), affinities: Dict[Tuple[str, str], float] = DEFAULT_AFFINITIES):
+        names = {normalize_element(name) for name in elements}
+        names.discard(NEUTRAL)
+        self.names: List[str] = [NEUTRAL] + sorted(names)
+        self._ids: Dict[str, int] = {name: index for index, name in enumerate(self.names)}
+        self.width: int = len(self.names)
+        self.values: array = array('d', [1.0]) * (self.width * self.width)
+        for (attack, defense), multiplier in affinities.items():
+            attack_id, defense_id = self._ids.get(attack), self._ids.get(defense)
+            if attack_id is not None and defense_id is not None:
+                self.values[attack_id * self.width + defense_id] = multiplier
+
+    @classmethod
+    def from_data(cls, data_manager, affinities: Dict[Tuple[str, str], float] = DEFAULT_AFFINITIES) -> "AffinityMatrix":
+        """Builds the matrix from a loaded GameDataManager's vocabulary and assigns the IDs."""
+        skills = list(data_manager.skills.values())
+        weapons = list(data_manager.weapons.values())
+        enemies = list(data_manager.enemies.values())
+        status_effects = list(data_manager.status_effects.values())
+        vocabulary = ([getattr(skill, 'element', "") for skill in skills] +
+                      [weapon.attack_type for weapon in weapons] +
+                      [enemy.enemy_type for enemy in enemies] +
+                      [effect.element for effect in status_effects])
+        matrix = cls(vocabulary, affinities)
+        matrix.assign_ids(skills=skills, weapons=weapons, enemies=enemies, status_effects=status_effects)
+        return matrix
+
+    def extended(self, elements: Iterable[str],
+                 affinities: Dict[Tuple[str, str], float] = DEFAULT_AFFINITIES) -> "AffinityMatrix":
+        """
+        Returns a matrix that also interns `elements`, or this matrix if it knows
+        them all. The existing IDs are kept and the new names appended, so entities
+        that already carry IDs from this matrix stay valid (see data.overlays).
+
+        Args:
+            elements: Element and type names, e.g. those of an overlay's records.
+            affinities: Multipliers for the pairs involving a new name.
+        """
+        added = sorted({normalize_element(name) for name in elements} - set(self._ids))
+        if not added:
+            return self
+        matrix = AffinityMatrix()
+        matrix.names = self.names + added
+        matrix._ids = {name: index for index, name in enumerate(matrix.names)}
+        matrix.width = width = len(matrix.names)
+        matrix.values = array('d', [1.0]) * (width * width)
+        for attack_id in range(self.width):
+            matrix.values[attack_id * width:attack_id * width + self.width] = \
+                self.values[attack_id * self.width:(attack_id + 1) * self.width]
+        for (attack, defense), multiplier in affinities.items():
+            if attack in added or defense in added:
+                attack_id, defense_id = matrix._ids.get(attack), matrix._ids.get(defense)
+                if attack_id is not None and defense_id is not None:
+                    matrix.values[attack_id * width + defense_id] = multiplier
+        return matrix
+
+    def id_of(self, name: str) -> int:
+        """Returns the ID of an element or type; unknown names are neutral (0)."""
+        return self._ids.get(normalize_element(name), 0)
+
+    def assign_ids(self, skills: Iterable = (), weapons: Iterable = (), enemies: Iterable = (),
+                   status_effects: Iterable = ()) -> None:
+        """Stores the interned IDs on the entities (element_id / type_id) for per-hit lookups."""
+        for skill in skills:
+            if hasattr(skill, 'element'):
+                skill.element_id = self.id_of(skill.element)
+        for weapon in weapons:
+            weapon.element_id = self.id_of(weapon.attack_type)
+        for enemy in enemies:
+            enemy.type_id = self.id_of(enemy.enemy_type)
+        for effect in status_effects:
+            effect.element_id = self.id_of(effect.element)
+
+    def multiplier(self, attack_id: int, defense_id: int) -> float:
+        return self.values[attack_id * self.width + defense_id]
+
+    def scale(self, damage: int, attack_id: int, defense_id: int) -> int:
+        """Returns damage after the affinity of an attack element against a defender type."""
+        return int(damage * self.values[attack_id * self.width + defense_id])
+
+    def defense_row(self, type_id: int = 0, equipment: Iterable = ()) -> array:
+        """
+        Returns the multipliers of every attack element against one defender, indexed
+        by element ID, with the resistances of the equipment's compiled modifiers
+        ("Fire Res + 10%", "Elemental Resistance +5%") applied.
+        """
+        width = self.width
+        row = array('d', (self.values[attack_id * width + type_id] for attack_id in range(width)))
+        worn = ModifierTotals()
+        for item in equipment:
+            worn.add(modifiers_of(item))
+        for element_id in range(1, width):
+            resistance = worn.apply(f"{self.names[element_id].lower().replace(' ', '_')}_resistance") / 100
+            if resistance:
+                row[element_id] = max(0.0, row[element_id] * (1 - resistance))
+        return row
+
+    def __len__(self) -> int:
+        return self.width
+
+    def __repr__(self) -> str:
+        return f"AffinityMatrix({self.width} elements)"
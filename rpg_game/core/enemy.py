@@ -20,7 +20,8 @@ class Enemy:
                  max_mp: int, magic_attack: int, magic_defense: int,
                  agility: int, luck: int, has_sprite: bool,
                  abilities_spells: List[Skill], loot: List[Item],
-                 zone_name: Optional[str] = None):
+                 zone_name: Optional[str] = None,
+                 level: Optional[int] = None):
         """
         Initializes a new enemy.
 
@@ -41,6 +42,7 @@ class Enemy:
             abilities_spells: A list of Skill objects the enemy has.
             loot: A list of Item objects the enemy can drop.
             zone_name: The name of the zone this enemy instance might be associated with.
+            level: The level this instance was spawned at, or None for a sheet template.
         """
         self.name: str = name
         self.max_hp: int = max_hp
@@ -59,6 +61,8 @@ class Enemy:
         self.abilities_spells: List[Skill] = abilities_spells
         self.loot: List[Item] = loot
         self.zone_name: Optional[str] = zone_name
+        self.level: Optional[int] = level
+        self.type_id: int = 0 # Interned enemy_type, set by AffinityMatrix.assign_ids (0 = neutral)
 
     def take_damage(self, amount: int) -> int:
         """
@@ -74,6 +78,20 @@ class Enemy:
         self.hp -= actual_damage
         return actual_damage
 
+    def heal(self, amount: int) -> int:
+        """
+        Increases enemy's HP by the given amount, up to max_hp.
+
+        Args:
+            amount: The amount of HP to restore.
+
+        Returns:
+            The actual amount of HP healed.
+        """
+        amount_to_heal = max(0, min(amount, self.max_hp - self.hp))
+        self.hp += amount_to_heal
+        return amount_to_heal
+
     def is_alive(self) -> bool:
         """
         Checks if the enemy is still alive.
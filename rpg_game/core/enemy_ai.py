@@ -0,0 +1,328 @@
+import random
+import re
+from typing import Dict, Hashable, List, NamedTuple, Optional, Tuple
+
+from .combat import calculate_damage
+from .formula import (HP_DAMAGE, HP_DRAIN, HP_RECOVER, BattlerParams, CompiledFormula, battler_params, hp_effect,
+                      skill_formula)
+from .skill import Ability, Skill
+try:
+    from ..utils.cache import Cache
+except ImportError: # Fallback when 'core' is imported as a top-level package
+    from utils.cache import Cache
+
+
+# Damage-equivalent worth of a status effect that lands with certainty.
+STATUS_VALUE = 5.0
+# Damage-equivalent cost of spending one MP.
+MP_WEIGHT = 0.5
+# Bonus for an action that defeats the player (and penalty for being defeated) in the search.
+KILL_VALUE = 1000.0
+# Raise in the user's attack that run_combat applies to enemy skills without a formula.
+FLAT_SKILL_BONUS = 2
+
+_FIRST_NUMBER = re.compile(r"\d+")
+_PERCENT = re.compile(r"(\d+(?:\.\d+)?)\s*%")
+# Formulas that read the user's current HP/MP must be re-evaluated as the fight goes on.
+_STATE_PARAMS = re.compile(r"\ba\s*\.\s*(hp|mp)\b")
+
+
+def _at_full(params: BattlerParams) -> BattlerParams:
+    # Current HP and MP belong to the fight state, so tables are built at full HP and MP
+    return params[:6] + (params[7], params[7], params[9], params[9])
+
+
+# Compact fight state: (enemy HP, enemy MP, player HP).
+FightKey = Tuple[int, int, int]
+
+
+def parse_mp_cost(cost: str) -> int:
+    """
+    Returns the MP cost of a skill sheet "Cost" value ("10", "5 MP"); percentages and blanks cost 0.
+    """
+    if not cost or "%" in cost:
+        return 0
+    match = _FIRST_NUMBER.search(cost)
+    return int(match.group()) if match else 0
+
+
+def parse_status_chance(effects: str) -> float:
+    """
+    Returns the chance (0..1) that a skill's effects text ("Bleed 100%", "Def Down  2 Turns")
+    applies its status; effects without a percentage always apply.
+    """
+    if not effects or not effects.strip():
+        return 0.0
+    match = _PERCENT.search(effects)
+    return min(1.0, float(match.group(1)) / 100) if match else 1.0
+
+
+def parse_variance(variance: str) -> float:
+    """Returns a skill's damage variance ("20%") as a fraction."""
+    match = _PERCENT.search(variance or "")
+    return float(match.group(1)) / 100 if match else 0.0
+
+
+class ScoredAction(NamedTuple):
+    """
+    One row of a SkillTable. `skill` is None for the basic attack. `formula` is
+    the damage formula (None for skills whose formula heals or does no damage).
+    """
+    skill: Optional[Skill]
+    damage: float
+    mp_cost: int
+    status_value: float
+    variance: float
+    formula: Optional[CompiledFormula]
+    state_dependent: bool
+    heal: float = 0.0 # HP the enemy restores to itself
+    drain: bool = False # The enemy also regains the damage dealt
+
+
+class SkillTable:
+    """
+    The actions of one enemy template against one kind of target, scored once.
+
+    Row 0 is always the basic attack. Damage is evaluated against the target's
+    parameters with the enemy at full HP/MP; rows whose formula reads the user's
+    current HP or MP are flagged and re-evaluated by damage_at(). A formula only
+    deals damage for the HP_DAMAGE and HP_DRAIN types; for HP_RECOVER it is the HP
+    the enemy restores to itself, and other types (buffs, debuffs) leave HP alone.
+    """
+    def __init__(self, enemy, target_params: BattlerParams, status_value: float = STATUS_VALUE,
+                 key: Hashable = None):
+        self.key: Hashable = key
+        self.enemy_params: BattlerParams = _at_full(battler_params(enemy))
+        self.target_params: BattlerParams = _at_full(target_params)
+        self.enemy_max_hp: int = enemy.max_hp
+        self.enemy_max_mp: int = enemy.max_mp
+        # Damage the target's basic attack does back to the enemy
+        self.target_damage: int = calculate_damage(target_params[0], enemy.defense)
+
+        actions: List[ScoredAction] = [ScoredAction(None, calculate_damage(enemy.attack_power, target_params[1]),
+                                                    0, 0.0, 0.0, None, False)]
+        for skill in enemy.abilities_spells:
+            if not isinstance(skill, Ability):
+                continue # Passive skills cannot be used in a turn
+            formula = skill_formula(skill)
+            effect = hp_effect(skill)
+            damage, heal = 0, 0
+            if formula is not None and effect == HP_RECOVER:
+                heal = formula.damage(self.enemy_params, self.enemy_params)
+            if formula is not None and effect not in (HP_DAMAGE, HP_DRAIN):
+                formula = None # Not a damage formula
+            elif formula is not None:
+                damage = formula.damage(self.enemy_params, self.target_params)
+            elif skill.dmg_type == "Hp Damage":
+                base_attack = max(enemy.attack_power, getattr(enemy, 'magic_attack', 0))
+                damage = calculate_damage(base_attack + FLAT_SKILL_BONUS, target_params[1])
+            actions.append(ScoredAction(
+                skill, damage, parse_mp_cost(skill.cost), parse_status_chance(skill.effects_csv) * status_value,
+                parse_variance(skill.variance), formula,
+                formula is not None and _STATE_PARAMS.search(formula.source) is not None,
+                heal, formula is not None and effect == HP_DRAIN))
+        self.actions: Tuple[ScoredAction, ...] = tuple(actions)
+
+    def damage_at(self, index: int, enemy_hp: int, enemy_mp: int) -> float:
+        """Returns the damage of an action when the enemy has the given HP and MP."""
+        action = self.actions[index]
+        if not action.state_dependent:
+            return action.damage
+        params = self.enemy_params
+        return action.formula.damage(params[:6] + (enemy_hp, params[7], enemy_mp, params[9]), self.target_params)
+
+    def healed(self, index: int, enemy_hp: int, dealt: float) -> int:
+        """Returns the HP an action restores to the enemy at `enemy_hp` after dealing `dealt` damage."""
+        action = self.actions[index]
+        restored = action.heal + (dealt if action.drain else 0)
+        return int(max(0, min(restored, self.enemy_max_hp - enemy_hp)))
+
+    def affordable(self, enemy_mp: int) -> List[int]:
+        """Returns the indexes of the actions the enemy can pay for."""
+        return [index for index, action in enumerate(self.actions) if action.mp_cost <= enemy_mp]
+
+    def __len__(self) -> int:
+        return len(self.actions)
+
+
+class SkillTableCache:
+    """
+    SkillTables keyed on the enemy template (name and parameters) and the target's
+    static parameters, so every spawn of a template fighting the same build shares one table.
+    The least recently used tables are dropped beyond max_entries; entries are tagged
+    "enemy:<name>" for invalidation.
+    """
+    def __init__(self, max_entries: int = 1024, status_value: float = STATUS_VALUE):
+        self.max_entries: int = max_entries
+        self.status_value: float = status_value
+        self._tables: Cache = Cache("enemy_skill_tables", max_entries)
+
+    def get(self, enemy, target) -> SkillTable:
+        target_params = battler_params(target)
+        enemy_params = battler_params(enemy)
+        key = (enemy.name, _at_full(enemy_params), _at_full(target_params),
+               tuple(id(skill) for skill in enemy.abilities_spells))
+        table = self._tables.get(key)
+        if table is None:
+            table = SkillTable(enemy, target_params, self.status_value, key)
+            self._tables.put(key, table, (f"enemy:{enemy.name}",))
+        return table
+
+    def __len__(self) -> int:
+        return len(self._tables)
+
+
+class TranspositionCache:
+    """
+    Decisions and state values shared by the table-driven policies, keyed on
+    (table key, search depth, compact fight state). Cleared when it fills up.
+    """
+    def __init__(self, max_entries: int = 1 << 16):
+        self.max_entries: int = max_entries
+        self._entries: Dict[Hashable, Tuple[float, int]] = {}
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def get(self, key: Hashable) -> Optional[Tuple[float, int]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def put(self, key: Hashable, value: float, action: int) -> None:
+        if len(self._entries) >= self.max_entries:
+            self._entries.clear()
+        self._entries[key] = (value, action)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class EnemyPolicy:
+    """
+    Chooses what an enemy does on its turn.
+    """
+    def choose(self, enemy, player) -> Optional[Skill]:
+        """Returns the skill the enemy uses, or None for a basic attack."""
+        raise NotImplementedError
+
+
+class RandomPolicy(EnemyPolicy):
+    """
+    The original behaviour: a random known skill half of the time, otherwise a basic attack.
+    """
+    def __init__(self, skill_chance: float = 0.5, rng=None):
+        self.skill_chance: float = skill_chance
+        self.rng = rng if rng is not None else random
+
+    def choose(self, enemy, player) -> Optional[Skill]:
+        if enemy.abilities_spells and self.rng.random() < self.skill_chance:
+            return self.rng.choice(enemy.abilities_spells)
+        return None
+
+
+class _TablePolicy(EnemyPolicy):
+    def __init__(self, cache: Optional[TranspositionCache] = None, tables: Optional[SkillTableCache] = None,
+                 mp_weight: float = MP_WEIGHT):
+        self.cache: TranspositionCache = cache if cache is not None else TranspositionCache()
+        self.tables: SkillTableCache = tables if tables is not None else SkillTableCache()
+        self.mp_weight: float = mp_weight
+
+    def choose(self, enemy, player) -> Optional[Skill]:
+        table = self.tables.get(enemy, player)
+        if len(table) == 1:
+            return None
+        state = (enemy.hp, getattr(enemy, 'mp', enemy.max_mp), player.hp)
+        return table.actions[self.choose_index(table, state)].skill
+
+    def choose_index(self, table: SkillTable, state: FightKey) -> int:
+        """Returns the row of `table` to use in the given fight state."""
+        raise NotImplementedError
+
+
+class GreedyPolicy(_TablePolicy):
+    """
+    Picks the action with the best immediate value: expected damage (capped at the
+    player's HP, plus KILL_VALUE for a finishing blow), HP healed and status value,
+    minus MP spent.
+    """
+    def choose_index(self, table: SkillTable, state: FightKey) -> int:
+        key = (table.key, "greedy", state)
+        entry = self.cache.get(key)
+        if entry is not None:
+            return entry[1]
+        enemy_hp, enemy_mp, player_hp = state
+        best_index, best_value = 0, float("-inf")
+        for index in table.affordable(enemy_mp):
+            action = table.actions[index]
+            damage = table.damage_at(index, enemy_hp, enemy_mp)
+            dealt = min(damage, player_hp)
+            value = dealt + table.healed(index, enemy_hp, dealt) + action.status_value - self.mp_weight * action.mp_cost
+            if damage >= player_hp:
+                value += KILL_VALUE
+            if value > best_value:
+                best_index, best_value = index, value
+        self.cache.put(key, best_value, best_index)
+        return best_index
+
+
+class ExpectimaxPolicy(_TablePolicy):
+    """
+    Looks `depth` enemy turns ahead. Each enemy action is a chance node over its
+    damage variance (low, mean, high), followed by the player's basic attack.
+    Values are damage dealt and HP healed minus damage taken, with KILL_VALUE for
+    ending the fight.
+    """
+    def __init__(self, depth: int = 2, cache: Optional[TranspositionCache] = None,
+                 tables: Optional[SkillTableCache] = None, mp_weight: float = MP_WEIGHT):
+        super().__init__(cache, tables, mp_weight)
+        self.depth: int = depth
+
+    def choose_index(self, table: SkillTable, state: FightKey) -> int:
+        return self._search(table, state, self.depth)[1]
+
+    def _search(self, table: SkillTable, state: FightKey, depth: int) -> Tuple[float, int]:
+        key = (table.key, depth, state)
+        entry = self.cache.get(key)
+        if entry is not None:
+            return entry
+        enemy_hp, enemy_mp, player_hp = state
+        best_index, best_value = 0, float("-inf")
+        for index in table.affordable(enemy_mp):
+            action = table.actions[index]
+            value = self._action_value(table, state, index, action, depth)
+            if value > best_value:
+                best_index, best_value = index, value
+        self.cache.put(key, best_value, best_index)
+        return best_value, best_index
+
+    def _action_value(self, table: SkillTable, state: FightKey, index: int, action: ScoredAction,
+                      depth: int) -> float:
+        enemy_hp, enemy_mp, player_hp = state
+        damage = table.damage_at(index, enemy_hp, enemy_mp)
+        outcomes = (damage,) if not action.variance else \
+            (damage * (1 - action.variance), damage, damage * (1 + action.variance))
+        mp_left = enemy_mp - action.mp_cost
+        immediate = action.status_value - self.mp_weight * action.mp_cost
+        total = 0.0
+        for rolled in outcomes:
+            dealt = min(int(rolled), player_hp)
+            value = immediate + dealt
+            if dealt >= player_hp:
+                total += value + KILL_VALUE
+                continue
+            healed = table.healed(index, enemy_hp, dealt)
+            hp = enemy_hp + healed
+            taken = min(table.target_damage, hp)
+            value += healed - taken
+            if taken >= hp:
+                value -= KILL_VALUE
+            elif depth > 1:
+                value += self._search(table, (hp - taken, mp_left, player_hp - dealt), depth - 1)[0]
+            total += value
+        return total / len(outcomes)
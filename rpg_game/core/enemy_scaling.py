@@ -0,0 +1,243 @@
+import random
+from collections import ChainMap
+from typing import Dict, Iterable, List, Mapping, MutableMapping, Optional, Tuple
+
+try:
+    from .enemy import Enemy
+except ImportError: # Fallback for running the module directly from 'core'
+    from enemy import Enemy
+
+
+# Order of the stats stored in every precomputed row of the scaling table.
+SCALED_STATS: Tuple[str, ...] = (
+    "max_hp", "max_mp", "attack_power", "defense",
+    "magic_attack", "magic_defense", "agility", "luck",
+)
+
+
+def parse_level_range(level_range: str, default_level: int = 1) -> Tuple[int, int]:
+    """
+    Parses a level range cell from the enemy sheet.
+
+    Args:
+        level_range: The raw cell value, e.g. "1-2", "5", "20-20" or "".
+        default_level: Level used when the cell is empty or not numeric.
+
+    Returns:
+        A (min_level, max_level) tuple with min_level <= max_level.
+    """
+    parts = [part.strip() for part in (level_range or "").split('-') if part.strip()]
+    levels: List[int] = []
+    for part in parts[:2]:
+        try:
+            levels.append(int(part))
+        except ValueError:
+            continue
+    if not levels:
+        return default_level, default_level
+    low, high = levels[0], levels[-1]
+    if low > high:
+        low, high = high, low
+    return max(1, low), max(1, high)
+
+
+class GrowthCurve:
+    """
+    Describes how a single stat grows for every level above an enemy's lowest level.
+    """
+    def __init__(self, rate: float, kind: str = "linear"):
+        """
+        Initializes a growth curve.
+
+        Args:
+            rate: Growth per level (0.1 means +10% of the base value per level).
+            kind: "linear" (base * (1 + rate * n)) or "exponential" (base * (1 + rate) ** n).
+        """
+        if kind not in ("linear", "exponential"):
+            raise ValueError(f"Unknown growth curve kind: {kind}")
+        self.rate: float = rate
+        self.kind: str = kind
+
+    def factor(self, levels_above_min: int) -> float:
+        """Returns the multiplier applied to the base stat at the given level offset."""
+        if self.kind == "exponential":
+            return (1.0 + self.rate) ** levels_above_min
+        return 1.0 + self.rate * levels_above_min
+
+    def scale(self, base_value: int, levels_above_min: int) -> int:
+        """Returns the scaled stat value, rounded to the nearest integer."""
+        return int(round(base_value * self.factor(levels_above_min)))
+
+
+# Default curves; the sheet's stats are given for the lowest level of each range.
+DEFAULT_GROWTH_CURVES: Dict[str, GrowthCurve] = {
+    "max_hp": GrowthCurve(0.10),
+    "max_mp": GrowthCurve(0.05),
+    "attack_power": GrowthCurve(0.06),
+    "defense": GrowthCurve(0.06),
+    "magic_attack": GrowthCurve(0.06),
+    "magic_defense": GrowthCurve(0.06),
+    "agility": GrowthCurve(0.04),
+    "luck": GrowthCurve(0.04),
+}
+
+
+class EnemyScalingTable:
+    """
+    Precomputed (enemy x level) stat lookup table.
+
+    Every enemy template gets one row of stat tuples per level in its level range,
+    so spawning an enemy at a given level is a table lookup instead of arithmetic.
+    """
+    def __init__(self,
+                 enemies: Mapping[str, Enemy],
+                 growth_curves: Optional[Dict[str, GrowthCurve]] = None,
+                 precompute: bool = True):
+        """
+        Builds the lookup table for all enemy templates.
+
+        Args:
+            enemies: Enemy templates keyed by name (as loaded by the GameDataManager).
+            growth_curves: Per-stat curves overriding DEFAULT_GROWTH_CURVES.
+            precompute: Build every template's row now. Otherwise a row is built the
+                        first time the template is used, for template mappings that
+                        load their entries on demand (see data.sqlite_store).
+        """
+        self.templates: Mapping[str, Enemy] = enemies
+        self.growth_curves: Dict[str, GrowthCurve] = dict(DEFAULT_GROWTH_CURVES)
+        if growth_curves:
+            self.growth_curves.update(growth_curves)
+
+        # name -> (min_level, max_level, [stat tuple for min_level, ..., stat tuple for max_level])
+        self._rows: MutableMapping[str, Tuple[int, int, List[Tuple[int, ...]]]] = {}
+        if precompute:
+            for name, template in enemies.items():
+                self._rows[name] = self._build_row(template)
+
+    def overlay(self, enemies: Mapping[str, Enemy], changed: Iterable[str]) -> "EnemyScalingTable":
+        """
+        Returns a table for `enemies`, a layered view of this table's templates,
+        that shares this table's rows and precomputes only the `changed` templates
+        (see data.overlays). Costs O(len(changed)).
+        """
+        table = EnemyScalingTable(enemies, precompute=False)
+        table.growth_curves = self.growth_curves
+        if isinstance(self._rows, ChainMap): # Fork the layer instead of stacking another one
+            table._rows = ChainMap(dict(self._rows.maps[0]), *self._rows.maps[1:])
+        else:
+            table._rows = ChainMap({}, self._rows)
+        for name in changed:
+            if name in enemies:
+                table._rows[name] = table._build_row(enemies[name])
+        return table
+
+    def _row(self, name: str) -> Tuple[int, int, List[Tuple[int, ...]]]:
+        row = self._rows.get(name)
+        if row is None:
+            row = self._rows[name] = self._build_row(self.templates[name])
+        return row
+
+    def _build_row(self, template: Enemy) -> Tuple[int, int, List[Tuple[int, ...]]]:
+        """Precomputes the stat tuples of one enemy template for its whole level range."""
+        min_level, max_level = parse_level_range(template.level_range)
+        base_values = [getattr(template, stat) for stat in SCALED_STATS]
+        curves = [self.growth_curves[stat] for stat in SCALED_STATS]
+        levels: List[Tuple[int, ...]] = []
+        for offset in range(max_level - min_level + 1):
+            levels.append(tuple(curve.scale(base, offset) for curve, base in zip(curves, base_values)))
+        return min_level, max_level, levels
+
+    def level_bounds(self, name: str) -> Tuple[int, int]:
+        """Returns the (min_level, max_level) of an enemy template."""
+        min_level, max_level, _ = self._row(name)
+        return min_level, max_level
+
+    def get_stats(self, name: str, level: int) -> Dict[str, int]:
+        """
+        Returns the scaled stats of an enemy at a level (clamped to its level range).
+
+        Raises:
+            KeyError: If the enemy is not in the table.
+        """
+        return dict(zip(SCALED_STATS, self._lookup(name, level)[1]))
+
+    def _lookup(self, name: str, level: int) -> Tuple[int, Tuple[int, ...]]:
+        """Returns the clamped level and its stat tuple."""
+        min_level, max_level, levels = self._row(name)
+        if level < min_level:
+            level = min_level
+        elif level > max_level:
+            level = max_level
+        return level, levels[level - min_level]
+
+    def spawn(self, name: str, level: Optional[int] = None,
+              rng: Optional[random.Random] = None) -> Enemy:
+        """
+        Creates a fresh Enemy instance scaled to the given level.
+
+        Args:
+            name: The enemy template name.
+            level: The desired level. If None, a level is rolled within the template's range.
+                   Levels outside the range are clamped to it.
+            rng: Optional random generator used when rolling the level.
+
+        Returns:
+            A new Enemy at full HP. Skills and loot lists are shared with the template.
+        """
+        template = self.templates[name]
+        if level is None:
+            min_level, max_level, _ = self._row(name)
+            level = (rng or random).randint(min_level, max_level)
+        level, stats = self._lookup(name, level)
+        max_hp, max_mp, attack_power, defense, magic_attack, magic_defense, agility, luck = stats
+        enemy = Enemy(
+            name=template.name,
+            max_hp=max_hp,
+            attack_power=attack_power,
+            defense=defense,
+            level_range=template.level_range,
+            spawn_chance=template.spawn_chance,
+            enemy_type=template.enemy_type,
+            max_mp=max_mp,
+            magic_attack=magic_attack,
+            magic_defense=magic_defense,
+            agility=agility,
+            luck=luck,
+            has_sprite=template.has_sprite,
+            abilities_spells=template.abilities_spells,
+            loot=template.loot,
+            zone_name=template.zone_name,
+            level=level
+        )
+        enemy.type_id = template.type_id
+        return enemy
+
+    def spawn_batch(self, count: int,
+                    names: Optional[Iterable[str]] = None,
+                    rng: Optional[random.Random] = None) -> List[Enemy]:
+        """
+        Spawns many level-varied enemies, e.g. for simulations.
+
+        Args:
+            count: How many enemies to spawn.
+            names: Template names to pick from (uniformly). Defaults to all templates.
+            rng: Optional random generator; pass a seeded one for repeatable batches.
+
+        Returns:
+            A list of `count` new Enemy instances.
+        """
+        rng = rng or random.Random()
+        pool = list(names) if names is not None else list(self.templates)
+        if not pool:
+            return []
+        spawned: List[Enemy] = []
+        for _ in range(count):
+            name = pool[rng.randrange(len(pool))]
+            spawned.append(self.spawn(name, rng=rng))
+        return spawned
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.templates
+
+    def __len__(self) -> int:
+        return len(self.templates)
@@ -1,8 +1,9 @@
-from typing import Optional
+from typing import Optional, Tuple
 # Assuming Item class is in rpg_game.core.item
 # Adjust import path if necessary based on actual project structure
 try:
     from rpg_game.core.item import Item
+    from rpg_game.core.modifiers import Modifier, compile_modifiers
 except ImportError:
     # Fallback for running script directly or if path is not set up
     import sys
@@ -12,6 +13,12 @@ except ImportError:
     # and 'rpg_game' is the top-level package.
     sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
     from core.item import Item
+    from core.modifiers import Modifier, compile_modifiers
+
+
+# The numeric bonuses every Equipment (and Weapon) carries, in the order of Equipment.bonuses.
+BONUS_FIELDS: Tuple[str, ...] = ("attack_bonus", "defense_bonus", "magic_attack_bonus", "magic_defense_bonus",
+                                 "agility_bonus", "luck_bonus", "max_hp_bonus", "max_mp_bonus")
 
 
 class Equipment(Item):
@@ -50,7 +57,8 @@ class Equipment(Item):
             luck_bonus: Bonus to luck.
             max_hp_bonus: Bonus to maximum HP.
             max_mp_bonus: Bonus to maximum MP.
-            extra_increases: Any other increases the equipment provides (e.g. "Fire Resistance +10%").
+            extra_increases: Any other increases the equipment provides (e.g. "Fire Resistance +10%"),
+                             compiled into `modifiers` (see core.modifiers).
             recipe: Crafting recipe for the equipment, if any.
             source: How the equipment is obtained (e.g., "Monster Drop", "Quest Reward").
         """
@@ -66,8 +74,17 @@ class Equipment(Item):
         self.max_hp_bonus: int = max_hp_bonus
         self.max_mp_bonus: int = max_mp_bonus
         self.extra_increases: str = extra_increases
+        self.modifiers: Tuple[Modifier, ...] = compile_modifiers(extra_increases)
         self.recipe: str = recipe
         self.source: str = source
+        self.refresh_bonuses()
+
+    def refresh_bonuses(self) -> None:
+        """
+        Rebuilds `bonuses`, the bonus fields as a vector in BONUS_FIELDS order. Loaders
+        build it once per record; call this again after changing a bonus field in place.
+        """
+        self.bonuses: Tuple[int, ...] = tuple([getattr(self, field) for field in BONUS_FIELDS])
 
     def __str__(self) -> str:
         """
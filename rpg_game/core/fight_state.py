@@ -0,0 +1,236 @@
+import re
+from array import array
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .combat import calculate_damage, player_skill_damage, skill_recovery
+from .enemy_ai import SkillTable, parse_mp_cost, parse_status_chance, parse_variance
+from .formula import HP_DRAIN, battler_params, hp_effect
+from .skill import Ability
+
+
+# Turns a status lasts when the effects text does not say ("Def Down  2 Turns" does).
+DEFAULT_STATUS_TURNS = 3
+# Chance that the enemy uses one of its skills instead of a basic attack, as in run_combat.
+ENEMY_SKILL_CHANCE = 0.5
+
+# Fixed slots at the start of FightState.values; the *_ACTION slots hold the
+# action indexes played in the last round (-1 before the first one).
+PLAYER_HP, PLAYER_MP, ENEMY_HP, ENEMY_MP, TURN, RNG_POSITION, PLAYER_ACTION, ENEMY_ACTION = range(8)
+HEADER_SIZE = 8
+
+_TURNS = re.compile(r"(\d+)\s*turns?", re.IGNORECASE)
+_STATUS_NAME = re.compile(r"^\s*([A-Za-z][A-Za-z' ]*?)\s*(?:\d|\(|$)")
+_MASK64 = (1 << 64) - 1
+
+
+class FightAction(NamedTuple):
+    """One usable action of a combatant. `skill` is None for the basic attack."""
+    name: str
+    skill: Optional[Ability]
+    damage: int
+    mp_cost: int
+    variance: float
+    status: int # Status slot, or -1
+    status_chance: float
+    status_turns: int
+    cooldown: int
+    heal: int = 0 # HP the user restores to itself
+    drain: bool = False # The user also regains the damage dealt
+
+
+def _status_of(effects: str) -> Tuple[Optional[str], float, int]:
+    # "Bleed 100%" -> ("Bleed", 1.0, 3); "Def Down  2 Turns" -> ("Def Down", 1.0, 2)
+    chance = parse_status_chance(effects)
+    if not chance:
+        return None, 0.0, 0
+    name = _STATUS_NAME.match(effects)
+    turns = _TURNS.search(effects)
+    return (" ".join(name.group(1).split()) if name else effects.strip(), chance,
+            int(turns.group(1)) if turns else DEFAULT_STATUS_TURNS)
+
+
+class FightSetup:
+    """
+    The immutable part of a fight: both sides' actions and the status slots.
+    Built once per (player, enemy) and shared by every FightState cloned from it.
+
+    Args:
+        player: The player, whose current HP and MP become the starting state.
+        enemy: The enemy, whose current HP becomes the starting state.
+        cooldowns: Optional cooldown in turns per skill name (the sheets have none).
+        enemy_skill_chance: Chance that the enemy uses a skill instead of a basic attack.
+        affinities: Optional AffinityMatrix; elemental multipliers are folded into the
+                    precomputed damage, so they cost nothing per round.
+        player_equipment: Equipment whose resistances protect the player.
+    """
+    def __init__(self, player, enemy, cooldowns: Optional[Dict[str, int]] = None,
+                 enemy_skill_chance: float = ENEMY_SKILL_CHANCE, affinities=None, player_equipment: Iterable = ()):
+        cooldowns = cooldowns or {}
+        self.player = player
+        self.enemy = enemy
+        self.enemy_skill_chance: float = enemy_skill_chance
+        self.status_names: List[str] = []
+        self._status_slots: Dict[str, int] = {}
+
+        player_actions = [FightAction("Attack", None,
+                                      calculate_damage(player.derived_stats.get('attack_power', player.stats['strength']),
+                                                       enemy.defense), 0, 0.0, -1, 0.0, 0, 0)]
+        for skill in list(player.known_abilities) + list(player.known_spells):
+            damage = player_skill_damage(player, enemy, skill) # The rules of the player's turn in run_combat
+            if damage is not None and affinities is not None:
+                damage = affinities.scale(damage, skill.element_id, enemy.type_id)
+            player_actions.append(self._action(skill, damage or 0, cooldowns, skill_recovery(player, skill),
+                                               damage is not None and hp_effect(skill) == HP_DRAIN))
+        self.player_actions: Tuple[FightAction, ...] = tuple(player_actions)
+
+        enemy_table = SkillTable(enemy, battler_params(player))
+        player_row = affinities.defense_row(0, player_equipment) if affinities is not None else None
+        enemy_actions = []
+        for row in enemy_table.actions:
+            if row.skill is None:
+                enemy_actions.append(FightAction("Attack", None, int(row.damage), 0, 0.0, -1, 0.0, 0, 0))
+                continue
+            damage = row.damage * player_row[row.skill.element_id] if player_row is not None else row.damage
+            enemy_actions.append(self._action(row.skill, int(damage), cooldowns, int(row.heal), row.drain))
+        self.enemy_actions: Tuple[FightAction, ...] = tuple(enemy_actions)
+
+        # Layout of FightState.values after the header
+        self.player_cooldowns: int = HEADER_SIZE
+        self.enemy_cooldowns: int = self.player_cooldowns + len(self.player_actions)
+        self.player_statuses: int = self.enemy_cooldowns + len(self.enemy_actions)
+        self.enemy_statuses: int = self.player_statuses + len(self.status_names)
+        self.size: int = self.enemy_statuses + len(self.status_names)
+
+    def _action(self, skill: Ability, damage: int, cooldowns: Dict[str, int], heal: int = 0,
+                drain: bool = False) -> FightAction:
+        status_name, chance, turns = _status_of(getattr(skill, 'effects_csv', ''))
+        status = -1
+        if status_name is not None:
+            status = self._status_slots.setdefault(status_name, len(self.status_names))
+            if status == len(self.status_names):
+                self.status_names.append(status_name)
+        return FightAction(skill.name, skill, damage, parse_mp_cost(skill.cost), parse_variance(skill.variance),
+                           status, chance, turns, cooldowns.get(skill.name, 0), heal, drain)
+
+    def initial_state(self, seed: int = 0) -> "FightState":
+        """Returns the state at the start of the fight."""
+        values = array('q', [0]) * self.size
+        values[PLAYER_HP] = self.player.hp
+        values[PLAYER_MP] = self.player.mp
+        values[ENEMY_HP] = self.enemy.hp
+        values[ENEMY_MP] = getattr(self.enemy, 'mp', self.enemy.max_mp)
+        values[PLAYER_ACTION] = values[ENEMY_ACTION] = -1
+        return FightState(self, values, seed)
+
+
+def _random(seed: int, position: int) -> float:
+    # Counter-based RNG (splitmix64), so the whole generator state is one integer slot
+    z = (seed + (position + 1) * 0x9E3779B97F4A7C15) & _MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return ((z ^ (z >> 31)) >> 11) / 9007199254740992.0
+
+
+class FightState:
+    """
+    Everything that changes during a fight, in one flat integer array: both sides'
+    HP and MP, the turn, the RNG position, action cooldowns and status turns left.
+
+    clone() copies the array; apply() plays one round (player action, enemy reply,
+    cooldown and status ticks) and undo() restores the previous array in O(1).
+    """
+    __slots__ = ("setup", "values", "seed", "_history")
+
+    def __init__(self, setup: FightSetup, values: array, seed: int = 0):
+        self.setup: FightSetup = setup
+        self.values: array = values
+        self.seed: int = seed
+        self._history: List[array] = []
+
+    def clone(self) -> "FightState":
+        """Returns an independent copy without undo history."""
+        return FightState(self.setup, array('q', self.values), self.seed)
+
+    def key(self) -> Tuple[int, ...]:
+        """Returns the state as a hashable tuple, e.g. for transposition tables."""
+        return tuple(self.values)
+
+    def is_over(self) -> bool:
+        return self.values[PLAYER_HP] <= 0 or self.values[ENEMY_HP] <= 0
+
+    def player_won(self) -> bool:
+        return self.values[PLAYER_HP] > 0 and self.values[ENEMY_HP] <= 0
+
+    def legal_actions(self) -> List[int]:
+        """Returns the indexes of the player actions that are paid for and off cooldown."""
+        values, setup = self.values, self.setup
+        mp = values[PLAYER_MP]
+        base = setup.player_cooldowns
+        return [index for index, action in enumerate(setup.player_actions)
+                if action.mp_cost <= mp and not values[base + index]]
+
+    def _roll(self) -> float:
+        values = self.values
+        position = values[RNG_POSITION]
+        values[RNG_POSITION] = position + 1
+        return _random(self.seed, position)
+
+    def _use(self, action: FightAction, index: int, user_hp: int, user_max_hp: int, target_hp: int, mp_slot: int,
+             cooldowns: int, target_statuses: int) -> None:
+        values = self.values
+        damage = action.damage
+        if action.variance and damage:
+            damage = int(damage * (1 + action.variance * (2 * self._roll() - 1)))
+        dealt = min(values[target_hp], damage)
+        values[target_hp] -= dealt
+        restored = action.heal + (dealt if action.drain else 0)
+        if restored:
+            values[user_hp] = min(user_max_hp, values[user_hp] + restored)
+        values[mp_slot] -= action.mp_cost
+        if action.cooldown:
+            values[cooldowns + index] = action.cooldown + 1 # Ticks once at the end of this round
+        if action.status >= 0 and (action.status_chance >= 1 or self._roll() < action.status_chance):
+            slot = target_statuses + action.status
+            values[slot] = max(values[slot], action.status_turns)
+
+    def _enemy_choice(self) -> int:
+        values, setup = self.values, self.setup
+        actions = setup.enemy_actions
+        if len(actions) > 1 and self._roll() < setup.enemy_skill_chance:
+            usable = [index for index in range(1, len(actions))
+                      if actions[index].mp_cost <= values[ENEMY_MP] and not values[setup.enemy_cooldowns + index]]
+            if usable:
+                return usable[int(self._roll() * len(usable))]
+        return 0
+
+    def apply(self, action: int) -> None:
+        """
+        Plays one round: the player's action, then the enemy's reply if it is still
+        standing, then cooldowns and statuses tick. Use undo() to take it back.
+        """
+        setup = self.setup
+        self._history.append(self.values)
+        self.values = array('q', self.values)
+        self._use(setup.player_actions[action], action, PLAYER_HP, setup.player.max_hp, ENEMY_HP, PLAYER_MP,
+                  setup.player_cooldowns, setup.enemy_statuses)
+        values = self.values
+        values[PLAYER_ACTION] = action
+        values[ENEMY_ACTION] = -1
+        if values[ENEMY_HP] > 0:
+            enemy_action = values[ENEMY_ACTION] = self._enemy_choice()
+            self._use(setup.enemy_actions[enemy_action], enemy_action, ENEMY_HP, setup.enemy.max_hp, PLAYER_HP,
+                      ENEMY_MP, setup.enemy_cooldowns, setup.player_statuses)
+        for slot in range(setup.player_cooldowns, setup.size):
+            if values[slot]:
+                values[slot] -= 1
+        values[TURN] += 1
+
+    def undo(self) -> None:
+        """Takes back the last apply()."""
+        self.values = self._history.pop()
+
+    def statuses(self, side: str = "player") -> Dict[str, int]:
+        """Returns the active statuses of "player" or "enemy" with their remaining turns."""
+        base = self.setup.player_statuses if side == "player" else self.setup.enemy_statuses
+        return {name: self.values[base + slot] for slot, name in enumerate(self.setup.status_names)
+                if self.values[base + slot]}
@@ -0,0 +1,147 @@
+import ast
+import re
+from functools import lru_cache
+from typing import Callable, Optional, Tuple
+
+
+# Battler parameters a skill formula can read ("a" is the user, "b" the target),
+# in the order of the tuples built by battler_params(). These are the RPG Maker
+# style names the skill sheet uses, e.g. "a.atk * 2 - b.def".
+PARAM_NAMES = ("atk", "def", "mat", "mdf", "agi", "luk", "hp", "mhp", "mp", "mmp")
+_PARAM_INDEX = {name: index for index, name in enumerate(PARAM_NAMES)}
+
+_ALLOWED_FUNCTIONS = {"min": min, "max": max, "abs": abs, "round": round}
+_ALLOWED_NODES = (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Constant, ast.Attribute, ast.Name,
+                  ast.Load, ast.Call, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod,
+                  ast.Pow, ast.USub, ast.UAdd)
+
+# The Dmg Type values that change HP, as returned by hp_effect(). A formula's result
+# is damage to the target (HP_DAMAGE), damage the user also regains (HP_DRAIN) or HP
+# the user restores to itself (HP_RECOVER).
+HP_DAMAGE = "hp damage"
+HP_DRAIN = "hp drain"
+HP_RECOVER = "hp recover"
+
+# "def" is a Python keyword, so b.def is renamed before parsing.
+_KEYWORD_PARAM = re.compile(r"\.\s*def\b")
+
+BattlerParams = Tuple[float, ...]
+
+
+class FormulaError(ValueError):
+    """Raised when a skill formula cannot be compiled."""
+
+
+class _ParamsToIndexes(ast.NodeTransformer):
+    """Rewrites a.atk / b.def_ into a[0] / b[1] so evaluation is plain tuple indexing."""
+    def visit_Attribute(self, node: ast.Attribute) -> ast.AST:
+        if not isinstance(node.value, ast.Name) or node.value.id not in ("a", "b"):
+            raise FormulaError("Only a.<param> and b.<param> may be read.")
+        param = "def" if node.attr == "def_" else node.attr
+        if param not in _PARAM_INDEX:
+            raise FormulaError(f"Unknown parameter '{param}'.")
+        return ast.copy_location(ast.Subscript(value=node.value, slice=ast.Constant(_PARAM_INDEX[param]),
+                                               ctx=ast.Load()), node)
+
+
+class CompiledFormula:
+    """
+    A skill damage formula compiled to a Python function of two parameter tuples.
+    """
+    def __init__(self, source: str, function: Callable[[BattlerParams, BattlerParams], float]):
+        self.source: str = source
+        self._function = function
+
+    def __call__(self, a: BattlerParams, b: BattlerParams) -> float:
+        """Evaluates the formula for user parameters a and target parameters b."""
+        return self._function(a, b)
+
+    def damage(self, a: BattlerParams, b: BattlerParams) -> int:
+        """Evaluates the formula as whole, non-negative damage."""
+        try:
+            value = self._function(a, b)
+        except ZeroDivisionError:
+            return 0
+        return int(value) if value > 0 else 0
+
+    def __repr__(self) -> str:
+        return f"CompiledFormula({self.source!r})"
+
+
+@lru_cache(maxsize=1024)
+def compile_formula(source: str) -> CompiledFormula:
+    """
+    Compiles a formula from the skill sheet.
+
+    The formula is parsed once, checked against a whitelist (arithmetic, a.<param>,
+    b.<param>, numbers, min/max/abs/round) and turned into a lambda over parameter
+    tuples, so evaluating it costs about as much as the arithmetic itself.
+
+    Args:
+        source: The formula text, e.g. "a.atk * 2 - b.def".
+
+    Returns:
+        The compiled formula; identical sources share one instance.
+
+    Raises:
+        FormulaError: If the text is not a valid formula.
+    """
+    try:
+        tree = ast.parse(_KEYWORD_PARAM.sub(".def_", source.strip()), mode="eval")
+    except SyntaxError as e:
+        raise FormulaError(f"Invalid formula {source!r}: {e.msg}")
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise FormulaError(f"Invalid formula {source!r}: {type(node).__name__} is not allowed.")
+        if isinstance(node, ast.Name) and node.id not in ("a", "b") and node.id not in _ALLOWED_FUNCTIONS:
+            raise FormulaError(f"Invalid formula {source!r}: unknown name '{node.id}'.")
+        if isinstance(node, ast.Call) and not (isinstance(node.func, ast.Name) and node.func.id in _ALLOWED_FUNCTIONS):
+            raise FormulaError(f"Invalid formula {source!r}: only {sorted(_ALLOWED_FUNCTIONS)} can be called.")
+    try:
+        body = _ParamsToIndexes().visit(tree).body
+    except FormulaError as e:
+        raise FormulaError(f"Invalid formula {source!r}: {e}")
+    lambda_tree = ast.Expression(ast.Lambda(
+        args=ast.arguments(posonlyargs=[], args=[ast.arg("a"), ast.arg("b")], kwonlyargs=[],
+                           kw_defaults=[], defaults=[]),
+        body=body))
+    ast.fix_missing_locations(lambda_tree)
+    function = eval(compile(lambda_tree, "<formula>", "eval"), {"__builtins__": {}, **_ALLOWED_FUNCTIONS})
+    return CompiledFormula(source, function)
+
+
+def skill_formula(skill) -> Optional[CompiledFormula]:
+    """Returns the compiled formula of a skill, or None if it has no valid formula."""
+    source = getattr(skill, "formula", "")
+    if not source:
+        return None
+    try:
+        return compile_formula(source)
+    except FormulaError:
+        return None
+
+
+def hp_effect(skill) -> str:
+    """
+    Returns what a skill does to HP: its sheet Dmg Type, normalized to HP_DAMAGE,
+    HP_DRAIN, HP_RECOVER or another lower-case value (e.g. "buff", "null") for
+    skills that leave HP alone. The sheet spells the types inconsistently
+    ("HP Damage", "Hp Damage").
+    """
+    return " ".join((getattr(skill, "dmg_type", "") or "").split()).lower()
+
+
+def battler_params(battler) -> BattlerParams:
+    """
+    Returns the formula parameters of a Player or an Enemy, in PARAM_NAMES order.
+    """
+    derived = getattr(battler, "derived_stats", None)
+    if derived is not None: # Player
+        stats = battler.stats
+        return (derived.get('attack_power', 0), derived.get('defense', 0),
+                derived.get('magic_power', 0), derived.get('magic_defense', derived.get('defense', 0)),
+                stats.get('dexterity', 0), stats.get('luck', 0),
+                battler.hp, battler.max_hp, battler.mp, battler.max_mp)
+    return (battler.attack_power, battler.defense, battler.magic_attack, battler.magic_defense,
+            battler.agility, battler.luck, battler.hp, battler.max_hp,
+            getattr(battler, 'mp', battler.max_mp), battler.max_mp) # Enemies do not track current MP yet
@@ -0,0 +1,159 @@
+import heapq
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+# Agility is offset before it becomes a speed, so that the sheets' enemy agility
+# (roughly 2-160) and a player's dexterity (10 at level 1) stay within a few
+# actions of each other instead of a 1:16 ratio.
+SPEED_BASE = 100
+# Timeline units one action takes at speed 1; a combatant acts every ACTION_TIME / speed.
+ACTION_TIME = 1000.0
+
+
+def agility_of(battler) -> int:
+    """Returns the initiative stat of a Player (dexterity) or an Enemy (agility)."""
+    stats = getattr(battler, 'stats', None)
+    if stats is not None: # Player
+        return stats.get('dexterity', 0)
+    return getattr(battler, 'agility', 0)
+
+
+class TurnScheduler:
+    """
+    Initiative timeline for any number of combatants.
+
+    Every combatant's next action time sits in a min-heap, so finding who acts
+    next and rescheduling them is O(log n). Faster combatants (higher agility
+    or a speed multiplier) come around more often. Speed changes and delays push
+    a fresh heap entry and leave the old one to be skipped when it surfaces.
+    Ties go to the combatant that was added first.
+
+    Args:
+        speed_base: Added to agility before it becomes a speed (see SPEED_BASE).
+        key: Returns what identifies a combatant. The default, id(), keeps every
+             object distinct; values such as indexes must be keyed by value
+             (e.g. key=int), since equal ints or strings need not be the same object.
+    """
+    def __init__(self, speed_base: int = SPEED_BASE, key: Callable[[Any], Hashable] = id):
+        self.speed_base: int = speed_base
+        self.key: Callable[[Any], Hashable] = key
+        self.now: float = 0.0
+        self._heap: List[Tuple[float, int, int]] = [] # (due time, slot, version)
+        self._slots: Dict[Hashable, int] = {} # key(combatant) -> slot
+        self._combatants: List[Any] = []
+        self._agility: List[int] = []
+        self._multiplier: List[float] = []
+        self._due: List[float] = []
+        self._version: List[int] = []
+        self._live: List[bool] = []
+        self._count: int = 0
+
+    def _speed(self, slot: int) -> float:
+        return max(1e-9, (self._agility[slot] + self.speed_base) * self._multiplier[slot])
+
+    def _push(self, slot: int, due: float) -> None:
+        self._version[slot] += 1
+        self._due[slot] = due
+        heapq.heappush(self._heap, (due, slot, self._version[slot]))
+        if len(self._heap) > 4 * self._count + 16: # Mostly stale entries: rebuild
+            self._heap = [(self._due[s], s, self._version[s]) for s in range(len(self._live)) if self._live[s]]
+            heapq.heapify(self._heap)
+
+    def _slot(self, combatant) -> int:
+        slot = self._slots.get(self.key(combatant))
+        if slot is None:
+            raise KeyError(f"{getattr(combatant, 'name', combatant)!r} is not scheduled.")
+        return slot
+
+    def add(self, combatant, agility: Optional[int] = None, delay: float = 0.0) -> None:
+        """
+        Puts a combatant on the timeline. Their first action comes one action
+        interval (plus `delay`) from now, so the fastest combatant opens the fight.
+
+        Args:
+            combatant: A Player, an Enemy, or any object (its key is what counts).
+            agility: Initiative stat; read from the combatant (see agility_of) if omitted.
+            delay: Extra time before the first action, e.g. for an ambushed party.
+        """
+        key = self.key(combatant)
+        if key in self._slots:
+            raise ValueError(f"{getattr(combatant, 'name', combatant)!r} is already scheduled.")
+        slot = len(self._combatants)
+        self._slots[key] = slot
+        self._combatants.append(combatant)
+        self._agility.append(agility_of(combatant) if agility is None else agility)
+        self._multiplier.append(1.0)
+        self._due.append(0.0)
+        self._version.append(0)
+        self._live.append(True)
+        self._count += 1
+        self._push(slot, self.now + ACTION_TIME / self._speed(slot) + delay)
+
+    def remove(self, combatant) -> None:
+        """Takes a combatant (e.g. a defeated one) off the timeline."""
+        slot = self._slot(combatant)
+        del self._slots[self.key(combatant)]
+        self._live[slot] = False
+        self._version[slot] += 1
+        self._count -= 1
+
+    def _head(self) -> Tuple[float, int, int]:
+        heap = self._heap
+        while heap:
+            entry = heap[0]
+            if self._live[entry[1]] and self._version[entry[1]] == entry[2]:
+                return entry
+            heapq.heappop(heap)
+        raise IndexError("No combatants are scheduled.")
+
+    def peek(self):
+        """Returns the combatant who acts next without advancing the timeline."""
+        return self._combatants[self._head()[1]]
+
+    def next(self):
+        """Advances the timeline to the next action and returns the combatant taking it."""
+        due, slot, _ = self._head()
+        self.now = due
+        heapq.heappop(self._heap)
+        self._push(slot, due + ACTION_TIME / self._speed(slot))
+        return self._combatants[slot]
+
+    def set_speed(self, combatant, multiplier: Optional[float] = None, agility: Optional[int] = None) -> None:
+        """
+        Changes a combatant's speed (a haste/slow multiplier or a new agility). The
+        time left until their next action shrinks or stretches in proportion.
+        """
+        slot = self._slot(combatant)
+        old_speed = self._speed(slot)
+        if multiplier is not None:
+            self._multiplier[slot] = multiplier
+        if agility is not None:
+            self._agility[slot] = agility
+        remaining = max(0.0, self._due[slot] - self.now)
+        self._push(slot, self.now + remaining * old_speed / self._speed(slot))
+
+    def delay(self, combatant, time: float) -> None:
+        """Pushes a combatant's next action back by `time` (negative brings it forward, not past now)."""
+        slot = self._slot(combatant)
+        self._push(slot, max(self.now, self._due[slot] + time))
+
+    def due(self, combatant) -> float:
+        """Returns the time of a combatant's next action."""
+        return self._due[self._slot(combatant)]
+
+    def upcoming(self, count: int) -> List:
+        """Returns the next `count` combatants to act, in order, without advancing the timeline."""
+        heap = [(self._due[slot], slot) for slot in range(len(self._live)) if self._live[slot]]
+        heapq.heapify(heap)
+        order = []
+        while heap and len(order) < count:
+            due, slot = heap[0]
+            order.append(self._combatants[slot])
+            heapq.heapreplace(heap, (due + ACTION_TIME / self._speed(slot), slot))
+        return order
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, combatant) -> bool:
+        return self.key(combatant) in self._slots
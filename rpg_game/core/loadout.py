@@ -0,0 +1,435 @@
+import operator
+from itertools import combinations
+from typing import Dict, FrozenSet, Hashable, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    from .equipment import BONUS_FIELDS, Equipment
+    from .combat import calculate_damage
+    from .modifiers import ModifierTotals, modifiers_of
+    from ..utils.cache import Cache, invalidate, memoize
+except ImportError: # Fallback for running this file directly from 'core'
+    from equipment import BONUS_FIELDS, Equipment
+    from combat import calculate_damage
+    from modifiers import ModifierTotals, modifiers_of
+    from utils.cache import Cache, invalidate, memoize
+
+_NO_BONUSES: Tuple[int, ...] = (0,) * len(BONUS_FIELDS)
+# Derived values built from equipment records are dropped when these collections change.
+_EQUIPMENT_TAGS: Tuple[str, ...] = ("data:equipment", "data:weapons")
+
+
+class SlotGroup(NamedTuple):
+    """
+    One or more identical equipment slots and the equip_type values they accept.
+    `blocks` holds (equip_type, group name) pairs: wearing an item of that type
+    here leaves the named group empty.
+    """
+    name: str
+    equip_types: Tuple[str, ...]
+    count: int = 1
+    blocks: Tuple[Tuple[str, str], ...] = ()
+
+
+# The character's slots. "Armor" is the sheet's generic armor category (mostly cloaks)
+# and "Accesory" is how the sheet spells accessories. A two-handed weapon takes the offhand too.
+DEFAULT_SLOT_GROUPS: Tuple[SlotGroup, ...] = (
+    SlotGroup("Main Hand", ("Main Hand", "Two-Hand"), blocks=(("Two-Hand", "Offhand"),)),
+    SlotGroup("Offhand", ("Shield", "Offhand")),
+    SlotGroup("Head", ("Head",)),
+    SlotGroup("Body", ("Body",)),
+    SlotGroup("Armor", ("Armor",)),
+    SlotGroup("Gloves", ("Gloves",)),
+    SlotGroup("Pants", ("Pants",)),
+    SlotGroup("Boots", ("Boots",)),
+    SlotGroup("Accessory", ("Accesory", "Accessory"), 2),
+)
+
+
+def bonus_vector(equipment: Equipment) -> Tuple[int, ...]:
+    """Returns the equipment's bonuses in BONUS_FIELDS order (built when the record was loaded)."""
+    bonuses = getattr(equipment, 'bonuses', None)
+    if bonuses is None: # Not built through Equipment.__init__
+        return tuple([getattr(equipment, field) for field in BONUS_FIELDS])
+    return bonuses
+
+
+class LoadoutTotals:
+    """
+    The summed bonuses of the items worn in a set of slots, kept up to date by
+    adding or subtracting one item's vector per equip or unequip rather than
+    re-summing every slot on each read. The items' compiled extra_increases are
+    totalled the same way in `modifiers`.
+
+    With an `owner` (a player name), every change invalidates the cache tag
+    "player:<owner>:equipment" (see utils.cache).
+    """
+    def __init__(self, owner: Optional[str] = None):
+        self.owner: Optional[str] = owner
+        self.slots: Dict[str, Equipment] = {}
+        self._total: List[int] = list(_NO_BONUSES)
+        self.modifiers: ModifierTotals = ModifierTotals()
+
+    def equip(self, slot: str, item: Equipment) -> Optional[Equipment]:
+        """Puts an item in a slot. Returns the item it replaced, if any."""
+        replaced = self.unequip(slot)
+        self.slots[slot] = item
+        self._total = [total + bonus for total, bonus in zip(self._total, bonus_vector(item))]
+        self.modifiers.add(modifiers_of(item))
+        self._changed()
+        return replaced
+
+    def unequip(self, slot: str) -> Optional[Equipment]:
+        """Empties a slot. Returns the item it held, if any."""
+        item = self.slots.pop(slot, None)
+        if item is not None:
+            self._total = [total - bonus for total, bonus in zip(self._total, bonus_vector(item))]
+            self.modifiers.remove(modifiers_of(item))
+            self._changed()
+        return item
+
+    def _changed(self) -> None:
+        if self.owner is not None:
+            invalidate(f"player:{self.owner}:equipment")
+
+    def key(self) -> Tuple[Tuple[int, ...], Tuple]:
+        """
+        The summed bonuses and modifier totals, for cache keys. Built from the values
+        rather than the item names, so same-named records (e.g. overlay variants) differ.
+        """
+        return self.total, self.modifiers.key()
+
+    @property
+    def total(self) -> Tuple[int, ...]:
+        """The summed bonuses in BONUS_FIELDS order."""
+        return tuple(self._total)
+
+    def get(self, field: str) -> int:
+        """Returns one summed bonus, e.g. get("attack_bonus")."""
+        return self._total[BONUS_FIELDS.index(field)]
+
+    def as_dict(self) -> Dict[str, int]:
+        return dict(zip(BONUS_FIELDS, self._total))
+
+    def apply(self, stat: str, base: float, conditions: Iterable[str] = ()) -> float:
+        """Returns a stat after the worn items' modifiers, e.g. apply("attack", attack_power)."""
+        return self.modifiers.apply(stat, base, conditions)
+
+
+def equipped_stats(player, worn: LoadoutTotals) -> Dict[str, int]:
+    """
+    Returns a player's attack_power, defense and max_hp with the worn items'
+    bonuses and modifiers applied. Results are cached per player and worn totals
+    (see LoadoutTotals.key), tagged "player:<name>:equipment" and the equipment
+    collections; each call returns its own copy.
+    """
+    return dict(_equipped_stats(player, worn))
+
+
+@memoize("player_stats", max_entries=4096,
+         key=lambda player, worn: (player.name, player.derived_stats.get('attack_power', 0),
+                                   player.derived_stats.get('defense', 0), player.max_hp, worn.key()),
+         tags=lambda player, worn: (f"player:{player.name}:equipment",) + _EQUIPMENT_TAGS)
+def _equipped_stats(player, worn: LoadoutTotals) -> Dict[str, int]:
+    return {
+        'attack_power': int(worn.apply('attack', player.derived_stats.get('attack_power', 0) + worn.get('attack_bonus'))),
+        'defense': int(worn.apply('defense', player.derived_stats.get('defense', 0) + worn.get('defense_bonus'))),
+        'max_hp': int(worn.apply('max_hp', player.max_hp + worn.get('max_hp_bonus'))),
+    }
+
+
+class BonusMatrix:
+    """
+    The bonus vectors of a fixed list of items as a matrix with one row per item,
+    for totalling many candidate loadouts in one pass (e.g. in optimizers and
+    simulations).
+
+    A batch of loadouts is a selection matrix with one row per loadout and one
+    column per item (how many of the item the loadout has); its totals are the
+    product of that matrix and this one. totals() takes the sparse form instead:
+    one list of item rows per loadout.
+    """
+    def __init__(self, items: Iterable[Equipment]):
+        self.items: List[Equipment] = list(items)
+        self.rows: List[Tuple[int, ...]] = [bonus_vector(item) for item in self.items]
+        self._columns: List[Tuple[int, ...]] = [tuple(column) for column in zip(*self.rows)] or \
+            [()] * len(BONUS_FIELDS)
+        self._row_of: Dict[int, int] = {id(item): row for row, item in enumerate(self.items)}
+
+    def row_of(self, item: Equipment) -> int:
+        """Returns an item's row. Raises KeyError for items not in the matrix."""
+        return self._row_of[id(item)]
+
+    def totals(self, loadouts: Iterable[Sequence[int]]) -> List[Tuple[int, ...]]:
+        """Returns the summed bonuses of each loadout, given as the rows of its items."""
+        rows = self.rows
+        return [tuple(map(sum, zip(*[rows[row] for row in loadout]))) if loadout else _NO_BONUSES
+                for loadout in loadouts]
+
+    def multiply(self, selection: Iterable[Sequence[float]]) -> List[Tuple[float, ...]]:
+        """
+        Returns selection x matrix: the summed bonuses of each loadout, given as a
+        row of per-item counts (or weights) in item order.
+        """
+        columns = self._columns
+        totals = []
+        for counts in selection:
+            if len(counts) != len(self.items):
+                raise ValueError(f"A selection row needs {len(self.items)} entries, got {len(counts)}.")
+            totals.append(tuple([sum(map(operator.mul, counts, column)) for column in columns]))
+        return totals
+
+
+class LoadoutObjective:
+    """
+    What the optimizer maximizes.
+
+    project() maps an item's bonus vector into the objective's own space, where the
+    components add up over a loadout and larger is better in every component.
+    score() turns a summed projection into the value to maximize and must not
+    decrease when any component grows; both pruning and bounding rely on that.
+    """
+    def project(self, bonuses: Sequence[int]) -> Tuple[float, ...]:
+        raise NotImplementedError
+
+    def score(self, total: Sequence[float]) -> float:
+        raise NotImplementedError
+
+    def cache_key(self) -> Optional[Hashable]:
+        """Identifies the objective in the loadout cache; None (the default) skips the cache."""
+        return None
+
+    def tags(self) -> Tuple[str, ...]:
+        """Invalidation tags of the objective's cached loadouts, besides the equipment collections."""
+        return ()
+
+
+class WeightedObjective(LoadoutObjective):
+    """Maximizes a weighted sum of bonuses, e.g. {"attack_bonus": 2, "defense_bonus": 1}."""
+    def __init__(self, weights: Dict[str, float]):
+        unknown = set(weights) - set(BONUS_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown bonus fields: {sorted(unknown)}")
+        self.weights: Dict[str, float] = weights
+        self._weights: Tuple[float, ...] = tuple(weights.get(field, 0.0) for field in BONUS_FIELDS)
+
+    def project(self, bonuses: Sequence[int]) -> Tuple[float, ...]:
+        return (sum(w * b for w, b in zip(self._weights, bonuses)),)
+
+    def score(self, total: Sequence[float]) -> float:
+        return total[0]
+
+    def cache_key(self) -> Optional[Hashable]:
+        return ("weighted", self._weights)
+
+
+class MatchupObjective(LoadoutObjective):
+    """
+    Surrogate for "maximize win rate against one enemy" in basic-attack combat.
+
+    The score is (turns the player survives) / (turns needed to kill the enemy), using
+    the same calculate_damage as combat; above 1 the player usually wins.
+    """
+    def __init__(self, enemy, base_attack: int, base_defense: int, base_max_hp: int):
+        """
+        Initializes the objective.
+
+        Args:
+            enemy: The enemy to beat (its attack_power, defense and max_hp are used).
+            base_attack: The player's attack power without equipment.
+            base_defense: The player's defense without equipment.
+            base_max_hp: The player's max HP without equipment.
+        """
+        self.enemy = enemy
+        self.base = (base_attack, base_defense, base_max_hp)
+
+    @classmethod
+    def for_player(cls, player, enemy) -> "MatchupObjective":
+        """Builds the objective from a Player's current (unequipped) stats."""
+        return cls(enemy, player.derived_stats.get('attack_power', 0),
+                   player.derived_stats.get('defense', 0), player.max_hp)
+
+    def project(self, bonuses: Sequence[int]) -> Tuple[float, ...]:
+        return (bonuses[0], bonuses[1], bonuses[6]) # attack, defense, max HP
+
+    def score(self, total: Sequence[float]) -> float:
+        attack, defense, max_hp = (base + bonus for base, bonus in zip(self.base, total))
+        player_damage = calculate_damage(attack, self.enemy.defense)
+        if player_damage <= 0 or max_hp <= 0:
+            return 0.0
+        enemy_damage = calculate_damage(self.enemy.attack_power, defense) or 0.5 # Immune still beats 1 damage
+        turns_to_survive = max_hp / enemy_damage
+        turns_to_kill = max(self.enemy.max_hp, 1) / player_damage
+        return turns_to_survive / turns_to_kill
+
+    def cache_key(self) -> Optional[Hashable]:
+        enemy = self.enemy
+        return ("matchup", enemy.name, enemy.attack_power, enemy.defense, enemy.max_hp, self.base)
+
+    def tags(self) -> Tuple[str, ...]:
+        return (f"enemy:{self.enemy.name}",)
+
+
+class Loadout(NamedTuple):
+    """An optimizer result: the item per slot (None for empty), summed bonuses and score."""
+    slots: Dict[str, Optional[Equipment]]
+    bonuses: Dict[str, int]
+    score: float
+
+
+# Optimizer results of objectives with a cache_key(), keyed on the objective, the
+# slots and the candidates' names and bonuses.
+_loadouts: Cache = Cache("loadout_scores", 256)
+
+
+def _add(a: Sequence[float], b: Sequence[float]) -> Tuple[float, ...]:
+    return tuple([x + y for x, y in zip(a, b)])
+
+
+def pareto_front(items: List[Tuple[Tuple[float, ...], Equipment]], keep: int) -> List[Tuple[Tuple[float, ...], Equipment]]:
+    """
+    Drops every item dominated by at least `keep` other items.
+
+    An item dominated that often can always be swapped for an unused, at least as good
+    item, so no optimal loadout needs it. Equal items count as dominating later ones.
+    """
+    ordered = sorted(items, key=lambda entry: (-sum(entry[0]), entry[1].name))
+    front: List[Tuple[Tuple[float, ...], Equipment]] = []
+    for vector, item in ordered:
+        dominators = 0
+        for other_vector, _ in front:
+            if all(o >= v for o, v in zip(other_vector, vector)):
+                dominators += 1
+                if dominators >= keep:
+                    break
+        if dominators < keep:
+            front.append((vector, item))
+    return front
+
+
+def optimize_loadout(candidates: Iterable, objective: LoadoutObjective,
+                     slot_groups: Sequence[SlotGroup] = DEFAULT_SLOT_GROUPS) -> Loadout:
+    """
+    Finds the loadout that maximizes the objective.
+
+    Candidates are split by slot, pruned to each slot's Pareto front in the objective's
+    space, then searched depth-first with branch-and-bound: a branch is cut when even
+    the best remaining choice for every open slot could not beat the best loadout found.
+    Groups blocked by a chosen item (see SlotGroup.blocks) stay empty.
+
+    Args:
+        candidates: Items to choose from (an inventory or a whole catalog). Items that
+                    are not Equipment or fit no slot are ignored.
+        objective: What to maximize.
+        slot_groups: The slots to fill.
+
+    Returns:
+        The best Loadout. Slots may stay empty when every item would lower the score.
+        Results are cached for objectives with a cache_key() and tagged with the
+        equipment collections and the objective's tags().
+    """
+    slot_of_type: Dict[str, int] = {}
+    for index, group in enumerate(slot_groups):
+        for equip_type in group.equip_types:
+            slot_of_type[equip_type.casefold()] = index
+
+    per_group: List[List[Tuple[Tuple[float, ...], Equipment]]] = [[] for _ in slot_groups]
+    for item in candidates:
+        if isinstance(item, Equipment):
+            index = slot_of_type.get(item.equip_type.strip().casefold())
+            if index is not None:
+                per_group[index].append((objective.project(bonus_vector(item)), item))
+
+    objective_key = objective.cache_key()
+    if objective_key is None:
+        return _optimize(per_group, objective, slot_groups)
+    cache_key = (objective_key, tuple(slot_groups),
+                 tuple(tuple((item.name, vector) for vector, item in items) for items in per_group))
+    best = _loadouts.get_or_compute(cache_key, lambda: _optimize(per_group, objective, slot_groups),
+                                    _EQUIPMENT_TAGS + objective.tags())
+    return Loadout(dict(best.slots), dict(best.bonuses), best.score) # Callers may edit their copy
+
+
+def _optimize(per_group: List[List[Tuple[Tuple[float, ...], Equipment]]], objective: LoadoutObjective,
+              slot_groups: Sequence[SlotGroup]) -> Loadout:
+    """The search of optimize_loadout over candidates already projected and split by slot group."""
+    zero = objective.project(_NO_BONUSES)
+    group_index = {group.name: index for index, group in enumerate(slot_groups)}
+
+    def blocked_by(group: SlotGroup, item: Equipment) -> FrozenSet[int]:
+        equip_type = item.equip_type.strip().casefold()
+        return frozenset(group_index[name] for blocking_type, name in group.blocks
+                         if blocking_type.casefold() == equip_type and name in group_index)
+
+    # Every way to fill each group (fewer items than slots leaves some empty), with the groups it blocks
+    choices: List[List[Tuple[Tuple[float, ...], Tuple[Equipment, ...], FrozenSet[int]]]] = []
+    for group, items in zip(slot_groups, per_group):
+        # Items that block different groups are not interchangeable, so each kind keeps its own front
+        kinds: Dict[FrozenSet[int], List[Tuple[Tuple[float, ...], Equipment]]] = {}
+        for entry in items:
+            kinds.setdefault(blocked_by(group, entry[1]), []).append(entry)
+        front = [entry for kind in kinds.values() for entry in pareto_front(kind, group.count)]
+        group_choices = []
+        for size in range(group.count + 1):
+            for combo in combinations(front, size):
+                total = zero
+                blocks: FrozenSet[int] = frozenset()
+                for vector, item in combo:
+                    total = _add(total, vector)
+                    blocks |= blocked_by(group, item)
+                group_choices.append((total, tuple(item for _, item in combo), blocks))
+        group_choices.sort(key=lambda choice: -objective.score(choice[0]))
+        choices.append(group_choices)
+
+    # Search groups that can block others first, then the groups with the most options so bounds tighten early
+    order = sorted(range(len(slot_groups)), key=lambda i: (not slot_groups[i].blocks, -len(choices[i])))
+    # optimistic[k]: componentwise best achievable from groups order[k:]
+    optimistic: List[Tuple[float, ...]] = [zero] * (len(order) + 1)
+    for k in range(len(order) - 1, -1, -1):
+        group_choices = choices[order[k]]
+        best = tuple(max(values) for values in zip(*(total for total, _, _ in group_choices)))
+        optimistic[k] = _add(optimistic[k + 1], best)
+
+    best_score = float("-inf")
+    best_picks: Optional[List[Tuple[Equipment, ...]]] = None
+    picks: List[Tuple[Equipment, ...]] = []
+    blocked = [0] * len(slot_groups) # How many picks block each group
+    filled = [False] * len(slot_groups)
+
+    def search(k: int, total: Tuple[float, ...]) -> None:
+        nonlocal best_score, best_picks
+        if k == len(order):
+            score = objective.score(total)
+            if score > best_score:
+                best_score, best_picks = score, list(picks)
+            return
+        index = order[k]
+        for choice_total, items, blocks in choices[index]:
+            if items and blocked[index] or any(filled[other] for other in blocks):
+                continue
+            candidate_total = _add(total, choice_total)
+            if objective.score(_add(candidate_total, optimistic[k + 1])) <= best_score:
+                continue
+            picks.append(items)
+            filled[index] = bool(items)
+            for other in blocks:
+                blocked[other] += 1
+            search(k + 1, candidate_total)
+            for other in blocks:
+                blocked[other] -= 1
+            filled[index] = False
+            picks.pop()
+
+    search(0, zero)
+
+    slots: Dict[str, Optional[Equipment]] = {}
+    worn = LoadoutTotals()
+    picked_by_group = {order[k]: items for k, items in enumerate(best_picks or [])}
+    for index, group in enumerate(slot_groups):
+        items = picked_by_group.get(index, ())
+        for slot_number in range(group.count):
+            slot_name = group.name if group.count == 1 else f"{group.name} {slot_number + 1}"
+            item = items[slot_number] if slot_number < len(items) else None
+            slots[slot_name] = item
+            if item is not None:
+                worn.equip(slot_name, item)
+    return Loadout(slots, worn.as_dict(), best_score)
@@ -0,0 +1,315 @@
+"""
+Typed modifier records compiled from the free-text bonus columns of the sheets:
+Equipment/Weapon "Extra Increases" and the "Effects" / "Additional Notes" of skills.
+
+Grammar, per clause (clauses are separated by ",", " - " or simply follow each
+other as in "All Stats +6% Crit +12%"):
+
+    clause    := subject [op] number ["%"] ["turns"] [condition]
+    subject   := stat {("&" | "/") stat}      e.g. "Atk & M.Atk", "Hp & Mp Rgn", "Light/Darkness Dmg"
+    op        := "+" | "-" | "*"
+    condition := ("when" | "while" | "during" | "against" | "vs" | "if" | "with" | "on") words
+
+A "Special: <what> bonuses: <clauses>" section makes <what> the condition of its
+clauses; other "Special:" sections are compiled like the rest of the text.
+
+Each clause becomes one Modifier per stat:
+
+    "Atk Spd + 4"          -> Modifier("attack_speed", ADD, 4)
+    "Crit + 3%"            -> Modifier("crit", ADD, 3)          (crit is already a percentage)
+    "All Stats +6%"        -> Modifier("all_stats", PERCENT, 6) (percent of the stat)
+    "Max Mp * 110%"        -> Modifier("max_mp", MULTIPLY, 1.1)
+    "Fire Res + 10%"       -> Modifier("fire_resistance", ADD, 10)
+    "Burn 50%"             -> Modifier("Burn", CHANCE, 0.5)     (a status the attack inflicts)
+    "Def Down  2 Turns"    -> Modifier("Def Down", TURNS, 2)
+
+Stat names are snake_case; status names are kept as the sheet writes them.
+Fragments that do not fit the grammar (e.g. "Special: 10% chance to phase
+through enemy defenses") are reported by parse_modifiers() and otherwise ignored.
+
+Records compile their text once, when they are built by the loaders, so the
+compiled tuples travel with the data snapshot (the pickle data cache stores
+them as they are) and nothing parses the text while the game runs.
+"""
+import re
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+
+try:
+    from ..utils.cache import memoize
+except ImportError: # Fallback when 'core' is imported as a top-level package
+    from utils.cache import memoize
+
+
+ADD = "add" # Flat amount, in the stat's own unit (percentage points for chances and rates)
+PERCENT = "percent" # Percent of the stat's value
+MULTIPLY = "multiply" # Factor applied after every ADD and PERCENT
+CHANCE = "chance" # Chance (0-1) that the status named by `stat` is inflicted
+TURNS = "turns" # Duration of the status named by `stat`
+
+# Stats whose "%" bonuses scale the stat; for every other stat "%" is the stat's unit.
+BASE_STATS = frozenset({"attack", "magic_attack", "defense", "magic_defense", "agility", "luck",
+                        "max_hp", "max_mp", "all_stats", "attack_speed", "attack_count"})
+# What "All Stats" raises.
+ALL_STATS_TARGETS = frozenset({"attack", "magic_attack", "defense", "magic_defense", "agility", "luck",
+                               "max_hp", "max_mp"})
+ALL_STATS = "all_stats"
+ALL_ELEMENTS = "all"
+
+_STAT_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "attack": ("atk", "attack", "patk"),
+    "magic_attack": ("m.atk", "matk", "mgc atk", "magic atk", "magic attack", "m.attack"),
+    "defense": ("def", "defense", "pdef"),
+    "magic_defense": ("m.def", "mdef", "mgc def", "magic def", "magic defense", "m.defense"),
+    "agility": ("agi", "agility"),
+    "luck": ("luk", "luck"),
+    "max_hp": ("max hp", "hp", "mhp"),
+    "max_mp": ("max mp", "mp", "mmp"),
+    ALL_STATS: ("all stats",),
+    "hit": ("hit", "hit rate", "accuracy"),
+    "evasion": ("eva", "evasion"),
+    "magic_evasion": ("mgc eva", "magic eva", "magic evasion"),
+    "crit": ("crit", "critical", "crit rate", "crit chance", "critical rate", "critical chance"),
+    "crit_evasion": ("crit eva", "critical evasion"),
+    "counter": ("ctr atk", "counter", "counter attack"),
+    "magic_reflection": ("mgc ref", "mgc reflection", "magic reflection"),
+    "attack_speed": ("atk spd", "atk speed", "attack speed"),
+    "attack_count": ("atk count", "attack count"),
+    "hp_regen": ("hp rgn", "hp regen"),
+    "mp_regen": ("mp rgn", "mp regen", "mana regen"),
+    "tp_regen": ("tp rgn", "tp regen"),
+    "tp_charge_rate": ("tp chrg rt", "tp charge rate"),
+    "skill_power": ("skill power",),
+    "skill_speed": ("skill speed",),
+    "mp_cost": ("mp cost",),
+    "ignore_defense": ("ignore defense", "ignore def"),
+}
+_STATS: Dict[str, str] = {alias: stat for stat, aliases in _STAT_ALIASES.items() for alias in aliases}
+
+# "<element> Dmg" -> "<element>_damage"; suffixes that "&" and "/" lists share ("Hp & Mp Rgn")
+_ELEMENT_SUFFIXES = {"dmg": "damage", "damage": "damage", "res": "resistance", "resist": "resistance",
+                     "resistance": "resistance", "absorption": "absorption", "absorb": "absorption"}
+_SHARED_SUFFIXES = frozenset(_ELEMENT_SUFFIXES) | {"rgn", "regen"}
+_ALL_ELEMENT_WORDS = {"all", "elemental", "all elemental"}
+
+_SPECIAL = re.compile(r"\bspecial\s*:\s*", re.IGNORECASE)
+_CONDITIONAL_SECTION = re.compile(r"^(?P<condition>[^:]+?)\s+bonuses\s*:\s*(?P<body>.*)$", re.IGNORECASE | re.DOTALL)
+# ", " and " - " separate clauses; so does a number followed by a capitalized word ("+6% Crit")
+_SEPARATOR = re.compile(r"\s*,\s*|\s+-\s+|(?<=[\d%])\s+(?=[A-Z])(?!Turns?\b)")
+_TYPO_PLUS = re.compile(r"(\w)\+(?=\s*[+-])") # "Hit+ + 2%"
+_CLAUSE = re.compile(
+    r"^(?P<subject>[A-Za-z](?:[A-Za-z.&/' ]|#\d+)*?)\s*(?P<op>[+*-])?\s*(?P<value>\d+(?:\.\d+)?)\s*(?P<percent>%)?"
+    r"(?:\s*(?P<turns>turns?)\b)?"
+    r"(?:\s+(?P<condition>(?:when|while|during|against|vs\.?|if|with|on)\s.+?))?\s*\.?$",
+    re.IGNORECASE)
+_INFLICT = re.compile(r"^(?P<value>\d+(?:\.\d+)?)\s*%\s+chance\s+to\s+inflict\s+(?P<status>[A-Za-z][A-Za-z' ]*?)"
+                      r"(?:\s+status)?\s*\.?$", re.IGNORECASE)
+
+
+class Modifier(NamedTuple):
+    """
+    One compiled bonus.
+
+    Attributes:
+        stat: The stat it changes (e.g. "crit", "fire_resistance"), or the status
+              name for CHANCE and TURNS modifiers.
+        op: ADD, PERCENT, MULTIPLY, CHANCE or TURNS.
+        value: The amount; a factor for MULTIPLY and a 0-1 chance for CHANCE.
+        condition: When it applies (e.g. "during night battles"); "" means always.
+    """
+    stat: str
+    op: str
+    value: float
+    condition: str = ""
+
+
+class ParsedModifiers(NamedTuple):
+    """The modifiers of a text and the fragments that did not fit the grammar."""
+    modifiers: Tuple[Modifier, ...]
+    unparsed: Tuple[str, ...]
+
+
+def _words(text: str) -> List[str]:
+    return text.lower().replace("'", "").split()
+
+
+def _stat_of(words: List[str]) -> str:
+    """Returns the stat a subject names, or "" if it is not a stat (then it may be a status)."""
+    key = " ".join(words)
+    if key in _STATS:
+        return _STATS[key]
+    if len(words) >= 2 and words[-1] in _ELEMENT_SUFFIXES:
+        element = " ".join(words[:-1])
+        element = ALL_ELEMENTS if element in _ALL_ELEMENT_WORDS else "_".join(words[:-1])
+        return f"{element}_{_ELEMENT_SUFFIXES[words[-1]]}"
+    if len(words) == 2 and words[0] in ("res", "resist", "resistance"): # "Resist Fire"
+        return f"{words[1]}_resistance"
+    return ""
+
+
+def _subject_stats(subject: str) -> List[List[str]]:
+    """Splits a subject on "&" and "/", sharing a suffix or prefix between the parts."""
+    parts = [_words(part) for part in re.split(r"\s*[&/]\s*", subject) if part.strip()]
+    if len(parts) > 1:
+        last, first = parts[-1], parts[0]
+        if len(last) > 1 and last[-1] in _SHARED_SUFFIXES: # "Hp & Mp Rgn", "Light/Darkness Dmg"
+            parts = [part + [last[-1]] if len(part) == 1 else part for part in parts[:-1]] + [last]
+        if len(first) > 1 and first[-1] in _SHARED_SUFFIXES: # "All Elemental Dmg/Resistance"
+            parts = [first] + [first[:-1] + part if len(part) == 1 and part[0] in _SHARED_SUFFIXES else part
+                               for part in parts[1:]]
+    return parts
+
+
+def _compile_clause(clause: str, condition: str) -> Tuple[Modifier, ...]:
+    inflict = _INFLICT.match(clause)
+    if inflict is not None:
+        status = " ".join(inflict.group("status").split())
+        if " or " in f" {status.lower()} ":
+            return ()
+        return (Modifier(status, CHANCE, min(1.0, float(inflict.group("value")) / 100), condition),)
+    match = _CLAUSE.match(clause)
+    if match is None:
+        return ()
+    subject = " ".join(match.group("subject").split())
+    op, value, percent = match.group("op"), float(match.group("value")), match.group("percent") is not None
+    if match.group("condition"):
+        condition = " ".join(match.group("condition").lower().split())
+    parts = _subject_stats(subject)
+    stats = [_stat_of(part) for part in parts]
+    if op is None and not all(stats):
+        # Not a stat: a status the attack inflicts ("Burn 50%") or its duration ("Def Down 2 Turns").
+        # Status names are capitalized, which keeps sentences ("Converts ... by 25%") out.
+        if not all(word[0].isupper() or not word[0].isalpha() for word in subject.split()):
+            return ()
+        if match.group("turns"):
+            return (Modifier(subject, TURNS, value, condition),)
+        if percent:
+            return (Modifier(subject, CHANCE, min(1.0, value / 100), condition),)
+        return ()
+    if match.group("turns"):
+        return ()
+    stats = [stat or "_".join(part) for stat, part in zip(stats, parts)] # Unknown stats keep their name
+    if op == "*":
+        factor = value / 100 if percent else value
+        return tuple(Modifier(stat, MULTIPLY, factor, condition) for stat in stats) if factor > 0 else ()
+    if op == "-":
+        value = -value
+    return tuple(Modifier(stat, PERCENT if percent and stat in BASE_STATS else ADD, value, condition)
+                 for stat in stats)
+
+
+@memoize("modifier_texts", max_entries=4096)
+def parse_modifiers(text: str) -> ParsedModifiers:
+    """Compiles one text; see the module docstring for the grammar."""
+    modifiers: List[Modifier] = []
+    unparsed: List[str] = []
+    for section in _SPECIAL.split(_TYPO_PLUS.sub(r"\1", text or "")):
+        condition = ""
+        conditional = _CONDITIONAL_SECTION.match(section.strip())
+        if conditional is not None:
+            condition = " ".join(conditional.group("condition").lower().split())
+            section = conditional.group("body")
+        for clause in _SEPARATOR.split(section):
+            clause = clause.strip()
+            if not clause:
+                continue
+            compiled = _compile_clause(clause, condition)
+            if compiled:
+                modifiers.extend(compiled)
+            else:
+                unparsed.append(clause)
+    return ParsedModifiers(tuple(modifiers), tuple(unparsed))
+
+
+def compile_modifiers(*texts: str) -> Tuple[Modifier, ...]:
+    """Returns the modifiers of one or more texts, in order."""
+    modifiers: Tuple[Modifier, ...] = ()
+    for text in texts:
+        if text:
+            modifiers += parse_modifiers(text).modifiers
+    return modifiers
+
+
+def modifiers_of(entity) -> Tuple[Modifier, ...]:
+    """
+    Returns the compiled modifiers of an equipment or skill record, compiling its
+    text only for records that were not built through their constructor.
+    """
+    modifiers = getattr(entity, 'modifiers', None)
+    if modifiers is None:
+        return compile_modifiers(getattr(entity, 'extra_increases', ""), getattr(entity, 'effects_csv', ""),
+                                 getattr(entity, 'additional_notes', ""))
+    return modifiers
+
+
+def _sources(stat: str) -> Tuple[str, ...]:
+    # The stat itself and the "all ..." stats that also raise it
+    if stat in ALL_STATS_TARGETS:
+        return (stat, ALL_STATS)
+    element, _, kind = stat.rpartition("_")
+    if kind in ("damage", "resistance", "absorption") and element and element != ALL_ELEMENTS:
+        return (stat, f"{ALL_ELEMENTS}_{kind}")
+    return (stat,)
+
+
+class ModifierTotals:
+    """
+    Running totals of the ADD, PERCENT and MULTIPLY modifiers of a set of records
+    (e.g. the worn equipment), by stat and condition. Adding or removing a record
+    touches only its own modifiers.
+
+    A stat's value is (base + added) * (1 + percent / 100) * factors, counting the
+    unconditional modifiers and those of the conditions passed to apply().
+    """
+    def __init__(self, modifiers: Iterable[Modifier] = ()):
+        self._added: Dict[Tuple[str, str], float] = {}
+        self._percent: Dict[Tuple[str, str], float] = {}
+        self._factor: Dict[Tuple[str, str], float] = {}
+        self.add(modifiers)
+
+    def add(self, modifiers: Iterable[Modifier]) -> None:
+        self._fold(modifiers, 1)
+
+    def remove(self, modifiers: Iterable[Modifier]) -> None:
+        """Takes back modifiers that were added."""
+        self._fold(modifiers, -1)
+
+    def _fold(self, modifiers: Iterable[Modifier], sign: int) -> None:
+        for modifier in modifiers:
+            key = (modifier.stat, modifier.condition)
+            if modifier.op == ADD:
+                self._added[key] = self._added.get(key, 0.0) + sign * modifier.value
+            elif modifier.op == PERCENT:
+                self._percent[key] = self._percent.get(key, 0.0) + sign * modifier.value
+            elif modifier.op == MULTIPLY:
+                factor = modifier.value if sign > 0 else 1 / modifier.value
+                self._factor[key] = self._factor.get(key, 1.0) * factor
+
+    def apply(self, stat: str, base: float = 0.0, conditions: Iterable[str] = ()) -> float:
+        """
+        Returns a stat after the modifiers.
+
+        Args:
+            stat: The stat, e.g. "attack" or "fire_resistance".
+            base: Its value before the modifiers.
+            conditions: Conditions that hold (e.g. "during night battles").
+        """
+        keys = [(source, condition) for source in _sources(stat) for condition in ("",) + tuple(conditions)]
+        added = sum(self._added.get(key, 0.0) for key in keys)
+        percent = sum(self._percent.get(key, 0.0) for key in keys)
+        factor = 1.0
+        for key in keys:
+            factor *= self._factor.get(key, 1.0)
+        return (base + added) * (1 + percent / 100) * factor
+
+    def key(self) -> Tuple:
+        """
+        Returns the totals in a hashable form, e.g. for cache keys. Totals that were
+        added and taken back again (0 added, a factor of 1) are left out.
+        """
+        return tuple(tuple(sorted((stat, round(value, 9)) for stat, value in table.items()
+                                  if round(value, 9) != neutral))
+                     for table, neutral in ((self._added, 0.0), (self._percent, 0.0), (self._factor, 1.0)))
+
+    def stats(self) -> List[str]:
+        """Returns the stats (and "all ..." stats) some modifier changes."""
+        return sorted({stat for table in (self._added, self._percent, self._factor) for stat, _ in table})
@@ -5,17 +5,30 @@ from typing import List, Optional # Ensure List and Optional are imported
 try:
     from .item import Item
     from .skill import Skill, Ability, Spell
+    from .progression import DEFAULT_XP_TABLE, STAT_GROWTH, XPTable
 except ImportError: # Fallback for running __main__ block or if structure differs
     # This might happen if player.py is run directly for its __main__
     # and the current directory is 'core', so direct imports work.
     from item import Item
     from skill import Skill, Ability, Spell
+    from progression import DEFAULT_XP_TABLE, STAT_GROWTH, XPTable
+
+try:
+    from ..utils.output import emit
+except ImportError: # 'core' imported as a top-level package, or this file run directly
+    import sys
+    import os
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    from utils.output import emit
 
 
 class Player:
     """
     Represents the player character in the RPG game.
     """
+    # XP thresholds per level; assign another XPTable (on the class or a player) for a different curve.
+    xp_table: XPTable = DEFAULT_XP_TABLE
+
     def __init__(self, name: str):
         """
         Initializes a new player.
@@ -26,7 +39,7 @@ class Player:
         self.name: str = name
         self.level: int = 1
         self.xp: int = 0
-        self.xp_to_next_level: int = 100
+        self.xp_to_next_level: int = self.xp_table.requirement(1)
         self.hp: int = 100 # Initial HP, will be set by _calculate_derived_stats based on constitution
         self.max_hp: int = 100 # Initial Max HP
         self.mp: int = 50 # Initial MP, will be set by _calculate_derived_stats based on intelligence
@@ -103,7 +116,10 @@ class Player:
 
     def gain_xp(self, amount: int) -> bool:
         """
-        Increases player's XP by the given amount and checks for level up.
+        Increases player's XP by the given amount and applies every level it is worth
+        at once: the final level is looked up in the XP table, stat growth for all the
+        levels is added in one go, derived stats are recalculated once and a single
+        level-up event is emitted.
 
         Args:
             amount: The amount of XP gained.
@@ -115,11 +131,17 @@ class Player:
             return False
             
         self.xp += amount
-        leveled_up_this_gain = False
-        while self.xp >= self.xp_to_next_level:
-            self.level_up()
-            leveled_up_this_gain = True
-        return leveled_up_this_gain
+        table = self.xp_table
+        if self.xp < self.xp_to_next_level or (table.max_level is not None and self.level >= table.max_level):
+            return False
+        # The current level is paid at its stored price, the rest comes from the table
+        start_level = self.level
+        self.xp -= self.xp_to_next_level
+        reached_total = table.total_for(start_level + 1) + self.xp
+        new_level = table.level_for(reached_total)
+        self.xp = reached_total - table.total_for(new_level)
+        self._advance_levels(new_level - start_level)
+        return True
 
     def level_up(self):
         """
@@ -127,16 +149,17 @@ class Player:
         Increases level, stats, resets XP (carries over overflow), 
         increases XP to next level, heals player, and recalculates derived stats.
         """
-        self.level += 1
         self.xp -= self.xp_to_next_level 
-        self.xp_to_next_level += 50  # Increase XP needed for next level (e.g., simple linear increase)
+        self._advance_levels(1)
+
+    def _advance_levels(self, levels: int) -> None:
+        """Adds `levels` levels with their stat growth, heals fully and emits one level-up event."""
+        self.level += levels
+        self.xp_to_next_level = self.xp_table.requirement(self.level)
 
         # Increase primary stats (fixed increases for now)
-        self.stats['strength'] += 2
-        self.stats['dexterity'] += 2
-        self.stats['intelligence'] += 2
-        self.stats['constitution'] += 2
-        self.stats['luck'] += 1
+        for stat, increase in STAT_GROWTH.items():
+            self.stats[stat] += increase * levels
 
         # Recalculate derived stats (which also updates max_hp, max_mp)
         self._calculate_derived_stats()
@@ -145,64 +168,78 @@ class Player:
         self.hp = self.max_hp
         self.mp = self.max_mp
         
-        print(f"Congratulations! {self.name} reached level {self.level}!")
+        if levels == 1:
+            emit(f"Congratulations! {self.name} reached level {self.level}!", "level_up", level=self.level)
+        else:
+            emit(f"Congratulations! {self.name} gained {levels} levels and reached level {self.level}!",
+                 "level_up", level=self.level, levels=levels)
 
     def add_item_to_inventory(self, item: Item) -> None:
         """Appends the item to self.inventory."""
         self.inventory.append(item)
-        print(f"{item.name} added to inventory.")
+        emit(f"{item.name} added to inventory.", "inventory", item=item.name)
 
     def learn_skill(self, skill: Skill) -> None:
         """Learns a new skill, adding it to the appropriate list."""
         if isinstance(skill, Ability) and not isinstance(skill, Spell): # Ensure it's an Ability but not a Spell
             if skill not in self.known_abilities:
                 self.known_abilities.append(skill)
-                print(f"{self.name} learned ability: {skill.name}!")
+                emit(f"{self.name} learned ability: {skill.name}!", "skill", skill=skill.name)
             else:
-                print(f"{self.name} already knows the ability: {skill.name}.")
+                emit(f"{self.name} already knows the ability: {skill.name}.", "skill", skill=skill.name)
         elif isinstance(skill, Spell):
             if skill not in self.known_spells:
                 self.known_spells.append(skill)
-                print(f"{self.name} learned spell: {skill.name}!")
+                emit(f"{self.name} learned spell: {skill.name}!", "skill", skill=skill.name)
             else:
-                print(f"{self.name} already knows the spell: {skill.name}.")
+                emit(f"{self.name} already knows the spell: {skill.name}.", "skill", skill=skill.name)
         else: # This includes PassiveSkill or any other Skill subclass
             # For now, we are not specifically tracking other skill types like PassiveSkill
             # in separate lists on the Player, but they could be learned conceptually.
             # The prompt only asks for abilities and spells to be added to lists.
-            print(f"Cannot specifically categorize skill: {skill.name} of type {type(skill).__name__}. It's a general skill.")
+            emit(f"Cannot specifically categorize skill: {skill.name} of type {type(skill).__name__}. It's a general skill.", "skill", skill=skill.name)
 
 
-    def view_inventory(self) -> None:
-        """Prints the contents of the player's inventory."""
-        print("\n--- Inventory ---")
+    def inventory_lines(self) -> List[str]:
+        """Returns the lines shown by view_inventory, for non-console front ends."""
+        lines = ["\n--- Inventory ---"]
         if not self.inventory:
-            print("Inventory is empty.")
+            lines.append("Inventory is empty.")
         else:
             for i, item_obj in enumerate(self.inventory):
-                print(f"{i + 1}. {item_obj.name} - {item_obj.description}")
-        print("-----------------")
+                lines.append(f"{i + 1}. {item_obj.name} - {item_obj.description}")
+        lines.append("-----------------")
+        return lines
 
-    def view_skills(self) -> None:
-        """Prints the player's known abilities and spells."""
-        print("\n--- Skills ---")
+    def skills_lines(self) -> List[str]:
+        """Returns the lines shown by view_skills, for non-console front ends."""
+        lines = ["\n--- Skills ---"]
         if not self.known_abilities and not self.known_spells:
-            print("No skills learned.")
+            lines.append("No skills learned.")
         
         if self.known_abilities:
-            print("Abilities:")
+            lines.append("Abilities:")
             for i, ability in enumerate(self.known_abilities):
-                print(f"  {i + 1}. {ability.name} - {ability.description}")
+                lines.append(f"  {i + 1}. {ability.name} - {ability.description}")
         else:
-            print("No abilities learned.")
+            lines.append("No abilities learned.")
             
         if self.known_spells:
-            print("Spells:")
+            lines.append("Spells:")
             for i, spell in enumerate(self.known_spells):
-                print(f"  {i + 1}. {spell.name} - {spell.description}")
+                lines.append(f"  {i + 1}. {spell.name} - {spell.description}")
         else:
-            print("No spells learned.")
-        print("--------------")
+            lines.append("No spells learned.")
+        lines.append("--------------")
+        return lines
+
+    def view_inventory(self) -> None:
+        """Shows the contents of the player's inventory."""
+        emit("\n".join(self.inventory_lines()), "inventory")
+
+    def view_skills(self) -> None:
+        """Shows the player's known abilities and spells."""
+        emit("\n".join(self.skills_lines()), "skill")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,78 @@
+from bisect import bisect_right
+from typing import Callable, Dict, List, Optional
+
+
+# XP needed to go from a level to the next one.
+XPCurve = Callable[[int], int]
+
+# Primary stat increases per level gained.
+STAT_GROWTH: Dict[str, int] = {
+    'strength': 2,
+    'dexterity': 2,
+    'intelligence': 2,
+    'constitution': 2,
+    'luck': 1,
+}
+
+
+def linear_curve(first: int = 100, step: int = 50) -> XPCurve:
+    """Level 1 needs `first` XP and every level after needs `step` more (the default curve)."""
+    return lambda level: first + step * (level - 1)
+
+
+def geometric_curve(first: int = 100, growth: float = 1.15) -> XPCurve:
+    """Every level needs `growth` times the XP of the previous one."""
+    return lambda level: int(first * growth ** (level - 1))
+
+
+def polynomial_curve(first: int = 100, exponent: float = 1.5) -> XPCurve:
+    """Level L needs first * L ** exponent XP."""
+    return lambda level: int(first * level ** exponent)
+
+
+class XPTable:
+    """
+    Cumulative XP thresholds of an XP curve.
+
+    totals[L] is the XP it takes to get from level 1 to level L, so the level a
+    total XP amount reaches is a binary search. The table is computed once and
+    doubled on demand when an XP total goes past its last level.
+
+    Args:
+        curve: XP needed for each level (see linear_curve and friends).
+        max_level: Level cap, or None for no cap.
+        levels: Levels computed up front.
+    """
+    def __init__(self, curve: Optional[XPCurve] = None, max_level: Optional[int] = None, levels: int = 100):
+        self.curve: XPCurve = curve or linear_curve()
+        self.max_level: Optional[int] = max_level
+        self._totals: List[int] = [0, 0] # Index 0 is unused; level 1 starts at 0 XP
+        self._extend(levels if max_level is None else min(levels, max_level))
+
+    def _extend(self, top_level: int) -> None:
+        totals = self._totals
+        curve = self.curve
+        for level in range(len(totals) - 1, top_level):
+            totals.append(totals[-1] + max(1, curve(level))) # Every level costs XP, so levels are strictly increasing
+
+    def requirement(self, level: int) -> int:
+        """Returns the XP needed to go from `level` to the next one."""
+        return max(1, self.curve(level))
+
+    def total_for(self, level: int) -> int:
+        """Returns the XP it takes to get from level 1 to `level`."""
+        if level >= len(self._totals):
+            self._extend(level)
+        return self._totals[level]
+
+    def level_for(self, total_xp: int) -> int:
+        """Returns the level reached with `total_xp` XP earned since level 1 (capped at max_level)."""
+        totals = self._totals
+        while total_xp >= totals[-1] and (self.max_level is None or len(totals) - 1 < self.max_level):
+            top = (len(totals) - 1) * 2
+            self._extend(top if self.max_level is None else min(top, self.max_level))
+        return bisect_right(totals, total_xp, 1) - 1
+
+
+# Shared by every Player unless one is given its own table.
+DEFAULT_XP_TABLE = XPTable()
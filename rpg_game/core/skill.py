@@ -1,4 +1,9 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
+
+try:
+    from .modifiers import Modifier, compile_modifiers
+except ImportError: # Fallback for running this file directly from 'core'
+    from modifiers import Modifier, compile_modifiers
 
 class Skill:
     """
@@ -70,6 +75,9 @@ class Ability(Skill):
         self.requirement: str = requirement
         self.effects_csv: str = effects_csv # Effects from CSV field
         self.additional_notes: str = additional_notes
+        # Compiled effects and notes, e.g. "Bleed 100%" -> Modifier("Bleed", CHANCE, 1.0)
+        self.modifiers: Tuple[Modifier, ...] = compile_modifiers(effects_csv, additional_notes)
+        self.element_id: int = 0 # Interned element, set by AffinityMatrix.assign_ids (0 = neutral)
 
     def __str__(self) -> str:
         base_str = super().__str__()
@@ -92,6 +100,7 @@ class PassiveSkill(Skill):
         """
         super().__init__(name, description, skill_rarity, skill_type_csv, category)
         self.effects_csv: str = effects_csv
+        self.modifiers: Tuple[Modifier, ...] = compile_modifiers(effects_csv) # e.g. "Max HP +10%"
 
     def __str__(self) -> str:
         base_str = super().__str__()
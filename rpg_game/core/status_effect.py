@@ -31,6 +31,7 @@ class StatusEffect:
         self.duration_str: str = duration_str
         self.effect_description: str = effect_description
         self.notes: str = notes
+        self.element_id: int = 0 # Interned element, set by AffinityMatrix.assign_ids (0 = neutral)
 
     def __str__(self) -> str:
         """
@@ -72,6 +72,7 @@ class Weapon(Equipment):
                          source=source)
         
         self.attack_type: str = attack_type
+        self.element_id: int = 0 # Interned attack_type, set by AffinityMatrix.assign_ids (0 = neutral)
         self.weapon_category: str = weapon_category
 
     def __str__(self) -> str:
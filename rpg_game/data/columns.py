@@ -0,0 +1,98 @@
+from operator import itemgetter
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    from rpg_game.data.name_index import normalize_name
+except ImportError: # Fallback when 'data' is a top-level package
+    import sys
+    import os
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    from data.name_index import normalize_name
+
+
+class Column(NamedTuple):
+    """
+    A field a loader reads from a sheet.
+
+    Attributes:
+        field: The name the value is returned under.
+        aliases: Header names the column may have, matched like entity names
+            (case, spacing and punctuation are ignored).
+        default_index: The column read when no header cell matches an alias; this
+            is where the field sits in the canonical sheet layout.
+        convert: Turns the raw cell into the field value.
+    """
+    field: str
+    aliases: Tuple[str, ...]
+    default_index: int
+    convert: Callable[[str], Any] = str.strip
+
+
+class ColumnPlan:
+    """
+    Column accessors compiled from a header row.
+
+    The header is matched against the columns once; every data row is then read
+    through a single itemgetter and the columns' converters, with no per-row
+    lookups, length checks or exception handling. Rows shorter than the plan are
+    padded with empty cells.
+    """
+    def __init__(self, columns: Sequence[Column], header: Optional[Sequence[str]] = None):
+        """
+        Compiles the plan.
+
+        Args:
+            columns: The fields to read.
+            header: The header row; the canonical layout is used if omitted.
+                Fields the header does not name are read from their default
+                position, or as empty cells if another field is named there.
+        """
+        positions: Dict[str, int] = {}
+        for index, cell in enumerate(header or ()):
+            key = normalize_name(cell)
+            if key:
+                positions.setdefault(key, index) # Leftmost column wins on duplicate names
+        self.columns: Tuple[Column, ...] = tuple(columns)
+        self.indices: Dict[str, int] = {}
+        self.missing: List[str] = [] # Fields the header does not name
+        for column in self.columns:
+            index = next((positions[key] for key in map(normalize_name, column.aliases) if key in positions), None)
+            if index is None:
+                self.missing.append(column.field)
+            else:
+                self.indices[column.field] = index
+        self.matched: int = len(self.indices)
+        named = set(self.indices.values())
+        converters = []
+        for column in self.columns:
+            convert = column.convert
+            if column.field not in self.indices:
+                self.indices[column.field] = column.default_index
+                if column.default_index in named: # Its default position holds another field: read it as empty
+                    convert = lambda _cell, convert=convert: convert("")
+            converters.append(convert)
+        self.width: int = max(self.indices.values()) + 1
+        self._fields = tuple(column.field for column in self.columns)
+        self._converters = tuple(converters)
+        cells = itemgetter(*(self.indices[field] for field in self._fields))
+        self._cells = cells if len(self._fields) > 1 else (lambda row: (cells(row),))
+
+    def read(self, row: List[str]) -> Dict[str, Any]:
+        """Returns the converted fields of a data row."""
+        if len(row) < self.width:
+            row = row + [""] * (self.width - len(row))
+        return {field: convert(cell) for field, convert, cell in zip(self._fields, self._converters, self._cells(row))}
+
+    def cell(self, row: List[str], field: str) -> str:
+        """Returns the raw cell at a field's position, or "" if the row is too short."""
+        index = self.indices[field]
+        return row[index] if index < len(row) else ""
+
+
+def is_header_row(row: Sequence[str], columns: Sequence[Column], minimum: int = 2) -> bool:
+    """
+    Returns whether a row names at least `minimum` of the columns, i.e. whether it
+    is a header rather than a title-only section row or data.
+    """
+    keys = {normalize_name(cell) for cell in row}
+    return sum(1 for column in columns if any(normalize_name(alias) in keys for alias in column.aliases)) >= minimum
@@ -0,0 +1,89 @@
+import hashlib
+import os
+import pickle
+from typing import Any, Dict, Iterable, Optional
+
+
+# Compiled form of the loaded game data, so startup can skip parsing the CSVs.
+# A cache file is a key line followed by a pickle of the GameDataManager state.
+# The key covers the CSV files (size and mtime), the code that builds the data
+# and CACHE_VERSION, so editing either makes the cache stale. Cache files are
+# only ever written by this module next to the data they were compiled from.
+CACHE_VERSION = 1
+CACHE_DIR = "__datacache__"
+CACHE_FILE = "game_data.pickle"
+
+# Packages whose source determines what the loaded data looks like.
+_SOURCE_DIRS = (os.path.dirname(os.path.abspath(__file__)),
+                os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "core"),
+                os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "world"))
+
+
+def cache_path(base_csv_path: str) -> str:
+    """Returns where the compiled data of a CSV directory is cached."""
+    return os.path.join(base_csv_path, CACHE_DIR, CACHE_FILE)
+
+
+def _stat_line(path: str) -> str:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return f"{path}|missing"
+    return f"{path}|{stat.st_size}|{stat.st_mtime_ns}"
+
+
+def cache_key(base_csv_path: str, file_names: Iterable[str], extra: str = "") -> str:
+    """
+    Returns the key a cache of these CSV files must carry to be used.
+
+    Args:
+        base_csv_path: The CSV directory.
+        file_names: The CSV files the data is loaded from.
+        extra: Anything else the data depends on (e.g. growth curve overrides).
+    """
+    digest = hashlib.sha1(f"{CACHE_VERSION}|{extra}".encode("utf-8"))
+    for name in file_names:
+        digest.update(_stat_line(os.path.join(base_csv_path, name)).encode("utf-8"))
+    for directory in _SOURCE_DIRS:
+        try:
+            sources = sorted(entry.path for entry in os.scandir(directory) if entry.name.endswith(".py"))
+        except OSError:
+            continue
+        for source in sources:
+            digest.update(_stat_line(source).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def read_cache(path: str, key: str) -> Optional[Dict[str, Any]]:
+    """
+    Returns the state stored in a cache file, or None if the file is missing,
+    was compiled from other data (key mismatch) or cannot be read.
+    """
+    try:
+        with open(path, 'rb') as f:
+            if f.readline().rstrip(b"\n") != key.encode("ascii"):
+                return None
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, ValueError):
+        return None
+
+
+def write_cache(path: str, key: str, state: Dict[str, Any]) -> bool:
+    """
+    Writes a cache file atomically. Returns False (and leaves any older cache in
+    place) if the directory is not writable.
+    """
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(temp_path, 'wb') as f:
+            f.write(key.encode("ascii") + b"\n")
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+        return True
+    except OSError:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        return False
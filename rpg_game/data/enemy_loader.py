@@ -1,5 +1,5 @@
 import csv
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterator, List, Tuple, Optional, Union
 # Adjust the import path based on your project structure.
 try:
     from rpg_game.core.enemy import Enemy
@@ -8,6 +8,9 @@ try:
     from rpg_game.core.consumable import Consumable # For dummy item data
     from rpg_game.core.material import Material # For dummy item data
     from rpg_game.world.zone import Zone # Import Zone
+    from rpg_game.utils.output import emit
+    from rpg_game.data.name_index import NameIndex, ResolutionReport, link_references
+    from rpg_game.data.columns import Column, ColumnPlan
 
 except ImportError:
     # Fallback for cases where the script might be run directly
@@ -21,6 +24,9 @@ except ImportError:
     from core.consumable import Consumable
     from core.material import Material
     from world.zone import Zone
+    from utils.output import emit
+    from data.name_index import NameIndex, ResolutionReport, link_references
+    from data.columns import Column, ColumnPlan
 
 
 def parse_list_from_string(s: str) -> List[str]:
@@ -29,162 +35,153 @@ def parse_list_from_string(s: str) -> List[str]:
         return []
     return [item.strip() for item in s.split(',') if item.strip()]
 
+def _to_stat(value: str) -> int:
+    """Converts a stat cell to an integer (0 if empty); raises ValueError if it is not a number."""
+    return int(value) if value else 0
+
+def _is_yes(value: str) -> bool:
+    """Converts a "Yes"/"No" cell to a bool."""
+    return value.strip().lower() == "yes"
+
+# Columns of the enemy sheet; the default positions are the canonical layout, whose
+# column 14 is blank.
+ENEMY_COLUMNS = (
+    Column("name", ("Name",), 0),
+    Column("level_range", ("Level Range",), 1),
+    Column("spawn_chance", ("Spawn Chance",), 2),
+    Column("enemy_type", ("Type", "Enemy Type"), 3),
+    Column("max_hp", ("Max Hp Lowest Level", "Max Hp"), 4, _to_stat),
+    Column("max_mp", ("Max Mp",), 5, _to_stat),
+    Column("attack_power", ("Attack",), 6, _to_stat),
+    Column("defense", ("Defense",), 7, _to_stat),
+    Column("magic_attack", ("M.Attack",), 8, _to_stat),
+    Column("magic_defense", ("M.Defense.", "M.Defense"), 9, _to_stat),
+    Column("agility", ("Agility",), 10, _to_stat),
+    Column("luck", ("Luck",), 11, _to_stat),
+    Column("has_sprite", ("Has Sprite?",), 12, _is_yes),
+    Column("abilities_spells", ("Abilitys & Spells", "Abilities & Spells"), 13, parse_list_from_string),
+    Column("loot", ("Enemy Loot", "Loot"), 15, parse_list_from_string),
+)
+
+ZONE_KEYWORDS = ("zone", "den", "citadel", "lair", "sanctum", "ruins", "plains", "forest", "mountain", "cave", "swamp")
+
+def iter_enemy_sheet(file_path: str,
+                     skills_data: Union[Dict[str, Skill], NameIndex],
+                     items_data: Union[Dict[str, Item], NameIndex],
+                     report: Optional[ResolutionReport] = None) -> Iterator[Union[Zone, Enemy]]:
+    """
+    Streams the enemy sheet: yields a Zone for each zone marker row and an Enemy
+    for each enemy row, in sheet order, with abilities/spells and loot linked to
+    the Skill and Item objects. Only the current row is held in memory.
+
+    Enemies carry the name of the zone they are listed under (zone_name); the
+    yielded zones are left empty. Columns are located by their header names (see
+    ENEMY_COLUMNS), so they may be reordered in the sheet. Names are matched
+    ignoring case, spacing and punctuation; references that still match nothing
+    are collected in `report`. The skills and items may be given as prebuilt
+    NameIndexes to share them between sheets.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+    """
+    if report is None:
+        report = ResolutionReport()
+    skill_index = skills_data if isinstance(skills_data, NameIndex) else NameIndex(skills_data)
+    item_index = items_data if isinstance(items_data, NameIndex) else NameIndex(items_data)
+    zone_name: Optional[str] = None
+
+    with open(file_path, mode='r', encoding='utf-8') as csvfile:
+        reader = csv.reader(csvfile)
+        plan = ColumnPlan(ENEMY_COLUMNS, next(reader, []))
+        if plan.missing:
+            emit(f"Warning: Enemy sheet header has no column for {', '.join(plan.missing)}; "
+                 "using the default positions.", "warning")
+
+        for row_number, row in enumerate(reader, start=2): # start=2 because 1 is header, 2 is first data row
+            if not any(row): # Skip completely empty rows
+                emit(f"Skipping empty row at line {row_number}", "load")
+                continue
+
+            name = plan.cell(row, "name").strip()
+            if not name:
+                emit(f"Warning: Skipping row {row_number} due to empty enemy name.", "warning")
+                continue
+
+            # Zone Marker Detection
+            # Heuristic: the name contains "Zone", "Den", "Citadel" etc.
+            # AND the critical stat cells (HP and Attack) are empty.
+            if any(keyword in name.lower() for keyword in ZONE_KEYWORDS) and \
+               not plan.cell(row, "max_hp").strip() and not plan.cell(row, "attack_power").strip():
+                zone_name = name
+                emit(f"Detected Zone: {name} at row {row_number}", "load")
+                yield Zone(name=name)
+                continue # Skip to the next row
+
+            # Rows that look like separators but aren't formal zone markers
+            # e.g. "Goblinoid Lair,,,,,,,,,,,,,,," (if the above didn't catch it as a Zone)
+            if not any(cell.strip() for cell in row[1:]):
+                emit(f"Skipping potential sub-header or separator row: {name} at line {row_number}", "load")
+                continue
+
+            try:
+                fields = plan.read(row)
+            except ValueError as e:
+                emit(f"Warning: Skipping enemy '{name}' (row {row_number}) due to invalid numeric value: {e}. Row data: {row}", "warning")
+                continue
+
+            fields["abilities_spells"] = link_references(fields["abilities_spells"], skill_index, "Skill", name, report)
+            fields["loot"] = link_references(fields["loot"], item_index, "Loot item", name, report)
+            yield Enemy(zone_name=zone_name, **fields)
+
+
+def iter_enemies(file_path: str,
+                 skills_data: Dict[str, Skill],
+                 items_data: Dict[str, Item],
+                 report: Optional[ResolutionReport] = None) -> Iterator[Enemy]:
+    """Streams the enemies of the enemy sheet (see iter_enemy_sheet), skipping the zone markers."""
+    for record in iter_enemy_sheet(file_path, skills_data, items_data, report):
+        if isinstance(record, Enemy):
+            yield record
+
+
 def load_enemies_from_csv(file_path: str, 
                           skills_data: Dict[str, Skill], 
-                          items_data: Dict[str, Item]) -> Tuple[Dict[str, Enemy], Dict[str, Zone]]:
+                          items_data: Dict[str, Item],
+                          report: Optional[ResolutionReport] = None) -> Tuple[Dict[str, Enemy], Dict[str, Zone]]:
     """
     Loads enemy data from a CSV file and returns a dictionary of Enemy objects,
     linking abilities/spells and loot to actual Skill and Item objects.
     Also loads zone information from the same CSV.
+
+    The sheet is read with iter_enemy_sheet. References that match nothing are
+    collected in `report` and emitted once at the end.
     """
+    if report is None:
+        report = ResolutionReport()
     enemies: Dict[str, Enemy] = {}
     zones: Dict[str, Zone] = {}
     current_zone: Optional[Zone] = None
     
-    expected_headers = [
-        "Name", "Level Range", "Spawn Chance", "Type", "Max Hp Lowest Level", 
-        "Max Mp", "Attack", "Defense", "M.Attack", "M.Defense.", "Agility", 
-        "Luck", "Has Sprite?", "Abilitys & Spells", "", "Enemy Loot"
-    ]
-
     try:
-        with open(file_path, mode='r', encoding='utf-8') as csvfile:
-            reader = csv.reader(csvfile)
-            header = next(reader) # Skip header row
-
-            # Verify header (optional but good practice)
-            if header != expected_headers:
-                print(f"Warning: CSV header mismatch. Expected {expected_headers}, got {header}")
-                # You might want to raise an error or handle this more gracefully
-
-            for row_number, row in enumerate(reader, start=2): # start=2 because 1 is header, 2 is first data row
-                if not any(row): # Skip completely empty rows
-                    print(f"Skipping empty row at line {row_number}")
-                    continue
-
-                name_cell = row[0].strip()
-
-                # Zone Marker Detection
-                # Heuristic: first cell contains "Zone", "Den", "Citadel" etc.
-                # AND other critical cells (like HP at index 4, Attack at index 6) are empty.
-                is_zone_marker = False
-                if name_cell:
-                    zone_keywords = ["zone", "den", "citadel", "lair", "sanctum", "ruins", "plains", "forest", "mountain", "cave", "swamp"]
-                    is_potential_zone = any(keyword in name_cell.lower() for keyword in zone_keywords)
-                    
-                    # Check if critical stat cells are empty (or non-numeric, though empty check is simpler here)
-                    # Assuming HP is row[4], Attack is row[6]
-                    if is_potential_zone and len(row) > 6 and \
-                       (not row[4].strip() and not row[6].strip()):
-                        is_zone_marker = True
-
-                if is_zone_marker:
-                    zone_name = name_cell
-                    current_zone = Zone(name=zone_name)
-                    zones[zone_name] = current_zone
-                    print(f"Detected Zone: {zone_name} at row {row_number}")
-                    continue # Skip to the next row
-
-                # Existing check for rows that look like separators but aren't formal zone markers
-                # e.g. "Goblinoid Lair,,,,,,,,,,,,,,," (if the above didn't catch it as a Zone)
-                if name_cell and all(not c.strip() for c in row[1:len(expected_headers)-1]): # Check if all other expected cells are empty
-                    # This might be a sub-header or separator not intended as a new Zone object.
-                    # If it was meant to be a Zone, it should have been caught by the more specific check above.
-                    # For now, we'll just skip these as they are not valid enemies.
-                    # If this row *should* define a zone, the heuristic above needs adjustment.
-                    print(f"Skipping potential sub-header or separator row: {name_cell} at line {row_number}")
-                    continue
-
-
-                if len(row) != len(expected_headers):
-                    print(f"Warning: Skipping row {row_number} due to incorrect number of columns. Expected {len(expected_headers)}, got {len(row)}. Row: '{','.join(row)}'")
-                    continue
-
-                try:
-                    name = name_cell # Already stripped
-                    if not name: # Skip if name is empty (should be caught by `any(row)` or zone checks mostly)
-                        print(f"Warning: Skipping row {row_number} due to empty enemy name.")
-                        continue
-                    
-                    # If it's an enemy row, and a zone is active, add enemy to zone
-                    if current_zone:
-                        current_zone.add_enemy_name(name)
-
-                    level_range = row[1].strip()
-                    spawn_chance = row[2].strip()
-                    enemy_type = row[3].strip()
-                    
-                    # Numeric fields with error handling
-                    try:
-                        max_hp = int(row[4]) if row[4] else 0
-                        max_mp = int(row[5]) if row[5] else 0
-                        attack_power = int(row[6]) if row[6] else 0
-                        defense = int(row[7]) if row[7] else 0
-                        magic_attack = int(row[8]) if row[8] else 0
-                        magic_defense = int(row[9]) if row[9] else 0 # M.Defense.
-                        agility = int(row[10]) if row[10] else 0
-                        luck = int(row[11]) if row[11] else 0
-                    except ValueError as e:
-                        print(f"Warning: Skipping enemy '{name}' (row {row_number}) due to invalid numeric value: {e}. Row data: {row}")
-                        continue
-
-                    has_sprite = row[12].strip().lower() == "yes"
-                    
-                    abilities_spells_str_list = parse_list_from_string(row[13])
-                    resolved_abilities_spells: List[Skill] = []
-                    for skill_name_str in abilities_spells_str_list:
-                        skill_obj = skills_data.get(skill_name_str.strip())
-                        if skill_obj:
-                            resolved_abilities_spells.append(skill_obj)
-                        else:
-                            print(f"Warning: Skill '{skill_name_str}' not found for enemy '{name}'.")
-                    
-                    # row[14] is the empty column, skipped
-                    loot_str_list = parse_list_from_string(row[15])
-                    resolved_loot_items: List[Item] = []
-                    for item_name_str in loot_str_list:
-                        item_obj = items_data.get(item_name_str.strip())
-                        if item_obj:
-                            resolved_loot_items.append(item_obj)
-                        else:
-                            print(f"Warning: Loot item '{item_name_str}' not found for enemy '{name}'.")
-
-                    enemy_obj = Enemy(
-                        name=name,
-                        max_hp=max_hp,
-                        attack_power=attack_power,
-                        defense=defense,
-                        level_range=level_range,
-                        spawn_chance=spawn_chance,
-                        enemy_type=enemy_type,
-                        max_mp=max_mp,
-                        magic_attack=magic_attack,
-                        magic_defense=magic_defense,
-                        agility=agility,
-                        luck=luck,
-                        has_sprite=has_sprite,
-                        abilities_spells=resolved_abilities_spells,
-                        loot=resolved_loot_items,
-                        zone_name=current_zone.name if current_zone else None
-                    )
-                    enemies[name] = enemy_obj
-                
-                except IndexError:
-                    print(f"Warning: Skipping row {row_number} due to missing columns for enemy '{name if 'name' in locals() else 'Unknown'}'. Row data: {row}")
-                    continue
-                except Exception as e:
-                    print(f"Warning: An unexpected error occurred while processing enemy row {row_number} for '{name if 'name' in locals() else 'Unknown'}': {e}. Row data: {row}")
-                    continue
-                    
+        for record in iter_enemy_sheet(file_path, skills_data, items_data, report):
+            if isinstance(record, Zone):
+                current_zone = zones[record.name] = record
+                continue
+            # If it's an enemy row, and a zone is active, add enemy to zone
+            if current_zone:
+                current_zone.add_enemy_name(record.name)
+            enemies[record.name] = record
+
     except FileNotFoundError:
         # Let FileNotFoundError propagate as per previous discussions for loaders
-        print(f"Error: The file '{file_path}' was not found.")
+        emit(f"Error: The file '{file_path}' was not found.", "warning")
         raise # Re-raise the exception
     except Exception as e:
-        print(f"An error occurred while opening or reading the file: {e}")
+        emit(f"An error occurred while opening or reading the file: {e}", "warning")
         # For other critical errors during file processing, return empty dicts
         return {}, {}
 
+    report.emit()
     return enemies, zones
 
 if __name__ == '__main__':
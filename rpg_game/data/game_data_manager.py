@@ -1,17 +1,20 @@
+import copy
 import os
-from typing import Dict, Optional, Union
+import time
+from typing import Dict, FrozenSet, Iterable, Optional, Sequence, Set, Tuple, Union
 
-# Loader function imports (using relative imports as this file is in the 'data' package)
+# The CSV loaders are imported on first use (see _loaders): a load from the
+# compiled data cache never needs them, which keeps startup fast.
 try:
-    from .enemy_loader import load_enemies_from_csv
-    from .item_loader import load_equipment_from_csv, load_consumables_and_materials_from_csv, load_weapons_from_csv
-    from .skill_loader import load_skills_from_csv
-    from .status_effect_loader import load_status_effects_from_csv
+    from .id_tables import ID_FILE, IdTable, read_id_tables, write_id_tables
+    from .name_index import NameIndex, ResolutionReport
+    from .overlays import DELETIONS_FILE, OverlayDict, layered, read_deletions
+    from . import data_cache
 except ImportError: # Fallback for running script directly for testing, if rpg_game is in PYTHONPATH
-    from enemy_loader import load_enemies_from_csv
-    from item_loader import load_equipment_from_csv, load_consumables_and_materials_from_csv, load_weapons_from_csv
-    from skill_loader import load_skills_from_csv
-    from status_effect_loader import load_status_effects_from_csv
+    from id_tables import ID_FILE, IdTable, read_id_tables, write_id_tables
+    from name_index import NameIndex, ResolutionReport
+    from overlays import DELETIONS_FILE, OverlayDict, layered, read_deletions
+    import data_cache
 
 
 # Core class imports for type hinting
@@ -24,7 +27,12 @@ try:
     from rpg_game.core.weapon import Weapon
     from rpg_game.core.skill import Skill, Ability, PassiveSkill, Spell
     from rpg_game.core.status_effect import StatusEffect
+    from rpg_game.core.enemy_scaling import EnemyScalingTable, GrowthCurve
+    from rpg_game.core.elements import AffinityMatrix
     from rpg_game.world.zone import Zone # Import Zone
+    from rpg_game.utils.output import emit, flush
+    from rpg_game.utils.metrics import registry as metrics
+    from rpg_game.utils.cache import invalidate
 except ImportError: # Fallback
     # This assumes the script might be run from 'rpg_game/data' or 'rpg_game' is in path
     # Adjusting path to find 'core' if running from 'data'
@@ -39,14 +47,50 @@ except ImportError: # Fallback
     from core.weapon import Weapon
     from core.skill import Skill, Ability, PassiveSkill, Spell
     from core.status_effect import StatusEffect
+    from core.enemy_scaling import EnemyScalingTable, GrowthCurve
+    from core.elements import AffinityMatrix
     from world.zone import Zone
+    from utils.output import emit, flush
+    from utils.metrics import registry as metrics
+    from utils.cache import invalidate
+
+
+# The CSV file of each kind of data inside the data directory.
+DATA_FILES: Dict[str, str] = {
+    "status_effects": "Buffs & Debuffs.csv",
+    "skills": "Spells & Abilitys.csv",
+    "equipment": "Armor, Accesories, Shields.csv",
+    "consumables_materials": "Potions, Consumables, Materials.csv",
+    "weapons": "Revised Weapon Sheet.csv",
+    "enemies": "Enemy's Sheet.csv",
+}
+
+# The record collections of a GameDataManager, which data overlays layer over.
+RECORD_COLLECTIONS: Tuple[str, ...] = ("enemies", "equipment", "consumables", "materials", "weapons",
+                                       "skills", "status_effects", "zones", "all_items")
+
+# The item collections, besides all_items.
+ITEM_COLLECTIONS: Tuple[str, ...] = ("equipment", "consumables", "materials", "weapons")
+
+# The collections with ID tables, and the attribute holding each table.
+_ID_TABLES: Tuple[Tuple[str, str], ...] = (("enemies", "enemy_ids"), ("all_items", "item_ids"), ("skills", "skill_ids"),
+                                           ("status_effects", "status_effect_ids"), ("zones", "zone_ids"))
+
+
+def _loaders():
+    """Imports the CSV loader modules."""
+    try:
+        from . import enemy_loader, item_loader, skill_loader, status_effect_loader
+    except ImportError:
+        import enemy_loader, item_loader, skill_loader, status_effect_loader
+    return enemy_loader, item_loader, skill_loader, status_effect_loader
 
 
 class GameDataManager:
     """
     Manages loading and accessing all game data from CSV files.
     """
-    def __init__(self):
+    def __init__(self, growth_curves: Optional[Dict[str, GrowthCurve]] = None):
         self.enemies: Dict[str, Enemy] = {}
         self.equipment: Dict[str, Equipment] = {}
         self.consumables: Dict[str, Consumable] = {}
@@ -58,103 +102,473 @@ class GameDataManager:
         
         self.all_items: Dict[str, Item] = {} # Combined for convenience
 
-    def load_all_data(self, base_csv_path: str = "Game Csv Data") -> None:
+        # Per-stat growth curve overrides and the (enemy x level) table built from them
+        self.growth_curves: Optional[Dict[str, GrowthCurve]] = growth_curves
+        self.enemy_scaling: Optional[EnemyScalingTable] = None
+
+        # Stable integer IDs (name <-> id) for compact references in saves, messages and tables.
+        # IDs are append-only and persisted in the data directory's ID_FILE.
+        self.enemy_ids: IdTable = IdTable()
+        self.item_ids: IdTable = IdTable()
+        self.skill_ids: IdTable = IdTable()
+        self.status_effect_ids: IdTable = IdTable()
+        self.zone_ids: IdTable = IdTable()
+
+        # Element/type IDs and the (attack element x defender type) damage multipliers
+        self.affinities: AffinityMatrix = AffinityMatrix()
+
+        # Skill and loot references from the enemy sheet that matched nothing
+        self.link_report: ResolutionReport = ResolutionReport()
+
+        # Seconds spent in each stage of the last load_all_data() call
+        self.load_timings: Dict[str, float] = {}
+
+        # Built on the first overlay and shared with the variants (see apply_overlay):
+        # name indexes of the skills and items, and the enemies naming each of them
+        self._skill_index: Optional[NameIndex] = None
+        self._item_index: Optional[NameIndex] = None
+        self._referrers: Optional[Dict[Tuple[str, str], FrozenSet[str]]] = None
+
+    def _record_stage(self, stage: str, started: float) -> float:
+        """
+        Records the duration of a load stage and returns the start time of the next one.
+        """
+        now = time.perf_counter()
+        self.load_timings[stage] = now - started
+        if metrics.enabled:
+            metrics.histogram("rpg_load_stage_seconds", "Time spent in each data loading stage.",
+                              stage=stage).observe(now - started)
+        return now
+
+    def load_all_data(self, base_csv_path: Union[str, Sequence[str]] = "Game Csv Data", use_cache: bool = False) -> None:
         """
         Loads all game data from the specified CSV files.
+
+        Args:
+            base_csv_path: The directory containing the CSV files, or a stack of
+                       directories: the first holds the base data and each later
+                       one is applied on top of it as an overlay (see apply_overlay).
+            use_cache: Load the compiled data cache (see data.data_cache) when it is
+                       up to date with the CSV files, and write it after parsing them.
+                       Only the base directory is cached; overlays are small.
+
+        Every cached value tagged "data:<collection>" or "enemy:<name>" is invalidated
+        (see utils.cache).
         """
-        print(f"Starting data loading process from base path: '{base_csv_path}'...")
+        if not isinstance(base_csv_path, str):
+            base_csv_path, *overlay_paths = base_csv_path
+            self.load_all_data(base_csv_path, use_cache)
+            for overlay_path in overlay_paths:
+                self.apply_overlay(overlay_path)
+            return
+        emit(f"Starting data loading process from base path: '{base_csv_path}'...", "load")
+        invalidate("data", "enemy") # Values cached from the previous data (see utils.cache)
+        self.load_timings = {}
+        self._skill_index = self._item_index = self._referrers = None
+        load_started = stage_started = time.perf_counter()
+        if use_cache:
+            cache_key = self._cache_key(base_csv_path)
+            state = data_cache.read_cache(data_cache.cache_path(base_csv_path), cache_key)
+            if state is not None:
+                self.__dict__.update(state)
+                self._record_stage("cache", load_started)
+                self._record_stage("total", load_started)
+                emit(f"Loaded {len(self.enemies)} enemies and {len(self.all_items)} items from the compiled data cache.", "load")
+                flush()
+                return
+        enemy_loader, item_loader, skill_loader, status_effect_loader = _loaders()
 
         # 1. Load Status Effects
-        status_effects_path = os.path.join(base_csv_path, "Buffs & Debuffs.csv")
-        print(f"\nLoading status effects from: {status_effects_path}")
+        status_effects_path = os.path.join(base_csv_path, DATA_FILES["status_effects"])
+        emit(f"\nLoading status effects from: {status_effects_path}", "load")
         try:
-            self.status_effects = load_status_effects_from_csv(status_effects_path)
-            print(f"  Loaded {len(self.status_effects)} status effects.")
+            self.status_effects = status_effect_loader.load_status_effects_from_csv(status_effects_path)
+            emit(f"  Loaded {len(self.status_effects)} status effects.", "load")
         except FileNotFoundError:
-            print(f"  ERROR: Status effects file not found at {status_effects_path}. Skipping.")
+            emit(f"  ERROR: Status effects file not found at {status_effects_path}. Skipping.", "warning")
         except Exception as e:
-            print(f"  ERROR: Failed to load status effects: {e}")
+            emit(f"  ERROR: Failed to load status effects: {e}", "warning")
 
+        stage_started = self._record_stage("status_effects", stage_started)
 
         # 2. Load Skills
-        skills_path = os.path.join(base_csv_path, "Spells & Abilitys.csv")
-        print(f"\nLoading skills from: {skills_path}")
+        skills_path = os.path.join(base_csv_path, DATA_FILES["skills"])
+        emit(f"\nLoading skills from: {skills_path}", "load")
         try:
-            self.skills = load_skills_from_csv(skills_path)
-            print(f"  Loaded {len(self.skills)} skills.")
+            self.skills = skill_loader.load_skills_from_csv(skills_path)
+            emit(f"  Loaded {len(self.skills)} skills.", "load")
         except FileNotFoundError:
-            print(f"  ERROR: Skills file not found at {skills_path}. Skipping.")
+            emit(f"  ERROR: Skills file not found at {skills_path}. Skipping.", "warning")
         except Exception as e:
-            print(f"  ERROR: Failed to load skills: {e}")
+            emit(f"  ERROR: Failed to load skills: {e}", "warning")
 
+        stage_started = self._record_stage("skills", stage_started)
 
         # 3. Load Equipment (Armor, Accessories, Shields)
-        equipment_path = os.path.join(base_csv_path, "Armor, Accesories, Shields.csv")
-        print(f"\nLoading equipment from: {equipment_path}")
+        equipment_path = os.path.join(base_csv_path, DATA_FILES["equipment"])
+        emit(f"\nLoading equipment from: {equipment_path}", "load")
         try:
-            self.equipment = load_equipment_from_csv(equipment_path)
-            print(f"  Loaded {len(self.equipment)} pieces of equipment.")
+            self.equipment = item_loader.load_equipment_from_csv(equipment_path)
+            emit(f"  Loaded {len(self.equipment)} pieces of equipment.", "load")
         except FileNotFoundError:
-            print(f"  ERROR: Equipment file not found at {equipment_path}. Skipping.")
+            emit(f"  ERROR: Equipment file not found at {equipment_path}. Skipping.", "warning")
         except Exception as e:
-            print(f"  ERROR: Failed to load equipment: {e}")
+            emit(f"  ERROR: Failed to load equipment: {e}", "warning")
 
+        stage_started = self._record_stage("equipment", stage_started)
 
         # 4. Load Consumables and Materials
-        consumables_materials_path = os.path.join(base_csv_path, "Potions, Consumables, Materials.csv")
-        print(f"\nLoading consumables and materials from: {consumables_materials_path}")
+        consumables_materials_path = os.path.join(base_csv_path, DATA_FILES["consumables_materials"])
+        emit(f"\nLoading consumables and materials from: {consumables_materials_path}", "load")
         try:
-            consumables_and_materials = load_consumables_and_materials_from_csv(consumables_materials_path)
+            consumables_and_materials = item_loader.load_consumables_and_materials_from_csv(consumables_materials_path)
             for name, item_obj in consumables_and_materials.items():
                 if isinstance(item_obj, Consumable):
                     self.consumables[name] = item_obj
                 elif isinstance(item_obj, Material):
                     self.materials[name] = item_obj
-            print(f"  Loaded {len(self.consumables)} consumables.")
-            print(f"  Loaded {len(self.materials)} materials.")
+            emit(f"  Loaded {len(self.consumables)} consumables.", "load")
+            emit(f"  Loaded {len(self.materials)} materials.", "load")
         except FileNotFoundError:
-            print(f"  ERROR: Consumables/materials file not found at {consumables_materials_path}. Skipping.")
+            emit(f"  ERROR: Consumables/materials file not found at {consumables_materials_path}. Skipping.", "warning")
         except Exception as e:
-            print(f"  ERROR: Failed to load consumables/materials: {e}")
+            emit(f"  ERROR: Failed to load consumables/materials: {e}", "warning")
             
+        stage_started = self._record_stage("consumables_materials", stage_started)
 
         # 5. Load Weapons
-        weapons_path = os.path.join(base_csv_path, "Revised Weapon Sheet.csv")
-        print(f"\nLoading weapons from: {weapons_path}")
+        weapons_path = os.path.join(base_csv_path, DATA_FILES["weapons"])
+        emit(f"\nLoading weapons from: {weapons_path}", "load")
         try:
-            self.weapons = load_weapons_from_csv(weapons_path)
-            print(f"  Loaded {len(self.weapons)} weapons.")
+            self.weapons = item_loader.load_weapons_from_csv(weapons_path)
+            emit(f"  Loaded {len(self.weapons)} weapons.", "load")
         except FileNotFoundError:
-            print(f"  ERROR: Weapons file not found at {weapons_path}. Skipping.")
+            emit(f"  ERROR: Weapons file not found at {weapons_path}. Skipping.", "warning")
         except Exception as e:
-            print(f"  ERROR: Failed to load weapons: {e}")
+            emit(f"  ERROR: Failed to load weapons: {e}", "warning")
 
+        stage_started = self._record_stage("weapons", stage_started)
         # 6. Create self.all_items
-        print("\nCombining all item types into 'all_items' dictionary...")
+        emit("\nCombining all item types into 'all_items' dictionary...", "load")
         self.all_items.update(self.equipment)
         self.all_items.update(self.consumables)
         self.all_items.update(self.materials)
         self.all_items.update(self.weapons)
-        print(f"  Total items in 'all_items': {len(self.all_items)}.")
+        emit(f"  Total items in 'all_items': {len(self.all_items)}.", "load")
 
-        # 7. Load Enemies
-        # Note: Enemy linking logic will be added in a subsequent step.
-        # For now, it loads enemies but doesn't link their skills/loot yet.
-        enemies_path = os.path.join(base_csv_path, "Enemy's Sheet.csv")
-        print(f"\nLoading enemies and zones from: {enemies_path}")
+        stage_started = self._record_stage("all_items", stage_started)
+        # 7. Load Enemies, linking their skills and loot by normalized name
+        enemies_path = os.path.join(base_csv_path, DATA_FILES["enemies"])
+        emit(f"\nLoading enemies and zones from: {enemies_path}", "load")
         try:
             # load_enemies_from_csv now returns (enemies, zones)
-            loaded_enemies, loaded_zones = load_enemies_from_csv(enemies_path, self.skills, self.all_items)
+            self.link_report = ResolutionReport()
+            loaded_enemies, loaded_zones = enemy_loader.load_enemies_from_csv(enemies_path, self.skills, self.all_items, self.link_report)
             self.enemies = loaded_enemies
             self.zones = loaded_zones
-            print(f"  Loaded {len(self.enemies)} enemies.")
-            print(f"  Loaded {len(self.zones)} zones.")
+            emit(f"  Loaded {len(self.enemies)} enemies.", "load")
+            emit(f"  Loaded {len(self.zones)} zones.", "load")
         except FileNotFoundError:
-            print(f"  ERROR: Enemies/Zones file not found at {enemies_path}. Skipping.")
+            emit(f"  ERROR: Enemies/Zones file not found at {enemies_path}. Skipping.", "warning")
         except Exception as e:
-            print(f"  ERROR: Failed to load enemies/zones: {e}")
+            emit(f"  ERROR: Failed to load enemies/zones: {e}", "warning")
+
+        stage_started = self._record_stage("enemies", stage_started)
+        # 8. Precompute level-scaled enemy stats
+        self.enemy_scaling = EnemyScalingTable(self.enemies, self.growth_curves)
+        emit(f"\nPrecomputed level scaling for {len(self.enemy_scaling)} enemies.", "load")
+
+        stage_started = self._record_stage("enemy_scaling", stage_started)
+        # 9. Assign stable integer IDs: the persisted ones, and the next free IDs to new records
+        id_path = os.path.join(base_csv_path, ID_FILE)
+        persisted = read_id_tables(id_path)
+        self.build_id_tables(persisted)
+        if any(table is not persisted.get(collection) for collection, table in self.id_tables().items()):
+            if write_id_tables(id_path, self.id_tables()):
+                emit(f"Recorded the IDs of new records in '{id_path}'.", "load")
+            else:
+                emit(f"  Warning: Cannot write '{id_path}'; IDs of new records are not persisted.", "warning")
+        emit(f"Assigned IDs to {len(self.enemy_ids)} enemies, {len(self.item_ids)} items, "
+             f"{len(self.skill_ids)} skills, {len(self.status_effect_ids)} status effects "
+             f"and {len(self.zone_ids)} zones.", "load")
+        stage_started = self._record_stage("id_tables", stage_started)
+
+        # 10. Intern elements and enemy types and build the affinity matrix
+        self.affinities = AffinityMatrix.from_data(self)
+        emit(f"Built the affinity matrix for {len(self.affinities)} elements and types.", "load")
+        stage_started = self._record_stage("affinities", stage_started)
+
+        if use_cache:
+            cache_key = self._cache_key(base_csv_path) # The ID file may have just been written
+            state = {name: value for name, value in self.__dict__.items() if name != "load_timings"}
+            if data_cache.write_cache(data_cache.cache_path(base_csv_path), cache_key, state):
+                emit("Wrote the compiled data cache.", "load")
+            self._record_stage("cache", stage_started)
+        self._record_stage("total", load_started)
             
-        print("\nAll data loading attempted.")
+        emit("\nAll data loading attempted.", "load")
+        flush()
+
+    def _cache_key(self, base_csv_path: str) -> str:
+        """Returns the data cache key for a CSV directory and this manager's settings."""
+        return data_cache.cache_key(base_csv_path, list(DATA_FILES.values()) + [ID_FILE],
+                                    f"{Enemy.__module__}|{self.growth_curves!r}")
+
+    def with_overlays(self, *overlay_paths: str) -> "GameDataManager":
+        """
+        Returns a variant of this data with the overlay directories applied in order
+        (see apply_overlay). The variant shares every record the overlays leave
+        untouched with this manager, which is not modified, so several variants
+        (e.g. seasonal events) can run side by side over one loaded base.
+        """
+        variant = GameDataManager(self.growth_curves)
+        for name in RECORD_COLLECTIONS:
+            setattr(variant, name, layered(getattr(self, name)))
+        self._overlay_indexes() # Built once on the base and shared by every variant
+        for name in ("enemy_scaling", "enemy_ids", "item_ids", "skill_ids", "status_effect_ids", "zone_ids",
+                     "affinities", "_skill_index", "_item_index"):
+            setattr(variant, name, getattr(self, name))
+        variant._referrers = layered(self._referrers)
+        for overlay_path in overlay_paths:
+            variant.apply_overlay(overlay_path)
+        return variant
+
+    def _overlay_indexes(self) -> None:
+        """Builds the skill and item name indexes and the reference index, if missing."""
+        if self._skill_index is None:
+            self._skill_index = NameIndex(self.skills)
+            self._item_index = NameIndex(self.all_items)
+        if self._referrers is None:
+            referrers: Dict[Tuple[str, str], Set[str]] = {}
+            for enemy in self.enemies.values():
+                for key in self._references_of(enemy):
+                    referrers.setdefault(key, set()).add(enemy.name)
+            self._referrers = {key: frozenset(names) for key, names in referrers.items()}
+
+    @staticmethod
+    def _references_of(enemy: Enemy) -> Iterable[Tuple[str, str]]:
+        """The (collection, name) of every skill and item an enemy links to."""
+        return [("skills", skill.name) for skill in enemy.abilities_spells] + \
+               [("all_items", item.name) for item in enemy.loot]
+
+    def apply_overlay(self, overlay_path: str) -> None:
+        """
+        Applies a data overlay directory on top of the loaded data.
+
+        An overlay holds any of the DATA_FILES sheets, in the usual format, with only
+        the records it adds or replaces (matched by name), and optionally a
+        DELETIONS_FILE naming the records it removes. The loaded records are never
+        modified: the collections become copy-on-write layers (see
+        data.overlays.OverlayDict) and changed zones and enemies are copied, so the
+        cost is proportional to the overlay, not to the data under it. Enemies whose
+        skills or loot the overlay replaces or removes are relinked.
+
+        Names the overlay adds get the next free IDs (see _update_id_tables). Cached
+        values tagged "data:<collection>" for a changed collection, or "enemy:<name>"
+        for a changed or relinked enemy, are invalidated (see utils.cache).
+        """
+        started = time.perf_counter()
+        emit(f"\nApplying data overlay: '{overlay_path}'", "load")
+        enemy_loader, item_loader, skill_loader, status_effect_loader = _loaders()
+        self._overlay_indexes()
+        for name in RECORD_COLLECTIONS:
+            collection = getattr(self, name)
+            if not isinstance(collection, OverlayDict):
+                setattr(self, name, OverlayDict(collection))
+        if not isinstance(self._referrers, OverlayDict):
+            self._referrers = OverlayDict(self._referrers)
+        # Names the overlay touches in each collection, and whether they existed before it
+        changed: Dict[str, Dict[str, bool]] = {name: {} for name in RECORD_COLLECTIONS}
+        counts: Dict[str, int] = {}
+
+        # 1. Removed records
+        for collection, names in read_deletions(os.path.join(overlay_path, DELETIONS_FILE)).items():
+            for name in names:
+                if self._delete_record(collection, name, changed):
+                    counts["deleted"] = counts.get("deleted", 0) + 1
+                else:
+                    emit(f"  Warning: Cannot delete '{name}' from {collection}: no such record.", "warning")
+
+        # 2. Added and replaced records of the sheets enemies link to
+        sheets = (("status_effects", status_effect_loader.iter_status_effects),
+                  ("skills", skill_loader.iter_skills),
+                  ("equipment", item_loader.iter_equipment),
+                  ("consumables_materials", item_loader.iter_consumables_and_materials),
+                  ("weapons", item_loader.iter_weapons))
+        for sheet, iterate in sheets:
+            sheet_path = os.path.join(overlay_path, DATA_FILES[sheet])
+            if not os.path.exists(sheet_path):
+                continue
+            try:
+                for record in iterate(sheet_path):
+                    if sheet == "consumables_materials":
+                        collection = "consumables" if isinstance(record, Consumable) else "materials"
+                    else:
+                        collection = sheet
+                    self._put_record(collection, record, changed)
+                    counts[collection] = counts.get(collection, 0) + 1
+            except Exception as e:
+                emit(f"  ERROR: Failed to apply {sheet_path}: {e}", "warning")
+        self._skill_index = self._skill_index.overlay(
+            self.skills, [name for name, existed in changed["skills"].items() if not existed])
+        self._item_index = self._item_index.overlay(
+            self.all_items, [name for name, existed in changed["all_items"].items() if not existed])
+
+        # 3. Enemies that link to replaced or removed skills and items
+        stale: Set[str] = set()
+        for collection in ("skills", "all_items"):
+            for name, existed in changed[collection].items():
+                if existed:
+                    stale.update(self._referrers.get((collection, name), ()))
+        for enemy_name in stale:
+            enemy = self.enemies.get(enemy_name)
+            if enemy is not None and self._relink(enemy):
+                counts["relinked enemies"] = counts.get("relinked enemies", 0) + 1
+
+        # 4. Added and replaced enemies and zones
+        enemies_path = os.path.join(overlay_path, DATA_FILES["enemies"])
+        if os.path.exists(enemies_path):
+            report = ResolutionReport()
+            try:
+                for record in enemy_loader.iter_enemy_sheet(enemies_path, self._skill_index, self._item_index, report):
+                    if isinstance(record, Zone):
+                        if record.name not in self.zones:
+                            changed["zones"].setdefault(record.name, False)
+                            self.zones[record.name] = record
+                        continue
+                    self._put_enemy(record, changed)
+                    counts["enemies"] = counts.get("enemies", 0) + 1
+            except Exception as e:
+                emit(f"  ERROR: Failed to apply {enemies_path}: {e}", "warning")
+            report.emit()
+            self.link_report.unresolved.extend(report.unresolved)
+
+        # 5. Derived tables, for the new records only
+        self.enemy_scaling = self.enemy_scaling.overlay(self.enemies, changed["enemies"])
+        new = {collection: [getattr(self, collection)[name] for name in changed[collection] if name in getattr(self, collection)]
+               for collection in ("skills", "weapons", "enemies", "status_effects")}
+        self.affinities = self.affinities.extended([getattr(skill, 'element', "") for skill in new["skills"]] +
+                                                   [weapon.attack_type for weapon in new["weapons"]] +
+                                                   [enemy.enemy_type for enemy in new["enemies"]] +
+                                                   [effect.element for effect in new["status_effects"]])
+        self.affinities.assign_ids(**new)
+        self._update_id_tables(changed)
+        invalidate(*[f"data:{collection}" for collection, names in changed.items() if names],
+                   *[f"enemy:{name}" for name in set(changed["enemies"]) | stale])
+
+        summary = ", ".join(f"{count} {what}" for what, count in counts.items()) or "no changes"
+        emit(f"  Applied overlay '{overlay_path}': {summary} ({(time.perf_counter() - started) * 1000:.1f} ms).", "load")
+        flush()
+
+    def _touch(self, changed: Dict[str, Dict[str, bool]], collection: str, name: str) -> None:
+        """Notes that an overlay changes a record, before it does."""
+        changed[collection].setdefault(name, name in getattr(self, collection))
+
+    def _put_record(self, collection: str, record, changed: Dict[str, Dict[str, bool]]) -> None:
+        """Adds or replaces a skill, status effect or item in an overlay layer."""
+        name = record.name
+        if collection in ITEM_COLLECTIONS:
+            for other in ITEM_COLLECTIONS: # An item may move to another sheet
+                if other != collection and name in getattr(self, other):
+                    self._touch(changed, other, name)
+                    del getattr(self, other)[name]
+            self._touch(changed, "all_items", name)
+            self.all_items[name] = record
+        self._touch(changed, collection, name)
+        getattr(self, collection)[name] = record
+
+    def _delete_record(self, collection: str, name: str, changed: Dict[str, Dict[str, bool]]) -> bool:
+        """Removes a record in an overlay layer. Returns False if there was none."""
+        found = False
+        for collection_name in (ITEM_COLLECTIONS if collection == "items" else (collection,)):
+            records = getattr(self, collection_name)
+            if name in records:
+                if collection_name == "enemies":
+                    self._move_enemy(name, records[name].zone_name, None, changed)
+                self._touch(changed, collection_name, name)
+                del records[name]
+                found = True
+        if found and (collection == "items" or collection in ITEM_COLLECTIONS):
+            self._touch(changed, "all_items", name)
+            del self.all_items[name]
+        return found
+
+    def _put_enemy(self, enemy: Enemy, changed: Dict[str, Dict[str, bool]]) -> None:
+        """Adds or replaces an enemy in an overlay layer, keeping the zones and references in step."""
+        previous = self.enemies.get(enemy.name)
+        self._move_enemy(enemy.name, previous.zone_name if previous is not None else None, enemy.zone_name, changed)
+        self._touch(changed, "enemies", enemy.name)
+        self.enemies[enemy.name] = enemy
+        for key in self._references_of(enemy):
+            self._referrers[key] = self._referrers.get(key, frozenset()) | {enemy.name}
+
+    def _move_enemy(self, enemy_name: str, old_zone_name: Optional[str], zone_name: Optional[str],
+                    changed: Dict[str, Dict[str, bool]]) -> None:
+        """Lists an enemy under another zone (None: under no zone), replacing the zones it changes."""
+        if old_zone_name == zone_name:
+            return
+        zone = self.zones.get(old_zone_name) if old_zone_name else None
+        if zone is not None and enemy_name in zone.enemy_names:
+            self._touch(changed, "zones", zone.name)
+            self.zones[zone.name] = Zone(zone.name, [name for name in zone.enemy_names if name != enemy_name])
+        zone = self.zones.get(zone_name) if zone_name else None
+        if zone is not None:
+            self._touch(changed, "zones", zone.name)
+            self.zones[zone.name] = Zone(zone.name, zone.enemy_names + [enemy_name])
+
+    def _relink(self, enemy: Enemy) -> bool:
+        """
+        Replaces an enemy whose skills or loot were replaced or removed with a copy
+        linked to the current records. Returns False if its links are current.
+        """
+        if all(self.skills.get(skill.name) is skill for skill in enemy.abilities_spells) and \
+           all(self.all_items.get(item.name) is item for item in enemy.loot):
+            return False
+        relinked = copy.copy(enemy)
+        relinked.abilities_spells = [self.skills[skill.name] for skill in enemy.abilities_spells if skill.name in self.skills]
+        relinked.loot = [self.all_items[item.name] for item in enemy.loot if item.name in self.all_items]
+        self.enemies[enemy.name] = relinked
+        return True
+
+    def _update_id_tables(self, changed: Dict[str, Dict[str, bool]]) -> None:
+        """
+        Gives the names the overlay added the next free IDs, and updates the zones'
+        enemy IDs. IDs of removed names are kept. Overlay IDs are not persisted.
+        """
+        renamed = {collection for collection, names in changed.items()
+                   if any(existed != (name in getattr(self, collection)) for name, existed in names.items())}
+        for collection, table in _ID_TABLES:
+            if collection in renamed:
+                setattr(self, table, getattr(self, table).extended(
+                    name for name in changed[collection] if name in getattr(self, collection)))
+        # Zones the overlay left alone are shared, so they are replaced rather than updated
+        for zone_name in (list(self.zones) if "enemies" in renamed else changed["zones"]):
+            zone = self.zones.get(zone_name)
+            if zone is None:
+                continue
+            if zone_name not in changed["zones"]:
+                zone = self.zones[zone_name] = Zone(zone.name, list(zone.enemy_names))
+            zone.enemy_ids = [self.enemy_ids.id_of(name) for name in zone.enemy_names if name in self.enemies]
+
+    def build_id_tables(self, persisted: Optional[Dict[str, IdTable]] = None) -> None:
+        """
+        (Re)builds the ID tables from the loaded data and fills in Zone.enemy_ids.
+        Call this after changing the data dictionaries by hand.
+
+        Args:
+            persisted: ID tables keyed by collection (see id_tables.read_id_tables).
+                       Their IDs are kept and records they lack get the next free IDs;
+                       without one, a collection's records are numbered in sorted order.
+        """
+        persisted = persisted or {}
+        for collection, table in _ID_TABLES:
+            setattr(self, table, persisted.get(collection, IdTable()).extended(getattr(self, collection)))
+        for zone in self.zones.values():
+            zone.enemy_ids = [self.enemy_ids.id_of(name) for name in zone.enemy_names if name in self.enemies]
+
+    def id_tables(self) -> Dict[str, IdTable]:
+        """Returns the ID tables keyed by collection, as persisted in ID_FILE."""
+        return {collection: getattr(self, table) for collection, table in _ID_TABLES}
 
     # Getter Methods
     def get_enemy(self, name: str) -> Optional[Enemy]:
@@ -173,6 +587,36 @@ class GameDataManager:
     def get_zone(self, name: str) -> Optional[Zone]:
         return self.zones.get(name)
 
+    # The by-ID getters return None for unknown IDs and for the IDs of removed records
+    def get_enemy_by_id(self, enemy_id: int) -> Optional[Enemy]:
+        return self._by_id(self.enemies, self.enemy_ids, enemy_id)
+
+    def get_item_by_id(self, item_id: int) -> Optional[Item]:
+        return self._by_id(self.all_items, self.item_ids, item_id)
+
+    def get_skill_by_id(self, skill_id: int) -> Optional[Skill]:
+        return self._by_id(self.skills, self.skill_ids, skill_id)
+
+    def get_status_effect_by_id(self, status_effect_id: int) -> Optional[StatusEffect]:
+        return self._by_id(self.status_effects, self.status_effect_ids, status_effect_id)
+
+    def get_zone_by_id(self, zone_id: int) -> Optional[Zone]:
+        return self._by_id(self.zones, self.zone_ids, zone_id)
+
+    @staticmethod
+    def _by_id(collection, table: IdTable, entity_id: int):
+        name = table.get_name(entity_id)
+        return collection.get(name) if name is not None else None
+
+    def spawn_enemy(self, name: str, level: Optional[int] = None) -> Optional[Enemy]:
+        """
+        Spawns a fresh, level-scaled instance of an enemy template.
+        If level is None a level within the enemy's range is rolled.
+        """
+        if self.enemy_scaling is None or name not in self.enemy_scaling:
+            return None
+        return self.enemy_scaling.spawn(name, level)
+
 if __name__ == '__main__':
     # This block assumes that the script is run from the 'rpg_game/data' directory,
     # or that 'Game Csv Data' is relative to where it's run.
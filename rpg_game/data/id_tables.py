@@ -0,0 +1,135 @@
+import csv
+import os
+import zlib
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+
+# The ID tables are persisted in this file of the data directory, one row per
+# (collection, ID, name), so IDs survive edits to the sheets.
+ID_FILE = "Entity IDs.csv"
+ID_FILE_HEADER = ["Collection", "ID", "Name"]
+
+
+class IdTable:
+    """
+    Two-way mapping between entity names and compact integer IDs.
+
+    IDs are append-only: a table built from names alone numbers them in sorted
+    order, extended() gives new names the next free IDs, and a name keeps its ID
+    after its record is removed, so an ID never changes meaning. IDs stay dense
+    (0 .. len-1) and can index tables directly.
+    """
+    def __init__(self, names: Iterable[str] = (), ordered: bool = False):
+        """
+        Initializes the table.
+
+        Args:
+            names: The entity names; duplicates are ignored.
+            ordered: Number the names in the given order (e.g. as read back from
+                     the ID file) instead of sorted order.
+        """
+        self.names: List[str] = list(dict.fromkeys(names)) if ordered else sorted(set(names))
+        self._ids: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        self.fingerprint: int = self.prefix_fingerprint(len(self.names))
+
+    def extended(self, names: Iterable[str]) -> "IdTable":
+        """
+        Returns a table that also numbers `names`: the ones this table does not
+        know get the next IDs, in sorted order. Returns this table if there are none.
+        """
+        added = sorted({name for name in names if name not in self._ids})
+        return IdTable(self.names + added, ordered=True) if added else self
+
+    def prefix_fingerprint(self, count: int) -> int:
+        """Returns the fingerprint the table had when it held its first `count` names."""
+        return zlib.crc32("\x1f".join(self.names[:count]).encode("utf-8"))
+
+    def id_of(self, name: str) -> int:
+        """Returns the ID of a name. Raises KeyError for unknown names."""
+        return self._ids[name]
+
+    def get_id(self, name: str, default: Optional[int] = None) -> Optional[int]:
+        """Returns the ID of a name, or default if the name is unknown."""
+        return self._ids.get(name, default)
+
+    def name_of(self, entity_id: int) -> str:
+        """Returns the name for an ID. Raises IndexError for unknown IDs."""
+        if entity_id < 0:
+            raise IndexError(f"Invalid entity ID: {entity_id}")
+        return self.names[entity_id]
+
+    def get_name(self, entity_id: int, default: Optional[str] = None) -> Optional[str]:
+        """Returns the name for an ID, or default if the ID is unknown."""
+        if 0 <= entity_id < len(self.names):
+            return self.names[entity_id]
+        return default
+
+    def items(self) -> Iterator[Tuple[int, str]]:
+        """Yields (ID, name) pairs in ID order."""
+        return enumerate(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._ids
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+    def __repr__(self) -> str:
+        return f"IdTable({len(self.names)} names, fingerprint={self.fingerprint:#010x})"
+
+
+def read_id_tables(path: str) -> Dict[str, IdTable]:
+    """
+    Reads the ID tables persisted in an ID file, keyed by collection.
+    Returns an empty dict if the file does not exist.
+
+    Raises:
+        ValueError: If the file is malformed or a collection's IDs are not 0 .. n-1.
+    """
+    if not os.path.exists(path):
+        return {}
+    rows: Dict[str, List[Tuple[int, str]]] = {}
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        if next(reader, None) != ID_FILE_HEADER:
+            raise ValueError(f"{path} is not an ID file (expected the header {','.join(ID_FILE_HEADER)}).")
+        for line_number, row in enumerate(reader, start=2):
+            if not any(cell.strip() for cell in row):
+                continue
+            try:
+                collection, entity_id, name = row
+                rows.setdefault(collection.strip(), []).append((int(entity_id), name))
+            except ValueError:
+                raise ValueError(f"{path}:{line_number}: expected Collection,ID,Name, got {row!r}.") from None
+    tables: Dict[str, IdTable] = {}
+    for collection, entries in rows.items():
+        entries.sort()
+        if [entity_id for entity_id, _ in entries] != list(range(len(entries))):
+            raise ValueError(f"{path}: the {collection} IDs must run from 0 to {len(entries) - 1} without gaps.")
+        tables[collection] = IdTable([name for _, name in entries], ordered=True)
+    return tables
+
+
+def write_id_tables(path: str, tables: Mapping[str, IdTable]) -> bool:
+    """
+    Writes ID tables to an ID file atomically. Returns False (and leaves any
+    older file in place) if the directory is not writable.
+    """
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(ID_FILE_HEADER)
+            for collection, table in tables.items():
+                writer.writerows((collection, entity_id, name) for entity_id, name in table.items())
+        os.replace(temp_path, path)
+        return True
+    except OSError:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        return False
@@ -1,5 +1,5 @@
 import csv
-from typing import Dict, Union
+from typing import Dict, Iterator, Union
 
 # Adjust import path based on project structure
 try:
@@ -8,6 +8,7 @@ try:
     from rpg_game.core.material import Material
     from rpg_game.core.item import Item # For type hinting
     from rpg_game.core.weapon import Weapon
+    from rpg_game.data.columns import Column, ColumnPlan, is_header_row
 except ImportError:
     import sys
     import os
@@ -17,6 +18,7 @@ except ImportError:
     from core.material import Material
     from core.item import Item # For type hinting
     from core.weapon import Weapon
+    from data.columns import Column, ColumnPlan, is_header_row
 
 
 def _to_int(value: str, default: int = 0) -> int:
@@ -28,30 +30,72 @@ def _to_int(value: str, default: int = 0) -> int:
     except ValueError:
         return default
 
-def load_equipment_from_csv(file_path: str) -> Dict[str, 'Equipment']:
+# Columns of the armor sheet; the name is always column 0 (its header is the sheet
+# title) and column 1, whose header is blank, says where the piece is found.
+EQUIPMENT_COLUMNS = (
+    Column("tier", ("Tier",), 2),
+    Column("recipe", ("Recipe",), 3),
+    Column("equip_type", ("Equip Type",), 4),
+    Column("attack_bonus", ("Attack",), 5, _to_int),
+    Column("defense_bonus", ("Defense",), 6, _to_int),
+    Column("magic_attack_bonus", ("M.Attack",), 7, _to_int),
+    Column("magic_defense_bonus", ("M.Defense",), 8, _to_int),
+    Column("agility_bonus", ("Agility",), 9, _to_int),
+    Column("luck_bonus", ("Luck",), 10, _to_int),
+    Column("max_hp_bonus", ("Max Hp",), 11, _to_int),
+    Column("max_mp_bonus", ("Max Mp",), 12, _to_int),
+    Column("extra_increases", ("Extra Increases",), 13),
+    Column("source", ("Source",), 15),
+)
+
+# Columns of each consumables section. The potion effects are in an unnamed
+# column (the "Effects" column holds their kind, e.g. "Restore Health").
+SECTION_COLUMNS = {
+    "Potion": (Column("effect_notes", ("Effect Notes",), 2),),
+    "Special Consumable": (Column("rarity", ("Rarity",), 1), Column("effect_notes", ("Effect Notes", "Notes"), 3)),
+    "Food": (Column("rarity", ("Rarity",), 1), Column("effect", ("Effect",), 2), Column("recipe", ("Recipe",), 3)),
+    "Material": (Column("rarity", ("Rarity",), 1),),
+}
+
+# Columns of a weapon section; the name is column 0, under the section title.
+WEAPON_COLUMNS = (
+    Column("level_range", ("Level Range",), 1),
+    Column("source", ("Source",), 2),
+    Column("tier", ("Tier",), 3),
+    Column("attack_type", ("Attack Type",), 4),
+    Column("attack_bonus", ("Attack", "Attack Damage"), 5, _to_int),
+    Column("defense_bonus", ("Defense",), 6, _to_int),
+    Column("magic_attack_bonus", ("M.Attack",), 7, _to_int),
+    Column("magic_defense_bonus", ("M.Defense",), 8, _to_int),
+    Column("agility_bonus", ("Agility",), 9, _to_int),
+    Column("luck_bonus", ("Luck",), 10, _to_int),
+    Column("max_hp_bonus", ("Max HP",), 11, _to_int),
+    Column("max_mp_bonus", ("Max MP",), 12, _to_int),
+    Column("recipe", ("Recipe",), 13),
+    Column("extra_increases", ("Extra Increases",), 14),
+)
+
+def iter_equipment(file_path: str) -> Iterator['Equipment']:
     """
-    Loads equipment data from a CSV file and returns a dictionary of Equipment objects.
+    Streams the Equipment objects of an armor CSV file in sheet order, holding
+    only the current row in memory.
+    Columns are located by the names in the header row (see EQUIPMENT_COLUMNS).
     """
-    equipment_dict: Dict[str, Equipment] = {}
-    
     # Known section headers or titles to skip. Case-insensitive matching might be good.
     section_titles = {"shields", "cloaks", "accesories", "armor sets", "leather set", "iron set", "steel set", 
                       "mythril set", "adamantite set", "dragon scale set", "crystal set", "bone set",
                       "elemental robes", "special armor"} # Add more as identified
 
-    # Expected main header for reference, though we primarily skip by position
-    # "Armor,(empty),Tier,Recipe,Equip Type,Attack,Defense,M.Attack,M.Defense,Agility,Luck,Max Hp,Max Mp,Extra Increases,Additional Changes, (empty or Source)"
-    
     with open(file_path, mode='r', encoding='utf-8') as csvfile:
         reader = csv.reader(csvfile)
         
         try:
-            _ = next(reader) # Skip the main header row
+            plan = ColumnPlan(EQUIPMENT_COLUMNS, next(reader))
         except StopIteration:
             # Empty file
-            return equipment_dict
+            return
 
-        for row_number, row in enumerate(reader, start=2): # Start from 2 as 1 was header
+        for row in reader:
             if not row or not any(row): # Skip completely empty rows
                 continue
 
@@ -61,84 +105,34 @@ def load_equipment_from_csv(file_path: str) -> Dict[str, 'Equipment']:
             if not name:
                 continue
             
-            # Check if it's a known section title (e.g., "Shields", "Cloaks")
-            # Also check for common patterns of section headers (e.g., "Leather set,,,,,,,")
-            # A row is a section header if name is in section_titles or (col2 is empty and col3 is empty and col4 is empty)
-            # Tier is in column index 2 (row[2])
-            is_section_header = False
-            if name.lower() in section_titles:
-                is_section_header = True
-            elif len(row) > 4 and not row[1].strip() and not row[2].strip() and not row[3].strip() and not row[4].strip():
-                # This pattern often indicates a set name like "Leather set,,,,,,,,"
-                is_section_header = True
-            
-            if is_section_header:
-                # print(f"Skipping section header: {name}")
+            # A row is a section header if its name is a known section title (e.g., "Shields", "Cloaks")
+            # or it has no tier, recipe or equip type (e.g., "Leather set,,,,,,,")
+            fields = plan.read(row)
+            if name.lower() in section_titles or not (fields["tier"] or fields["recipe"] or fields["equip_type"]):
                 continue
 
-            # Ensure row has enough columns, otherwise it might be a malformed entry or separator
-            if len(row) < 16: # Expecting up to at least column index 15 for Source
-                # print(f"Skipping row {row_number} due to insufficient columns: {row}")
-                continue
+            tier, equip_type = fields["tier"], fields["equip_type"]
+            description = f"A piece of {tier} {equip_type}." if tier and equip_type else "A piece of equipment."
+            yield Equipment(name=name, description=description, **fields)
 
-            try:
-                tier = row[2].strip()
-                recipe = row[3].strip()
-                equip_type = row[4].strip()
-
-                attack_bonus = _to_int(row[5])
-                defense_bonus = _to_int(row[6])
-                magic_attack_bonus = _to_int(row[7])
-                magic_defense_bonus = _to_int(row[8])
-                agility_bonus = _to_int(row[9])
-                luck_bonus = _to_int(row[10])
-                max_hp_bonus = _to_int(row[11])
-                max_mp_bonus = _to_int(row[12])
-                
-                extra_increases = row[13].strip()
-                # Column 14 is "Additional Changes" - not directly used in Equipment constructor per previous subtask
-                # Column 15 is "Source"
-                source = row[15].strip()
-
-                description = f"A piece of {tier} {equip_type}." if tier and equip_type else "A piece of equipment."
-
-                equipment_obj = Equipment(
-                    name=name,
-                    description=description,
-                    tier=tier,
-                    equip_type=equip_type,
-                    attack_bonus=attack_bonus,
-                    defense_bonus=defense_bonus,
-                    magic_attack_bonus=magic_attack_bonus,
-                    magic_defense_bonus=magic_defense_bonus,
-                    agility_bonus=agility_bonus,
-                    luck_bonus=luck_bonus,
-                    max_hp_bonus=max_hp_bonus,
-                    max_mp_bonus=max_mp_bonus,
-                    extra_increases=extra_increases,
-                    recipe=recipe,
-                    source=source
-                )
-                equipment_dict[name] = equipment_obj
-            
-            except IndexError:
-                # This can happen if a row is shorter than expected, even after the initial length check
-                # print(f"Warning: Skipping row {row_number} for item '{name}' due to IndexError (likely missing columns). Row data: {row}")
-                continue
-            except Exception as e:
-                # print(f"Warning: An unexpected error occurred while processing row {row_number} for item '{name}': {e}. Row data: {row}")
-                continue
-                
-    return equipment_dict
+
+def load_equipment_from_csv(file_path: str) -> Dict[str, 'Equipment']:
+    """
+    Loads equipment data from a CSV file and returns a dictionary of Equipment objects.
+    The sheet is read with iter_equipment.
+    """
+    return {equipment.name: equipment for equipment in iter_equipment(file_path)}
 
 
-def load_consumables_and_materials_from_csv(file_path: str) -> Dict[str, 'Item']:
+def iter_consumables_and_materials(file_path: str) -> Iterator['Item']:
     """
-    Loads consumables and materials data from a CSV file.
+    Streams the consumables and materials of a CSV file in sheet order, holding
+    only the current row in memory.
     The CSV is section-based: "Potions", "Special Consumable", "Food", "Raw Ingriedient".
+    Each section title row doubles as that section's header (see SECTION_COLUMNS).
     """
-    items: Dict[str, Item] = {}
     current_section: Union[str, None] = None
+    plan: Union[ColumnPlan, None] = None
     
     # Define section names (case-sensitive as per current implementation plan)
     section_map = {
@@ -147,97 +141,71 @@ def load_consumables_and_materials_from_csv(file_path: str) -> Dict[str, 'Item']
         "Food": "Food",
         "Raw Ingriedient": "Material" # "Raw Ingriedient" in CSV maps to Material type
     }
-    section_titles = list(section_map.keys())
 
     with open(file_path, mode='r', encoding='utf-8') as csvfile:
         reader = csv.reader(csvfile)
         
-        for row_number, row in enumerate(reader, start=1):
+        for row in reader:
             if not row or not any(row): # Skip empty rows
                 continue
 
-            first_cell_value = row[0].strip()
+            name = row[0].strip()
 
             # Check if this row defines a new section
-            if first_cell_value in section_titles:
-                current_section = section_map[first_cell_value]
-                # print(f"Switched to section: {current_section} (from '{first_cell_value}')")
+            if name in section_map:
+                current_section = section_map[name]
+                plan = ColumnPlan(SECTION_COLUMNS[current_section], row)
                 continue
 
-            if not current_section:
-                # print(f"Skipping row {row_number} as no section is currently active: {row}")
-                continue
-            
-            # Skip rows where the name is empty or matches the section title (often sub-headers)
-            if not first_cell_value or \
-               (first_cell_value == "Potions" and current_section == "Potion") or \
-               (first_cell_value == "Special Consumable" and current_section == "Special Consumable") or \
-               (first_cell_value == "Food" and current_section == "Food") or \
-               (first_cell_value == "Raw Ingriedient" and current_section == "Material"):
+            if not current_section or not name:
                 continue
 
-            name = first_cell_value
-            item_obj: Union[Consumable, Material, None] = None
-
-            try:
-                if current_section == "Potion":
-                    # Potions: name (col 0), (empty col 1), effect_notes (col 2)
-                    if len(row) < 3: continue # Ensure enough columns
-                    effect_notes = row[2].strip()
-                    item_obj = Consumable(
-                        name=name,
-                        description=effect_notes if effect_notes else f"A standard {name}.", # Default desc if notes empty
-                        category="Potion",
-                        effect_description=effect_notes,
-                        rarity="Common" # Default rarity for potions as per spec
-                    )
-                elif current_section == "Special Consumable":
-                    # Special Consumable: name (col 0), rarity (col 1), (empty col 2), effect_notes (col 3)
-                    if len(row) < 4: continue
-                    rarity = row[1].strip() if row[1].strip() else "Common" # Default if rarity empty
-                    effect_notes = row[3].strip()
-                    item_obj = Consumable(
-                        name=name,
-                        description=effect_notes if effect_notes else f"A special consumable: {name}.",
-                        category="Special Consumable",
-                        effect_description=effect_notes,
-                        rarity=rarity
-                    )
-                elif current_section == "Food":
-                    # Food: name (col 0), rarity (col 1), effect (col 2), recipe (col 3)
-                    if len(row) < 4: continue
-                    rarity = row[1].strip() if row[1].strip() else "Common"
-                    effect = row[2].strip()
-                    recipe = row[3].strip() # Can be empty
-                    item_obj = Consumable(
-                        name=name,
-                        description=effect if effect else f"A type of food: {name}.",
-                        category="Food",
-                        effect_description=effect,
-                        rarity=rarity,
-                        recipe=recipe
-                    )
-                elif current_section == "Material":
-                    # Raw Ingriedient (Material): name (col 0), rarity (col 1)
-                    if len(row) < 2: continue
-                    rarity = row[1].strip() if row[1].strip() else "Common"
-                    item_obj = Material(
-                        name=name,
-                        description=f"{rarity} crafting material: {name}.", # Generic description
-                        rarity=rarity
-                    )
-                
-                if item_obj:
-                    items[name] = item_obj
-
-            except IndexError:
-                # print(f"Warning: Skipping row {row_number} for item '{name}' in section '{current_section}' due to IndexError. Row data: {row}")
-                continue
-            except Exception as e:
-                # print(f"Warning: An unexpected error occurred while processing row {row_number} for item '{name}' in section '{current_section}': {e}. Row data: {row}")
-                continue
-                
-    return items
+            fields = plan.read(row)
+            rarity = fields.get("rarity") or "Common" # Default if rarity empty (potions have none)
+            item_obj: Union[Consumable, Material]
+            if current_section == "Potion":
+                effect_notes = fields["effect_notes"]
+                item_obj = Consumable(
+                    name=name,
+                    description=effect_notes if effect_notes else f"A standard {name}.", # Default desc if notes empty
+                    category="Potion",
+                    effect_description=effect_notes,
+                    rarity=rarity
+                )
+            elif current_section == "Special Consumable":
+                effect_notes = fields["effect_notes"]
+                item_obj = Consumable(
+                    name=name,
+                    description=effect_notes if effect_notes else f"A special consumable: {name}.",
+                    category="Special Consumable",
+                    effect_description=effect_notes,
+                    rarity=rarity
+                )
+            elif current_section == "Food":
+                effect = fields["effect"]
+                item_obj = Consumable(
+                    name=name,
+                    description=effect if effect else f"A type of food: {name}.",
+                    category="Food",
+                    effect_description=effect,
+                    rarity=rarity,
+                    recipe=fields["recipe"] # Can be empty
+                )
+            else: # Material
+                item_obj = Material(
+                    name=name,
+                    description=f"{rarity} crafting material: {name}.", # Generic description
+                    rarity=rarity
+                )
+            yield item_obj
+
+
+def load_consumables_and_materials_from_csv(file_path: str) -> Dict[str, 'Item']:
+    """
+    Loads consumables and materials data from a CSV file.
+    The sheet is read with iter_consumables_and_materials.
+    """
+    return {item.name: item for item in iter_consumables_and_materials(file_path)}
 
 
 if __name__ == '__main__':
@@ -328,14 +296,17 @@ if __name__ == '__main__':
     print("\nConsumables and materials loading test finished.")
 
 
-def load_weapons_from_csv(file_path: str) -> Dict[str, 'Weapon']:
+def iter_weapons(file_path: str) -> Iterator['Weapon']:
     """
-    Loads weapon data from a CSV file.
-    The CSV has sections like "Swords Level 1-50", each with its own header row.
+    Streams the Weapon objects of a CSV file in sheet order, holding only the
+    current row in memory.
+    The CSV has sections like "Swords Level 1-50". A section's column header is either
+    its title row or the row right after it; title-only sections without a header
+    keep the columns of the section before them (see WEAPON_COLUMNS).
     """
-    weapons: Dict[str, Weapon] = {}
     current_weapon_category: Union[str, None] = None
-    skip_next_row_as_header: bool = False
+    plan = ColumnPlan(WEAPON_COLUMNS)
+    expect_header: bool = False
 
     weapon_category_keywords = {
         "Swords": "Sword", "Daggers": "Dagger", "Axes": "Axe",
@@ -348,100 +319,49 @@ def load_weapons_from_csv(file_path: str) -> Dict[str, 'Weapon']:
     with open(file_path, mode='r', encoding='utf-8') as csvfile:
         reader = csv.reader(csvfile)
         
-        for row_number, row in enumerate(reader, start=1):
-            if not row or not any(field.strip() for field in row): # Skip fully empty or whitespace-only rows
+        for row in reader:
+            if not any(field.strip() for field in row): # Skip empty and separator rows like ",,,,,,,,,,,"
                 continue
             
-            # Check for separator rows like ",,,,,,,,,,,"
-            if all(not field.strip() for field in row):
-                # print(f"Skipping separator row {row_number}")
-                continue
-
-            first_cell_value = row[0].strip()
+            name = row[0].strip()
 
             # Identify weapon category section headers
-            identified_category = False
-            for keyword, category_name in weapon_category_keywords.items():
-                if first_cell_value.startswith(keyword):
-                    current_weapon_category = category_name
-                    skip_next_row_as_header = True # The row after this is the actual column header
-                    # print(f"Switched to weapon category: {current_weapon_category} (from '{first_cell_value}') at row {row_number}")
-                    identified_category = True
-                    break
-            
-            if identified_category:
-                continue # Skip the category defining row itself
-
-            if skip_next_row_as_header:
-                skip_next_row_as_header = False # This row is the column header, skip it
-                # print(f"Skipping column header row {row_number} for category {current_weapon_category}")
+            category = next((category_name for keyword, category_name in weapon_category_keywords.items()
+                             if name.startswith(keyword)), None)
+            if category:
+                current_weapon_category = category
+                expect_header = not is_header_row(row, WEAPON_COLUMNS)
+                if not expect_header:
+                    plan = ColumnPlan(WEAPON_COLUMNS, row)
                 continue
 
-            if not current_weapon_category:
-                # print(f"Skipping row {row_number} as no weapon category is active: {row}")
-                continue
+            if expect_header:
+                expect_header = False
+                if is_header_row(row, WEAPON_COLUMNS):
+                    plan = ColumnPlan(WEAPON_COLUMNS, row)
+                    continue
 
-            # At this point, we should be processing actual weapon data rows
-            name = first_cell_value
-            if not name: # Skip if name is empty
-                # print(f"Skipping row {row_number} due to empty weapon name in category {current_weapon_category}.")
+            if not current_weapon_category or not name:
                 continue
 
-            # Defensive check for row length
-            if len(row) < 15: # Expecting up to at least column index 14 (Extra Increases)
-                # print(f"Skipping row {row_number} for '{name}' due to insufficient columns ({len(row)}). Data: {row}")
-                continue
+            fields = plan.read(row)
+            tier, level_range = fields["tier"], fields.pop("level_range")
+            description = f"{tier} {current_weapon_category} (Lvl: {level_range})." if tier and level_range else f"{tier} {current_weapon_category}."
+            yield Weapon(
+                name=name,
+                description=description,
+                equip_type="Main Hand", # Default as per subtask
+                weapon_category=current_weapon_category,
+                **fields
+            )
 
-            try:
-                level_range = row[1].strip()
-                source = row[2].strip()
-                tier = row[3].strip()
-                attack_type = row[4].strip()
-
-                attack_bonus = _to_int(row[5])
-                defense_bonus = _to_int(row[6])
-                magic_attack_bonus = _to_int(row[7])
-                magic_defense_bonus = _to_int(row[8])
-                agility_bonus = _to_int(row[9])
-                luck_bonus = _to_int(row[10])
-                max_hp_bonus = _to_int(row[11])
-                max_mp_bonus = _to_int(row[12])
-                
-                recipe = row[13].strip()
-                extra_increases = row[14].strip()
-
-                description = f"{tier} {current_weapon_category} (Lvl: {level_range})." if tier and level_range else f"{tier} {current_weapon_category}."
-                equip_type = "Main Hand" # Default as per subtask
-
-                weapon_obj = Weapon(
-                    name=name,
-                    description=description,
-                    tier=tier,
-                    equip_type=equip_type,
-                    attack_type=attack_type,
-                    weapon_category=current_weapon_category,
-                    attack_bonus=attack_bonus,
-                    defense_bonus=defense_bonus,
-                    magic_attack_bonus=magic_attack_bonus,
-                    magic_defense_bonus=magic_defense_bonus,
-                    agility_bonus=agility_bonus,
-                    luck_bonus=luck_bonus,
-                    max_hp_bonus=max_hp_bonus,
-                    max_mp_bonus=max_mp_bonus,
-                    extra_increases=extra_increases,
-                    recipe=recipe,
-                    source=source
-                )
-                weapons[name] = weapon_obj
-            
-            except IndexError:
-                # print(f"Warning: Skipping row {row_number} for weapon '{name}' due to IndexError. Row data: {row}")
-                continue
-            except Exception as e:
-                # print(f"Warning: An unexpected error occurred while processing row {row_number} for weapon '{name}': {e}. Row data: {row}")
-                continue
-                
-    return weapons
+
+def load_weapons_from_csv(file_path: str) -> Dict[str, 'Weapon']:
+    """
+    Loads weapon data from a CSV file.
+    The sheet is read with iter_weapons.
+    """
+    return {weapon.name: weapon for weapon in iter_weapons(file_path)}
 
 
 if __name__ == '__main__':
@@ -0,0 +1,202 @@
+import re
+from collections import ChainMap
+from typing import Dict, Generic, Iterable, List, Mapping, NamedTuple, Optional, Set, Tuple, TypeVar
+
+try:
+    from rpg_game.utils.output import emit
+except ImportError: # Fallback when 'data' and 'utils' are top-level packages
+    import sys
+    import os
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    from utils.output import emit
+
+
+T = TypeVar("T")
+
+# Cell values the sheets use for "nothing here"; they are not references.
+PLACEHOLDER_KEYS = frozenset({"", "null", "none", "none yet", "n a", "na", "tbd"})
+
+_APOSTROPHES = re.compile(r"['’`]")
+_NON_ALNUM = re.compile(r"[\W_]+")
+
+
+def normalize_name(name: str) -> str:
+    """
+    Returns the lookup key for a name: casefolded, apostrophes dropped, any other
+    punctuation treated as a space and runs of whitespace collapsed.
+
+    "Washling sap", "Washling Sap " and "washling-sap" all map to "washling sap".
+    """
+    return _NON_ALNUM.sub(" ", _APOSTROPHES.sub("", name.casefold())).strip()
+
+
+def _trigrams(key: str) -> Set[str]:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex(Generic[T]):
+    """
+    Resolves the names written in the sheets to loaded entities.
+
+    Exact names and normalized keys are plain dict lookups. A trigram index over the
+    keys is only built the first time a suggestion for an unresolved name is needed.
+    """
+    def __init__(self, entities: Mapping[str, T]):
+        """
+        Initializes the index.
+
+        Args:
+            entities: The canonical entities by name.
+        """
+        self.entities: Mapping[str, T] = entities
+        self._by_key: Mapping[str, str] = {}
+        for name in entities:
+            self._by_key.setdefault(normalize_name(name), name) # First sheet row wins on collisions
+        self._trigram_index: Optional[Dict[str, List[str]]] = None
+        self._trigram_counts: Dict[str, int] = {}
+        self._suggestions: Dict[Tuple[str, int, float], List[str]] = {} # The same miss often repeats across rows
+
+    def overlay(self, entities: Mapping[str, T], added_names: Iterable[str]) -> "NameIndex[T]":
+        """
+        Returns an index over `entities`, a layered view of this index's entities,
+        that shares this index's keys and adds those of `added_names`. Costs
+        O(len(added_names)); keys of names the view removed resolve to nothing.
+        """
+        index: NameIndex[T] = NameIndex({})
+        index.entities = entities
+        if isinstance(self._by_key, ChainMap): # Fork the layer instead of stacking another one
+            index._by_key = ChainMap(dict(self._by_key.maps[0]), *self._by_key.maps[1:])
+        else:
+            index._by_key = ChainMap({}, self._by_key)
+        for name in added_names:
+            index._by_key.setdefault(normalize_name(name), name)
+        return index
+
+    def canonical_name(self, name: str) -> Optional[str]:
+        """Returns the canonical name a reference means, or None if nothing matches."""
+        if name in self.entities:
+            return name
+        canonical = self._by_key.get(normalize_name(name))
+        return canonical if canonical is not None and canonical in self.entities else None
+
+    def resolve(self, name: str) -> Optional[T]:
+        """Returns the entity a reference means, or None if nothing matches."""
+        entity = self.entities.get(name)
+        if entity is not None:
+            return entity
+        canonical = self._by_key.get(normalize_name(name))
+        return self.entities.get(canonical) if canonical is not None else None
+
+    def suggest(self, name: str, limit: int = 3, min_similarity: float = 0.4) -> List[str]:
+        """
+        Returns up to `limit` canonical names that look like `name`, best first.
+
+        Similarity is the Jaccard index of the normalized keys' character trigrams.
+        """
+        query = normalize_name(name)
+        memo_key = (query, limit, min_similarity)
+        cached = self._suggestions.get(memo_key)
+        if cached is not None:
+            return list(cached)
+
+        if self._trigram_index is None:
+            self._trigram_index = {}
+            for key in self._by_key:
+                key_grams = _trigrams(key)
+                self._trigram_counts[key] = len(key_grams)
+                for gram in key_grams:
+                    self._trigram_index.setdefault(gram, []).append(key)
+
+        grams = _trigrams(query)
+        shared: Dict[str, int] = {}
+        for gram in grams:
+            for key in self._trigram_index.get(gram, ()):
+                shared[key] = shared.get(key, 0) + 1
+
+        scored = []
+        counts = self._trigram_counts
+        for key, common in shared.items():
+            similarity = common / (len(grams) + counts[key] - common)
+            if similarity >= min_similarity:
+                scored.append((-similarity, key))
+        scored.sort()
+        suggestions = [self._by_key[key] for _, key in scored[:limit]]
+        self._suggestions[memo_key] = suggestions
+        return list(suggestions)
+
+
+def is_placeholder(name: str) -> bool:
+    """True for cells such as "NULL" or "None yet" that stand for no reference."""
+    return normalize_name(name) in PLACEHOLDER_KEYS
+
+
+class UnresolvedReference(NamedTuple):
+    """A name in one sheet that matched nothing in another."""
+    kind: str # e.g. "Skill", "Loot item"
+    name: str
+    owner: str # The row that made the reference
+    suggestions: List[str]
+
+
+class ResolutionReport:
+    """
+    Collects unresolved references during a load so they can be reported once,
+    instead of as one warning per cell.
+    """
+    def __init__(self):
+        self.unresolved: List[UnresolvedReference] = []
+        self.resolved_count: int = 0
+        self.normalized_count: int = 0 # Resolved only after normalization
+
+    def add(self, kind: str, name: str, owner: str, index: NameIndex) -> None:
+        """Records an unresolved reference along with near-miss suggestions."""
+        self.unresolved.append(UnresolvedReference(kind, name, owner, index.suggest(name)))
+
+    def lines(self) -> List[str]:
+        """Returns the report as text lines."""
+        lines = [f"Reference linking: {self.resolved_count} resolved "
+                 f"({self.normalized_count} after normalizing names), {len(self.unresolved)} unresolved."]
+        for ref in self.unresolved:
+            hint = f" Did you mean: {', '.join(ref.suggestions)}?" if ref.suggestions else ""
+            lines.append(f"  {ref.kind} '{ref.name}' (used by '{ref.owner}') not found.{hint}")
+        return lines
+
+    def emit(self) -> None:
+        """Emits the whole report as one event."""
+        kind = "warning" if self.unresolved else "load"
+        emit("\n".join(self.lines()), kind, unresolved=len(self.unresolved))
+
+    def __len__(self) -> int:
+        return len(self.unresolved)
+
+
+def link_references(names: List[str], index: NameIndex[T], kind: str, owner: str,
+                    report: ResolutionReport) -> List[T]:
+    """
+    Resolves the names listed in one cell, recording misses in the report.
+
+    Args:
+        names: The referenced names, already split and stripped.
+        index: The index of the sheet the names refer to.
+        kind: What is referenced, for the report (e.g. "Skill").
+        owner: The name of the row making the references.
+        report: Collects unresolved references and link counts.
+
+    Returns:
+        The resolved entities, in cell order.
+    """
+    resolved: List[T] = []
+    for name in names:
+        entity = index.entities.get(name)
+        if entity is None:
+            if is_placeholder(name):
+                continue
+            entity = index.resolve(name)
+            if entity is None:
+                report.add(kind, name, owner, index)
+                continue
+            report.normalized_count += 1
+        report.resolved_count += 1
+        resolved.append(entity)
+    return resolved
@@ -0,0 +1,159 @@
+import csv
+import os
+from typing import Dict, Iterator, List, Mapping, MutableMapping, Set, TypeVar
+
+try:
+    from .columns import Column, ColumnPlan
+    from .name_index import normalize_name
+    from ..utils.output import emit
+except ImportError: # Fallback when 'data' is a top-level package
+    from data.columns import Column, ColumnPlan
+    from data.name_index import normalize_name
+    from utils.output import emit
+
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+# The sheet of an overlay directory that lists the records the overlay removes.
+DELETIONS_FILE = "Deleted Records.csv"
+
+# The collections a deletion may name; "items" removes an item of any kind.
+DELETABLE_COLLECTIONS = ("enemies", "zones", "skills", "status_effects",
+                         "equipment", "consumables", "materials", "weapons", "items")
+
+DELETION_COLUMNS = (
+    Column("collection", ("Data", "Collection"), 0),
+    Column("name", ("Name",), 1),
+)
+
+
+class OverlayDict(MutableMapping[K, V]):
+    """
+    A copy-on-write dictionary layered over a shared base mapping.
+
+    Writes and deletions are recorded in the layer and never reach the base, so
+    any number of layers can share one base snapshot. Lookups, writes and
+    deletions are O(1); iteration yields the base keys in base order, then the
+    keys the layer adds.
+
+    Values are replaced, not mutated in place: a layer shares its values with the
+    base and with the layers forked from it.
+    """
+    def __init__(self, base: Mapping[K, V]):
+        """
+        Initializes an empty layer.
+
+        Args:
+            base: The shared mapping; it must not change while layers use it.
+        """
+        self.base: Mapping[K, V] = base
+        self._changes: Dict[K, V] = {} # Keys the layer adds or replaces
+        self._deleted: Set[K] = set() # Base keys the layer removes
+        self._added: int = 0 # Keys in _changes that are not in the base
+
+    def fork(self) -> "OverlayDict[K, V]":
+        """Returns an independent layer over the same base with this layer's changes."""
+        layer = OverlayDict(self.base)
+        layer._changes = dict(self._changes)
+        layer._deleted = set(self._deleted)
+        layer._added = self._added
+        return layer
+
+    def is_layered(self, key: K) -> bool:
+        """Returns whether the layer adds, replaces or removes a key."""
+        return key in self._changes or key in self._deleted
+
+    def __getitem__(self, key: K) -> V:
+        if key in self._changes:
+            return self._changes[key]
+        if key in self._deleted:
+            raise KeyError(key)
+        return self.base[key]
+
+    def get(self, key, default=None):
+        if key in self._changes:
+            return self._changes[key]
+        if key in self._deleted:
+            return default
+        return self.base.get(key, default)
+
+    def __contains__(self, key) -> bool:
+        return key in self._changes or (key not in self._deleted and key in self.base)
+
+    def __setitem__(self, key: K, value: V) -> None:
+        if key not in self._changes:
+            if key in self._deleted:
+                self._deleted.discard(key)
+            elif key not in self.base:
+                self._added += 1
+        self._changes[key] = value
+
+    def __delitem__(self, key: K) -> None:
+        if key in self._changes:
+            del self._changes[key]
+            if key in self.base:
+                self._deleted.add(key)
+            else:
+                self._added -= 1
+        elif key in self.base and key not in self._deleted:
+            self._deleted.add(key)
+        else:
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[K]:
+        deleted = self._deleted
+        for key in self.base:
+            if key not in deleted:
+                yield key
+        base = self.base
+        for key in self._changes:
+            if key not in base:
+                yield key
+
+    def __len__(self) -> int:
+        return len(self.base) - len(self._deleted) + self._added
+
+    def __repr__(self) -> str:
+        return (f"OverlayDict({len(self)} keys: {len(self._changes)} layered, "
+                f"{len(self._deleted)} deleted over {len(self.base)})")
+
+
+def layered(mapping: Mapping[K, V]) -> OverlayDict[K, V]:
+    """
+    Returns a new copy-on-write layer over a mapping. A layer is forked rather
+    than stacked, so lookups never go through more than one layer.
+    """
+    if isinstance(mapping, OverlayDict):
+        return mapping.fork()
+    return OverlayDict(mapping)
+
+
+def read_deletions(file_path: str) -> Dict[str, List[str]]:
+    """
+    Reads the deletion sheet of an overlay: one row per removed record, giving the
+    collection it belongs to (see DELETABLE_COLLECTIONS) and its name.
+
+    Returns:
+        The removed names by collection, in sheet order; empty if the file does not exist.
+    """
+    deletions: Dict[str, List[str]] = {}
+    if not os.path.exists(file_path):
+        return deletions
+    collections = {normalize_name(collection): collection for collection in DELETABLE_COLLECTIONS}
+    collections.update({normalize_name(collection.replace("_", " ")): collection for collection in DELETABLE_COLLECTIONS})
+
+    with open(file_path, mode='r', encoding='utf-8') as csvfile:
+        reader = csv.reader(csvfile)
+        plan = ColumnPlan(DELETION_COLUMNS, next(reader, []))
+        for row_number, row in enumerate(reader, start=2):
+            if not any(cell.strip() for cell in row):
+                continue
+            fields = plan.read(row)
+            collection = collections.get(normalize_name(fields["collection"]))
+            if collection is None or not fields["name"]:
+                emit(f"Warning: Skipping deletion at line {row_number} of '{file_path}': "
+                     f"unknown data '{fields['collection']}' or empty name.", "warning")
+                continue
+            deletions.setdefault(collection, []).append(fields["name"])
+    return deletions
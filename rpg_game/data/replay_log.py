@@ -0,0 +1,465 @@
+import argparse
+import bisect
+import mmap
+import os
+import queue
+import struct
+import threading
+import zlib
+from array import array
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    from rpg_game.core.fight_state import ENEMY_ACTION, PLAYER_ACTION, RNG_POSITION, TURN, FightState
+except ImportError: # Fallback when 'data' and 'core' are top-level packages (e.g. from Game.py)
+    import sys
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    from core.fight_state import ENEMY_ACTION, PLAYER_ACTION, RNG_POSITION, TURN, FightState
+
+
+# File layout: a header, then zlib-compressed blocks of records, then (on a clean
+# close) a compressed index of block offsets and keyframes and a fixed footer.
+# Records inside a block are (kind, payload length) + payload. A fight starts with a
+# FIGHT record holding its full initial state; every turn is a TURN record holding the
+# actions, the number of RNG draws and the changed state slots, and every
+# keyframe_interval turns a KEYFRAME record holds the full state again.
+REPLAY_MAGIC = b"RPGRPLY"
+REPLAY_VERSION = 1
+RECORD_FIGHT = 1
+RECORD_TURN = 2
+RECORD_KEYFRAME = 3
+RECORD_END = 4
+# Action IDs: skill IDs from the game data, or one of these
+ACTION_ATTACK = -1
+ACTION_UNKNOWN = -2
+
+_HEADER = struct.Struct(f"<{len(REPLAY_MAGIC)}sBI")
+_BLOCK = struct.Struct("<III") # raw length, compressed length, crc32 of the compressed bytes
+_RECORD = struct.Struct("<BH")
+_FIGHT = struct.Struct("<IQiHHH") # fight id, seed, enemy id, player actions, enemy actions, state size
+_TURN = struct.Struct("<IIhhHH") # fight id, turn, player action, enemy action, RNG draws, changed slots
+_DELTA = struct.Struct("<Hi")
+_KEYFRAME = struct.Struct("<IIH")
+_END = struct.Struct("<II?")
+_INDEX_COUNT = struct.Struct("<I")
+_KEYFRAME_ENTRY = struct.Struct("<IIII") # fight id, turn, block number, record offset in the block
+_FOOTER = struct.Struct("<QI4s")
+_FOOTER_MAGIC = b"RIDX"
+
+DEFAULT_BLOCK_SIZE = 64 * 1024
+
+
+def catalog_fingerprint(data_manager) -> int:
+    """Fingerprint of the enemy and skill IDs a replay refers to (0 without game data)."""
+    if data_manager is None:
+        return 0
+    return zlib.crc32(struct.pack("<II", data_manager.enemy_ids.fingerprint, data_manager.skill_ids.fingerprint))
+
+
+class FightInfo(NamedTuple):
+    fight_id: int
+    seed: int
+    enemy_id: int
+    player_name: str
+    player_actions: Tuple[int, ...] # Action IDs, indexed like FightSetup.player_actions
+    enemy_actions: Tuple[int, ...]
+    initial_state: Tuple[int, ...]
+
+
+class TurnRecord(NamedTuple):
+    turn: int
+    player_action: int # Index into FightInfo.player_actions
+    enemy_action: int # Index into FightInfo.enemy_actions, -1 if the enemy did not act
+    rng_draws: int
+    deltas: Tuple[Tuple[int, int], ...] # (state slot, new value)
+
+
+class FightRecording:
+    """
+    Records one fight into a ReplayWriter. Call turn() after every FightState.apply()
+    and end() when the fight is over.
+    """
+    def __init__(self, writer: "ReplayWriter", fight_id: int, state: FightState):
+        self.writer: "ReplayWriter" = writer
+        self.fight_id: int = fight_id
+        self._previous: array = array('q', state.values)
+
+    def turn(self, state: FightState) -> None:
+        values, previous = state.values, self._previous
+        deltas = [(slot, value) for slot, value in enumerate(values) if value != previous[slot]]
+        payload = bytearray(_TURN.pack(self.fight_id, values[TURN], values[PLAYER_ACTION], values[ENEMY_ACTION],
+                                       values[RNG_POSITION] - previous[RNG_POSITION], len(deltas)))
+        for delta in deltas:
+            payload += _DELTA.pack(*delta)
+        writer = self.writer
+        writer._append(RECORD_TURN, payload)
+        if values[TURN] % writer.keyframe_interval == 0:
+            writer._append_keyframe(self.fight_id, values[TURN], values)
+        self._previous = array('q', values)
+
+    def end(self, state: FightState) -> None:
+        self.writer._append(RECORD_END, _END.pack(self.fight_id, state.values[TURN], state.player_won()))
+
+
+class ReplayWriter:
+    """
+    Appends fights to a compressed replay log.
+
+    Records are packed on the calling thread into an in-memory block; full blocks
+    are compressed and written by a background thread, so recording a turn costs
+    about as much as packing a few integers.
+
+    Args:
+        path: The log file; an existing file is replaced.
+        data_manager: Optional GameDataManager whose enemy and skill IDs are recorded.
+        keyframe_interval: Turns between full-state keyframes.
+        block_size: Uncompressed bytes per compressed block.
+        level: zlib compression level.
+    """
+    def __init__(self, path: str, data_manager=None, keyframe_interval: int = 16,
+                 block_size: int = DEFAULT_BLOCK_SIZE, level: int = 6):
+        self.path: str = path
+        self.data_manager = data_manager
+        self.keyframe_interval: int = keyframe_interval
+        self.block_size: int = block_size
+        self.level: int = level
+        self._file = open(path, 'wb')
+        self._file.write(_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, catalog_fingerprint(data_manager)))
+        self._block = bytearray()
+        self._block_number: int = 0
+        self._block_offsets: List[int] = [] # Filled in by the writer thread
+        self._keyframes: List[Tuple[int, int, int, int]] = []
+        self._next_fight_id: int = 0
+        self._error: Optional[BaseException] = None
+        self._queue: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=16)
+        self._thread = threading.Thread(target=self._write_blocks, name="replay-writer", daemon=True)
+        self._thread.start()
+
+    def _write_blocks(self) -> None:
+        while True:
+            raw = self._queue.get()
+            if raw is None:
+                return
+            if self._error is not None:
+                continue
+            try:
+                compressed = zlib.compress(raw, self.level)
+                self._block_offsets.append(self._file.tell())
+                self._file.write(_BLOCK.pack(len(raw), len(compressed), zlib.crc32(compressed)))
+                self._file.write(compressed)
+            except BaseException as e: # Reported by close()
+                self._error = e
+
+    def _append(self, kind: int, payload: bytes) -> None:
+        self._block += _RECORD.pack(kind, len(payload))
+        self._block += payload
+        if len(self._block) >= self.block_size:
+            self._flush_block()
+
+    def _append_keyframe(self, fight_id: int, turn: int, values: Sequence[int]) -> None:
+        self._keyframes.append((fight_id, turn, self._block_number, len(self._block)))
+        self._append(RECORD_KEYFRAME, _KEYFRAME.pack(fight_id, turn, len(values)) + _pack_values(values))
+
+    def _flush_block(self) -> None:
+        if self._block:
+            self._queue.put(bytes(self._block))
+            self._block = bytearray()
+            self._block_number += 1
+
+    def _action_id(self, action) -> int:
+        if action.skill is None:
+            return ACTION_ATTACK
+        if self.data_manager is None:
+            return ACTION_UNKNOWN
+        return self.data_manager.skill_ids.get_id(action.name, ACTION_UNKNOWN)
+
+    def begin(self, state: FightState, player_name: str = "") -> FightRecording:
+        """Starts recording a fight from its initial state. Returns the recording to feed turns to."""
+        fight_id = self._next_fight_id
+        self._next_fight_id += 1
+        setup = state.setup
+        enemy_id = -1
+        if self.data_manager is not None:
+            enemy_id = self.data_manager.enemy_ids.get_id(setup.enemy.name, -1)
+        player_actions = [self._action_id(action) for action in setup.player_actions]
+        enemy_actions = [self._action_id(action) for action in setup.enemy_actions]
+        self._keyframes.append((fight_id, state.values[TURN], self._block_number, len(self._block)))
+        self._append(RECORD_FIGHT,
+                     _FIGHT.pack(fight_id, state.seed, enemy_id, len(player_actions), len(enemy_actions),
+                                 len(state.values))
+                     + _pack_values(player_actions) + _pack_values(enemy_actions) + _pack_values(state.values)
+                     + (player_name or getattr(setup.player, 'name', "")).encode("utf-8"))
+        return FightRecording(self, fight_id, state)
+
+    def close(self) -> None:
+        """Writes the pending block and the index, and stops the writer thread."""
+        if self._file.closed:
+            return
+        self._flush_block()
+        self._queue.put(None)
+        self._thread.join()
+        try:
+            if self._error is not None:
+                raise IOError(f"Writing replay log {self.path} failed: {self._error}")
+            index = bytearray(_INDEX_COUNT.pack(len(self._block_offsets)))
+            index += struct.pack(f"<{len(self._block_offsets)}Q", *self._block_offsets)
+            index += _INDEX_COUNT.pack(len(self._keyframes))
+            for entry in self._keyframes:
+                index += _KEYFRAME_ENTRY.pack(*entry)
+            compressed = zlib.compress(bytes(index), self.level)
+            index_offset = self._file.tell()
+            self._file.write(compressed)
+            self._file.write(_FOOTER.pack(index_offset, len(compressed), _FOOTER_MAGIC))
+        finally:
+            self._file.close()
+
+    def __enter__(self) -> "ReplayWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _pack_values(values: Sequence[int]) -> bytes:
+    return struct.pack(f"<{len(values)}i", *values)
+
+
+def _unpack_values(buffer, offset: int, count: int) -> Tuple[Tuple[int, ...], int]:
+    end = offset + 4 * count
+    return struct.unpack_from(f"<{count}i", buffer, offset), end
+
+
+class ReplayReader:
+    """
+    Reads a replay log written by ReplayWriter.
+
+    state_at() decompresses only the block holding the nearest keyframe at or before
+    the requested turn (and the following blocks if the fight continues into them).
+    Logs without an index, e.g. from a crashed process, are scanned once on open and
+    a torn last block is ignored.
+
+    Args:
+        path: The log file.
+        data_manager: Optional GameDataManager used to name enemies and skills.
+
+    Raises:
+        ValueError: If the file is not a replay log, or if the data manager's IDs differ
+                    from the ones the log was written with.
+    """
+    def __init__(self, path: str, data_manager=None):
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < _HEADER.size:
+                raise ValueError(f"{path} is not a replay log.")
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, fingerprint = _HEADER.unpack_from(self._data, 0)
+        if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a replay log (or was written by an unsupported version).")
+        if data_manager is not None and fingerprint and fingerprint != catalog_fingerprint(data_manager):
+            self.close()
+            raise ValueError(f"{path} was recorded with different game data.")
+        self.data_manager = data_manager
+        self._block_offsets: List[int] = []
+        self._keyframes: Dict[int, List[Tuple[int, int, int]]] = {} # fight id -> [(turn, block, offset)]
+        self._cached_block: Tuple[int, bytes] = (-1, b"")
+        if not self._read_index():
+            self._scan()
+
+    def close(self) -> None:
+        self._data.close()
+
+    def __enter__(self) -> "ReplayReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _read_index(self) -> bool:
+        data = self._data
+        if len(data) < _HEADER.size + _FOOTER.size:
+            return False
+        index_offset, index_length, magic = _FOOTER.unpack_from(data, len(data) - _FOOTER.size)
+        if magic != _FOOTER_MAGIC or index_offset + index_length != len(data) - _FOOTER.size:
+            return False
+        index = zlib.decompress(data[index_offset:index_offset + index_length])
+        (blocks,) = _INDEX_COUNT.unpack_from(index, 0)
+        self._block_offsets = list(struct.unpack_from(f"<{blocks}Q", index, _INDEX_COUNT.size))
+        offset = _INDEX_COUNT.size + 8 * blocks
+        (count,) = _INDEX_COUNT.unpack_from(index, offset)
+        offset += _INDEX_COUNT.size
+        for _ in range(count):
+            fight_id, turn, block, record_offset = _KEYFRAME_ENTRY.unpack_from(index, offset)
+            self._keyframes.setdefault(fight_id, []).append((turn, block, record_offset))
+            offset += _KEYFRAME_ENTRY.size
+        return True
+
+    def _scan(self) -> None:
+        data = self._data
+        offset = _HEADER.size
+        while offset + _BLOCK.size <= len(data):
+            raw_length, length, crc = _BLOCK.unpack_from(data, offset)
+            body = data[offset + _BLOCK.size:offset + _BLOCK.size + length]
+            if len(body) < length or zlib.crc32(body) != crc:
+                break # Torn or corrupt tail
+            block = len(self._block_offsets)
+            self._block_offsets.append(offset)
+            for kind, payload_offset, record_offset, raw in _records(zlib.decompress(body)):
+                if kind == RECORD_FIGHT or kind == RECORD_KEYFRAME:
+                    fight_id = struct.unpack_from("<I", raw, payload_offset)[0]
+                    turn = 0 if kind == RECORD_FIGHT else _KEYFRAME.unpack_from(raw, payload_offset)[1]
+                    self._keyframes.setdefault(fight_id, []).append((turn, block, record_offset))
+            offset += _BLOCK.size + length
+
+    def _block(self, block: int) -> Optional[bytes]:
+        if self._cached_block[0] == block:
+            return self._cached_block[1]
+        if block >= len(self._block_offsets):
+            return None
+        offset = self._block_offsets[block]
+        _, length, crc = _BLOCK.unpack_from(self._data, offset)
+        body = self._data[offset + _BLOCK.size:offset + _BLOCK.size + length]
+        if len(body) < length or zlib.crc32(body) != crc:
+            return None
+        raw = zlib.decompress(body)
+        self._cached_block = (block, raw)
+        return raw
+
+    def _records_from(self, block: int, record_offset: int) -> Iterator[Tuple[int, int, bytes]]:
+        # Yields (kind, payload offset, block bytes) from a position to the end of the log
+        while True:
+            raw = self._block(block)
+            if raw is None:
+                return
+            for kind, payload_offset, offset, _ in _records(raw, record_offset):
+                yield kind, payload_offset, raw
+            block += 1
+            record_offset = 0
+
+    def fight_ids(self) -> List[int]:
+        return sorted(self._keyframes)
+
+    def _keyframe_list(self, fight_id: int) -> List[Tuple[int, int, int]]:
+        if fight_id not in self._keyframes:
+            raise KeyError(f"No fight {fight_id} in the replay log.")
+        return self._keyframes[fight_id]
+
+    def fight(self, fight_id: int) -> FightInfo:
+        """Returns the FIGHT record of a fight."""
+        _, block, offset = self._keyframe_list(fight_id)[0]
+        _, payload_offset, raw = next(self._records_from(block, offset))
+        return _decode_fight(raw, payload_offset)
+
+    def turns(self, fight_id: int, after: int = 0) -> Iterator[TurnRecord]:
+        """Yields the turns of a fight after turn `after`, in order, from the nearest keyframe on."""
+        for record in self._replay(fight_id, after, None):
+            yield record
+
+    def state_at(self, fight_id: int, turn: int) -> Tuple[int, ...]:
+        """
+        Returns FightState.values after `turn` rounds of a fight.
+
+        Raises:
+            KeyError: If the fight is not in the log.
+            ValueError: If the fight ended (or the log stops) before that turn.
+        """
+        keyframes = self._keyframe_list(fight_id)
+        position = bisect.bisect_right(keyframes, (turn, float("inf"), float("inf"))) - 1
+        if position < 0:
+            raise ValueError(f"Fight {fight_id} has no turn {turn}.")
+        keyframe_turn, block, offset = keyframes[position]
+        values: List[int] = []
+        for kind, payload_offset, raw in self._records_from(block, offset):
+            if kind == RECORD_FIGHT:
+                info = _decode_fight(raw, payload_offset)
+                if info.fight_id == fight_id:
+                    values = list(info.initial_state)
+                    break
+            elif kind == RECORD_KEYFRAME:
+                record_fight, _, size = _KEYFRAME.unpack_from(raw, payload_offset)
+                if record_fight == fight_id:
+                    values = list(_unpack_values(raw, payload_offset + _KEYFRAME.size, size)[0])
+                    break
+        if keyframe_turn == turn:
+            return tuple(values)
+        for record in self._replay(fight_id, keyframe_turn, (block, offset)):
+            for slot, value in record.deltas:
+                values[slot] = value
+            if record.turn == turn:
+                return tuple(values)
+        raise ValueError(f"Fight {fight_id} has no turn {turn}.")
+
+    def _replay(self, fight_id: int, after: int, start: Optional[Tuple[int, int]]) -> Iterator[TurnRecord]:
+        if start is None:
+            keyframes = self._keyframe_list(fight_id)
+            position = bisect.bisect_right(keyframes, (after, float("inf"), float("inf"))) - 1
+            start = keyframes[max(position, 0)][1:]
+        for kind, payload_offset, raw in self._records_from(*start):
+            if kind == RECORD_TURN:
+                record_fight, turn, player_action, enemy_action, draws, changed = _TURN.unpack_from(raw, payload_offset)
+                if record_fight != fight_id or turn <= after:
+                    continue
+                offset = payload_offset + _TURN.size
+                deltas = tuple(_DELTA.unpack_from(raw, offset + i * _DELTA.size) for i in range(changed))
+                yield TurnRecord(turn, player_action, enemy_action, draws, deltas)
+            elif kind == RECORD_END and struct.unpack_from("<I", raw, payload_offset)[0] == fight_id:
+                return
+
+    def action_name(self, action_id: int) -> str:
+        """Returns a readable name for an action ID."""
+        if action_id == ACTION_ATTACK:
+            return "Attack"
+        if action_id >= 0 and self.data_manager is not None and action_id < len(self.data_manager.skill_ids):
+            return self.data_manager.skill_ids.name_of(action_id)
+        return f"skill #{action_id}" if action_id >= 0 else "unknown skill"
+
+
+def _records(raw: bytes, offset: int = 0) -> Iterator[Tuple[int, int, int, bytes]]:
+    # Yields (kind, payload offset, record offset, block bytes)
+    while offset + _RECORD.size <= len(raw):
+        kind, length = _RECORD.unpack_from(raw, offset)
+        yield kind, offset + _RECORD.size, offset, raw
+        offset += _RECORD.size + length
+
+
+def _decode_fight(raw: bytes, offset: int) -> FightInfo:
+    end = offset + _RECORD.unpack_from(raw, offset - _RECORD.size)[1]
+    fight_id, seed, enemy_id, player_count, enemy_count, size = _FIGHT.unpack_from(raw, offset)
+    offset += _FIGHT.size
+    player_actions, offset = _unpack_values(raw, offset, player_count)
+    enemy_actions, offset = _unpack_values(raw, offset, enemy_count)
+    initial_state, offset = _unpack_values(raw, offset, size)
+    return FightInfo(fight_id, seed, enemy_id, raw[offset:end].decode("utf-8"), player_actions, enemy_actions,
+                     initial_state)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Inspect a combat replay log.")
+    parser.add_argument("path")
+    parser.add_argument("--fight", type=int, help="Fight to show; lists the fights if omitted.")
+    parser.add_argument("--turn", type=int, help="Show the state after this turn instead of every turn.")
+    args = parser.parse_args(argv)
+
+    with ReplayReader(args.path) as reader:
+        _print_replay(reader, args.fight, args.turn)
+
+
+def _print_replay(reader: ReplayReader, fight_id: Optional[int], turn: Optional[int]) -> None:
+    if fight_id is None:
+        for fight_id in reader.fight_ids():
+            info = reader.fight(fight_id)
+            print(f"fight {fight_id}: {info.player_name or '?'} vs enemy #{info.enemy_id}, seed {info.seed}")
+        return
+    info = reader.fight(fight_id)
+    if turn is not None:
+        print(f"turn {turn}: {list(reader.state_at(fight_id, turn))}")
+        return
+    print(f"turn 0: {list(info.initial_state)}")
+    for record in reader.turns(fight_id):
+        player_action = reader.action_name(info.player_actions[record.player_action])
+        enemy_action = reader.action_name(info.enemy_actions[record.enemy_action]) if record.enemy_action >= 0 else "-"
+        print(f"turn {record.turn}: {player_action} / {enemy_action}, {record.rng_draws} draws, "
+              f"changed {dict(record.deltas)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,365 @@
+import mmap
+import os
+import struct
+import zlib
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    from rpg_game.core.player import Player
+    from rpg_game.data.id_tables import IdTable
+except ImportError: # Fallback when 'data' and 'core' are top-level packages (e.g. from Game.py)
+    import sys
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    from core.player import Player
+    from data.id_tables import IdTable
+
+
+# File layout: a short header, a full record (a checkpoint of the whole player) and
+# the delta records appended since, each holding only what changed since the previous
+# record. Each record is (kind, payload length, payload crc32) + payload.
+# Item and skill IDs are stored as unsigned 32-bit integers, list lengths as 16-bit.
+SAVE_MAGIC = b"RPGSAVE"
+SAVE_VERSION = 3
+RECORD_FULL = 1
+RECORD_DELTA = 2
+
+# Primary stats are stored positionally in this order.
+PLAYER_STAT_ORDER = ("strength", "dexterity", "intelligence", "constitution", "luck")
+# Scalar fields of a snapshot, followed by the primary stats.
+SCALAR_FIELDS = ("level", "xp", "xp_to_next_level", "hp", "max_hp", "mp", "max_mp") + PLAYER_STAT_ORDER
+LIST_FIELDS = ("inventory", "known_abilities", "known_spells")
+
+_HEADER = struct.Struct(f"<{len(SAVE_MAGIC)}sB")
+_CATALOG = struct.Struct("<III") # Item IDs, skill IDs and their fingerprint when a checkpoint was written
+_RECORD = struct.Struct("<BII")
+_SCALARS = struct.Struct(f"<{len(SCALAR_FIELDS)}i")
+_U16 = struct.Struct("<H")
+_I32 = struct.Struct("<i")
+_LIST_EDIT = struct.Struct("<HH")
+MAX_LIST_LENGTH = 0xFFFF # Entries in an inventory or skill list
+
+# (scalars, inventory ids, ability ids, spell ids)
+Snapshot = Tuple[Tuple[int, ...], Tuple[int, ...], Tuple[int, ...], Tuple[int, ...]]
+
+
+class SaveCatalog:
+    """
+    Maps a player's items and skills to the integer IDs of a loaded GameDataManager.
+
+    Save files only store these IDs. Every checkpoint also records how many item
+    and skill IDs there were and their fingerprint; since IDs are append-only (see
+    data.id_tables), a save still loads after records are added, while data whose
+    IDs mean something else is rejected.
+    """
+    def __init__(self, data_manager, item_table: Optional[IdTable] = None, skill_table: Optional[IdTable] = None):
+        """
+        Initializes the catalog.
+
+        Args:
+            data_manager: The loaded GameDataManager.
+            item_table: The item IDs (default: data_manager.item_ids).
+            skill_table: The skill IDs (default: data_manager.skill_ids). Data filled
+                         in by hand needs build_id_tables() for the defaults.
+        """
+        self.data_manager = data_manager
+        self.item_table: IdTable = item_table if item_table is not None else data_manager.item_ids
+        self.skill_table: IdTable = skill_table if skill_table is not None else data_manager.skill_ids
+        self._fingerprints: Dict[Tuple[int, int], Optional[int]] = {}
+        self.fingerprint: int = self.fingerprint_at(len(self.item_table), len(self.skill_table))
+
+    @property
+    def key(self) -> Tuple[int, int, int]:
+        """(item IDs, skill IDs, fingerprint) as stored in checkpoints."""
+        return len(self.item_table), len(self.skill_table), self.fingerprint
+
+    def fingerprint_at(self, item_count: int, skill_count: int) -> Optional[int]:
+        """
+        Returns the fingerprint of the first `item_count` item IDs and `skill_count`
+        skill IDs, or None if the tables have fewer.
+        """
+        counts = (item_count, skill_count)
+        if counts not in self._fingerprints:
+            if item_count > len(self.item_table) or skill_count > len(self.skill_table):
+                fingerprint = None
+            else:
+                fingerprint = zlib.crc32(struct.pack("<II", self.item_table.prefix_fingerprint(item_count),
+                                                     self.skill_table.prefix_fingerprint(skill_count)))
+            self._fingerprints[counts] = fingerprint
+        return self._fingerprints[counts]
+
+    def _ids(self, objects: Sequence, table: IdTable, kind: str) -> Tuple[int, ...]:
+        if len(objects) > MAX_LIST_LENGTH:
+            raise ValueError(f"Cannot save {len(objects)} {kind}s in one list: save files hold at most {MAX_LIST_LENGTH}.")
+        id_of = table.id_of
+        try:
+            return tuple([id_of(obj.name) for obj in objects])
+        except KeyError as e:
+            raise ValueError(f"Cannot save {kind} {e.args[0]!r}: it is not part of the loaded game data.")
+
+    def snapshot(self, player: Player) -> Snapshot:
+        """Returns the player's saveable state as plain integers."""
+        stats = player.stats
+        scalars = (player.level, player.xp, player.xp_to_next_level, player.hp, player.max_hp,
+                   player.mp, player.max_mp) + tuple([stats.get(stat, 0) for stat in PLAYER_STAT_ORDER])
+        return (scalars,
+                self._ids(player.inventory, self.item_table, "item"),
+                self._ids(player.known_abilities, self.skill_table, "skill"),
+                self._ids(player.known_spells, self.skill_table, "skill"))
+
+    def build_player(self, name: str, snapshot: Snapshot) -> Player:
+        """Creates a Player from a snapshot, resolving IDs to the loaded game objects."""
+        scalars, inventory_ids, ability_ids, spell_ids = snapshot
+        player = Player(name)
+        (player.level, player.xp, player.xp_to_next_level, hp, max_hp, mp, max_mp) = scalars[:7]
+        player.stats = dict(zip(PLAYER_STAT_ORDER, scalars[7:]))
+        player._calculate_derived_stats()
+        player.max_hp, player.max_mp, player.hp, player.mp = max_hp, max_mp, hp, mp
+
+        player.inventory = self._objects(inventory_ids, self.item_table, self.data_manager.all_items, "item")
+        player.known_abilities = self._objects(ability_ids, self.skill_table, self.data_manager.skills, "skill")
+        player.known_spells = self._objects(spell_ids, self.skill_table, self.data_manager.skills, "skill")
+        return player
+
+    @staticmethod
+    def _objects(ids: Sequence[int], table: IdTable, entities, kind: str) -> List:
+        names = table.names
+        try:
+            return [entities[names[i]] for i in ids]
+        except KeyError as e: # The ID outlived its record
+            raise ValueError(f"Cannot load {kind} {e.args[0]!r}: it was removed from the game data.")
+
+
+def _pack_ids(ids: Sequence[int]) -> bytes:
+    return struct.pack(f"<{len(ids)}I", *ids)
+
+
+def _unpack_ids(buffer, offset: int, count: int) -> Tuple[Tuple[int, ...], int]:
+    end = offset + 4 * count
+    return struct.unpack_from(f"<{count}I", buffer, offset), end
+
+
+def encode_full(name: str, snapshot: Snapshot, catalog_key: Tuple[int, int, int]) -> bytes:
+    """Encodes a checkpoint record payload; catalog_key is SaveCatalog.key."""
+    name_bytes = name.encode("utf-8")
+    parts = [_CATALOG.pack(*catalog_key), _U16.pack(len(name_bytes)), name_bytes, _SCALARS.pack(*snapshot[0])]
+    for ids in snapshot[1:]:
+        parts.append(_U16.pack(len(ids)))
+        parts.append(_pack_ids(ids))
+    return b"".join(parts)
+
+
+def decode_full(buffer, offset: int) -> Tuple[Tuple[int, int, int], str, Snapshot]:
+    """Decodes a checkpoint payload starting at offset. Returns (catalog key, name, snapshot)."""
+    catalog_key = _CATALOG.unpack_from(buffer, offset)
+    offset += _CATALOG.size
+    name_length, = _U16.unpack_from(buffer, offset)
+    offset += 2
+    name = bytes(buffer[offset:offset + name_length]).decode("utf-8")
+    offset += name_length
+    scalars = _SCALARS.unpack_from(buffer, offset)
+    offset += _SCALARS.size
+    lists = []
+    for _ in LIST_FIELDS:
+        count, = _U16.unpack_from(buffer, offset)
+        ids, offset = _unpack_ids(buffer, offset + 2, count)
+        lists.append(ids)
+    return catalog_key, name, (scalars, lists[0], lists[1], lists[2])
+
+
+def encode_delta(previous: Snapshot, current: Snapshot) -> bytes:
+    """
+    Encodes the difference between two snapshots.
+
+    Changed scalars are stored as (bitmask, values). A changed list is stored as the
+    length of the prefix it shares with the previous version plus the new tail, so
+    picking up an item or learning a skill costs a few bytes.
+    """
+    scalar_mask = 0
+    parts = [b""]
+    for i, (old, new) in enumerate(zip(previous[0], current[0])):
+        if old != new:
+            scalar_mask |= 1 << i
+            parts.append(_I32.pack(new))
+    list_mask = 0
+    for i in range(1, 4):
+        old, new = previous[i], current[i]
+        if old == new:
+            continue
+        list_mask |= 1 << (i - 1)
+        keep = 0
+        limit = min(len(old), len(new))
+        while keep < limit and old[keep] == new[keep]:
+            keep += 1
+        tail = new[keep:]
+        parts.append(_LIST_EDIT.pack(keep, len(tail)))
+        parts.append(_pack_ids(tail))
+    parts[0] = _U16.pack(scalar_mask) + bytes((list_mask,))
+    return b"".join(parts)
+
+
+def apply_delta(snapshot: Snapshot, buffer, offset: int) -> Snapshot:
+    """Applies a delta payload starting at offset to a snapshot and returns the new one."""
+    scalar_mask, = _U16.unpack_from(buffer, offset)
+    list_mask = buffer[offset + 2]
+    offset += 3
+    scalars = list(snapshot[0])
+    for i in range(len(SCALAR_FIELDS)):
+        if scalar_mask & (1 << i):
+            scalars[i], = _I32.unpack_from(buffer, offset)
+            offset += 4
+    lists = list(snapshot[1:])
+    for i in range(3):
+        if list_mask & (1 << i):
+            keep, count = _LIST_EDIT.unpack_from(buffer, offset)
+            tail, offset = _unpack_ids(buffer, offset + 4, count)
+            lists[i] = lists[i][:keep] + tail
+    return (tuple(scalars), lists[0], lists[1], lists[2])
+
+
+class SaveFile:
+    """
+    Save file for one player.
+
+    Every save() appends a small delta against the previous save, so saving each
+    turn stays cheap. The first save and every `checkpoint_interval` saves write a
+    full checkpoint instead, which replaces the file atomically: the file never holds
+    more than one checkpoint and `checkpoint_interval` deltas, however long the session.
+    """
+    def __init__(self, path: str, data_manager, checkpoint_interval: int = 32,
+                 catalog: Optional[SaveCatalog] = None):
+        """
+        Initializes the save file.
+
+        Args:
+            path: The save file; created on the first save if missing.
+            data_manager: The loaded GameDataManager the IDs refer to.
+            checkpoint_interval: Deltas written between two full checkpoints.
+            catalog: A prebuilt catalog to share between save files.
+        """
+        self.path: str = path
+        self.catalog: SaveCatalog = catalog if catalog is not None else SaveCatalog(data_manager)
+        self.checkpoint_interval: int = checkpoint_interval
+        self._file = None
+        self._last_name: Optional[str] = None
+        self._last_snapshot: Optional[Snapshot] = None
+        self._deltas_since_checkpoint: int = 0
+
+    def checkpoint(self, player: Player) -> int:
+        """
+        Replaces the file with a full checkpoint of the player (dropping the older
+        checkpoint, its deltas and any torn tail). Returns the bytes of the record.
+        """
+        snapshot = self.catalog.snapshot(player)
+        record = _record(RECORD_FULL, encode_full(player.name, snapshot, self.catalog.key))
+        self.close()
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(_HEADER.pack(SAVE_MAGIC, SAVE_VERSION) + record)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path) # A crash leaves either the old file or the new one
+        self._file = open(self.path, "ab")
+        self._last_name, self._last_snapshot = player.name, snapshot
+        self._deltas_since_checkpoint = 0
+        return len(record)
+
+    def save(self, player: Player) -> int:
+        """
+        Appends the player's current state. Returns the bytes written (0 if nothing changed).
+        """
+        if (self._last_snapshot is None or player.name != self._last_name
+                or self._deltas_since_checkpoint >= self.checkpoint_interval):
+            return self.checkpoint(player)
+        snapshot = self.catalog.snapshot(player)
+        if snapshot == self._last_snapshot:
+            return 0
+        record = _record(RECORD_DELTA, encode_delta(self._last_snapshot, snapshot))
+        self._file.write(record)
+        self._file.flush()
+        self._last_snapshot = snapshot
+        self._deltas_since_checkpoint += 1
+        return len(record)
+
+    def load(self) -> Optional[Player]:
+        """Loads the latest saved state of the player. See load_player."""
+        if self._file is not None:
+            self._file.flush()
+        return load_player(self.path, self.catalog.data_manager, self.catalog)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "SaveFile":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _record(kind: int, payload: bytes) -> bytes:
+    return _RECORD.pack(kind, len(payload), zlib.crc32(payload)) + payload
+
+
+def _scan_records(buffer) -> List[Tuple[int, int, int]]:
+    """
+    Returns (kind, payload start, payload end) for every intact record.
+    Scanning stops at the first torn or corrupt record, e.g. from a crash mid-write.
+    """
+    records = []
+    offset = _HEADER.size
+    size = len(buffer)
+    while offset + _RECORD.size <= size:
+        kind, length, crc = _RECORD.unpack_from(buffer, offset)
+        start = offset + _RECORD.size
+        end = start + length
+        if kind not in (RECORD_FULL, RECORD_DELTA) or end > size or zlib.crc32(buffer[start:end]) != crc:
+            break
+        records.append((kind, start, end))
+        offset = end
+    return records
+
+
+def load_player(path: str, data_manager, catalog: Optional[SaveCatalog] = None) -> Optional[Player]:
+    """
+    Loads the latest state of the player stored in a save file.
+
+    The file is memory-mapped; every record in it is checked and the last checkpoint
+    and the deltas after it are decoded. Files written by SaveFile hold one checkpoint
+    and at most `checkpoint_interval` deltas, which bounds the cost.
+
+    Args:
+        path: The save file.
+        data_manager: The loaded GameDataManager the saved IDs refer to.
+        catalog: A prebuilt catalog for data_manager.
+
+    Returns:
+        The restored Player, or None if the file holds no complete checkpoint.
+
+    Raises:
+        ValueError: If the file is not a save file or was written against different game data.
+    """
+    if catalog is None:
+        catalog = SaveCatalog(data_manager)
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < _HEADER.size:
+            return None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            magic, version = _HEADER.unpack_from(buffer, 0)
+            if magic != SAVE_MAGIC or version != SAVE_VERSION:
+                raise ValueError(f"{path} is not a version {SAVE_VERSION} save file.")
+            records = _scan_records(buffer)
+            last_full = None
+            for index, (kind, _, _) in enumerate(records):
+                if kind == RECORD_FULL:
+                    last_full = index
+            if last_full is None:
+                return None
+
+            (item_count, skill_count, fingerprint), name, snapshot = decode_full(buffer, records[last_full][1])
+            if fingerprint != catalog.fingerprint_at(item_count, skill_count):
+                raise ValueError(f"{path} was saved with different game data and cannot be loaded.")
+            for _, start, _ in records[last_full + 1:]:
+                snapshot = apply_delta(snapshot, buffer, start)
+    return catalog.build_player(name, snapshot)
@@ -1,14 +1,16 @@
 import csv
-from typing import Dict, Union, Tuple, Optional
+from typing import Dict, Iterator, Union, Tuple, Optional
 
 # Adjust import path based on project structure
 try:
     from rpg_game.core.skill import Skill, Ability, PassiveSkill, Spell
+    from rpg_game.data.columns import Column, ColumnPlan, is_header_row
 except ImportError:
     import sys
     import os
     sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
     from core.skill import Skill, Ability, PassiveSkill, Spell
+    from data.columns import Column, ColumnPlan, is_header_row
 
 def _normalize_cell_value(value: str) -> str:
     """Converts 'Null' or empty strings to an empty string, otherwise strips whitespace."""
@@ -65,123 +67,90 @@ def _determine_skill_category_and_type(first_cell_value: str) -> Optional[Tuple[
 
     return None # Not a recognized section header for skill categorization
 
-def load_skills_from_csv(file_path: str) -> Dict[str, Skill]:
-    skills: Dict[str, Skill] = {}
+# Columns of a skill section; the name is column 0, under the section title. The
+# default positions are the full layout of the "Universal Melee" section.
+SKILL_COLUMNS = (
+    Column("skill_rarity", ("Skill Rarity", "Rarity"), 1, _normalize_cell_value),
+    Column("skill_type_csv", ("Skill Type", "Type"), 2, _normalize_cell_value),
+    Column("scope", ("Scope",), 3, _normalize_cell_value),
+    Column("cost", ("Cost", "Tp Cost", "Mp Cost"), 4, _normalize_cell_value),
+    Column("dmg_type", ("Dmg Type",), 5, _normalize_cell_value),
+    Column("element", ("Element",), 6, _normalize_cell_value),
+    Column("occasion", ("Occasion",), 7, _normalize_cell_value),
+    Column("formula", ("Formula",), 8, _normalize_cell_value),
+    Column("variance", ("Variance",), 9, _normalize_cell_value),
+    Column("critical", ("Critical",), 10, _normalize_cell_value),
+    Column("hit_type", ("Hit Type",), 11, _normalize_cell_value),
+    Column("animation", ("Animation",), 12, _normalize_cell_value),
+    Column("requirement", ("Requirement",), 13, _normalize_cell_value),
+    Column("effects_csv", ("Effects", "Effect"), 14, _normalize_cell_value),
+    Column("additional_notes", ("Additional Notes",), 15, _normalize_cell_value),
+    Column("description", ("Description",), 16, _normalize_cell_value),
+)
+
+# Fields the PassiveSkill constructor takes besides name, description and category.
+_PASSIVE_FIELDS = ("skill_rarity", "skill_type_csv", "effects_csv")
+
+def iter_skills(file_path: str) -> Iterator[Skill]:
+    """
+    Streams the skills of a CSV file in sheet order, holding only the current row
+    in memory. The CSV has sections like "Sword" or "Light Spells";
+    a section's column header is either its title row or the row right after it, and
+    sections without one keep the columns of the section before them.
+    """
     current_category_tuple: Optional[Tuple[str, str]] = None # (parsed_category_name, class_type_str)
-    skip_next_row_as_header: bool = False
-    
-    # CSV Column mapping (0-indexed) based on typical full header:
-    # Name(0), Rarity(1), Type(2), Scope(3), Cost(4), Dmg Type(5), Element(6), Occasion(7), 
-    # Formula(8), Variance(9), Critical(10), Hit Type(11), Animation(12), Requirement(13),
-    # Effect(14), Additional Notes(15), Description(16)
+    plan = ColumnPlan(SKILL_COLUMNS)
+    expect_header: bool = False
+    skill_classes = {"PassiveSkill": PassiveSkill, "Spell": Spell, "Ability": Ability}
 
     with open(file_path, mode='r', encoding='utf-8') as csvfile:
         reader = csv.reader(csvfile)
         
-        for row_number, row in enumerate(reader, start=1):
-            if not row or not any(_normalize_cell_value(cell) for cell in row): # Skip fully empty rows
+        for row in reader:
+            if not any(_normalize_cell_value(cell) for cell in row): # Skip fully empty rows
                 continue
 
-            first_cell_norm = _normalize_cell_value(row[0])
-
             # Try to detect a new section category
             category_detection = _determine_skill_category_and_type(row[0].strip()) # Use raw value for detection
             if category_detection:
                 current_category_tuple = category_detection
-                skip_next_row_as_header = True
-                # print(f"Row {row_number}: Detected section: {current_category_tuple[0]} as {current_category_tuple[1]}")
+                expect_header = not is_header_row(row, SKILL_COLUMNS)
+                if not expect_header:
+                    plan = ColumnPlan(SKILL_COLUMNS, row)
                 continue
 
-            if skip_next_row_as_header:
-                skip_next_row_as_header = False
-                # print(f"Row {row_number}: Skipped as column header for {current_category_tuple[0] if current_category_tuple else 'Unknown'}")
-                continue
+            if expect_header:
+                expect_header = False
+                if is_header_row(row, SKILL_COLUMNS):
+                    plan = ColumnPlan(SKILL_COLUMNS, row)
+                    continue
 
             if not current_category_tuple:
-                # print(f"Row {row_number}: Skipped as no current category is active. Data: {row[0]}")
                 continue
             
             parsed_category_name, class_type_str = current_category_tuple
-
-            # Data Row Parsing
-            if not first_cell_norm or first_cell_norm.lower() == parsed_category_name.lower():
-                # print(f"Row {row_number}: Skipped empty name or name matching category. Data: {row[0]}")
-                continue
-
-            # Ensure row has enough columns for all expected fields up to description (index 16)
-            if len(row) < 17:
-                # print(f"Row {row_number}: Skipped due to insufficient columns ({len(row)}). Data: {row[0]}")
+            name = _normalize_cell_value(row[0])
+            if not name or name.lower() == parsed_category_name.lower():
                 continue
 
-            name = first_cell_norm
-            
-            # Normalize all expected cells
-            # Name(0) already done
-            skill_rarity = _normalize_cell_value(row[1])
-            skill_type_csv = _normalize_cell_value(row[2]) # e.g. "Active", "Passive"
-            scope = _normalize_cell_value(row[3])
-            cost = _normalize_cell_value(row[4])
-            dmg_type = _normalize_cell_value(row[5])
-            element = _normalize_cell_value(row[6])
-            occasion = _normalize_cell_value(row[7])
-            formula = _normalize_cell_value(row[8])
-            variance = _normalize_cell_value(row[9])
-            critical = _normalize_cell_value(row[10])
-            hit_type = _normalize_cell_value(row[11])
-            animation = _normalize_cell_value(row[12])
-            requirement = _normalize_cell_value(row[13])
-            effects_csv = _normalize_cell_value(row[14]) # "Effect" column
-            additional_notes = _normalize_cell_value(row[15])
-            description = _normalize_cell_value(row[16])
-            
+            fields = plan.read(row)
             # If description is empty, use effects_csv or a generic one.
-            if not description:
-                description = effects_csv if effects_csv else f"A {skill_rarity} {parsed_category_name} {class_type_str.lower().replace('skill','')}."
-
-
-            skill_obj: Optional[Skill] = None
-            try:
-                if class_type_str == "PassiveSkill":
-                    skill_obj = PassiveSkill(
-                        name=name, description=description, skill_rarity=skill_rarity,
-                        skill_type_csv=skill_type_csv if skill_type_csv else "Passive", # Default if CSV type empty
-                        category=parsed_category_name,
-                        effects_csv=effects_csv
-                    )
-                elif class_type_str == "Spell":
-                    skill_obj = Spell(
-                        name=name, description=description, skill_rarity=skill_rarity,
-                        skill_type_csv=skill_type_csv if skill_type_csv else "Active", # Default if CSV type empty
-                        category=parsed_category_name, scope=scope, cost=cost, dmg_type=dmg_type,
-                        element=element, occasion=occasion, formula=formula, variance=variance,
-                        critical=critical, hit_type=hit_type, animation=animation,
-                        requirement=requirement, effects_csv=effects_csv,
-                        additional_notes=additional_notes
-                    )
-                elif class_type_str == "Ability":
-                    skill_obj = Ability(
-                        name=name, description=description, skill_rarity=skill_rarity,
-                        skill_type_csv=skill_type_csv if skill_type_csv else "Active", # Default if CSV type empty
-                        category=parsed_category_name, scope=scope, cost=cost, dmg_type=dmg_type,
-                        element=element, occasion=occasion, formula=formula, variance=variance,
-                        critical=critical, hit_type=hit_type, animation=animation,
-                        requirement=requirement, effects_csv=effects_csv,
-                        additional_notes=additional_notes
-                    )
-                else:
-                    # print(f"Row {row_number}: Unknown class type '{class_type_str}' for category '{parsed_category_name}'. Skipping '{name}'.")
-                    continue
-                
-                if name in skills:
-                    # print(f"Warning: Duplicate skill name '{name}' found. Overwriting previous entry.")
-                    pass # Allow overwrite, or handle as error
-                skills[name] = skill_obj
-
-            except Exception as e:
-                # print(f"Error instantiating skill '{name}' at row {row_number}: {e}. Data: {row[:17]}")
-                continue
-                
-    return skills
+            if not fields["description"]:
+                fields["description"] = fields["effects_csv"] or \
+                    f"A {fields['skill_rarity']} {parsed_category_name} {class_type_str.lower().replace('skill','')}."
+            if class_type_str == "PassiveSkill":
+                fields = {field: fields[field] for field in _PASSIVE_FIELDS + ("description",)}
+                fields["skill_type_csv"] = fields["skill_type_csv"] or "Passive" # Default if CSV type empty
+            else:
+                fields["skill_type_csv"] = fields["skill_type_csv"] or "Active" # Default if CSV type empty
+            yield skill_classes[class_type_str](name=name, category=parsed_category_name, **fields)
+
+
+def load_skills_from_csv(file_path: str) -> Dict[str, Skill]:
+    """
+    Loads skills from a CSV file (see iter_skills) into a dictionary keyed by name.
+    """
+    return {skill.name: skill for skill in iter_skills(file_path)} # Later rows overwrite duplicates
 
 
 if __name__ == '__main__':
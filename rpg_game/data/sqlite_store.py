@@ -0,0 +1,543 @@
+import argparse
+import os
+import re
+import sqlite3
+import sys
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+from urllib.parse import quote
+
+try:
+    from .game_data_manager import GameDataManager
+    from .id_tables import IdTable
+    from .name_index import NameIndex
+    from ..core.consumable import Consumable
+    from ..core.elements import AffinityMatrix
+    from ..core.enemy import Enemy
+    from ..core.enemy_scaling import EnemyScalingTable, GrowthCurve, parse_level_range
+    from ..core.equipment import Equipment
+    from ..core.item import Item
+    from ..core.material import Material
+    from ..core.modifiers import compile_modifiers
+    from ..core.skill import Ability, PassiveSkill, Skill, Spell
+    from ..core.status_effect import StatusEffect
+    from ..core.weapon import Weapon
+    from ..world.zone import Zone
+    from ..utils.cache import Cache
+except ImportError: # Fallback when 'data', 'core' and 'world' are top-level packages
+    from data.game_data_manager import GameDataManager
+    from data.id_tables import IdTable
+    from data.name_index import NameIndex
+    from core.consumable import Consumable
+    from core.elements import AffinityMatrix
+    from core.enemy import Enemy
+    from core.enemy_scaling import EnemyScalingTable, GrowthCurve, parse_level_range
+    from core.equipment import Equipment
+    from core.item import Item
+    from core.material import Material
+    from core.modifiers import compile_modifiers
+    from core.skill import Ability, PassiveSkill, Skill, Spell
+    from core.status_effect import StatusEffect
+    from core.weapon import Weapon
+    from world.zone import Zone
+    from utils.cache import Cache
+
+
+# The fully linked game data as a SQLite database, for tools that want to query
+# it with SQL and for datasets too large to keep in memory. Row IDs are the IDs
+# of the GameDataManager ID tables, which are stored whole in entity_ids so the
+# IDs of removed records stay taken (see data.id_tables).
+SCHEMA_VERSION = 2
+DEFAULT_CACHE_SIZE = 1024
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE entity_ids (
+    collection TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (collection, id)
+);
+CREATE TABLE elements (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE affinities (
+    attack_id INTEGER NOT NULL REFERENCES elements(id),
+    defense_id INTEGER NOT NULL REFERENCES elements(id),
+    multiplier REAL NOT NULL,
+    PRIMARY KEY (attack_id, defense_id)
+);
+CREATE TABLE zones (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE zone_enemies (
+    zone_id INTEGER NOT NULL REFERENCES zones(id),
+    position INTEGER NOT NULL,
+    enemy_name TEXT NOT NULL,
+    PRIMARY KEY (zone_id, position)
+);
+CREATE TABLE enemies (
+    id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE, zone_id INTEGER REFERENCES zones(id),
+    level_range TEXT, min_level INTEGER, max_level INTEGER, spawn_chance TEXT,
+    enemy_type TEXT, type_id INTEGER, max_hp INTEGER, max_mp INTEGER, attack_power INTEGER,
+    defense INTEGER, magic_attack INTEGER, magic_defense INTEGER, agility INTEGER, luck INTEGER,
+    has_sprite INTEGER
+);
+CREATE TABLE items (
+    id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE, kind TEXT NOT NULL, description TEXT,
+    rarity TEXT, tier TEXT, recipe TEXT, category TEXT, effect_description TEXT
+);
+CREATE TABLE equipment (
+    item_id INTEGER PRIMARY KEY REFERENCES items(id), equip_type TEXT,
+    attack_bonus INTEGER, defense_bonus INTEGER, magic_attack_bonus INTEGER,
+    magic_defense_bonus INTEGER, agility_bonus INTEGER, luck_bonus INTEGER,
+    max_hp_bonus INTEGER, max_mp_bonus INTEGER, extra_increases TEXT, source TEXT
+);
+CREATE TABLE weapons (
+    item_id INTEGER PRIMARY KEY REFERENCES items(id), equip_type TEXT,
+    attack_bonus INTEGER, defense_bonus INTEGER, magic_attack_bonus INTEGER,
+    magic_defense_bonus INTEGER, agility_bonus INTEGER, luck_bonus INTEGER,
+    max_hp_bonus INTEGER, max_mp_bonus INTEGER, extra_increases TEXT, source TEXT,
+    attack_type TEXT, element_id INTEGER, weapon_category TEXT
+);
+CREATE TABLE skills (
+    id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE, kind TEXT NOT NULL, description TEXT,
+    skill_rarity TEXT, skill_type_csv TEXT, category TEXT, scope TEXT, cost TEXT, dmg_type TEXT,
+    element TEXT, element_id INTEGER, occasion TEXT, formula TEXT, variance TEXT, critical TEXT,
+    hit_type TEXT, animation TEXT, requirement TEXT, effects_csv TEXT, additional_notes TEXT
+);
+CREATE TABLE status_effects (
+    id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE, description TEXT, effect_type TEXT,
+    element TEXT, element_id INTEGER, duration_str TEXT, effect_description TEXT, notes TEXT
+);
+CREATE TABLE enemy_skills (
+    enemy_id INTEGER NOT NULL REFERENCES enemies(id),
+    position INTEGER NOT NULL,
+    skill_id INTEGER NOT NULL REFERENCES skills(id),
+    PRIMARY KEY (enemy_id, position)
+);
+CREATE TABLE enemy_loot (
+    enemy_id INTEGER NOT NULL REFERENCES enemies(id),
+    position INTEGER NOT NULL,
+    item_id INTEGER NOT NULL REFERENCES items(id),
+    PRIMARY KEY (enemy_id, position)
+);
+CREATE TABLE recipes (
+    item_id INTEGER NOT NULL REFERENCES items(id),
+    position INTEGER NOT NULL,
+    quantity INTEGER NOT NULL,
+    ingredient TEXT NOT NULL,
+    ingredient_id INTEGER REFERENCES items(id),
+    PRIMARY KEY (item_id, position)
+);
+CREATE INDEX enemies_zone ON enemies(zone_id);
+CREATE INDEX enemies_type ON enemies(enemy_type);
+CREATE INDEX enemies_levels ON enemies(min_level, max_level);
+CREATE INDEX items_kind ON items(kind);
+CREATE INDEX items_tier ON items(tier);
+CREATE INDEX weapons_category ON weapons(weapon_category);
+CREATE INDEX equipment_type ON equipment(equip_type);
+CREATE INDEX skills_category ON skills(category);
+CREATE INDEX skills_element ON skills(element_id);
+CREATE INDEX status_effects_type ON status_effects(effect_type);
+CREATE INDEX enemy_skills_skill ON enemy_skills(skill_id);
+CREATE INDEX enemy_loot_item ON enemy_loot(item_id);
+CREATE INDEX recipes_ingredient ON recipes(ingredient_id);
+"""
+
+_ENEMY_COLUMNS = ("level_range", "spawn_chance", "enemy_type", "type_id", "max_hp", "max_mp", "attack_power",
+                  "defense", "magic_attack", "magic_defense", "agility", "luck")
+_BONUS_COLUMNS = ("equip_type", "attack_bonus", "defense_bonus", "magic_attack_bonus", "magic_defense_bonus",
+                  "agility_bonus", "luck_bonus", "max_hp_bonus", "max_mp_bonus", "extra_increases", "source")
+_WEAPON_COLUMNS = _BONUS_COLUMNS + ("attack_type", "element_id", "weapon_category")
+_ABILITY_COLUMNS = ("scope", "cost", "dmg_type", "element", "element_id", "occasion", "formula", "variance",
+                    "critical", "hit_type", "animation", "requirement", "additional_notes")
+_STATUS_EFFECT_COLUMNS = ("description", "effect_type", "element", "element_id", "duration_str",
+                          "effect_description", "notes")
+
+# The attributes of each kind of item and skill, i.e. what a materialized object is built from.
+_ITEM_KINDS: Dict[str, Tuple[type, Tuple[str, ...]]] = {
+    "weapon": (Weapon, ("description", "tier", "recipe") + _WEAPON_COLUMNS),
+    "equipment": (Equipment, ("description", "tier", "recipe") + _BONUS_COLUMNS),
+    "consumable": (Consumable, ("description", "category", "effect_description", "rarity", "recipe")),
+    "material": (Material, ("description", "rarity")),
+}
+# The tables holding the kind-specific columns of weapon and equipment items.
+_DETAIL_TABLES = {"weapon": "weapons", "equipment": "equipment"}
+_SKILL_KINDS: Dict[str, Tuple[type, Tuple[str, ...]]] = {
+    "passive": (PassiveSkill, ("description", "skill_rarity", "skill_type_csv", "category", "effects_csv")),
+    "ability": (Ability, ("description", "skill_rarity", "skill_type_csv", "category", "effects_csv") + _ABILITY_COLUMNS),
+    "spell": (Spell, ("description", "skill_rarity", "skill_type_csv", "category", "effects_csv") + _ABILITY_COLUMNS),
+}
+
+# "3x Bark Fragments 1x Chomper Tooth" or "1x Raw Meat, 1x Salt"
+_RECIPE_PART = re.compile(r"(\d+)\s*x\s*(.+?)\s*,?\s*(?=\d+\s*x\s|$)", re.IGNORECASE)
+
+
+def parse_recipe(recipe: str) -> List[Tuple[int, str]]:
+    """Returns the (quantity, ingredient) pairs of a recipe cell; cells in other formats give none."""
+    return [(int(quantity), ingredient) for quantity, ingredient in _RECIPE_PART.findall(recipe.strip())]
+
+
+def _item_kind(item: Item) -> str:
+    for kind, (cls, _) in _ITEM_KINDS.items(): # Weapon is checked before its base class Equipment
+        if isinstance(item, cls):
+            return kind
+    return "material"
+
+
+def _skill_kind(skill: Skill) -> str:
+    return "spell" if isinstance(skill, Spell) else "ability" if isinstance(skill, Ability) else "passive"
+
+
+def _insert(connection: sqlite3.Connection, table: str, values: Dict[str, Any]) -> None:
+    connection.execute(f"INSERT INTO {table} ({', '.join(values)}) VALUES ({', '.join('?' * len(values))})",
+                       tuple(values.values()))
+
+
+def export_sqlite(data_manager: GameDataManager, path: str) -> None:
+    """
+    Writes the loaded data of a GameDataManager to a new SQLite database file.
+    The file is replaced atomically, so readers never see a partial export.
+    """
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+    connection = sqlite3.connect(temp_path)
+    try:
+        connection.executescript(SCHEMA)
+        with connection:
+            _export(connection, data_manager)
+        connection.execute("ANALYZE")
+    finally:
+        connection.close()
+    os.replace(temp_path, path)
+
+
+def _export(connection: sqlite3.Connection, dm: GameDataManager) -> None:
+    item_index = NameIndex(dm.all_items)
+    connection.execute("INSERT INTO meta VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),))
+    affinities = dm.affinities
+    connection.executemany("INSERT INTO elements VALUES (?, ?)", enumerate(affinities.names))
+    connection.executemany("INSERT INTO affinities VALUES (?, ?, ?)",
+                           ((attack, defense, affinities.multiplier(attack, defense))
+                            for attack in range(affinities.width) for defense in range(affinities.width)
+                            if affinities.multiplier(attack, defense) != 1.0))
+
+    for collection, table in dm.id_tables().items():
+        connection.executemany("INSERT INTO entity_ids VALUES (?, ?, ?)",
+                               ((collection, entity_id, name) for entity_id, name in table.items()))
+
+    # Names of removed records keep their IDs but have no rows
+    for zone_id, name in dm.zone_ids.items():
+        if name not in dm.zones:
+            continue
+        connection.execute("INSERT INTO zones VALUES (?, ?)", (zone_id, name))
+        connection.executemany("INSERT INTO zone_enemies VALUES (?, ?, ?)",
+                               ((zone_id, position, enemy_name)
+                                for position, enemy_name in enumerate(dm.zones[name].enemy_names)))
+
+    for item_id, name in dm.item_ids.items():
+        if name not in dm.all_items:
+            continue
+        item = dm.all_items[name]
+        kind = _item_kind(item)
+        _insert(connection, "items", {"id": item_id, "name": name, "kind": kind, "description": item.description,
+                                      "rarity": getattr(item, "rarity", None), "tier": getattr(item, "tier", None),
+                                      "recipe": getattr(item, "recipe", None),
+                                      "category": getattr(item, "category", None),
+                                      "effect_description": getattr(item, "effect_description", None)})
+        if kind in _DETAIL_TABLES:
+            columns = _WEAPON_COLUMNS if kind == "weapon" else _BONUS_COLUMNS
+            _insert(connection, _DETAIL_TABLES[kind], dict(item_id=item_id, **{column: getattr(item, column)
+                                                                               for column in columns}))
+        for position, (quantity, ingredient) in enumerate(parse_recipe(getattr(item, "recipe", "") or "")):
+            canonical = item_index.canonical_name(ingredient)
+            connection.execute("INSERT INTO recipes VALUES (?, ?, ?, ?, ?)",
+                               (item_id, position, quantity, ingredient,
+                                dm.item_ids.get_id(canonical) if canonical is not None else None))
+
+    for skill_id, name in dm.skill_ids.items():
+        if name not in dm.skills:
+            continue
+        skill = dm.skills[name]
+        kind = _skill_kind(skill)
+        _insert(connection, "skills", dict(id=skill_id, name=name, kind=kind,
+                                           **{attribute: getattr(skill, attribute, None)
+                                              for attribute in _SKILL_KINDS[kind][1]}))
+
+    for effect_id, name in dm.status_effect_ids.items():
+        if name not in dm.status_effects:
+            continue
+        effect = dm.status_effects[name]
+        _insert(connection, "status_effects", dict(id=effect_id, name=name,
+                                                   **{column: getattr(effect, column, None)
+                                                      for column in _STATUS_EFFECT_COLUMNS}))
+
+    for enemy_id, name in dm.enemy_ids.items():
+        if name not in dm.enemies:
+            continue
+        enemy = dm.enemies[name]
+        min_level, max_level = parse_level_range(enemy.level_range)
+        _insert(connection, "enemies", dict(id=enemy_id, name=name,
+                                            zone_id=dm.zone_ids.get_id(enemy.zone_name) if enemy.zone_name else None,
+                                            min_level=min_level, max_level=max_level,
+                                            has_sprite=int(enemy.has_sprite),
+                                            **{column: getattr(enemy, column, None) for column in _ENEMY_COLUMNS}))
+        connection.executemany("INSERT INTO enemy_skills VALUES (?, ?, ?)",
+                               ((enemy_id, position, dm.skill_ids.id_of(skill.name))
+                                for position, skill in enumerate(enemy.abilities_spells)))
+        connection.executemany("INSERT INTO enemy_loot VALUES (?, ?, ?)",
+                               ((enemy_id, position, dm.item_ids.id_of(item.name))
+                                for position, item in enumerate(enemy.loot)))
+
+
+def _restore(cls: type, name: str, row: sqlite3.Row, attributes: Sequence[str]) -> Any:
+    """Builds an entity from its row without re-running the constructor, like the pickle cache."""
+    entity = cls.__new__(cls)
+    entity.name = name
+    for attribute in attributes:
+        setattr(entity, attribute, row[attribute])
+    return entity
+
+
+class SqliteMapping(Mapping):
+    """
+    A read-only name -> entity mapping over one table of a SqliteGameDataManager.
+    Entities are materialized on access through the manager's LRU cache.
+    """
+    def __init__(self, manager: "SqliteGameDataManager", kind: str, table: str, where: str = ""):
+        self._manager = manager
+        self._kind = kind
+        self._table = table
+        self._where = f" WHERE {where}" if where else ""
+        self._and = f" AND {where}" if where else ""
+
+    def __getitem__(self, name: str) -> Any:
+        if not isinstance(name, str):
+            raise KeyError(name)
+        entity = self._manager._entity(self._kind, name)
+        if entity is None or (self._and and name not in self):
+            raise KeyError(name)
+        return entity
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and self._manager.connection.execute(
+            f"SELECT 1 FROM {self._table} WHERE name = ?{self._and}", (name,)).fetchone() is not None
+
+    def __iter__(self) -> Iterator[str]:
+        for (name,) in self._manager.connection.execute(f"SELECT name FROM {self._table}{self._where} ORDER BY id"):
+            yield name
+
+    def __len__(self) -> int:
+        return self._manager.connection.execute(f"SELECT COUNT(*) FROM {self._table}{self._where}").fetchone()[0]
+
+    def __repr__(self) -> str:
+        return f"SqliteMapping({self._table}{self._where}, {len(self)} entries)"
+
+
+class SqliteGameDataManager(GameDataManager):
+    """
+    A GameDataManager that answers from a database written by export_sqlite instead
+    of holding the data in memory.
+
+    The data dictionaries (enemies, all_items, skills, ...) are read-only mappings
+    that materialize entities on access. The most recently used entities are kept
+    in an LRU cache of `cache_size` entries; an entity evicted from it is loaded
+    again on its next use, as a new object. query() runs ad-hoc SQL.
+    """
+    def __init__(self, path: str, cache_size: int = DEFAULT_CACHE_SIZE,
+                 growth_curves: Optional[Dict[str, GrowthCurve]] = None):
+        """
+        Opens a database read-only.
+
+        Args:
+            path: The database file.
+            cache_size: How many materialized entities to keep.
+            growth_curves: Per-stat growth curve overrides for enemy scaling.
+
+        Raises:
+            ValueError: If the file is not a database of this schema version.
+        """
+        super().__init__(growth_curves)
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"No game database at '{path}'.")
+        self.path: str = path
+        self.connection: sqlite3.Connection = sqlite3.connect(f"file:{quote(os.path.abspath(path))}?mode=ro", uri=True)
+        self.connection.row_factory = sqlite3.Row
+        try:
+            version = self.connection.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        except sqlite3.DatabaseError as e:
+            self.connection.close()
+            raise ValueError(f"'{path}' is not a game database: {e}") from e
+        if version is None or version[0] != str(SCHEMA_VERSION):
+            self.connection.close()
+            raise ValueError(f"'{path}' has schema version {version and version[0]}, expected {SCHEMA_VERSION}.")
+
+        self.cache_size: int = cache_size
+        self._cache: Cache = Cache("sqlite_entities", cache_size)
+        self._loaders: Dict[str, Callable[[str], Any]] = {
+            "enemy": self._load_enemy, "item": self._load_item, "skill": self._load_skill,
+            "status_effect": self._load_status_effect, "zone": self._load_zone,
+        }
+
+        self.enemies = SqliteMapping(self, "enemy", "enemies")
+        self.all_items = SqliteMapping(self, "item", "items")
+        self.equipment = SqliteMapping(self, "item", "items", "kind = 'equipment'")
+        self.weapons = SqliteMapping(self, "item", "items", "kind = 'weapon'")
+        self.consumables = SqliteMapping(self, "item", "items", "kind = 'consumable'")
+        self.materials = SqliteMapping(self, "item", "items", "kind = 'material'")
+        self.skills = SqliteMapping(self, "skill", "skills")
+        self.status_effects = SqliteMapping(self, "status_effect", "status_effects")
+        self.zones = SqliteMapping(self, "zone", "zones")
+
+        ids: Dict[str, List[str]] = {}
+        for collection, name in self.connection.execute("SELECT collection, name FROM entity_ids ORDER BY collection, id"):
+            ids.setdefault(collection, []).append(name)
+        self.enemy_ids = IdTable(ids.get("enemies", ()), ordered=True)
+        self.item_ids = IdTable(ids.get("all_items", ()), ordered=True)
+        self.skill_ids = IdTable(ids.get("skills", ()), ordered=True)
+        self.status_effect_ids = IdTable(ids.get("status_effects", ()), ordered=True)
+        self.zone_ids = IdTable(ids.get("zones", ()), ordered=True)
+
+        names = [name for (name,) in self.connection.execute("SELECT name FROM elements ORDER BY id")]
+        self.affinities = AffinityMatrix(names, {})
+        for attack_id, defense_id, multiplier in self.connection.execute("SELECT * FROM affinities"):
+            self.affinities.values[attack_id * self.affinities.width + defense_id] = multiplier
+        self.enemy_scaling = EnemyScalingTable(self.enemies, growth_curves, precompute=False)
+
+    def load_all_data(self, base_csv_path: str = "Game Csv Data", use_cache: bool = False) -> None:
+        raise TypeError("SqliteGameDataManager is read-only; export a loaded GameDataManager instead.")
+
+    def build_id_tables(self) -> None:
+        raise TypeError("SqliteGameDataManager is read-only; its IDs come from the database.")
+
+    @property
+    def cache_hits(self) -> int:
+        return self._cache.hits
+
+    @property
+    def cache_misses(self) -> int:
+        return self._cache.misses
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> List[sqlite3.Row]:
+        """Runs a read-only SQL statement and returns its rows."""
+        return self.connection.execute(sql, params).fetchall()
+
+    def enemies_in_zone(self, zone_name: str) -> List[Enemy]:
+        """Returns the enemy templates of a zone."""
+        return self._entities("enemy", "SELECT e.name FROM enemies e JOIN zones z ON e.zone_id = z.id "
+                                       "WHERE z.name = ? ORDER BY e.id", (zone_name,))
+
+    def enemies_for_level(self, level: int) -> List[Enemy]:
+        """Returns the enemy templates whose level range includes a level."""
+        return self._entities("enemy", "SELECT name FROM enemies WHERE min_level <= ? AND max_level >= ? "
+                                       "ORDER BY id", (level, level))
+
+    def enemies_dropping(self, item_name: str) -> List[Enemy]:
+        """Returns the enemy templates with an item in their loot."""
+        return self._entities("enemy", "SELECT DISTINCT e.name FROM enemies e JOIN enemy_loot l ON l.enemy_id = e.id "
+                                       "JOIN items i ON l.item_id = i.id WHERE i.name = ? ORDER BY e.id", (item_name,))
+
+    def items_using(self, ingredient_name: str) -> List[Item]:
+        """Returns the items whose recipe needs an ingredient."""
+        return self._entities("item", "SELECT DISTINCT i.name FROM items i JOIN recipes r ON r.item_id = i.id "
+                                      "JOIN items g ON r.ingredient_id = g.id WHERE g.name = ? ORDER BY i.id",
+                              (ingredient_name,))
+
+    def _entities(self, kind: str, sql: str, params: Sequence[Any]) -> List[Any]:
+        return [self._entity(kind, name) for (name,) in self.connection.execute(sql, params)]
+
+    def _entity(self, kind: str, name: str) -> Any:
+        """Returns a materialized entity (from the LRU cache if possible), or None if there is none."""
+        key = (kind, name)
+        entity = self._cache.get(key)
+        if entity is None:
+            entity = self._loaders[kind](name)
+            if entity is not None:
+                self._cache.put(key, entity)
+        return entity
+
+    def _row(self, sql: str, name: str) -> Optional[sqlite3.Row]:
+        return self.connection.execute(sql, (name,)).fetchone()
+
+    def _load_item(self, name: str) -> Optional[Item]:
+        row = self._row("SELECT * FROM items WHERE name = ?", name)
+        if row is None:
+            return None
+        kind = row["kind"]
+        if kind in _DETAIL_TABLES:
+            row = self._row(f"SELECT * FROM items i JOIN {_DETAIL_TABLES[kind]} d ON d.item_id = i.id "
+                            "WHERE i.name = ?", name)
+        cls, attributes = _ITEM_KINDS[kind]
+        item = _restore(cls, name, row, attributes)
+        if isinstance(item, Equipment):
+            item.refresh_bonuses()
+            item.modifiers = compile_modifiers(item.extra_increases)
+        return item
+
+    def _load_skill(self, name: str) -> Optional[Skill]:
+        row = self._row("SELECT * FROM skills WHERE name = ?", name)
+        if row is None:
+            return None
+        cls, attributes = _SKILL_KINDS[row["kind"]]
+        skill = _restore(cls, name, row, attributes)
+        if isinstance(skill, (Ability, PassiveSkill)):
+            skill.modifiers = compile_modifiers(skill.effects_csv, getattr(skill, 'additional_notes', ""))
+        return skill
+
+    def _load_status_effect(self, name: str) -> Optional[StatusEffect]:
+        row = self._row("SELECT * FROM status_effects WHERE name = ?", name)
+        return _restore(StatusEffect, name, row, _STATUS_EFFECT_COLUMNS) if row is not None else None
+
+    def _load_zone(self, name: str) -> Optional[Zone]:
+        row = self._row("SELECT id FROM zones WHERE name = ?", name)
+        if row is None:
+            return None
+        zone = Zone(name=name)
+        zone.enemy_names = [enemy_name for (enemy_name,) in self.connection.execute(
+            "SELECT enemy_name FROM zone_enemies WHERE zone_id = ? ORDER BY position", (row["id"],))]
+        zone.enemy_ids = [self.enemy_ids.id_of(enemy_name) for enemy_name in zone.enemy_names
+                          if enemy_name in self.enemies]
+        return zone
+
+    def _load_enemy(self, name: str) -> Optional[Enemy]:
+        row = self._row("SELECT e.*, z.name AS zone_name FROM enemies e LEFT JOIN zones z ON e.zone_id = z.id "
+                        "WHERE e.name = ?", name)
+        if row is None:
+            return None
+        skills = [self._entity("skill", skill_name) for (skill_name,) in self.connection.execute(
+            "SELECT s.name FROM enemy_skills es JOIN skills s ON es.skill_id = s.id "
+            "WHERE es.enemy_id = ? ORDER BY es.position", (row["id"],))]
+        loot = [self._entity("item", item_name) for (item_name,) in self.connection.execute(
+            "SELECT i.name FROM enemy_loot l JOIN items i ON l.item_id = i.id "
+            "WHERE l.enemy_id = ? ORDER BY l.position", (row["id"],))]
+        enemy = Enemy(name=name, max_hp=row["max_hp"], attack_power=row["attack_power"], defense=row["defense"],
+                      level_range=row["level_range"], spawn_chance=row["spawn_chance"],
+                      enemy_type=row["enemy_type"], max_mp=row["max_mp"], magic_attack=row["magic_attack"],
+                      magic_defense=row["magic_defense"], agility=row["agility"], luck=row["luck"],
+                      has_sprite=bool(row["has_sprite"]), abilities_spells=skills, loot=loot,
+                      zone_name=row["zone_name"])
+        enemy.type_id = row["type_id"]
+        return enemy
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Loads the CSV data and exports it to a SQLite database."""
+    parser = argparse.ArgumentParser(prog="python -m rpg_game.data.sqlite_store",
+                                     description="Export the game data to a SQLite database.")
+    parser.add_argument("output", help="The database file to write.")
+    parser.add_argument("--data", default="Game Csv Data", help="Directory containing the game CSV files.")
+    args = parser.parse_args(argv)
+
+    data_manager = GameDataManager()
+    data_manager.load_all_data(args.data)
+    if not data_manager.enemies and not data_manager.all_items:
+        print(f"No game data found in '{args.data}'.", file=sys.stderr)
+        return 1
+    export_sqlite(data_manager, args.output)
+    print(f"Exported {len(data_manager.enemies)} enemies, {len(data_manager.all_items)} items and "
+          f"{len(data_manager.skills)} skills to '{args.output}'.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
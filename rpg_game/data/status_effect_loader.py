@@ -1,14 +1,16 @@
 import csv
-from typing import Dict, Optional
+from typing import Dict, Iterator, Optional
 
 # Adjust import path based on project structure
 try:
     from rpg_game.core.status_effect import StatusEffect
+    from rpg_game.data.columns import Column, ColumnPlan, is_header_row
 except ImportError:
     import sys
     import os
     sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
     from core.status_effect import StatusEffect
+    from data.columns import Column, ColumnPlan, is_header_row
 
 def _normalize_status_cell_value(value: str) -> str:
     """Converts 'Null' or empty strings to an empty string, otherwise strips whitespace."""
@@ -17,27 +19,35 @@ def _normalize_status_cell_value(value: str) -> str:
         return ""
     return stripped_value
 
-def load_status_effects_from_csv(file_path: str) -> Dict[str, StatusEffect]:
+# Columns of a status effect section; the name is column 0, under the section title.
+STATUS_EFFECT_COLUMNS = (
+    Column("element", ("Element",), 1, _normalize_status_cell_value),
+    Column("duration_str", ("Duration",), 2, _normalize_status_cell_value),
+    Column("effect_description", ("Effect", "Effects"), 3, _normalize_status_cell_value),
+    Column("notes", ("Notes",), 4, _normalize_status_cell_value),
+)
+
+def iter_status_effects(file_path: str) -> Iterator[StatusEffect]:
     """
-    Loads status effect data from a CSV file.
-    The CSV is section-based: "Positive States" and "Negative States".
+    Streams the status effects of a CSV file in sheet order, holding only the
+    current row in memory.
+    The CSV is section-based: "Positive States" and "Negative States". A section's
+    column header is its title row or the row right after it (see STATUS_EFFECT_COLUMNS).
     """
-    status_effects: Dict[str, StatusEffect] = {}
     current_effect_type: Optional[str] = None
+    plan = ColumnPlan(STATUS_EFFECT_COLUMNS)
+    expect_header: bool = False
 
     section_headers = {
         "Positive States": "Positive",
         "Negative States": "Negative"
     }
-    
-    # Expected columns for data rows (0-indexed):
-    # Name (0), Element (1), Duration (2), Effect (3), Notes (4)
 
     with open(file_path, mode='r', encoding='utf-8') as csvfile:
         reader = csv.reader(csvfile)
         
-        for row_number, row in enumerate(reader, start=1):
-            if not row or not any(_normalize_status_cell_value(cell) for cell in row): # Skip fully empty rows
+        for row in reader:
+            if not any(_normalize_status_cell_value(cell) for cell in row): # Skip fully empty rows
                 continue
 
             first_cell_raw = row[0].strip()
@@ -45,58 +55,43 @@ def load_status_effects_from_csv(file_path: str) -> Dict[str, StatusEffect]:
             # Check if this row defines a new section
             if first_cell_raw in section_headers:
                 current_effect_type = section_headers[first_cell_raw]
-                # print(f"Row {row_number}: Switched to section: {current_effect_type}")
+                expect_header = not is_header_row(row, STATUS_EFFECT_COLUMNS)
+                if not expect_header:
+                    plan = ColumnPlan(STATUS_EFFECT_COLUMNS, row)
                 continue
 
+            if expect_header:
+                expect_header = False
+                if is_header_row(row, STATUS_EFFECT_COLUMNS):
+                    plan = ColumnPlan(STATUS_EFFECT_COLUMNS, row)
+                    continue
+
             if not current_effect_type:
-                # print(f"Row {row_number}: Skipped as no effect type section is active. Data: {row[0]}")
                 continue
             
-            # Data Row Parsing
             name = _normalize_status_cell_value(first_cell_raw)
-            if not name or name == "Positive States" or name == "Negative States": # Skip if name is empty or a section title
-                # print(f"Row {row_number}: Skipped due to empty name or name matching section title. Name: '{name}'")
+            if not name:
                 continue
 
-            # Ensure row has enough columns for all expected fields up to Notes (index 4)
-            if len(row) < 5:
-                # print(f"Row {row_number}: Skipped due to insufficient columns ({len(row)}). Data: {row[0]}")
-                continue
-            
-            element = _normalize_status_cell_value(row[1])
-            duration_str = _normalize_status_cell_value(row[2])
-            effect_str = _normalize_status_cell_value(row[3]) # Main effect description
-            notes = _normalize_status_cell_value(row[4])
-
+            fields = plan.read(row)
+            effect_str, notes = fields["effect_description"], fields["notes"]
             # Create a general description. Can be refined.
-            description = f"{current_effect_type} effect. {effect_str}" if effect_str else f"A {current_effect_type.lower()} status effect."
-            if not effect_str and notes: # If no main effect, but notes exist, use notes for description.
-                 description = notes
-            elif not effect_str and not notes: # Fallback if both are empty
-                 description = f"A {current_effect_type.lower()} status effect named {name}."
-
-
-            try:
-                status_effect_obj = StatusEffect(
-                    name=name,
-                    description=description,
-                    effect_type=current_effect_type,
-                    element=element,
-                    duration_str=duration_str,
-                    effect_description=effect_str, # This is the primary mechanical effect
-                    notes=notes
-                )
-                
-                if name in status_effects:
-                    # print(f"Warning: Duplicate status effect name '{name}' found at row {row_number}. Overwriting previous entry.")
-                    pass 
-                status_effects[name] = status_effect_obj
-
-            except Exception as e:
-                # print(f"Error instantiating status effect '{name}' at row {row_number}: {e}. Data: {row[:5]}")
-                continue
-                
-    return status_effects
+            if effect_str:
+                description = f"{current_effect_type} effect. {effect_str}"
+            elif notes: # If no main effect, but notes exist, use notes for description.
+                description = notes
+            else: # Fallback if both are empty
+                description = f"A {current_effect_type.lower()} status effect named {name}."
+
+            yield StatusEffect(name=name, description=description, effect_type=current_effect_type, **fields)
+
+
+def load_status_effects_from_csv(file_path: str) -> Dict[str, StatusEffect]:
+    """
+    Loads status effect data from a CSV file (see iter_status_effects) into a
+    dictionary keyed by name.
+    """
+    return {effect.name: effect for effect in iter_status_effects(file_path)} # Later rows overwrite duplicates
 
 if __name__ == '__main__':
     csv_file_path = "Game Csv Data/Buffs & Debuffs.csv"
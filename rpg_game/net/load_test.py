@@ -0,0 +1,156 @@
+import argparse
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from rpg_game.data.game_data_manager import GameDataManager
+    from rpg_game.net.server import GameServer
+    from rpg_game.ui.game_io import PROMPT_PREFIX
+except ImportError: # Fallback when run from inside the rpg_game directory
+    from data.game_data_manager import GameDataManager
+    from net.server import GameServer
+    from ui.game_io import PROMPT_PREFIX
+
+
+def _raise_open_file_limit(needed: int) -> None:
+    """Raises the soft file-descriptor limit so thousands of sockets can be open at once."""
+    try:
+        import resource
+    except ImportError: # Not available on Windows
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < needed:
+        new_soft = needed if hard == resource.RLIM_INFINITY else min(needed, hard)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (new_soft, hard))
+
+
+async def _read_until_prompt(reader: asyncio.StreamReader) -> List[str]:
+    """Reads server output up to and including the next prompt line."""
+    lines: List[str] = []
+    prefix = PROMPT_PREFIX.encode()
+    while True:
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError("Server closed the session.")
+        lines.append(line.decode("utf-8", errors="replace").rstrip("\n"))
+        if line.startswith(prefix):
+            return lines
+
+
+async def _open_session(host: str, port: int, name: str) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    """Connects, creates a character and waits at the main menu."""
+    reader, writer = await asyncio.open_connection(host, port)
+    await _read_until_prompt(reader) # Name prompt
+    writer.write(f"{name}\n".encode())
+    await _read_until_prompt(reader) # Main menu prompt
+    return reader, writer
+
+
+async def _timed_commands(reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                          command: str, count: int) -> List[float]:
+    """Sends a command `count` times and returns each round-trip latency in seconds."""
+    latencies: List[float] = []
+    for _ in range(count):
+        started = time.perf_counter()
+        writer.write(f"{command}\n".encode())
+        await _read_until_prompt(reader)
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Returns the nearest-rank percentile of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100.0 * len(ordered))))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+async def run_load_test(host: str, port: int,
+                        idle_sessions: int = 1000,
+                        active_sessions: int = 50,
+                        commands_per_session: int = 20,
+                        command: str = "1",
+                        connect_batch: int = 200) -> Dict[str, float]:
+    """
+    Opens many idle sessions, then measures command latency from a set of active ones.
+
+    Args:
+        host: Server host.
+        port: Server port.
+        idle_sessions: Sessions that log in and then sit at the main menu.
+        active_sessions: Sessions that repeatedly send `command` while the idle ones stay open.
+        commands_per_session: Commands each active session sends.
+        command: Menu command to send ("1" is View Stats).
+        connect_batch: How many sessions connect concurrently at a time.
+
+    Returns:
+        A dict with the session counts and p50/p99/max latency in milliseconds.
+    """
+    idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+    for start in range(0, idle_sessions, connect_batch):
+        batch = range(start, min(start + connect_batch, idle_sessions))
+        idle.extend(await asyncio.gather(*(_open_session(host, port, f"Idle{i}") for i in batch)))
+
+    active = await asyncio.gather(*(_open_session(host, port, f"Active{i}") for i in range(active_sessions)))
+    started = time.perf_counter()
+    results = await asyncio.gather(*(_timed_commands(r, w, command, commands_per_session) for r, w in active))
+    elapsed = time.perf_counter() - started
+    latencies = [latency for session in results for latency in session]
+
+    for _, writer in list(idle) + list(active):
+        writer.close()
+    await asyncio.gather(*(w.wait_closed() for _, w in list(idle) + list(active)), return_exceptions=True)
+
+    return {
+        "idle_sessions": float(len(idle)),
+        "active_sessions": float(len(active)),
+        "commands": float(len(latencies)),
+        "commands_per_second": len(latencies) / elapsed if elapsed > 0 else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000.0,
+        "p99_ms": percentile(latencies, 99) * 1000.0,
+        "max_ms": max(latencies) * 1000.0 if latencies else 0.0,
+    }
+
+
+async def _main(args: argparse.Namespace) -> Dict[str, float]:
+    server: Optional[GameServer] = None
+    host, port = args.host, args.port
+    if args.port == 0:
+        # No external server given: host one in this process on a free port.
+        data_manager = GameDataManager()
+        data_manager.load_all_data(args.data)
+        server = GameServer(data_manager, host, 0)
+        await server.start()
+        port = server.port
+    try:
+        return await run_load_test(host, port, args.idle, args.active, args.commands)
+    finally:
+        if server is not None:
+            await server.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test for the RPG game server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0, help="Server port; 0 starts an in-process server.")
+    parser.add_argument("--data", default="Game Csv Data", help="CSV directory for the in-process server.")
+    parser.add_argument("--idle", type=int, default=1000, help="Number of idle sessions.")
+    parser.add_argument("--active", type=int, default=50, help="Number of sessions sending commands.")
+    parser.add_argument("--commands", type=int, default=20, help="Commands sent per active session.")
+    args = parser.parse_args()
+
+    # Each session needs a client and (in-process) a server socket.
+    _raise_open_file_limit(2 * (args.idle + args.active) + 256)
+    report = asyncio.run(_main(args))
+    print("\n--- Load Test Report ---")
+    print(f"Idle sessions held open: {int(report['idle_sessions'])}")
+    print(f"Active sessions: {int(report['active_sessions'])}, commands: {int(report['commands'])}")
+    print(f"Throughput: {report['commands_per_second']:.0f} commands/s")
+    print(f"Latency p50: {report['p50_ms']:.2f} ms | p99: {report['p99_ms']:.2f} ms | max: {report['max_ms']:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
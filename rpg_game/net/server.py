@@ -0,0 +1,124 @@
+import argparse
+import asyncio
+from typing import Optional, Set
+
+try:
+    from rpg_game.data.game_data_manager import GameDataManager
+    from rpg_game.ui.game_io import StreamIO
+    from rpg_game.ui.menu import run_game_session
+    from rpg_game.utils import metrics
+except ImportError: # Fallback when run from inside the rpg_game directory
+    from data.game_data_manager import GameDataManager
+    from ui.game_io import StreamIO
+    from ui.menu import run_game_session
+    from utils import metrics
+
+
+class GameServer:
+    """
+    Hosts many concurrent player sessions in one process over a line-based TCP protocol.
+
+    Each connection runs the same menu as the console game. Lines sent by the server
+    that start with PROMPT_PREFIX mean it is waiting for one line of input.
+    All sessions share one read-only GameDataManager.
+    """
+    def __init__(self, data_manager: GameDataManager, host: str = "127.0.0.1", port: int = 0):
+        """
+        Initializes the server.
+
+        Args:
+            data_manager: A loaded GameDataManager shared by every session.
+            host: Interface to bind.
+            port: TCP port to bind; 0 picks a free port (see `port` after start()).
+        """
+        self.data_manager: GameDataManager = data_manager
+        self.host: str = host
+        self.port: int = port
+        self.active_sessions: int = 0
+        self.total_sessions: int = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        """Starts listening. The bound port is stored in self.port."""
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port,
+                                                  backlog=4096)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        """Starts the server (if needed) and serves until cancelled."""
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """Stops accepting connections and ends all running sessions."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Runs one player session for the lifetime of a connection."""
+        task = asyncio.current_task()
+        self._tasks.add(task)
+        self.active_sessions += 1
+        self.total_sessions += 1
+        try:
+            await run_game_session(StreamIO(reader, writer), self.data_manager)
+        except asyncio.CancelledError:
+            pass # Server shutting down; the session simply ends
+        finally:
+            self.active_sessions -= 1
+            self._tasks.discard(task)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, asyncio.CancelledError):
+                pass
+
+
+async def _serve(host: str, port: int, base_csv_path: str) -> None:
+    data_manager = GameDataManager()
+    data_manager.load_all_data(base_csv_path, use_cache=True)
+    server = GameServer(data_manager, host, port)
+    await server.start()
+    print(f"RPG server listening on {server.host}:{server.port}")
+    await server.serve_forever()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Multi-session RPG game server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7777)
+    parser.add_argument("--data", default="Game Csv Data", help="Directory containing the game CSV files.")
+    parser.add_argument("--metrics", metavar="PATH", nargs="?", const="-",
+                        help="Record combat and loading metrics; written on shutdown to PATH "
+                             "(.json for JSON, otherwise Prometheus text) or stdout.")
+    args = parser.parse_args()
+    if args.metrics:
+        metrics.enable()
+    try:
+        asyncio.run(_serve(args.host, args.port, args.data))
+    except KeyboardInterrupt:
+        print("\nServer stopped.")
+    finally:
+        if args.metrics:
+            _write_metrics(args.metrics)
+
+
+def _write_metrics(path: str) -> None:
+    text = metrics.registry.to_json() if path.endswith(".json") else metrics.registry.to_prometheus()
+    if path == "-":
+        print(text)
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,20 @@
+try:
+    from rpg_game.core.enemy import Enemy
+except ImportError:
+    import os
+    import sys
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+    from rpg_game.core.enemy import Enemy
+
+
+def make_enemy(skills=(), **fields) -> Enemy:
+    """
+    Returns a level 1 Ogre for tests: 60 HP, 25 attack, 4 defense, 10 MP, 3 magic
+    attack, 2 magic defense, 5 agility and no loot. Keyword arguments override any
+    Enemy field, e.g. make_enemy([SMASH], max_hp=120, enemy_type="Ice").
+    """
+    values = dict(name="Ogre", max_hp=60, attack_power=25, defense=4, level_range="1", spawn_chance="Common",
+                  enemy_type="Giant", max_mp=10, magic_attack=3, magic_defense=2, agility=5, luck=1,
+                  has_sprite=False, abilities_spells=list(skills), loot=[])
+    values.update(fields)
+    return Enemy(**values)
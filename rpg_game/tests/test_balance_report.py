@@ -0,0 +1,130 @@
+import unittest
+import contextlib
+import csv
+import io
+import os
+import tempfile
+
+try:
+    from rpg_game.balance.report import (BalanceReport, LevelBand, MatchupResult, ReferenceBuild, flag_outliers,
+                                         load_cache, main, make_bands, make_player, parse_bands, save_cache)
+    from rpg_game.data.game_data_manager import DATA_FILES, GameDataManager
+    from rpg_game.utils.output import NullSink, use_sink
+except ImportError:
+    import sys
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+    from rpg_game.balance.report import (BalanceReport, LevelBand, MatchupResult, ReferenceBuild, flag_outliers,
+                                         load_cache, main, make_bands, make_player, parse_bands, save_cache)
+    from rpg_game.data.game_data_manager import DATA_FILES, GameDataManager
+    from rpg_game.utils.output import NullSink, use_sink
+
+DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..', "Game Csv Data"))
+
+ENEMY_HEADER = ["Name", "Level Range", "Spawn Chance", "Type", "Max Hp Lowest Level", "Max Mp", "Attack", "Defense",
+                "M.Attack", "M.Defense.", "Agility", "Luck", "Has Sprite?", "Abilitys & Spells", "", "Enemy Loot"]
+
+
+class TestBandsAndFlags(unittest.TestCase):
+
+    def test_bands(self):
+        self.assertEqual(make_bands(10, 25), [LevelBand(1, 10), LevelBand(11, 20), LevelBand(21, 25)])
+        self.assertEqual(parse_bands("1-5, 6-10,12"), [LevelBand(1, 5), LevelBand(6, 10), LevelBand(12, 12)])
+        self.assertEqual(LevelBand(6, 10).label, "6-10")
+        with self.assertRaises(ValueError):
+            parse_bands("10-5")
+
+    def test_outliers_are_relative_to_the_zone(self):
+        results = [MatchupResult("Zone", "1-10", name, 10, wins, turns)
+                   for name, wins, turns in (("a", 10, 50), ("b", 10, 60), ("c", 10, 40),
+                                             ("slow", 10, 200), ("fast", 10, 10), ("deadly", 2, 10))]
+        flags = {result.enemy: result.flags for result in flag_outliers(results)}
+        self.assertEqual(flags, {"a": (), "b": (), "c": (), "slow": ("slow",), "fast": ("fast",), "deadly": ("deadly",)})
+        self.assertIsNone(MatchupResult("Zone", "1-10", "x", 4, 0, 0).mean_ttk)
+        self.assertEqual(MatchupResult("Zone", "1-10", "x", 4, 0, 0).death_rate, 1.0)
+
+
+@unittest.skipUnless(os.path.isdir(DATA_DIR), "game data not available")
+class TestBalanceReport(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.overlay = os.path.join(cls.temp_dir.name, "overlay")
+        os.makedirs(cls.overlay)
+        with open(os.path.join(cls.overlay, DATA_FILES["enemies"]), 'w', newline='', encoding='utf-8') as f:
+            csv.writer(f).writerows([
+                ENEMY_HEADER,
+                ["Forest Zone"] + [""] * 15,
+                ["Squirrelkin", "1-2", "Common", "Physical", "60", "0", "5", "1", "3", "8", "2", "2", "Yes", "", "", ""],
+            ])
+        with use_sink(NullSink()):
+            cls.data_manager = GameDataManager()
+            cls.data_manager.load_all_data(DATA_DIR)
+            cls.edited = cls.data_manager.with_overlays(cls.overlay)
+        cls.bands = [LevelBand(1, 3), LevelBand(4, 6)]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+
+    def test_reference_build(self):
+        plain = make_player(ReferenceBuild(), 5, self.data_manager)
+        self.assertEqual(plain.level, 5)
+        self.assertEqual(plain.hp, plain.max_hp)
+        build = ReferenceBuild("Knife", {"constitution": 2}, ("Rusty Knife",))
+        equipped = make_player(build, 5, self.data_manager)
+        self.assertEqual(equipped.derived_stats['attack_power'],
+                         plain.derived_stats['attack_power'] + self.data_manager.get_item("Rusty Knife").attack_bonus)
+        self.assertEqual(equipped.max_hp, plain.max_hp + 20)
+        with self.assertRaises(ValueError):
+            make_player(ReferenceBuild("Bad", equipment=("No Such Item",)), 1, self.data_manager)
+        with self.assertRaises(ValueError):
+            make_player(ReferenceBuild("Bad", {"charisma": 1}), 1, self.data_manager)
+
+    def test_every_zone_enemy_is_measured(self):
+        report = BalanceReport(self.data_manager, ReferenceBuild(), self.bands).run()
+        expected = sum(len([name for name in zone.enemy_names if name in self.data_manager.enemies])
+                       for zone in self.data_manager.zones.values()) * len(self.bands)
+        self.assertEqual(len(report.results), expected)
+        self.assertEqual({(cell.zone, cell.band) for cell in report.summaries},
+                         {(result.zone, result.band) for result in report.results})
+        for result in report.results:
+            low, high = self.data_manager.enemy_scaling.level_bounds(result.enemy)
+            self.assertEqual(result.fights, 3 * (high - low + 1))
+
+    def test_only_changed_enemies_are_simulated_again(self):
+        cache = {}
+        first = BalanceReport(self.data_manager, ReferenceBuild(), self.bands, cache).run()
+        self.assertGreater(first.simulated, 0)
+        again = BalanceReport(self.data_manager, ReferenceBuild(), self.bands, cache).run()
+        self.assertEqual(again.simulated, 0)
+        self.assertEqual(again.results, first.results)
+        edited = BalanceReport(self.edited, ReferenceBuild(), self.bands, cache).run()
+        self.assertEqual(edited.simulated, len(self.bands)) # Squirrelkin, once per band
+        stronger = BalanceReport(self.data_manager, ReferenceBuild("Strong", {"strength": 3}), self.bands, cache).run()
+        self.assertEqual(stronger.simulated, first.simulated)
+
+    def test_cache_file_round_trips(self):
+        path = os.path.join(self.temp_dir.name, "cache", "results.json")
+        self.assertEqual(load_cache(path), {})
+        save_cache(path, {"a:b": [4, 3, 12]})
+        self.assertEqual(load_cache(path), {"a:b": [4, 3, 12]})
+
+    def test_command_line(self):
+        output_dir = os.path.join(self.temp_dir.name, "report")
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            self.assertEqual(main(["--data", DATA_DIR, "--bands", "1-2", "--output-dir", output_dir]), 0)
+        self.assertIn("simulated", out.getvalue())
+        for name in ("heatmap.csv", "matchups.csv", "report.html", "balance_cache.json"):
+            self.assertTrue(os.path.exists(os.path.join(output_dir, name)), name)
+        with open(os.path.join(output_dir, "heatmap.csv"), newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual({row["Zone"] for row in rows}, set(self.data_manager.zones))
+        with open(os.path.join(output_dir, "report.html"), encoding='utf-8') as f:
+            page = f.read()
+        self.assertIn("Mean turns to kill", page)
+        self.assertNotIn("<script", page)
+
+
+if __name__ == '__main__':
+    unittest.main()
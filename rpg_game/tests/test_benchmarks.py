@@ -0,0 +1,48 @@
+import unittest
+import os
+import csv
+import tempfile
+
+try:
+    from rpg_game.benchmarks.suite import compare_results, make_synthetic_sheets, measure
+except ImportError:
+    import sys
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+    from rpg_game.benchmarks.suite import compare_results, make_synthetic_sheets, measure
+
+
+def _results(**values) -> dict:
+    return {"results": {name: {"value": value, "unit": "ops/s"} for name, value in values.items()}}
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+
+    def test_compare_results_flags_regressions_beyond_threshold(self):
+        baseline = _results(fights=1000.0, loads=10.0, saves=500.0)
+        current = _results(fights=700.0, loads=9.0, saves=800.0, spawns=50.0)
+        regressions, lines = compare_results(current, baseline, threshold=0.25)
+        self.assertEqual([r.name for r in regressions], ["fights"])
+        self.assertAlmostEqual(regressions[0].change, -0.3)
+        self.assertEqual(len(lines), 4)
+        self.assertIn("no baseline", lines[3])
+
+    def test_synthetic_sheets_repeat_data_rows_only(self):
+        with tempfile.TemporaryDirectory() as source, tempfile.TemporaryDirectory() as target:
+            with open(os.path.join(source, "Enemy's Sheet.csv"), 'w', newline='', encoding='utf-8') as f:
+                csv.writer(f).writerows([
+                    ["Name", "Level Range", "Max Hp"],
+                    ["Forest Zone", "", ""],
+                    ["Goblin", "1-3", "30"],
+                ])
+            make_synthetic_sheets(source, target, 3)
+            with open(os.path.join(target, "Enemy's Sheet.csv"), newline='', encoding='utf-8') as f:
+                names = [row[0] for row in csv.reader(f)]
+        self.assertEqual(names, ["Name", "Forest Zone", "Goblin", "Goblin 2", "Goblin 3"])
+
+    def test_measure_returns_rate(self):
+        rate = measure(lambda: 10, min_time=0.01, repeat=2)
+        self.assertGreater(rate, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
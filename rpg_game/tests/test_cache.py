@@ -0,0 +1,139 @@
+import unittest
+import os
+
+try:
+    from rpg_game.utils.cache import Cache, all_stats, invalidate, memoize
+    from rpg_game.utils.metrics import registry as metrics
+except ImportError:
+    import sys
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+    from rpg_game.utils.cache import Cache, all_stats, invalidate, memoize
+    from rpg_game.utils.metrics import registry as metrics
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestCache(unittest.TestCase):
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = Cache("test_lru", max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1) # "b" is now the least recently used
+        cache.put("c", 3)
+        self.assertNotIn("b", cache)
+        self.assertEqual((cache.get("a"), cache.get("b"), cache.get("c")), (1, None, 3))
+        stats = cache.stats()
+        self.assertEqual((stats.size, stats.hits, stats.misses, stats.evictions), (2, 3, 1, 1))
+        self.assertAlmostEqual(stats.hit_rate, 0.75)
+
+    def test_entries_expire(self):
+        clock = FakeClock()
+        cache = Cache("test_ttl", ttl=10, clock=clock)
+        cache.put("a", 1)
+        clock.now = 5
+        cache.put("b", 2)
+        clock.now = 10
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("b"), 2)
+        clock.now = 20
+        self.assertEqual(cache.purge_expired(), 1)
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.stats().expirations, 2)
+
+    def test_tags_are_hierarchical(self):
+        cache = Cache("test_tags")
+        cache.put("stats", 1, ["player:42:equipment"])
+        cache.put("skills", 2, ["player:42:skills"])
+        cache.put("other", 3, ["player:420"])
+        cache.put("weapon", 4, ["data:weapons", "player:42:equipment"])
+        self.assertEqual(cache.invalidate_tag("player:42:equipment"), 2)
+        self.assertEqual(sorted(key for key in ("stats", "skills", "other", "weapon") if key in cache), ["other", "skills"])
+        self.assertEqual(cache.invalidate_tag("player:42"), 1)
+        self.assertIn("other", cache)
+        cache.put("other", 5) # Replacing an entry drops its old tags
+        self.assertEqual(cache.invalidate_tag("player:420"), 0)
+        self.assertEqual(cache.stats().invalidations, 3)
+
+    def test_invalidate_reaches_every_cache(self):
+        first, second = Cache("test_first"), Cache("test_second")
+        # Tags no module cache uses, so entries cached by other tests do not count
+        first.put("a", 1, ["test_data:weapons"])
+        second.put("b", 2, ["test_data:weapons"])
+        second.put("c", 3, ["test_data:skills"])
+        self.assertEqual(invalidate("test_data:weapons"), 2)
+        self.assertEqual((len(first), len(second)), (0, 1))
+        self.assertIn("test_second", all_stats())
+
+    def test_get_or_compute_caches_none(self):
+        cache = Cache("test_compute")
+        calls = []
+        for _ in range(2):
+            self.assertIsNone(cache.get_or_compute("k", lambda: calls.append(1)))
+        self.assertEqual(len(calls), 1)
+
+    def test_metrics_are_recorded_when_enabled(self):
+        cache = Cache("test_metrics", max_entries=1)
+        hits = metrics.counter("rpg_cache_requests_total", cache="test_metrics", result="hit")
+        evictions = metrics.counter("rpg_cache_evictions_total", cache="test_metrics", reason="size")
+        before = (hits.value, evictions.value)
+        was_enabled = metrics.enabled
+        metrics.enabled = True
+        try:
+            cache.put("a", 1)
+            cache.get("a")
+            cache.put("b", 2)
+        finally:
+            metrics.enabled = was_enabled
+        self.assertEqual((hits.value - before[0], evictions.value - before[1]), (1, 1))
+
+    def test_rejects_empty_caches(self):
+        with self.assertRaises(ValueError):
+            Cache("test_empty", max_entries=0)
+
+
+class TestMemoize(unittest.TestCase):
+
+    def test_results_are_cached_per_arguments(self):
+        calls = []
+
+        @memoize(max_entries=2, tags=lambda name, level=1: [f"enemy:{name}"])
+        def scaled(name, level=1):
+            calls.append((name, level))
+            return f"{name}@{level}"
+
+        self.assertEqual(scaled("Goblin"), "Goblin@1")
+        self.assertEqual(scaled("Goblin"), "Goblin@1")
+        self.assertEqual(scaled("Goblin", level=3), "Goblin@3")
+        self.assertEqual(calls, [("Goblin", 1), ("Goblin", 3)])
+        self.assertEqual(scaled.__name__, "scaled")
+        self.assertEqual(scaled.cache.max_entries, 2)
+        self.assertEqual(invalidate("enemy:Goblin"), 2)
+        scaled("Goblin")
+        self.assertEqual(len(calls), 3)
+        scaled.cache_clear()
+        self.assertEqual(len(scaled.cache), 0)
+
+    def test_custom_keys_and_shared_caches(self):
+        shared = Cache("test_shared")
+
+        @memoize(shared, key=lambda player, stat: (player["id"], stat))
+        def stat_of(player, stat):
+            return player[stat]
+
+        player = {"id": 42, "attack": 10}
+        self.assertEqual(stat_of(player, "attack"), 10)
+        player["attack"] = 99 # Not part of the key, so the cached value is returned
+        self.assertEqual(stat_of(player, "attack"), 10)
+        self.assertIs(stat_of.cache, shared)
+        self.assertIn((42, "attack"), shared)
+
+
+if __name__ == '__main__':
+    unittest.main()
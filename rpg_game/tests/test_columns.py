@@ -0,0 +1,113 @@
+import unittest
+import csv
+import os
+import tempfile
+
+try:
+    from rpg_game.data.columns import Column, ColumnPlan, is_header_row
+    from rpg_game.data.enemy_loader import load_enemies_from_csv
+    from rpg_game.data.item_loader import load_weapons_from_csv
+    from rpg_game.data.skill_loader import load_skills_from_csv
+    from rpg_game.utils.output import MemorySink, use_sink
+except ImportError:
+    import sys
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+    from rpg_game.data.columns import Column, ColumnPlan, is_header_row
+    from rpg_game.data.enemy_loader import load_enemies_from_csv
+    from rpg_game.data.item_loader import load_weapons_from_csv
+    from rpg_game.data.skill_loader import load_skills_from_csv
+    from rpg_game.utils.output import MemorySink, use_sink
+
+COLUMNS = (
+    Column("tier", ("Tier",), 1),
+    Column("attack", ("Attack", "Attack Damage"), 2, int),
+    Column("notes", ("Notes",), 3),
+)
+
+ENEMY_HEADER = ["Name", "Level Range", "Spawn Chance", "Type", "Max Hp Lowest Level", "Max Mp", "Attack", "Defense",
+                "M.Attack", "M.Defense.", "Agility", "Luck", "Has Sprite?", "Abilitys & Spells", "", "Enemy Loot"]
+ENEMY_ROWS = [
+    ["Forest Zone"] + [""] * 15,
+    ["Squirrelkin", "1-2", "Common", "Beast", "45", "0", "5", "1", "3", "8", "2", "2", "Yes", "", "", ""],
+]
+
+
+class TestColumnPlan(unittest.TestCase):
+
+    def test_columns_are_found_by_header_name(self):
+        plan = ColumnPlan(COLUMNS, ["Name", "Notes", " attack damage ", "TIER"])
+        self.assertEqual(plan.read(["Sword", "sharp", "7", " Rare "]), {"tier": "Rare", "attack": 7, "notes": "sharp"})
+        self.assertEqual(plan.matched, 3)
+
+    def test_unnamed_columns_use_their_default_position(self):
+        plan = ColumnPlan(COLUMNS, ["Name", "Attack", "", ""])
+        self.assertEqual(plan.missing, ["tier", "notes"])
+        # "tier" defaults to column 1, which the header gives to "attack", so it reads as empty
+        self.assertEqual(plan.read(["Sword", "7", "", "sharp"]), {"tier": "", "attack": 7, "notes": "sharp"})
+
+    def test_short_rows_are_padded(self):
+        plan = ColumnPlan(COLUMNS)
+        self.assertEqual(plan.read(["Sword", "Rare", "3"]), {"tier": "Rare", "attack": 3, "notes": ""})
+        self.assertEqual(plan.cell(["Sword"], "notes"), "")
+
+    def test_header_rows_are_told_apart_from_titles_and_data(self):
+        self.assertTrue(is_header_row(["Swords Level 1-50", "Tier", "Attack"], COLUMNS))
+        self.assertFalse(is_header_row(["Swords Level 50-80", "", ""], COLUMNS))
+        self.assertFalse(is_header_row(["Iron Sword", "Common", "7"], COLUMNS))
+
+
+class TestLoadersFollowTheHeader(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write(self, name, rows):
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            csv.writer(f).writerows(rows)
+        return path
+
+    def test_reordered_enemy_columns_load_the_same_enemies(self):
+        order = list(reversed(range(len(ENEMY_HEADER))))
+        order.remove(0)
+        order.insert(0, 0) # Zone markers are recognised by the first cell
+        paths = [self._write("canonical.csv", [ENEMY_HEADER] + ENEMY_ROWS),
+                 self._write("reordered.csv", [[row[i] for i in order] for row in [ENEMY_HEADER] + ENEMY_ROWS])]
+        sink = MemorySink()
+        with use_sink(sink):
+            loaded = [load_enemies_from_csv(path, {}, {}) for path in paths]
+        self.assertEqual([e for e in sink.events if e.kind == "warning"], [])
+        (canonical, canonical_zones), (reordered, reordered_zones) = loaded
+        self.assertEqual(list(reordered_zones), ["Forest Zone"])
+        self.assertEqual(vars(reordered["Squirrelkin"]), vars(canonical["Squirrelkin"]))
+        self.assertEqual(reordered["Squirrelkin"].magic_defense, 8)
+
+    def test_weapon_sections_keep_their_first_row(self):
+        path = self._write("weapons.csv", [
+            ["Swords Level 1-50", "Level Range", "Tier", "Source", "Attack Type", "Attack"],
+            ["Rusty Sword", "1-3", "Trash", "Dropped", "Physical", "3"],
+            ["Swords Level 50-80", "", "", "", "", ""],
+            ["", "", "", "", "", ""],
+            ["Blade of Sheol", "55-59", "Epic", "Dropped", "Fire", "46"],
+        ])
+        weapons = load_weapons_from_csv(path)
+        self.assertEqual(list(weapons), ["Rusty Sword", "Blade of Sheol"])
+        self.assertEqual((weapons["Blade of Sheol"].tier, weapons["Blade of Sheol"].source), ("Epic", "Dropped"))
+        self.assertEqual(weapons["Blade of Sheol"].attack_bonus, 46)
+
+    def test_skill_section_headers_may_move_columns(self):
+        path = self._write("skills.csv", [
+            ["Light Spells", "", "Scope", "Cost", "Formula", "Effects", "Description"],
+            ["Heal", "", "Single", "10", "a.mat * 2", "Restores HP", "Heals an ally."],
+        ])
+        heal = load_skills_from_csv(path)["Heal"]
+        self.assertEqual((heal.scope, heal.cost, heal.formula), ("Single", "10", "a.mat * 2"))
+        self.assertEqual((heal.effects_csv, heal.description), ("Restores HP", "Heals an ally."))
+        self.assertEqual(heal.skill_type_csv, "Active") # Default position is taken by "Scope"
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import os
+
+try:
+    from rpg_game.core.elements import NEUTRAL, AffinityMatrix, normalize_element
+    from rpg_game.core.enemy_scaling import EnemyScalingTable
+    from rpg_game.core.equipment import Equipment
+    from rpg_game.core.fight_state import FightSetup
+    from rpg_game.core.player import Player
+    from rpg_game.core.skill import Ability
+    from rpg_game.tests.factories import make_enemy
+except ImportError:
+    import sys
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+    from rpg_game.core.elements import NEUTRAL, AffinityMatrix, normalize_element
+    from rpg_game.core.enemy_scaling import EnemyScalingTable
+    from rpg_game.core.equipment import Equipment
+    from rpg_game.core.fight_state import FightSetup
+    from rpg_game.core.player import Player
+    from rpg_game.core.skill import Ability
+    from rpg_game.tests.factories import make_enemy
+
+
+FIREBALL = Ability("Fireball", "", "Common", "Active", "Magic", dmg_type="Hp Damage", element="Fire",
+                   formula="a.atk * 2 - b.def")
+
+
+class TestElements(unittest.TestCase):
+
+    def test_normalize_element(self):
+        self.assertEqual(normalize_element("Nil Element"), NEUTRAL)
+        self.assertEqual(normalize_element("Null"), NEUTRAL)
+        self.assertEqual(normalize_element("2 ~ 3"), NEUTRAL) # Duration in the element column
+        self.assertEqual(normalize_element("  fire "), "Fire")
+
+    def test_matrix_lookup(self):
+        matrix = AffinityMatrix(["Fire", "Ice", "Nil Element", "Physical"])
+        self.assertEqual(matrix.names, [NEUTRAL, "Fire", "Ice", "Physical"])
+        fire, ice = matrix.id_of("Fire"), matrix.id_of("ice")
+        self.assertEqual(matrix.multiplier(fire, ice), 1.5)
+        self.assertEqual(matrix.multiplier(ice, fire), 0.5)
+        self.assertEqual(matrix.multiplier(matrix.id_of("Physical"), ice), 1.0)
+        self.assertEqual(matrix.id_of("Unknown"), 0)
+        self.assertEqual(matrix.scale(11, fire, ice), 16)
+
+    def test_defense_row_applies_equipment_resistances(self):
+        matrix = AffinityMatrix(["Fire", "Ice"])
+        cloak = Equipment("Ember Cloak", "", "Rare", "Body", extra_increases="Fire Res + 40%")
+        row = matrix.defense_row(matrix.id_of("Ice"), [cloak])
+        self.assertAlmostEqual(row[matrix.id_of("Fire")], 0.9) # 1.5 weakness, then 40% resisted
+        self.assertEqual(row[matrix.id_of("Ice")], 0.5)
+
+    def test_ids_are_assigned_and_kept_by_spawns(self):
+        enemy = make_enemy(name="Ice Slime", enemy_type="Ice")
+        matrix = AffinityMatrix(["Fire", "Ice"])
+        matrix.assign_ids(skills=[FIREBALL], enemies=[enemy])
+        self.assertEqual((FIREBALL.element_id, enemy.type_id), (matrix.id_of("Fire"), matrix.id_of("Ice")))
+        spawned = EnemyScalingTable({enemy.name: enemy}).spawn(enemy.name, 2)
+        self.assertEqual(spawned.type_id, enemy.type_id)
+
+    def test_fight_setup_folds_affinities_into_damage(self):
+        enemy = make_enemy([FIREBALL], name="Ice Slime", enemy_type="Ice")
+        player = Player("Hero")
+        player.known_abilities.append(FIREBALL)
+        matrix = AffinityMatrix(["Fire", "Ice"])
+        matrix.assign_ids(skills=[FIREBALL], enemies=[enemy])
+        plain = FightSetup(player, enemy)
+        elemental = FightSetup(player, enemy, affinities=matrix)
+        self.assertEqual(elemental.player_actions[1].damage, int(plain.player_actions[1].damage * 1.5))
+        self.assertEqual(elemental.enemy_actions[1].damage, plain.enemy_actions[1].damage) # The player is neutral
+        cloak = Equipment("Ember Cloak", "", "Rare", "Body", extra_increases="Fire Res + 50%")
+        protected = FightSetup(player, enemy, affinities=matrix, player_equipment=[cloak])
+        self.assertEqual(protected.enemy_actions[1].damage, plain.enemy_actions[1].damage // 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
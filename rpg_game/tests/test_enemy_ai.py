@@ -0,0 +1,156 @@
+import unittest
+import os
+
+try:
+    from rpg_game.core import combat
+    from rpg_game.core.enemy_ai import (ExpectimaxPolicy, GreedyPolicy, KILL_VALUE, RandomPolicy, SkillTable,
+                                        SkillTableCache, TranspositionCache, parse_mp_cost, parse_status_chance)
+    from rpg_game.core.formula import battler_params
+    from rpg_game.core.player import Player
+    from rpg_game.core.skill import Ability, PassiveSkill
+    from rpg_game.utils.output import NullSink, use_sink
+    from rpg_game.tests.factories import make_enemy
+except ImportError:
+    import sys
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+    from rpg_game.core import combat
+    from rpg_game.core.enemy_ai import (ExpectimaxPolicy, GreedyPolicy, KILL_VALUE, RandomPolicy, SkillTable,
+                                        SkillTableCache, TranspositionCache, parse_mp_cost, parse_status_chance)
+    from rpg_game.core.formula import battler_params
+    from rpg_game.core.player import Player
+    from rpg_game.core.skill import Ability, PassiveSkill
+    from rpg_game.utils.output import NullSink, use_sink
+    from rpg_game.tests.factories import make_enemy
+
+
+def _skill(name, formula="", cost="", effects="", variance="", dmg_type="Hp Damage") -> Ability:
+    return Ability(name, "", "Common", "Active", "Monster", cost=cost, dmg_type=dmg_type, formula=formula,
+                   effects_csv=effects, variance=variance)
+
+
+# Against the default Player (15 defense): basic attack 10, Smash 35, Frenzy 5 at full HP.
+SMASH = _skill("Smash", "a.atk * 2 - b.def", cost="10")
+FRENZY = _skill("Frenzy", "a.atk * (2 - a.hp / a.mhp) - 20")
+HEX = _skill("Hex", "0", effects="Def Down 50%")
+# Formulas that are not damage: a buff, a self-heal of 40 and a 35 damage drain.
+ROAR = _skill("Roar", "a.atk * 2", dmg_type="Buff")
+MEND = _skill("Mend", "40", dmg_type="HP Recover")
+LEECH = _skill("Leech", "a.atk * 2 - b.def", dmg_type="Hp Drain")
+
+
+class TestSkillTable(unittest.TestCase):
+
+    def test_parsing(self):
+        self.assertEqual(parse_mp_cost("10"), 10)
+        self.assertEqual(parse_mp_cost("5 MP"), 5)
+        self.assertEqual(parse_mp_cost("10% HP"), 0)
+        self.assertEqual(parse_status_chance("Burn 45%"), 0.45)
+        self.assertEqual(parse_status_chance("Def Down  2 Turns"), 1.0)
+        self.assertEqual(parse_status_chance(""), 0.0)
+
+    def test_rows(self):
+        passive = PassiveSkill("Thick Hide", "", "Common", "Passive", "Monster")
+        table = SkillTable(make_enemy([SMASH, passive, FRENZY, HEX]), battler_params(Player("Hero")), status_value=8)
+        self.assertEqual([action.skill for action in table.actions], [None, SMASH, FRENZY, HEX])
+        self.assertEqual([action.damage for action in table.actions], [10, 35, 5, 0])
+        self.assertEqual(table.actions[1].mp_cost, 10)
+        self.assertEqual(table.actions[3].status_value, 4)
+        self.assertEqual([action.state_dependent for action in table.actions], [False, False, True, False])
+        self.assertEqual(table.damage_at(2, 30, 10), 17) # Frenzy hits harder when hurt
+        self.assertEqual(table.affordable(5), [0, 2, 3])
+
+    def test_rows_follow_the_dmg_type(self):
+        table = SkillTable(make_enemy([ROAR, MEND, LEECH]), battler_params(Player("Hero")))
+        self.assertEqual([action.damage for action in table.actions], [10, 0, 0, 35])
+        self.assertEqual([action.heal for action in table.actions], [0, 0, 40, 0])
+        self.assertEqual([action.drain for action in table.actions], [False, False, False, True])
+        self.assertIsNone(table.actions[1].formula)
+        self.assertEqual(table.healed(2, 30, 0), 30) # Capped at max HP
+        self.assertEqual(table.healed(3, 50, 35), 10)
+
+    def test_tables_are_shared_per_template(self):
+        tables = SkillTableCache()
+        player = Player("Hero")
+        first, second = make_enemy([SMASH]), make_enemy([SMASH])
+        second.hp = 1
+        self.assertIs(tables.get(first, player), tables.get(second, player))
+        self.assertEqual(len(tables), 1)
+
+
+class TestPolicies(unittest.TestCase):
+
+    def test_random_policy_keeps_original_odds(self):
+        class FixedRng:
+            def __init__(self, roll): self.roll = roll
+            def random(self): return self.roll
+            def choice(self, options): return options[-1]
+        enemy = make_enemy([SMASH, HEX])
+        self.assertIs(RandomPolicy(rng=FixedRng(0.1)).choose(enemy, Player("Hero")), HEX)
+        self.assertIsNone(RandomPolicy(rng=FixedRng(0.9)).choose(enemy, Player("Hero")))
+
+    def test_greedy_prefers_damage_it_can_afford(self):
+        policy = GreedyPolicy()
+        enemy, player = make_enemy([HEX, SMASH]), Player("Hero")
+        self.assertIs(policy.choose(enemy, player), SMASH)
+        enemy.mp = 5 # Enemies do not track MP yet; the policy reads it when present
+        self.assertIsNone(policy.choose(enemy, player))
+
+    def test_greedy_takes_the_finishing_blow(self):
+        policy = GreedyPolicy(mp_weight=100)
+        enemy, player = make_enemy([SMASH]), Player("Hero")
+        self.assertIsNone(policy.choose(enemy, player)) # MP is too precious for a normal hit...
+        player.hp = 30
+        self.assertIs(policy.choose(enemy, player), SMASH) # ...but not for the kill
+
+    def test_greedy_heals_when_hurt(self):
+        policy = GreedyPolicy()
+        enemy, player = make_enemy([ROAR, MEND]), Player("Hero")
+        self.assertIsNone(policy.choose(enemy, player)) # Nothing to heal at full HP
+        enemy.hp = 10
+        self.assertIs(policy.choose(enemy, player), MEND)
+
+    def test_expectimax_shares_the_transposition_cache(self):
+        cache, tables = TranspositionCache(), SkillTableCache()
+        greedy = GreedyPolicy(cache, tables)
+        search = ExpectimaxPolicy(depth=3, cache=cache, tables=tables)
+        enemy, player = make_enemy([FRENZY, SMASH]), Player("Hero")
+        self.assertIs(greedy.choose(enemy, player), SMASH)
+        self.assertIs(search.choose(enemy, player), SMASH)
+        entries = len(cache)
+        hits = cache.hits
+        self.assertIs(search.choose(enemy, player), SMASH)
+        self.assertEqual(len(cache), entries)
+        self.assertEqual(cache.hits, hits + 1)
+
+    def test_expectimax_value_of_a_won_race(self):
+        # Player has 10 HP left: the basic attack kills, so the best value is KILL_VALUE plus the damage.
+        search = ExpectimaxPolicy(depth=2)
+        table = search.tables.get(make_enemy([HEX]), Player("Hero"))
+        value, index = search._search(table, (60, 10, 10), 2)
+        self.assertEqual(index, 0)
+        self.assertEqual(value, KILL_VALUE + 10)
+
+
+class TestEnemyTurn(unittest.TestCase):
+
+    class Always:
+        def __init__(self, skill): self.skill = skill
+        def choose(self, enemy, player): return self.skill
+
+    def _turn(self, skill, enemy_hp=60):
+        enemy, player = make_enemy([skill]), Player("Hero")
+        enemy.hp = enemy_hp
+        with use_sink(NullSink()):
+            combat._enemy_turn(player, enemy, self.Always(skill))
+        return player.max_hp - player.hp, enemy.hp
+
+    def test_formula_skills_apply_by_dmg_type(self):
+        self.assertEqual(self._turn(SMASH), (35, 60))
+        self.assertEqual(self._turn(ROAR), (0, 60)) # A buff's formula is not damage
+        self.assertEqual(self._turn(MEND, enemy_hp=10), (0, 50))
+        self.assertEqual(self._turn(MEND, enemy_hp=40), (0, 60))
+        self.assertEqual(self._turn(LEECH, enemy_hp=10), (35, 45))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+import os
+import random
+
+try:
+    from rpg_game.core.enemy_scaling import EnemyScalingTable, GrowthCurve, parse_level_range
+    from rpg_game.tests.factories import make_enemy
+except ImportError:
+    import sys
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+    from rpg_game.core.enemy_scaling import EnemyScalingTable, GrowthCurve, parse_level_range
+    from rpg_game.tests.factories import make_enemy
+
+
+class TestParseLevelRange(unittest.TestCase):
+
+    def test_parse_level_range(self):
+        self.assertEqual(parse_level_range("1-2"), (1, 2))
+        self.assertEqual(parse_level_range("5"), (5, 5))
+        self.assertEqual(parse_level_range("20-20"), (20, 20))
+        self.assertEqual(parse_level_range(" 90 - 95 "), (90, 95))
+        self.assertEqual(parse_level_range("7-3"), (3, 7)) # Reversed range is normalized
+        self.assertEqual(parse_level_range(""), (1, 1))
+        self.assertEqual(parse_level_range("Boss", default_level=4), (4, 4))
+
+
+class TestEnemyScalingTable(unittest.TestCase):
+
+    def setUp(self):
+        self.templates = {
+            "Squirrelkin": make_enemy(name="Squirrelkin", level_range="1-3", max_hp=45, attack_power=5),
+            "River Sprite": make_enemy(name="River Sprite", level_range="10", max_hp=450),
+        }
+        self.table = EnemyScalingTable(self.templates, {"max_hp": GrowthCurve(0.5)})
+
+    def test_lowest_level_matches_sheet(self):
+        stats = self.table.get_stats("Squirrelkin", 1)
+        self.assertEqual(stats["max_hp"], 45)
+        self.assertEqual(stats["attack_power"], 5)
+
+    def test_growth_curve_applied(self):
+        self.assertEqual(self.table.get_stats("Squirrelkin", 3)["max_hp"], 90) # 45 * (1 + 0.5 * 2)
+        self.assertEqual(GrowthCurve(0.5, kind="exponential").scale(45, 2), 101) # 45 * 1.5 ** 2
+
+    def test_levels_clamped_to_range(self):
+        self.assertEqual(self.table.get_stats("Squirrelkin", 99), self.table.get_stats("Squirrelkin", 3))
+        self.assertEqual(self.table.level_bounds("River Sprite"), (10, 10))
+
+    def test_spawn_creates_independent_instance(self):
+        enemy = self.table.spawn("Squirrelkin", 2)
+        self.assertIsNot(enemy, self.templates["Squirrelkin"])
+        self.assertEqual(enemy.level, 2)
+        self.assertEqual(enemy.hp, enemy.max_hp)
+        enemy.take_damage(10)
+        self.assertEqual(self.templates["Squirrelkin"].hp, 45) # Template untouched
+
+    def test_spawn_batch_is_repeatable_with_seed(self):
+        first = self.table.spawn_batch(500, rng=random.Random(7))
+        second = self.table.spawn_batch(500, rng=random.Random(7))
+        self.assertEqual(len(first), 500)
+        self.assertEqual([(e.name, e.level) for e in first], [(e.name, e.level) for e in second])
+        for enemy in first:
+            low, high = self.table.level_bounds(enemy.name)
+            self.assertTrue(low <= enemy.level <= high)
+
+    def test_invalid_curve_kind(self):
+        with self.assertRaises(ValueError):
+            GrowthCurve(0.1, kind="cubic")
+
+
+if __name__ == '__main__':
+    unittest.main()
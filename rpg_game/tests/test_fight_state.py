@@ -0,0 +1,149 @@
+import unittest
+import asyncio
+import os
+
+try:
+    from rpg_game.core.autoplay import MCTSAutoplayer, autoplay
+    from rpg_game.core.combat import run_combat, simulate_basic_fight
+    from rpg_game.core.fight_state import ENEMY_HP, PLAYER_HP, PLAYER_MP, TURN, FightSetup
+    from rpg_game.core.player import Player
+    from rpg_game.core.skill import Ability, Spell
+    from rpg_game.ui.game_io import GameIO
+    from rpg_game.utils.output import NullSink, use_sink
+    from rpg_game.tests.factories import make_enemy
+except ImportError:
+    import sys
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+    from rpg_game.core.autoplay import MCTSAutoplayer, autoplay
+    from rpg_game.core.combat import run_combat, simulate_basic_fight
+    from rpg_game.core.fight_state import ENEMY_HP, PLAYER_HP, PLAYER_MP, TURN, FightSetup
+    from rpg_game.core.player import Player
+    from rpg_game.core.skill import Ability, Spell
+    from rpg_game.ui.game_io import GameIO
+    from rpg_game.utils.output import NullSink, use_sink
+    from rpg_game.tests.factories import make_enemy
+
+
+POWER_STRIKE = Ability("Power Strike", "", "Common", "Active", "Sword", cost="10", dmg_type="Hp Damage",
+                       formula="a.atk * 3 - b.def")
+REND = Ability("Rend", "", "Common", "Active", "Sword", effects_csv="Bleed 100%")
+SMASH = Ability("Smash", "", "Common", "Active", "Monster", cost="5", dmg_type="Hp Damage",
+                formula="a.atk * 2 - b.def", variance="20%")
+
+
+def _player(*skills) -> Player:
+    player = Player("Hero")
+    player.known_abilities.extend(skills)
+    return player
+
+
+class _Script(GameIO):
+    """Plays the given player actions (FightState indexes) in a loop, noting both sides' HP each round."""
+    def __init__(self, player, enemy, actions):
+        self.sink = NullSink()
+        self.player, self.enemy = player, enemy
+        self.actions = actions
+        self.rounds = []
+        self._pending = []
+
+    async def read_line(self, prompt: str = "") -> str:
+        if self._pending:
+            return self._pending.pop()
+        self.rounds.append((self.player.hp, self.enemy.hp))
+        action = self.actions[(len(self.rounds) - 1) % len(self.actions)]
+        if action == 0:
+            return "1"
+        self._pending.append(str(action))
+        return "2"
+
+
+class TestFightState(unittest.TestCase):
+
+    def test_basic_attacks_match_simulate_basic_fight(self):
+        player, enemy = _player(), make_enemy(max_hp=120)
+        state = FightSetup(player, enemy).initial_state()
+        while not state.is_over():
+            self.assertEqual(state.legal_actions(), [0])
+            state.apply(0)
+        expected = simulate_basic_fight(player, enemy)
+        self.assertEqual((state.player_won(), state.values[TURN], state.values[PLAYER_HP], state.values[ENEMY_HP]),
+                         tuple(expected))
+
+    def test_apply_and_undo_restore_the_exact_state(self):
+        state = FightSetup(_player(POWER_STRIKE, REND), make_enemy([SMASH], max_hp=120)).initial_state(seed=7)
+        start = state.key()
+        state.apply(1)
+        state.apply(2)
+        self.assertEqual(state.values[PLAYER_MP], 40)
+        self.assertEqual(state.statuses("enemy"), {"Bleed": 2}) # Ticked once at the end of the round
+        state.undo()
+        state.undo()
+        self.assertEqual(state.key(), start)
+
+    def test_clone_is_independent_and_deterministic(self):
+        state = FightSetup(_player(POWER_STRIKE), make_enemy([SMASH], max_hp=120)).initial_state(seed=3)
+        first, second = state.clone(), state.clone()
+        for _ in range(3):
+            first.apply(0)
+            second.apply(0)
+        self.assertEqual(first.key(), second.key())
+        self.assertEqual(state.values[TURN], 0)
+
+    def test_mp_and_cooldowns_limit_actions(self):
+        player = _player(POWER_STRIKE)
+        player.mp = 10
+        state = FightSetup(player, make_enemy(max_hp=120), cooldowns={"Rend": 2}).initial_state()
+        self.assertEqual(state.legal_actions(), [0, 1])
+        state.apply(1)
+        self.assertEqual(state.legal_actions(), [0])
+
+        state = FightSetup(_player(REND), make_enemy(max_hp=120), cooldowns={"Rend": 2}).initial_state()
+        state.apply(1)
+        self.assertEqual(state.legal_actions(), [0])
+        state.apply(0)
+        self.assertEqual(state.legal_actions(), [0])
+        state.apply(0)
+        self.assertEqual(state.legal_actions(), [0, 1])
+
+    def test_skills_match_run_combat(self):
+        drain = Ability("Leech", "", "Common", "Active", "Sword", dmg_type="HP Drain", formula="a.atk - b.def")
+        mend = Ability("Mend", "", "Common", "Active", "Sword", dmg_type="HP Recover", formula="20")
+        roar = Ability("Roar", "", "Common", "Active", "Sword", dmg_type="Buff", formula="a.atk * 9")
+        bolt = Spell("Bolt", "", "Common", "Active", "Magic", dmg_type="Hp Damage")
+        strike = Ability("Strike", "", "Common", "Active", "Sword", dmg_type="Hp Damage", formula="a.atk * 2 - b.def")
+        actions = [1, 2, 3, 4, 5, 0]
+
+        player, enemy = _player(drain, mend, roar, strike), make_enemy(max_hp=200)
+        player.known_spells.append(bolt)
+        state = FightSetup(player, enemy).initial_state()
+        self.assertEqual([action.name for action in state.setup.player_actions],
+                         ["Attack", "Leech", "Mend", "Roar", "Strike", "Bolt"])
+        expected = []
+        while not state.is_over():
+            expected.append((state.values[PLAYER_HP], state.values[ENEMY_HP]))
+            state.apply(actions[(len(expected) - 1) % len(actions)])
+
+        io = _Script(player, enemy, actions)
+        with use_sink(NullSink()):
+            asyncio.run(run_combat(player, enemy, io))
+        self.assertGreater(len(expected), len(actions))
+        self.assertEqual(io.rounds, expected)
+        self.assertEqual(enemy.hp, state.values[ENEMY_HP])
+
+
+class TestAutoplay(unittest.TestCase):
+
+    def test_mcts_uses_the_strong_skill(self):
+        state = FightSetup(_player(POWER_STRIKE, REND), make_enemy([SMASH], max_hp=120)).initial_state(seed=1)
+        self.assertEqual(MCTSAutoplayer(iterations=200, seed=1).choose(state), 1)
+
+    def test_autoplay_wins_what_basic_attacks_cannot(self):
+        player, enemy = _player(POWER_STRIKE), make_enemy([SMASH], max_hp=110, attack_power=35)
+        self.assertFalse(simulate_basic_fight(player, enemy).player_won)
+        result = autoplay(player, enemy, MCTSAutoplayer(iterations=100, seed=2), seed=2)
+        self.assertTrue(result.player_won)
+        self.assertEqual((player.hp, enemy.hp), (100, 110))
+
+
+if __name__ == '__main__':
+    unittest.main()
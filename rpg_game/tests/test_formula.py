@@ -0,0 +1,73 @@
+import unittest
+import os
+
+try:
+    from rpg_game.core.formula import FormulaError, battler_params, compile_formula, skill_formula
+    from rpg_game.core.combat import simulate_basic_fight
+    from rpg_game.core.player import Player
+    from rpg_game.core.skill import Ability
+    from rpg_game.tests.factories import make_enemy
+except ImportError:
+    import sys
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+    from rpg_game.core.formula import FormulaError, battler_params, compile_formula, skill_formula
+    from rpg_game.core.combat import simulate_basic_fight
+    from rpg_game.core.player import Player
+    from rpg_game.core.skill import Ability
+    from rpg_game.tests.factories import make_enemy
+
+
+class TestFormula(unittest.TestCase):
+
+    def test_sheet_formulas(self):
+        user = (20, 5, 12, 4, 10, 5, 50, 100, 10, 10)
+        target = (8, 4, 3, 2, 5, 1, 40, 40, 0, 0)
+        self.assertEqual(compile_formula("a.atk * 2 - b.def")(user, target), 36)
+        self.assertEqual(compile_formula("(a.atk * 1.5 - b.def) * 2")(user, target), 52)
+        self.assertEqual(compile_formula("a.mat * 1.5 - b.mdf")(user, target), 16)
+        self.assertEqual(compile_formula("a.atk * (1 + (1 - a.hp / a.mhp)) * 5")(user, target), 150)
+        self.assertEqual(compile_formula("max(1, b.def - a.atk)")(user, target), 1)
+
+    def test_damage_is_whole_and_non_negative(self):
+        formula = compile_formula("a.atk * 0.5 - b.def")
+        self.assertEqual(formula.damage((9,) * 10, (1,) * 10), 3)
+        self.assertEqual(formula.damage((1,) * 10, (9,) * 10), 0)
+        self.assertEqual(compile_formula("a.atk / b.def").damage((1,) * 10, (0,) * 10), 0)
+
+    def test_compiled_once(self):
+        self.assertIs(compile_formula("a.atk - b.def"), compile_formula("a.atk - b.def"))
+
+    def test_rejects_unsafe_or_invalid_formulas(self):
+        for source in ("Battle Screen", "__import__('os')", "a.foo", "a.atk.real", "c.atk", "a.__class__", "[1][0]"):
+            with self.assertRaises(FormulaError, msg=source):
+                compile_formula(source)
+
+    def test_skill_formula_and_params(self):
+        skill = Ability("Strike", "", "Common", "Active", "Sword", formula="a.atk * 2 - b.def")
+        self.assertIsNotNone(skill_formula(skill))
+        self.assertIsNone(skill_formula(Ability("Nothing", "", "Common", "Active", "Sword", formula="Battle Screen")))
+        player = Player("Hero")
+        enemy = make_enemy(max_hp=50, attack_power=8)
+        self.assertEqual(skill_formula(skill).damage(battler_params(player), battler_params(enemy)), 36)
+        self.assertEqual(battler_params(enemy)[6:], (50, 50, 10, 10))
+
+
+class TestSimulateBasicFight(unittest.TestCase):
+
+    def test_matches_turn_order_without_mutation(self):
+        player = Player("Hero") # 20 attack, 15 defense, 100 HP
+        enemy = make_enemy(max_hp=50) # Takes 16 per hit, deals 10
+        result = simulate_basic_fight(player, enemy)
+        self.assertTrue(result.player_won)
+        self.assertEqual(result.turns, 4)
+        self.assertEqual(result.player_hp, 70) # Enemy hit back on the first three turns
+        self.assertEqual((player.hp, enemy.hp), (100, 50))
+
+    def test_stalemate_is_a_loss(self):
+        result = simulate_basic_fight(Player("Hero"), make_enemy(attack_power=0, defense=100), max_turns=10)
+        self.assertFalse(result.player_won)
+        self.assertEqual(result.turns, 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import unittest
+import os
+import shutil
+import tempfile
+
+try:
+    from rpg_game.data.id_tables import ID_FILE, IdTable, read_id_tables, write_id_tables
+    from rpg_game.data.game_data_manager import DATA_FILES, GameDataManager
+    from rpg_game.core.item import Item
+    from rpg_game.world.zone import Zone
+    from rpg_game.utils.output import NullSink, use_sink
+except ImportError:
+    import sys
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+    from rpg_game.data.id_tables import ID_FILE, IdTable, read_id_tables, write_id_tables
+    from rpg_game.data.game_data_manager import DATA_FILES, GameDataManager
+    from rpg_game.core.item import Item
+    from rpg_game.world.zone import Zone
+    from rpg_game.utils.output import NullSink, use_sink
+
+DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..', "Game Csv Data"))
+
+
+class TestIdTable(unittest.TestCase):
+
+    def test_ids_are_sorted_dense_and_deterministic(self):
+        table = IdTable(["Wolf", "Goblin", "Bat", "Goblin"])
+        self.assertEqual(table.names, ["Bat", "Goblin", "Wolf"])
+        self.assertEqual([table.id_of(name) for name in ("Bat", "Goblin", "Wolf")], [0, 1, 2])
+        self.assertEqual(table.name_of(2), "Wolf")
+        self.assertEqual(len(table), 3)
+        self.assertIn("Bat", table)
+        self.assertIsNone(table.get_id("Dragon"))
+        self.assertEqual(IdTable(["Goblin", "Wolf", "Bat"]).fingerprint, table.fingerprint)
+        self.assertNotEqual(IdTable(["Goblin", "Wolf"]).fingerprint, table.fingerprint)
+
+    def test_unknown_lookups_raise(self):
+        table = IdTable(["Bat"])
+        with self.assertRaises(KeyError):
+            table.id_of("Dragon")
+        with self.assertRaises(IndexError):
+            table.name_of(1)
+        with self.assertRaises(IndexError):
+            table.name_of(-1)
+
+    def test_ids_are_append_only(self):
+        table = IdTable(["Wolf", "Goblin"])
+        extended = table.extended(["Goblin", "Wolf", "Bat", "Ape"])
+        self.assertEqual(extended.names, ["Goblin", "Wolf", "Ape", "Bat"])
+        self.assertIs(extended.extended(["Bat"]), extended)
+        self.assertEqual(extended.prefix_fingerprint(2), table.fingerprint)
+        self.assertEqual(extended.get_name(3), "Bat")
+        self.assertIsNone(extended.get_name(4))
+        self.assertIsNone(extended.get_name(-1))
+
+    def test_tables_round_trip_through_the_id_file(self):
+        tables = {"enemies": IdTable(["Wolf", "Goblin"]).extended(["Ape"]), "zones": IdTable()}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, ID_FILE)
+            self.assertEqual(read_id_tables(path), {})
+            self.assertTrue(write_id_tables(path, tables))
+            restored = read_id_tables(path)
+            self.assertEqual(restored["enemies"].names, ["Goblin", "Wolf", "Ape"])
+            self.assertNotIn("zones", restored) # No rows
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write("enemies,5,Dragon\n")
+            with self.assertRaises(ValueError):
+                read_id_tables(path)
+
+    def test_data_manager_tables(self):
+        data_manager = GameDataManager()
+        data_manager.all_items = {"Potion": Item("Potion", "Heals."), "Axe": Item("Axe", "Chops.")}
+        data_manager.enemies = {"Goblin": object(), "Bat": object()}
+        data_manager.zones = {"Forest": Zone("Forest", ["Goblin", "Unknown", "Bat"])}
+        data_manager.build_id_tables()
+
+        self.assertEqual(data_manager.item_ids.id_of("Potion"), 1)
+        self.assertIs(data_manager.get_item_by_id(0), data_manager.all_items["Axe"])
+        self.assertEqual(data_manager.get_zone_by_id(0).name, "Forest")
+        self.assertEqual(data_manager.zones["Forest"].enemy_ids, [1, 0]) # Unknown names are skipped
+        self.assertEqual(len(data_manager.skill_ids), 0)
+        self.assertIsNone(data_manager.get_item_by_id(2))
+        self.assertIsNone(data_manager.get_enemy_by_id(-1))
+
+        persisted = data_manager.id_tables()
+        del data_manager.all_items["Axe"]
+        data_manager.all_items["Bow"] = Item("Bow", "Shoots.")
+        data_manager.build_id_tables(persisted)
+        self.assertEqual(list(data_manager.item_ids), ["Axe", "Potion", "Bow"])
+        self.assertIsNone(data_manager.get_item_by_id(0)) # The removed Axe keeps its ID
+        self.assertEqual(data_manager.get_item_by_id(2).name, "Bow")
+
+    @unittest.skipUnless(os.path.isdir(DATA_DIR), "game data not available")
+    def test_loaded_ids_are_persisted_with_the_data(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for name in os.listdir(DATA_DIR):
+                if name.endswith(".csv") and name != ID_FILE:
+                    shutil.copy(os.path.join(DATA_DIR, name), temp_dir)
+            with use_sink(NullSink()):
+                first = GameDataManager()
+                first.load_all_data(temp_dir)
+                self.assertEqual(list(first.enemy_ids), sorted(first.enemies)) # A fresh file numbers in sorted order
+                self.assertIn("Squirrelkin", read_id_tables(os.path.join(temp_dir, ID_FILE))["enemies"])
+                enemies = os.path.join(temp_dir, DATA_FILES["enemies"])
+                with open(enemies, 'a', encoding='utf-8') as f:
+                    f.write("Aardvark,1-2,Common,Physical,10,0,1,1,1,1,1,1,No,,,\n")
+                second = GameDataManager()
+                second.load_all_data(temp_dir)
+            self.assertEqual(second.enemy_ids.names[:len(first.enemy_ids)], first.enemy_ids.names)
+            self.assertEqual(second.enemy_ids.id_of("Aardvark"), len(first.enemy_ids))
+            self.assertEqual(read_id_tables(os.path.join(temp_dir, ID_FILE))["enemies"].names, second.enemy_ids.names)
+
+
+if __name__ == '__main__':
+    unittest.main()
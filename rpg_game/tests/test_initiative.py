@@ -0,0 +1,115 @@
+import unittest
+import asyncio
+import os
+
+try:
+    from rpg_game.core.combat import run_combat, simulate_basic_fight, simulate_party_fight
+    from rpg_game.core.initiative import TurnScheduler
+    from rpg_game.core.player import Player
+    from rpg_game.ui.game_io import GameIO
+    from rpg_game.utils.output import MemorySink, use_sink
+    from rpg_game.tests.factories import make_enemy
+except ImportError:
+    import sys
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+    from rpg_game.core.combat import run_combat, simulate_basic_fight, simulate_party_fight
+    from rpg_game.core.initiative import TurnScheduler
+    from rpg_game.core.player import Player
+    from rpg_game.ui.game_io import GameIO
+    from rpg_game.utils.output import MemorySink, use_sink
+    from rpg_game.tests.factories import make_enemy
+
+
+class _AlwaysAttack(GameIO):
+    def __init__(self, sink):
+        self.sink = sink
+
+    async def read_line(self, prompt: str = "") -> str:
+        return "1"
+
+
+class TestTurnScheduler(unittest.TestCase):
+
+    def test_faster_combatants_act_more_often(self):
+        schedule = TurnScheduler(speed_base=0)
+        schedule.add("slow", agility=10)
+        schedule.add("fast", agility=20)
+        self.assertEqual(schedule.upcoming(6), ["fast", "slow", "fast", "fast", "slow", "fast"])
+        self.assertEqual([schedule.next() for _ in range(6)], ["fast", "slow", "fast", "fast", "slow", "fast"])
+
+    def test_ties_keep_the_order_combatants_were_added_in(self):
+        schedule = TurnScheduler()
+        for name in ("a", "b", "c"):
+            schedule.add(name, agility=10)
+        self.assertEqual([schedule.next() for _ in range(6)], ["a", "b", "c", "a", "b", "c"])
+
+    def test_speed_changes_delays_and_removal(self):
+        schedule = TurnScheduler(speed_base=0)
+        schedule.add("a", agility=10)
+        schedule.add("b", agility=10)
+        self.assertEqual(schedule.next(), "a")
+        schedule.set_speed("a", multiplier=4.0) # a's remaining 100 units shrink to 25
+        self.assertEqual(schedule.due("a"), 125.0)
+        self.assertEqual(schedule.upcoming(3), ["b", "a", "a"])
+        schedule.delay("a", 1000)
+        self.assertEqual(schedule.next(), "b")
+        self.assertEqual(schedule.next(), "b")
+        schedule.remove("b")
+        self.assertNotIn("b", schedule)
+        self.assertEqual((schedule.next(), len(schedule)), ("a", 1))
+        with self.assertRaises(KeyError):
+            schedule.delay("b", 1)
+
+    def test_many_buffs_do_not_grow_the_heap(self):
+        schedule = TurnScheduler()
+        schedule.add("a", agility=10)
+        schedule.add("b", agility=50)
+        for step in range(1000):
+            schedule.set_speed("a", multiplier=1.0 + step % 3)
+        self.assertLess(len(schedule._heap), 32)
+        self.assertEqual(len(schedule.upcoming(4)), 4)
+
+
+class TestInitiativeCombat(unittest.TestCase):
+
+    def test_party_fight_matches_duel_when_speeds_are_equal(self):
+        player = Player("Hero")
+        enemy = make_enemy(agility=player.stats['dexterity'])
+        duel = simulate_basic_fight(player, enemy)
+        party = simulate_party_fight([player], [enemy])
+        self.assertEqual((party.party_won, party.party_hp, party.enemy_hp),
+                         (duel.player_won, [duel.player_hp], [duel.enemy_hp]))
+        self.assertEqual(enemy.hp, enemy.max_hp) # Untouched
+
+    def test_party_fight_with_repeated_enemies(self):
+        party = [Player("Hero"), Player("Sidekick")]
+        enemy = make_enemy(agility=5, max_hp=30)
+        result = simulate_party_fight(party, [enemy] * 4)
+        self.assertTrue(result.party_won)
+        self.assertEqual(result.enemy_hp, [0, 0, 0, 0])
+        self.assertLess(result.party_hp[0], party[0].max_hp) # The first hero soaks every hit
+        self.assertEqual(result.party_hp[1], party[1].max_hp)
+
+    def test_party_fight_with_hundreds_of_combatants(self):
+        # Indexes above 256 are distinct int objects, so the scheduler must key them by value
+        party = [Player(f"Hero {index}") for index in range(3)]
+        for player in party:
+            player.hp = player.max_hp = 100000
+        result = simulate_party_fight(party, [make_enemy(agility=5, max_hp=5, attack_power=1)] * 400)
+        self.assertTrue(result.party_won)
+        self.assertEqual(result.enemy_hp, [0] * 400)
+
+    def test_faster_enemy_strikes_first(self):
+        sink = MemorySink()
+        player = Player("Hero")
+        enemy = make_enemy(agility=500, max_hp=30)
+        with use_sink(sink):
+            asyncio.run(run_combat(player, enemy, _AlwaysAttack(sink), initiative=True))
+        texts = [event.text for event in sink.events]
+        first_enemy = texts.index(f"{enemy.name} attacks {player.name} for 10 damage.")
+        first_player = next(i for i, text in enumerate(texts) if text.startswith(f"{player.name} attacks"))
+        self.assertLess(first_enemy, first_player)
+
+
+if __name__ == '__main__':
+    unittest.main()
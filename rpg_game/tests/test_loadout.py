@@ -0,0 +1,205 @@
+import unittest
+import os
+import random
+from itertools import combinations, product
+
+try:
+    from rpg_game.core.equipment import Equipment
+    from rpg_game.core.weapon import Weapon
+    from rpg_game.core.enemy import Enemy
+    from rpg_game.core.item import Item
+    from rpg_game.core.loadout import (BONUS_FIELDS, BonusMatrix, LoadoutTotals, MatchupObjective, SlotGroup,
+                                       WeightedObjective, bonus_vector, equipped_stats, optimize_loadout,
+                                       pareto_front)
+    from rpg_game.core.player import Player
+    from rpg_game.utils.cache import all_stats, invalidate
+except ImportError:
+    import sys
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+    from rpg_game.core.equipment import Equipment
+    from rpg_game.core.weapon import Weapon
+    from rpg_game.core.enemy import Enemy
+    from rpg_game.core.item import Item
+    from rpg_game.core.loadout import (BONUS_FIELDS, BonusMatrix, LoadoutTotals, MatchupObjective, SlotGroup,
+                                       WeightedObjective, bonus_vector, equipped_stats, optimize_loadout,
+                                       pareto_front)
+    from rpg_game.core.player import Player
+    from rpg_game.utils.cache import all_stats, invalidate
+
+
+SLOTS = (SlotGroup("Main Hand", ("Main Hand",)), SlotGroup("Head", ("Head",)),
+         SlotGroup("Accessory", ("Accesory",), 2))
+
+
+def _random_catalog(rng: random.Random, per_type: int = 6) -> list:
+    catalog = []
+    for equip_type in ("Main Hand", "Head", "Accesory"):
+        for i in range(per_type):
+            bonuses = {field: rng.randint(-3, 10) for field in BONUS_FIELDS}
+            if equip_type == "Main Hand":
+                catalog.append(Weapon(f"{equip_type} {i}", "", "Common", equip_type, "Physical", "Sword", **bonuses))
+            else:
+                catalog.append(Equipment(f"{equip_type} {i}", "", "Common", equip_type, **bonuses))
+    return catalog
+
+
+def _brute_force(catalog: list, objective) -> float:
+    by_type = {group.equip_types[0]: [item for item in catalog if item.equip_type == group.equip_types[0]]
+               for group in SLOTS}
+    options = []
+    for group in SLOTS:
+        items = by_type[group.equip_types[0]]
+        options.append([combo for size in range(group.count + 1) for combo in combinations(items, size)])
+    best = float("-inf")
+    for picks in product(*options):
+        total = objective.project((0,) * len(BONUS_FIELDS))
+        for combo in picks:
+            for item in combo:
+                total = tuple(a + b for a, b in zip(total, objective.project(bonus_vector(item))))
+        best = max(best, objective.score(total))
+    return best
+
+
+class TestLoadoutOptimizer(unittest.TestCase):
+
+    def test_matches_brute_force(self):
+        rng = random.Random(7)
+        enemy = Enemy("Ogre", max_hp=200, attack_power=30, defense=15, level_range="5", spawn_chance="Common",
+                      enemy_type="Giant", max_mp=0, magic_attack=0, magic_defense=0, agility=0, luck=0,
+                      has_sprite=False, abilities_spells=[], loot=[])
+        for _ in range(5):
+            catalog = _random_catalog(rng)
+            objectives = [WeightedObjective({"attack_bonus": 2, "defense_bonus": 1, "luck_bonus": -0.5}),
+                          MatchupObjective(enemy, base_attack=20, base_defense=10, base_max_hp=100)]
+            for objective in objectives:
+                result = optimize_loadout(catalog, objective, SLOTS)
+                self.assertAlmostEqual(result.score, _brute_force(catalog, objective))
+
+    def test_result_layout(self):
+        sword = Weapon("Sword", "", "Common", "Main Hand", "Physical", "Sword", attack_bonus=5)
+        cursed_ring = Equipment("Cursed Ring", "", "Common", "Accesory", attack_bonus=-2)
+        rings = [Equipment(f"Ring {i}", "", "Common", "Accesory", attack_bonus=i) for i in range(1, 4)]
+        candidates = [sword, cursed_ring, Item("Potion", "Not equipment.")] + rings
+        result = optimize_loadout(candidates, WeightedObjective({"attack_bonus": 1}), SLOTS)
+        self.assertIs(result.slots["Main Hand"], sword)
+        self.assertIsNone(result.slots["Head"]) # Nothing fits
+        self.assertEqual({result.slots["Accessory 1"].name, result.slots["Accessory 2"].name}, {"Ring 3", "Ring 2"})
+        self.assertEqual(result.bonuses["attack_bonus"], 10)
+        self.assertEqual(result.score, 10)
+
+    def test_two_handed_weapons_block_the_offhand(self):
+        greatsword = Weapon("Greatsword", "", "Common", "Two-Hand", "Physical", "Sword", attack_bonus=10)
+        dagger = Weapon("Dagger", "", "Common", "Main Hand", "Physical", "Dagger", attack_bonus=4)
+        objective = WeightedObjective({"attack_bonus": 1, "defense_bonus": 1})
+        for shield_defense, expected in ((8, (dagger, "Shield")), (3, (greatsword, None))):
+            shield = Equipment("Shield", "", "Common", "Shield", defense_bonus=shield_defense)
+            result = optimize_loadout([greatsword, dagger, shield], objective)
+            offhand = result.slots["Offhand"]
+            self.assertEqual((result.slots["Main Hand"], offhand and offhand.name), expected)
+            self.assertEqual(result.score, max(4 + shield_defense, 10))
+
+    def test_pareto_front_keeps_enough_for_repeated_slots(self):
+        items = [Equipment(f"Ring {i}", "", "Common", "Accesory") for i in range(3)]
+        vectors = [((5.0, 5.0), items[0]), ((4.0, 4.0), items[1]), ((1.0, 9.0), items[2])]
+        self.assertEqual([item.name for _, item in pareto_front(vectors, 1)], ["Ring 0", "Ring 2"])
+        self.assertEqual(len(pareto_front(vectors, 2)), 3)
+
+    def test_unknown_weight_rejected(self):
+        with self.assertRaises(ValueError):
+            WeightedObjective({"charisma_bonus": 1})
+
+
+class TestBonusVectors(unittest.TestCase):
+
+    def test_vectors_are_built_with_the_record(self):
+        cap = Equipment("Cap", "", "Common", "Head", defense_bonus=2, agility_bonus=1, max_hp_bonus=5)
+        self.assertEqual(cap.bonuses, (0, 2, 0, 0, 1, 0, 5, 0))
+        self.assertEqual(bonus_vector(cap), tuple(getattr(cap, field) for field in BONUS_FIELDS))
+        cap.luck_bonus = 3
+        cap.refresh_bonuses()
+        self.assertEqual(cap.bonuses[BONUS_FIELDS.index("luck_bonus")], 3)
+
+    def test_running_totals_follow_equip_and_unequip(self):
+        rng = random.Random(3)
+        catalog = _random_catalog(rng)
+        worn = LoadoutTotals()
+        for _ in range(200):
+            slot = rng.choice(["a", "b", "c"])
+            if rng.random() < 0.3:
+                worn.unequip(slot)
+            else:
+                worn.equip(slot, rng.choice(catalog))
+            expected = [sum(values) for values in zip((0,) * len(BONUS_FIELDS), *map(bonus_vector, worn.slots.values()))]
+            self.assertEqual(list(worn.total), expected)
+        self.assertEqual(worn.get("defense_bonus"), worn.as_dict()["defense_bonus"])
+        sword = catalog[0]
+        worn.equip("a", sword)
+        self.assertIs(worn.equip("a", catalog[1]), sword)
+
+    def test_batch_totals_match_item_sums(self):
+        rng = random.Random(5)
+        catalog = _random_catalog(rng)
+        matrix = BonusMatrix(catalog)
+        loadouts = [rng.sample(range(len(catalog)), rng.randint(0, 6)) for _ in range(500)]
+        expected = [tuple(sum(values) for values in zip((0,) * len(BONUS_FIELDS), *(bonus_vector(catalog[i]) for i in loadout)))
+                    for loadout in loadouts]
+        self.assertEqual(matrix.totals(loadouts), expected)
+        selection = [[loadout.count(row) for row in range(len(catalog))] for loadout in loadouts]
+        self.assertEqual(matrix.multiply(selection), expected)
+        self.assertEqual(matrix.row_of(catalog[4]), 4)
+        with self.assertRaises(ValueError):
+            matrix.multiply([[1, 0]])
+
+
+class TestDerivedValueCaches(unittest.TestCase):
+
+    def test_loadout_scores_are_cached_until_the_equipment_changes(self):
+        catalog = _random_catalog(random.Random(11))
+        objective = WeightedObjective({"attack_bonus": 1, "defense_bonus": 1})
+        first = optimize_loadout(catalog, objective, SLOTS)
+        hits = all_stats()["loadout_scores"].hits
+        again = optimize_loadout(catalog, objective, SLOTS)
+        self.assertEqual(all_stats()["loadout_scores"].hits, hits + 1)
+        self.assertEqual(again, first)
+        again.slots.clear() # A copy of the cached result
+        self.assertEqual(optimize_loadout(catalog, objective, SLOTS), first)
+        invalidate("data:weapons")
+        hits = all_stats()["loadout_scores"].hits
+        self.assertEqual(optimize_loadout(catalog, objective, SLOTS), first)
+        self.assertEqual(all_stats()["loadout_scores"].hits, hits)
+
+    def test_player_stats_are_invalidated_on_equip(self):
+        player = Player("Cache Tester")
+        ring = Equipment("Ring", "", "Rare", "Accesory", attack_bonus=4, extra_increases="Atk +50%")
+        cap = Equipment("Cap", "", "Common", "Head", max_hp_bonus=20)
+        worn = LoadoutTotals(player.name)
+        worn.equip("Accessory 1", ring)
+        stats = equipped_stats(player, worn)
+        self.assertEqual(stats['attack_power'], int((player.derived_stats['attack_power'] + 4) * 1.5))
+        hits = all_stats()["player_stats"].hits
+        self.assertEqual(equipped_stats(player, worn), stats)
+        self.assertEqual(all_stats()["player_stats"].hits, hits + 1)
+        stats.clear() # A copy of the cached result
+        stats = equipped_stats(player, worn)
+        self.assertEqual(stats['attack_power'], int((player.derived_stats['attack_power'] + 4) * 1.5))
+        invalidations = all_stats()["player_stats"].invalidations
+        worn.equip("Head", cap)
+        self.assertEqual(all_stats()["player_stats"].invalidations, invalidations + 1)
+        self.assertEqual(equipped_stats(player, worn)['max_hp'], player.max_hp + 20)
+        worn.unequip("Head")
+        self.assertEqual(equipped_stats(player, worn), stats)
+
+    def test_player_stats_follow_the_values_of_same_named_items(self):
+        # E.g. the same record in two overlay variants loaded side by side
+        player = Player("Cache Tester")
+        plain, modded = LoadoutTotals(), LoadoutTotals()
+        plain.equip("Main Hand", Weapon("Iron Sword", "", "Common", "Main Hand", "Physical", "Sword", attack_bonus=5))
+        modded.equip("Main Hand", Weapon("Iron Sword", "", "Common", "Main Hand", "Physical", "Sword",
+                                         attack_bonus=50, extra_increases="Atk +10%"))
+        base = player.derived_stats['attack_power']
+        self.assertEqual(equipped_stats(player, plain)['attack_power'], base + 5)
+        self.assertEqual(equipped_stats(player, modded)['attack_power'], int((base + 50) * 1.1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+import os
+import json
+
+try:
+    from rpg_game.utils import metrics
+    from rpg_game.utils.metrics import MetricsRegistry
+    from rpg_game.core.combat import simulate_basic_fight
+    from rpg_game.core.enemy import Enemy
+    from rpg_game.core.player import Player
+except ImportError:
+    import sys
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+    from rpg_game.utils import metrics
+    from rpg_game.utils.metrics import MetricsRegistry
+    from rpg_game.core.combat import simulate_basic_fight
+    from rpg_game.core.enemy import Enemy
+    from rpg_game.core.player import Player
+
+
+class TestMetricsRegistry(unittest.TestCase):
+
+    def test_counter_and_histogram_are_shared_per_name_and_labels(self):
+        registry = MetricsRegistry(enabled=True)
+        counter = registry.counter("hits", "Hits.", kind="crit")
+        self.assertIs(counter, registry.counter("hits", kind="crit"))
+        self.assertIsNot(counter, registry.counter("hits", kind="normal"))
+        counter.inc()
+        counter.inc(2)
+        self.assertEqual(counter.value, 3)
+
+        histogram = registry.histogram("turns", buckets=(1, 5))
+        for value in (1, 3, 9):
+            histogram.observe(value)
+        self.assertEqual(histogram.counts, [1, 1, 1])
+        self.assertEqual((histogram.count, histogram.sum), (3, 13))
+
+    def test_disabled_registry_records_no_timings(self):
+        registry = MetricsRegistry(enabled=False)
+        histogram = registry.histogram("phase")
+        started = registry.start()
+        self.assertIsNone(started)
+        registry.stop_and_observe(histogram, started)
+        self.assertEqual(histogram.count, 0)
+
+    def test_exports(self):
+        registry = MetricsRegistry(enabled=True)
+        registry.counter("fights_total", "Finished fights.", outcome="victory").inc()
+        registry.histogram("turns", buckets=(1, 5)).observe(3)
+        text = registry.to_prometheus()
+        self.assertIn("# HELP fights_total Finished fights.", text)
+        self.assertIn('fights_total{outcome="victory"} 1', text)
+        self.assertIn('turns_bucket{le="1"} 0', text)
+        self.assertIn('turns_bucket{le="5"} 1', text)
+        self.assertIn('turns_bucket{le="+Inf"} 1', text)
+        self.assertIn("turns_count 1", text)
+        snapshot = json.loads(registry.to_json())
+        self.assertEqual(snapshot["turns"]["type"], "histogram")
+        self.assertEqual(snapshot["fights_total"]["series"][0]["value"], 1)
+
+        registry.reset()
+        self.assertEqual(registry.counter("fights_total", outcome="victory").value, 0)
+
+
+class TestCombatMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.was_enabled = metrics.is_enabled()
+        metrics.registry.reset()
+
+    def tearDown(self):
+        metrics.registry.enabled = self.was_enabled
+        metrics.registry.reset()
+
+    def test_headless_fights_record_turns_only_when_enabled(self):
+        enemy = Enemy(name="Goblin", max_hp=50, attack_power=25, defense=4, level_range="1",
+                      spawn_chance="Common", enemy_type="Goblinoid", max_mp=10, magic_attack=3, magic_defense=2,
+                      agility=5, luck=1, has_sprite=False, abilities_spells=[], loot=[])
+        turns = metrics.registry.histogram("rpg_fight_turns", mode="headless")
+        wins = metrics.registry.counter("rpg_fights_total", mode="headless", outcome="victory")
+
+        metrics.disable()
+        simulate_basic_fight(Player("Hero"), enemy)
+        self.assertEqual(turns.count, 0)
+
+        metrics.enable()
+        simulate_basic_fight(Player("Hero"), enemy)
+        self.assertEqual((turns.count, turns.sum), (1, 4))
+        self.assertEqual(wins.value, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+import unittest
+import os
+import tempfile
+
+try:
+    from rpg_game.core.elements import AffinityMatrix
+    from rpg_game.core.equipment import Equipment
+    from rpg_game.core.loadout import LoadoutTotals
+    from rpg_game.core.modifiers import (ADD, CHANCE, MULTIPLY, PERCENT, TURNS, Modifier, ModifierTotals,
+                                         compile_modifiers, parse_modifiers)
+    from rpg_game.core.skill import Ability, PassiveSkill
+    from rpg_game.data.data_cache import read_cache, write_cache
+    from rpg_game.data.game_data_manager import GameDataManager
+    from rpg_game.utils.output import NullSink, use_sink
+except ImportError:
+    import sys
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+    from rpg_game.core.elements import AffinityMatrix
+    from rpg_game.core.equipment import Equipment
+    from rpg_game.core.loadout import LoadoutTotals
+    from rpg_game.core.modifiers import (ADD, CHANCE, MULTIPLY, PERCENT, TURNS, Modifier, ModifierTotals,
+                                         compile_modifiers, parse_modifiers)
+    from rpg_game.core.skill import Ability, PassiveSkill
+    from rpg_game.data.data_cache import read_cache, write_cache
+    from rpg_game.data.game_data_manager import GameDataManager
+    from rpg_game.utils.output import NullSink, use_sink
+
+DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..', "Game Csv Data"))
+
+
+class TestGrammar(unittest.TestCase):
+
+    def test_sheet_clauses(self):
+        cases = {
+            "Crit + 1%": [Modifier("crit", ADD, 1.0)],
+            "Atk Spd + 4 - Melt 50%": [Modifier("attack_speed", ADD, 4.0), Modifier("Melt", CHANCE, 0.5)],
+            "Atk & M.Atk * 105% - Ctr Atk + 5%": [Modifier("attack", MULTIPLY, 1.05),
+                                                  Modifier("magic_attack", MULTIPLY, 1.05),
+                                                  Modifier("counter", ADD, 5.0)],
+            "Hit+ + 2% - Crit Eva + 2%": [Modifier("hit", ADD, 2.0), Modifier("crit_evasion", ADD, 2.0)],
+            "All Stats +6%  Elemental resistance +10% Atk Speed +6": [
+                Modifier("all_stats", PERCENT, 6.0), Modifier("all_resistance", ADD, 10.0),
+                Modifier("attack_speed", ADD, 6.0)],
+            "Hp & Mp Rgn +6%, Light/Darkness Dmg +20%": [
+                Modifier("hp_regen", ADD, 6.0), Modifier("mp_regen", ADD, 6.0),
+                Modifier("light_damage", ADD, 20.0), Modifier("darkness_damage", ADD, 20.0)],
+            "All Elemental Dmg/Resistance +25%, MP Cost -10%": [
+                Modifier("all_damage", ADD, 25.0), Modifier("all_resistance", ADD, 25.0),
+                Modifier("mp_cost", ADD, -10.0)],
+            "Resist Ice 20% - Thunder Resistance -5%": [Modifier("ice_resistance", ADD, 20.0),
+                                                        Modifier("thunder_resistance", ADD, -5.0)],
+            "Def Down  2 Turns": [Modifier("Def Down", TURNS, 2.0)],
+            "Toughness +1": [Modifier("toughness", ADD, 1.0)],
+        }
+        for text, expected in cases.items():
+            with self.subTest(text=text):
+                parsed = parse_modifiers(text)
+                self.assertEqual(list(parsed.modifiers), expected)
+                self.assertEqual(parsed.unparsed, ())
+
+    def test_conditions(self):
+        self.assertEqual(compile_modifiers("Critical Chance +5% when a sword is equipped."),
+                         (Modifier("crit", ADD, 5.0, "when a sword is equipped"),))
+        self.assertEqual(compile_modifiers("Hit +20% Special: Underwater combat bonuses: Atk Spd +2, Eva +15%"),
+                         (Modifier("hit", ADD, 20.0), Modifier("attack_speed", ADD, 2.0, "underwater combat"),
+                          Modifier("evasion", ADD, 15.0, "underwater combat")))
+
+    def test_unparsed_fragments_are_reported(self):
+        parsed = parse_modifiers("Crit +20% Special: Converts Light damage to Darkness and boosts it by 25%, "
+                                 "25% chance to inflict Burn status")
+        self.assertEqual(parsed.modifiers, (Modifier("crit", ADD, 20.0), Modifier("Burn", CHANCE, 0.25)))
+        self.assertEqual(parsed.unparsed, ("Converts Light damage to Darkness and boosts it by 25%",))
+        self.assertEqual(parse_modifiers("10").unparsed, ("10",))
+        self.assertEqual(compile_modifiers("", "Max Mp", "Shield"), ())
+
+
+class TestModifierTotals(unittest.TestCase):
+
+    def test_stat_arithmetic(self):
+        totals = ModifierTotals(compile_modifiers("Atk +10, Atk +20%, All Stats +5%, Atk * 110%"))
+        self.assertAlmostEqual(totals.apply("attack", 100), 110 * 1.25 * 1.1)
+        self.assertAlmostEqual(totals.apply("luck", 10), 10.5) # Only "All Stats"
+        self.assertEqual(totals.apply("crit"), 0.0)
+
+    def test_conditions_and_removal(self):
+        night = compile_modifiers("Eva +5% during night battles")
+        totals = ModifierTotals(compile_modifiers("Eva +10%, Fire Res +20%, Elemental Resistance +5%") + night)
+        self.assertEqual(totals.apply("evasion"), 10.0)
+        self.assertEqual(totals.apply("evasion", conditions=["during night battles"]), 15.0)
+        self.assertEqual(totals.apply("fire_resistance"), 25.0)
+        self.assertEqual(totals.apply("ice_resistance"), 5.0)
+        totals.remove(night)
+        self.assertEqual(totals.apply("evasion", conditions=["during night battles"]), 10.0)
+
+
+class TestCompiledRecords(unittest.TestCase):
+
+    def test_records_compile_at_construction(self):
+        cloak = Equipment("Frost Cloak", "", "Rare", "Armor", extra_increases="Ice Res + 50% - Max Mp * 110%")
+        self.assertEqual(cloak.modifiers, (Modifier("ice_resistance", ADD, 50.0), Modifier("max_mp", MULTIPLY, 1.1)))
+        rend = Ability("Rend", "", "Common", "Active", "Sword", effects_csv="Bleed 100%", additional_notes="Shield")
+        self.assertEqual(rend.modifiers, (Modifier("Bleed", CHANCE, 1.0),))
+        tough = PassiveSkill("Tough", "", "Common", "Passive", "General", effects_csv="Max HP +10%")
+        self.assertEqual(tough.modifiers, (Modifier("max_hp", PERCENT, 10.0),))
+
+    def test_loadout_and_defense_row_use_the_compiled_form(self):
+        ring = Equipment("Ring", "", "Rare", "Accesory", attack_bonus=4, extra_increases="Atk +50%")
+        ward = Equipment("Ward", "", "Rare", "Accesory", extra_increases="Elemental Resistance +20%")
+        worn = LoadoutTotals()
+        worn.equip("Accessory 1", ring)
+        worn.equip("Accessory 2", ward)
+        self.assertEqual(worn.apply("attack", 10 + worn.get("attack_bonus")), 21.0)
+        worn.unequip("Accessory 1")
+        self.assertEqual(worn.apply("attack", 10), 10.0)
+        ward.extra_increases = "" # The compiled form is what counts
+        matrix = AffinityMatrix(["Fire", "Ice"])
+        row = matrix.defense_row(0, [ward])
+        self.assertAlmostEqual(row[matrix.id_of("Fire")], 0.8)
+        self.assertAlmostEqual(row[matrix.id_of("Ice")], 0.8)
+        self.assertEqual(row[0], 1.0) # Neutral attacks are not elemental
+
+    def test_compiled_form_survives_the_data_snapshot(self):
+        cloak = Equipment("Frost Cloak", "", "Rare", "Armor", extra_increases="Ice Res + 50%")
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "snapshot.pickle")
+            self.assertTrue(write_cache(path, "key", {"equipment": {cloak.name: cloak}}))
+            restored = read_cache(path, "key")["equipment"][cloak.name]
+        self.assertEqual(restored.modifiers, cloak.modifiers)
+        self.assertIsInstance(restored.modifiers[0], Modifier)
+
+
+@unittest.skipUnless(os.path.isdir(DATA_DIR), "game data not available")
+class TestSheetData(unittest.TestCase):
+
+    def test_loaded_records_carry_their_modifiers(self):
+        with use_sink(NullSink()):
+            data_manager = GameDataManager()
+            data_manager.load_all_data(DATA_DIR)
+        compiled = [item for item in data_manager.equipment.values() if item.modifiers]
+        self.assertGreater(len(compiled), 0)
+        for item in list(data_manager.equipment.values()) + list(data_manager.weapons.values()):
+            self.assertEqual(item.modifiers, compile_modifiers(item.extra_increases))
+
+
+if __name__ == '__main__':
+    unittest.main()
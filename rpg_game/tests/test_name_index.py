@@ -0,0 +1,91 @@
+import unittest
+import os
+import csv
+import tempfile
+
+try:
+    from rpg_game.core.item import Item
+    from rpg_game.core.skill import Skill
+    from rpg_game.data.enemy_loader import load_enemies_from_csv
+    from rpg_game.data.name_index import (NameIndex, ResolutionReport, is_placeholder,
+                                          link_references, normalize_name)
+    from rpg_game.utils.output import MemorySink, use_sink
+except ImportError:
+    import sys
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+    from rpg_game.core.item import Item
+    from rpg_game.core.skill import Skill
+    from rpg_game.data.enemy_loader import load_enemies_from_csv
+    from rpg_game.data.name_index import (NameIndex, ResolutionReport, is_placeholder,
+                                          link_references, normalize_name)
+    from rpg_game.utils.output import MemorySink, use_sink
+
+
+HEADER = ["Name", "Level Range", "Spawn Chance", "Type", "Max Hp Lowest Level", "Max Mp", "Attack", "Defense",
+          "M.Attack", "M.Defense.", "Agility", "Luck", "Has Sprite?", "Abilitys & Spells", "", "Enemy Loot"]
+
+
+class TestNameIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.items = {name: Item(name, "") for name in ("Washling Sap", "Chomper Filet", "Assassin's Cloak")}
+        self.index = NameIndex(self.items)
+
+    def test_normalize_name(self):
+        self.assertEqual(normalize_name("  Washling   sap "), "washling sap")
+        self.assertEqual(normalize_name("Washling-Sap"), "washling sap")
+        self.assertEqual(normalize_name("Assassin’s CLOAK"), "assassins cloak")
+
+    def test_resolve_exact_and_normalized(self):
+        self.assertIs(self.index.resolve("Washling Sap"), self.items["Washling Sap"])
+        self.assertIs(self.index.resolve("washling sap"), self.items["Washling Sap"])
+        self.assertEqual(self.index.canonical_name("assassins cloak"), "Assassin's Cloak")
+        self.assertIsNone(self.index.resolve("Chomper Tooth"))
+
+    def test_suggestions_for_near_misses(self):
+        self.assertEqual(self.index.suggest("Chomper Fillet")[0], "Chomper Filet")
+        self.assertEqual(self.index.suggest("Dragon Scale"), [])
+
+    def test_placeholders(self):
+        self.assertTrue(is_placeholder("NULL"))
+        self.assertTrue(is_placeholder("None yet"))
+        self.assertFalse(is_placeholder("Nonesuch"))
+
+    def test_link_references_reports_misses(self):
+        report = ResolutionReport()
+        linked = link_references(["washling SAP", "NULL", "Chomper Fillet"], self.index, "Loot item", "Chomper", report)
+        self.assertEqual([item.name for item in linked], ["Washling Sap"])
+        self.assertEqual((report.resolved_count, report.normalized_count, len(report)), (1, 1, 1))
+        self.assertEqual(report.unresolved[0].suggestions[0], "Chomper Filet")
+        self.assertIn("Did you mean: Chomper Filet", report.lines()[1])
+
+
+class TestEnemyLinking(unittest.TestCase):
+
+    def test_loader_links_normalized_names_and_reports_once(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "enemies.csv")
+            with open(path, 'w', newline='', encoding='utf-8') as f:
+                csv.writer(f).writerows([
+                    HEADER,
+                    ["Wahshling", "1-3", "Rare ", "Plant", "40", "0", "5", "2", "0", "0", "3", "1", "Yes",
+                     "vine whip", "", "Washling sap, Vine Tendril, NULL"],
+                ])
+            skills = {"Vine Whip": Skill("Vine Whip", "", "Common", "Active", "Monster")}
+            items = {"Washling Sap": Item("Washling Sap", "")}
+            sink = MemorySink()
+            report = ResolutionReport()
+            with use_sink(sink):
+                enemies, _ = load_enemies_from_csv(path, skills, items, report)
+
+        enemy = enemies["Wahshling"]
+        self.assertEqual(enemy.spawn_chance, "Rare")
+        self.assertEqual([s.name for s in enemy.abilities_spells], ["Vine Whip"])
+        self.assertEqual([i.name for i in enemy.loot], ["Washling Sap"])
+        self.assertEqual([ref.name for ref in report.unresolved], ["Vine Tendril"])
+        reports = [event for event in sink.events if "Vine Tendril" in event.text]
+        self.assertEqual(len(reports), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import asyncio
+import io
+import os
+
+try:
+    from rpg_game.utils.output import (BufferedConsoleSink, MemorySink, NullSink,
+                                       emit, flush, get_sink, use_sink)
+    from rpg_game.core.player import Player
+    from rpg_game.core.item import Item
+except ImportError:
+    import sys
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+    from rpg_game.utils.output import (BufferedConsoleSink, MemorySink, NullSink,
+                                       emit, flush, get_sink, use_sink)
+    from rpg_game.core.player import Player
+    from rpg_game.core.item import Item
+
+
+class TestOutputSinks(unittest.TestCase):
+
+    def test_buffered_console_sink_batches_until_flush(self):
+        stream = io.StringIO()
+        sink = BufferedConsoleSink(stream)
+        sink.emit("line one")
+        sink.emit("line two")
+        self.assertEqual(stream.getvalue(), "") # Nothing written before the turn boundary
+        sink.flush()
+        self.assertEqual(stream.getvalue(), "line one\nline two\n")
+
+    def test_buffered_console_sink_flushes_when_full(self):
+        stream = io.StringIO()
+        sink = BufferedConsoleSink(stream, max_buffered_lines=2)
+        sink.emit("a")
+        sink.emit("b")
+        self.assertEqual(stream.getvalue(), "a\nb\n")
+
+    def test_memory_sink_keeps_structured_events(self):
+        sink = MemorySink()
+        with use_sink(sink):
+            player = Player("Hero")
+            player.add_item_to_inventory(Item("Iron Sword", "A basic sword."))
+            player.gain_xp(100)
+        kinds = [event.kind for event in sink.events]
+        self.assertEqual(kinds, ["inventory", "level_up"])
+        self.assertEqual(sink.events[0].data["item"], "Iron Sword")
+        self.assertEqual(sink.events[1].data["level"], 2)
+        self.assertEqual(len(sink.drain()), 2)
+        self.assertEqual(sink.events, [])
+
+    def test_null_sink_discards_output(self):
+        previous = get_sink()
+        with use_sink(NullSink()):
+            emit("ignored")
+            flush()
+        self.assertIs(get_sink(), previous) # Restored on exit
+
+    def test_sinks_are_isolated_per_task(self):
+        async def session(name: str) -> MemorySink:
+            sink = MemorySink()
+            with use_sink(sink):
+                for turn in range(3):
+                    emit(f"{name} turn {turn}", "combat")
+                    await asyncio.sleep(0)
+            return sink
+
+        async def run_sessions():
+            return await asyncio.gather(session("a"), session("b"))
+
+        sink_a, sink_b = asyncio.run(run_sessions())
+        self.assertEqual(sink_a.lines(), ["a turn 0", "a turn 1", "a turn 2"])
+        self.assertEqual(sink_b.lines(), ["b turn 0", "b turn 1", "b turn 2"])
+
+
+if __name__ == '__main__':
+    unittest.main()
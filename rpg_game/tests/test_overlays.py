@@ -0,0 +1,197 @@
+import unittest
+import csv
+import os
+import tempfile
+
+try:
+    from rpg_game.data.game_data_manager import DATA_FILES, GameDataManager
+    from rpg_game.data.overlays import DELETIONS_FILE, OverlayDict, read_deletions
+    from rpg_game.utils.cache import Cache
+    from rpg_game.utils.output import NullSink, use_sink
+except ImportError:
+    import sys
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+    from rpg_game.data.game_data_manager import DATA_FILES, GameDataManager
+    from rpg_game.data.overlays import DELETIONS_FILE, OverlayDict, read_deletions
+    from rpg_game.utils.cache import Cache
+    from rpg_game.utils.output import NullSink, use_sink
+
+DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..', "Game Csv Data"))
+
+ENEMY_HEADER = ["Name", "Level Range", "Spawn Chance", "Type", "Max Hp Lowest Level", "Max Mp", "Attack", "Defense",
+                "M.Attack", "M.Defense.", "Agility", "Luck", "Has Sprite?", "Abilitys & Spells", "", "Enemy Loot"]
+
+
+def _write(directory, name, rows):
+    with open(os.path.join(directory, name), 'w', newline='', encoding='utf-8') as f:
+        csv.writer(f).writerows(rows)
+
+
+class TestOverlayDict(unittest.TestCase):
+
+    def test_writes_stay_in_the_layer(self):
+        base = {"a": 1, "b": 2, "c": 3}
+        layer = OverlayDict(base)
+        layer["b"] = 20
+        layer["d"] = 4
+        del layer["a"]
+        self.assertEqual(base, {"a": 1, "b": 2, "c": 3})
+        self.assertEqual(dict(layer), {"b": 20, "c": 3, "d": 4})
+        self.assertEqual(list(layer), ["b", "c", "d"])
+        self.assertEqual(len(layer), 3)
+        self.assertNotIn("a", layer)
+        self.assertIsNone(layer.get("a"))
+        with self.assertRaises(KeyError):
+            del layer["a"]
+        layer["a"] = 10
+        del layer["d"]
+        self.assertEqual(dict(layer), {"a": 10, "b": 20, "c": 3})
+        self.assertEqual(len(layer), 3)
+
+    def test_forks_are_independent(self):
+        layer = OverlayDict({"a": 1})
+        layer["b"] = 2
+        fork = layer.fork()
+        fork["c"] = 3
+        del fork["a"]
+        self.assertEqual(dict(layer), {"a": 1, "b": 2})
+        self.assertEqual(dict(fork), {"b": 2, "c": 3})
+        self.assertIs(fork.base, layer.base)
+        self.assertTrue(fork.is_layered("a"))
+        self.assertFalse(layer.is_layered("a"))
+
+
+class TestReadDeletions(unittest.TestCase):
+
+    def test_rows_are_grouped_by_collection(self):
+        with tempfile.TemporaryDirectory() as directory:
+            _write(directory, DELETIONS_FILE, [["Data", "Name"], ["Enemies", "Goblin"], ["status effects", "Regen"],
+                                               ["", ""], ["Spaceships", "Enterprise"], ["items", "Iron Ore"]])
+            with use_sink(NullSink()):
+                deletions = read_deletions(os.path.join(directory, DELETIONS_FILE))
+            self.assertEqual(read_deletions(os.path.join(directory, "missing.csv")), {})
+        self.assertEqual(deletions, {"enemies": ["Goblin"], "status_effects": ["Regen"], "items": ["Iron Ore"]})
+
+
+@unittest.skipUnless(os.path.isdir(DATA_DIR), "game data not available")
+class TestDataOverlays(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.hotfix = os.path.join(cls.temp_dir.name, "hotfix")
+        cls.event = os.path.join(cls.temp_dir.name, "event")
+        os.makedirs(cls.hotfix)
+        os.makedirs(cls.event)
+        _write(cls.hotfix, DATA_FILES["weapons"], [
+            ["Daggers Level 1-50", "Level Range", "Source", "Tier", "Attack Type", "Attack Damage"],
+            ["Rusty Knife", "1-3", "Dropped", "Trash", "Physical", "4"],
+            ["Pumpkin Shiv", "1-5", "Event", "Rare", "Pumpkin", "9"],
+        ])
+        _write(cls.hotfix, DELETIONS_FILE, [["Data", "Name"], ["Enemies", "Dark Goblin Warrior"], ["Items", "Sharp Vine Stick"]])
+        _write(cls.event, DATA_FILES["enemies"], [
+            ENEMY_HEADER,
+            ["Haunted Zone"] + [""] * 15,
+            ["Jack O Lantern", "3-5", "Rare", "Pumpkin", "80", "10", "9", "4", "6", "4", "3", "5", "No", "", "", "Pumpkin Shiv"],
+            ["Forest Zone"] + [""] * 15,
+            ["Squirrelkin", "1-2", "Common", "Physical", "60", "0", "5", "1", "3", "8", "2", "2", "Yes", "", "", "Rusty Knife"],
+        ])
+        with use_sink(NullSink()):
+            cls.base = GameDataManager()
+            cls.base.load_all_data(DATA_DIR)
+            cls.hotfixed = cls.base.with_overlays(cls.hotfix)
+            cls.variant = cls.base.with_overlays(cls.hotfix, cls.event)
+            cls.stacked = GameDataManager()
+            cls.stacked.load_all_data([DATA_DIR, cls.hotfix, cls.event])
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+
+    def test_base_is_left_untouched(self):
+        self.assertEqual(self.base.weapons["Rusty Knife"].attack_bonus, 2)
+        self.assertIn("Dark Goblin Warrior", self.base.enemies)
+        self.assertIn("Sharp Vine Stick", self.base.all_items)
+        self.assertNotIn("Jack O Lantern", self.base.enemies)
+        self.assertIn("Dark Goblin Warrior", self.base.zones["Forest Zone"].enemy_names)
+        self.assertIs(self.base.get_enemy("Squirrelkin").loot[-1], self.base.weapons["Rusty Knife"])
+        self.assertEqual(len(self.base.enemy_ids), len(self.base.enemies))
+
+    def test_records_are_added_replaced_and_deleted(self):
+        variant = self.variant
+        self.assertEqual(variant.get_item("Rusty Knife").attack_bonus, 4)
+        self.assertEqual(variant.get_item("Pumpkin Shiv").tier, "Rare")
+        self.assertIsNone(variant.get_enemy("Dark Goblin Warrior"))
+        self.assertIsNone(variant.get_item("Sharp Vine Stick"))
+        self.assertNotIn("Sharp Vine Stick", variant.weapons)
+        self.assertNotIn("Dark Goblin Warrior", variant.zones["Forest Zone"].enemy_names)
+        self.assertEqual(len(variant.enemies), len(self.base.enemies))
+        self.assertEqual([loot.name for loot in variant.get_enemy("Jack O Lantern").loot], ["Pumpkin Shiv"])
+        self.assertEqual(variant.get_zone("Haunted Zone").enemy_names, ["Jack O Lantern"])
+        self.assertEqual(variant.spawn_enemy("Squirrelkin", level=1).max_hp, 60)
+        self.assertEqual(variant.spawn_enemy("Jack O Lantern", level=3).max_hp, 80)
+
+    def test_unchanged_records_are_shared(self):
+        for name, enemy in self.base.enemies.items():
+            if name not in ("Squirrelkin", "Dark Goblin Warrior") and \
+               not any(item.name in ("Rusty Knife", "Sharp Vine Stick") for item in enemy.loot):
+                self.assertIs(self.variant.enemies[name], enemy)
+        self.assertIs(self.variant.skills["Power Strike"], self.base.skills["Power Strike"])
+
+    def test_enemies_are_relinked_to_replaced_records(self):
+        hotfixed = self.hotfixed.get_enemy("Squirrelkin")
+        self.assertIsNot(hotfixed, self.base.get_enemy("Squirrelkin"))
+        self.assertIs(hotfixed.loot[-1], self.hotfixed.weapons["Rusty Knife"])
+        self.assertEqual([item.name for item in hotfixed.loot], [item.name for item in self.base.get_enemy("Squirrelkin").loot])
+
+    def test_variants_are_independent(self):
+        self.assertNotIn("Jack O Lantern", self.hotfixed.enemies)
+        self.assertNotIn("Haunted Zone", self.hotfixed.zones)
+        self.assertEqual(self.hotfixed.spawn_enemy("Squirrelkin", level=1).max_hp,
+                         self.base.spawn_enemy("Squirrelkin", level=1).max_hp)
+
+    def test_derived_tables_follow_the_overlay(self):
+        variant = self.variant
+        for table in ("enemy_ids", "item_ids", "zone_ids"): # IDs are append-only
+            base_names = getattr(self.base, table).names
+            self.assertEqual(getattr(variant, table).names[:len(base_names)], base_names, table)
+        self.assertEqual(variant.enemy_ids.names[len(self.base.enemy_ids):], ["Jack O Lantern"])
+        self.assertEqual(variant.item_ids.names[len(self.base.item_ids):], ["Pumpkin Shiv"])
+        self.assertEqual(variant.zone_ids.names[len(self.base.zone_ids):], ["Haunted Zone"])
+        self.assertIsNone(variant.get_enemy_by_id(variant.enemy_ids.id_of("Dark Goblin Warrior"))) # Removed
+        self.assertIs(variant.skill_ids, self.base.skill_ids) # No skill was added or removed
+        for zone in variant.zones.values():
+            self.assertEqual([variant.enemy_ids.name_of(enemy_id) for enemy_id in zone.enemy_ids],
+                             [name for name in zone.enemy_names if name in variant.enemies])
+        for zone in self.base.zones.values():
+            self.assertEqual([self.base.enemy_ids.name_of(enemy_id) for enemy_id in zone.enemy_ids],
+                             [name for name in zone.enemy_names if name in self.base.enemies])
+        pumpkin = variant.affinities.id_of("Pumpkin")
+        self.assertNotEqual(pumpkin, 0)
+        self.assertEqual(variant.get_enemy("Jack O Lantern").type_id, pumpkin)
+        self.assertEqual(variant.get_item("Pumpkin Shiv").element_id, pumpkin)
+        self.assertEqual(self.base.affinities.id_of("Pumpkin"), 0)
+
+    def test_stacked_directories_match_with_overlays(self):
+        for collection in ("enemies", "all_items", "skills", "status_effects", "zones"):
+            self.assertEqual(list(getattr(self.stacked, collection)), list(getattr(self.variant, collection)), collection)
+        self.assertEqual(self.stacked.spawn_enemy("Squirrelkin", level=1).max_hp, 60)
+        self.assertEqual(self.stacked.get_zone("Forest Zone").enemy_names, self.variant.get_zone("Forest Zone").enemy_names)
+
+    def test_overlays_invalidate_cached_values(self):
+        cache = Cache("overlay_test")
+        for key, tag in (("knife", "data:weapons"), ("skill", "data:skills"), ("squirrel", "enemy:Squirrelkin"),
+                         ("slime", "enemy:Nature Slime"), ("build", "player:Hero:equipment")):
+            cache.put(key, 1, [tag])
+        with use_sink(NullSink()):
+            self.base.with_overlays(self.hotfix)
+        self.assertNotIn("knife", cache)
+        self.assertNotIn("squirrel", cache) # Relinked to the replaced Rusty Knife
+        self.assertEqual(sorted(key for key in ("skill", "slime", "build") if key in cache), ["build", "skill", "slime"])
+        with use_sink(NullSink()):
+            GameDataManager().load_all_data(self.hotfix)
+        self.assertEqual([key for key in ("skill", "slime", "build") if key in cache], ["build"])
+
+
+if __name__ == '__main__':
+    unittest.main()
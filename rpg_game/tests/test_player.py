@@ -1,5 +1,16 @@
 import unittest
-from core.player import Player
+import os
+
+try:
+    from rpg_game.core.player import Player
+    from rpg_game.core.item import Item
+    from rpg_game.core.skill import Skill, Ability, Spell
+except ImportError:
+    import sys
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+    from rpg_game.core.player import Player
+    from rpg_game.core.item import Item
+    from rpg_game.core.skill import Skill, Ability, Spell
 
 class TestPlayerCreation(unittest.TestCase):
     def setUp(self):
@@ -238,12 +249,6 @@ class TestPlayerDerivedStats(unittest.TestCase):
         self.assertEqual(self.player.max_mp, 30) # 6 * 5
         self.assertEqual(self.player.mp, 30)
 
-# Import Item and Skill classes for new tests
-from core.item import Item
-from core.skill import Skill, Ability, Spell
-# Note: The Player class itself should already handle its own relative imports for these if needed internally.
-# Here, we need them for instantiation in the tests.
-
 class TestPlayerInventoryAndSkills(unittest.TestCase):
     def setUp(self):
         self.player = Player("TestHeroInventorySkills")
@@ -0,0 +1,57 @@
+import unittest
+import os
+
+try:
+    from rpg_game.core.player import Player
+    from rpg_game.core.progression import XPTable, geometric_curve, linear_curve
+    from rpg_game.utils.output import MemorySink, use_sink
+except ImportError:
+    import sys
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+    from rpg_game.core.player import Player
+    from rpg_game.core.progression import XPTable, geometric_curve, linear_curve
+    from rpg_game.utils.output import MemorySink, use_sink
+
+
+class TestXPTable(unittest.TestCase):
+
+    def test_thresholds_follow_the_curve(self):
+        table = XPTable(linear_curve(100, 50), levels=3)
+        self.assertEqual([table.total_for(level) for level in (1, 2, 3, 4)], [0, 100, 250, 450])
+        self.assertEqual([table.level_for(xp) for xp in (0, 99, 100, 249, 250)], [1, 1, 2, 2, 3])
+        self.assertEqual(table.level_for(table.total_for(500)), 500) # Grows past the precomputed levels
+
+    def test_custom_curve_and_level_cap(self):
+        table = XPTable(geometric_curve(10, 2.0), max_level=5)
+        self.assertEqual(table.requirement(3), 40)
+        self.assertEqual(table.level_for(10 ** 9), 5)
+
+
+class TestMultiLevelGain(unittest.TestCase):
+
+    def test_large_grant_matches_levelling_one_at_a_time(self):
+        stepped = Player("Stepped")
+        stepped.xp = 123456
+        with use_sink(MemorySink()):
+            while stepped.xp >= stepped.xp_to_next_level:
+                stepped.level_up()
+        sink = MemorySink()
+        jumped = Player("Jumped")
+        with use_sink(sink):
+            self.assertTrue(jumped.gain_xp(123456))
+        for field in ("level", "xp", "xp_to_next_level", "stats", "derived_stats", "hp", "max_hp", "mp", "max_mp"):
+            self.assertEqual(getattr(jumped, field), getattr(stepped, field), field)
+        self.assertEqual(len(sink.events), 1)
+        self.assertEqual(sink.events[0].data, {"level": jumped.level, "levels": jumped.level - 1})
+
+    def test_player_with_its_own_table_stops_at_the_cap(self):
+        player = Player("Capped")
+        player.xp_table = XPTable(linear_curve(100, 0), max_level=3)
+        with use_sink(MemorySink()):
+            self.assertTrue(player.gain_xp(1000))
+            self.assertFalse(player.gain_xp(1000))
+        self.assertEqual((player.level, player.xp), (3, 1800))
+
+
+if __name__ == '__main__':
+    unittest.main()
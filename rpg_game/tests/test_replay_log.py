@@ -0,0 +1,138 @@
+import unittest
+import os
+import random
+import tempfile
+from types import SimpleNamespace
+
+try:
+    from rpg_game.core.autoplay import MCTSAutoplayer, autoplay
+    from rpg_game.core.fight_state import FightSetup
+    from rpg_game.core.enemy import Enemy
+    from rpg_game.core.player import Player
+    from rpg_game.core.skill import Ability
+    from rpg_game.data.id_tables import IdTable
+    from rpg_game.data.replay_log import ACTION_ATTACK, ReplayReader, ReplayWriter
+except ImportError:
+    import sys
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+    from rpg_game.core.autoplay import MCTSAutoplayer, autoplay
+    from rpg_game.core.fight_state import FightSetup
+    from rpg_game.core.enemy import Enemy
+    from rpg_game.core.player import Player
+    from rpg_game.core.skill import Ability
+    from rpg_game.data.id_tables import IdTable
+    from rpg_game.data.replay_log import ACTION_ATTACK, ReplayReader, ReplayWriter
+
+
+POWER_STRIKE = Ability("Power Strike", "", "Common", "Active", "Sword", cost="10", dmg_type="Hp Damage",
+                       formula="a.atk * 3 - b.def")
+SMASH = Ability("Smash", "", "Common", "Active", "Monster", cost="5", dmg_type="Hp Damage",
+                formula="a.atk * 2 - b.def", variance="20%")
+
+
+def _data_manager(skills=("Power Strike", "Smash")):
+    return SimpleNamespace(enemy_ids=IdTable(["Ogre", "Slime"]), skill_ids=IdTable(skills))
+
+
+def _fight(seed: int):
+    player = Player("Hero")
+    player.known_abilities.append(POWER_STRIKE)
+    enemy = Enemy(name="Ogre", max_hp=400 + seed, attack_power=18, defense=4, level_range="1",
+                  spawn_chance="Common", enemy_type="Giant", max_mp=10, magic_attack=3, magic_defense=2,
+                  agility=5, luck=1, has_sprite=False, abilities_spells=[SMASH], loot=[])
+    return FightSetup(player, enemy).initial_state(seed)
+
+
+class TestReplayLog(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "fights.replay")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _record(self, fights: int = 5):
+        """Records interleaved random fights; returns {fight id: [state after each turn]}."""
+        rng = random.Random(5)
+        history = {}
+        with ReplayWriter(self.path, _data_manager(), keyframe_interval=4, block_size=512) as writer:
+            states = [_fight(seed) for seed in range(fights)]
+            recordings = [writer.begin(state) for state in states]
+            for recording, state in zip(recordings, states):
+                history[recording.fight_id] = [tuple(state.values)]
+            while any(not state.is_over() for state in states):
+                for recording, state in zip(recordings, states):
+                    if state.is_over():
+                        continue
+                    actions = state.legal_actions()
+                    state.apply(rng.choice(actions))
+                    recording.turn(state)
+                    history[recording.fight_id].append(tuple(state.values))
+                    if state.is_over():
+                        recording.end(state)
+        return history
+
+    def test_state_at_every_turn_matches_the_fight(self):
+        history = self._record()
+        with ReplayReader(self.path, _data_manager()) as reader:
+            self.assertEqual(reader.fight_ids(), sorted(history))
+            self.assertGreater(len(reader._block_offsets), 2)
+            for fight_id, states in history.items():
+                for turn, values in enumerate(states):
+                    self.assertEqual(reader.state_at(fight_id, turn), values, (fight_id, turn))
+                with self.assertRaises(ValueError):
+                    reader.state_at(fight_id, len(states))
+
+    def test_fight_and_turn_records(self):
+        history = self._record(fights=1)
+        with ReplayReader(self.path, _data_manager()) as reader:
+            info = reader.fight(0)
+            self.assertEqual(info.player_name, "Hero")
+            self.assertEqual(info.enemy_id, 0)
+            self.assertEqual(info.player_actions, (ACTION_ATTACK, 0))
+            self.assertEqual(info.enemy_actions, (ACTION_ATTACK, 1))
+            self.assertEqual(info.initial_state, history[0][0])
+            turns = list(reader.turns(0))
+            self.assertEqual([record.turn for record in turns], list(range(1, len(history[0]))))
+            self.assertIn(reader.action_name(info.player_actions[turns[0].player_action]), ("Attack", "Power Strike"))
+            self.assertTrue(all(record.rng_draws >= 0 for record in turns))
+            self.assertEqual([record.turn for record in reader.turns(0, after=6)], list(range(7, len(history[0]))))
+
+    def test_log_without_index_is_scanned(self):
+        history = self._record()
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        with ReplayReader(self.path) as reader:
+            index_offset = reader._block_offsets[-1]
+        # Drop the index and tear the last block, as if the process had crashed
+        with open(self.path, 'wb') as f:
+            f.write(data[:index_offset + 20])
+        with ReplayReader(self.path) as reader:
+            fight_id = reader.fight_ids()[0]
+            self.assertEqual(reader.state_at(fight_id, 3), history[fight_id][3])
+
+    def test_rejects_other_game_data_and_other_files(self):
+        self._record(fights=1)
+        with self.assertRaises(ValueError):
+            ReplayReader(self.path, _data_manager(skills=("Fireball",)))
+        other = os.path.join(self.temp_dir.name, "other.bin")
+        with open(other, 'wb') as f:
+            f.write(b"not a replay log")
+        with self.assertRaises(ValueError):
+            ReplayReader(other)
+
+    def test_autoplay_records_the_fight(self):
+        player = Player("Hero")
+        enemy = Enemy(name="Slime", max_hp=60, attack_power=12, defense=2, level_range="1", spawn_chance="Common",
+                      enemy_type="Slime", max_mp=0, magic_attack=0, magic_defense=0, agility=1, luck=1,
+                      has_sprite=False, abilities_spells=[], loot=[])
+        with ReplayWriter(self.path, _data_manager()) as writer:
+            result = autoplay(player, enemy, MCTSAutoplayer(iterations=10, seed=1), seed=1, replay=writer)
+        with ReplayReader(self.path) as reader:
+            final = reader.state_at(0, result.turns)
+        self.assertEqual((final[0], final[2]), (result.player_hp, result.enemy_hp))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,178 @@
+import unittest
+import os
+import tempfile
+
+try:
+    from rpg_game.core.player import Player
+    from rpg_game.core.item import Item
+    from rpg_game.core.skill import Ability, Spell
+    from rpg_game.data.game_data_manager import GameDataManager
+    from rpg_game.data.save_game import SaveFile, load_player
+    from rpg_game.utils.output import NullSink, use_sink
+except ImportError:
+    import sys
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+    from rpg_game.core.player import Player
+    from rpg_game.core.item import Item
+    from rpg_game.core.skill import Ability, Spell
+    from rpg_game.data.game_data_manager import GameDataManager
+    from rpg_game.data.save_game import SaveFile, load_player
+    from rpg_game.utils.output import NullSink, use_sink
+
+
+def _build_data_manager() -> GameDataManager:
+    data_manager = GameDataManager()
+    data_manager.all_items = {name: Item(name, f"A {name}.") for name in ("Iron Sword", "Leather Cap", "Potion")}
+    data_manager.skills = {
+        "Power Strike": Ability("Power Strike", "A strong hit.", "Common", "Active", "Combat"),
+        "Heal": Spell("Heal", "Restores HP.", "Common", "Active", "Healing"),
+    }
+    data_manager.build_id_tables()
+    return data_manager
+
+
+class TestSaveGame(unittest.TestCase):
+
+    def setUp(self):
+        self.data_manager = _build_data_manager()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "hero.sav")
+        self.sink = use_sink(NullSink())
+        self.sink.__enter__()
+        self.player = Player("Hero")
+        self.player.add_item_to_inventory(self.data_manager.all_items["Iron Sword"])
+        self.player.learn_skill(self.data_manager.skills["Power Strike"])
+        self.player.learn_skill(self.data_manager.skills["Heal"])
+
+    def tearDown(self):
+        self.sink.__exit__(None, None, None)
+        self.temp_dir.cleanup()
+
+    def assertSamePlayer(self, loaded: Player, player: Player):
+        for field in ("name", "level", "xp", "xp_to_next_level", "hp", "max_hp", "mp", "max_mp", "stats", "derived_stats"):
+            self.assertEqual(getattr(loaded, field), getattr(player, field), field)
+        self.assertEqual([i.name for i in loaded.inventory], [i.name for i in player.inventory])
+        self.assertIs(loaded.known_abilities[0], self.data_manager.skills["Power Strike"]) # Shared game objects
+        self.assertEqual(loaded.known_spells, player.known_spells)
+
+    def test_checkpoint_round_trip(self):
+        with SaveFile(self.path, self.data_manager) as save:
+            save.save(self.player)
+        self.assertSamePlayer(load_player(self.path, self.data_manager), self.player)
+
+    def test_deltas_are_small_and_replayed(self):
+        with SaveFile(self.path, self.data_manager) as save:
+            full_size = save.save(self.player)
+            self.player.take_damage(12)
+            delta_size = save.save(self.player)
+            self.assertLess(delta_size, 20)
+            self.assertLess(delta_size, full_size)
+            self.assertEqual(save.save(self.player), 0) # Unchanged state writes nothing
+
+            self.player.add_item_to_inventory(self.data_manager.all_items["Potion"])
+            self.player.gain_xp(150)
+            save.save(self.player)
+            self.player.inventory.pop(0)
+            save.save(self.player)
+            self.assertSamePlayer(save.load(), self.player)
+
+    def test_periodic_checkpoints(self):
+        with SaveFile(self.path, self.data_manager, checkpoint_interval=2) as save:
+            sizes = []
+            for _ in range(6):
+                self.player.take_damage(1)
+                sizes.append(save.save(self.player))
+        self.assertEqual(sizes[0], sizes[3]) # Checkpoint, two deltas, checkpoint
+        self.assertLess(sizes[1], sizes[0])
+        self.assertSamePlayer(load_player(self.path, self.data_manager), self.player)
+
+    def test_checkpoints_keep_the_file_small(self):
+        with SaveFile(self.path, self.data_manager, checkpoint_interval=4) as save:
+            first = save.save(self.player)
+            for _ in range(4):
+                self.player.take_damage(1)
+                save.save(self.player)
+            bounded = os.path.getsize(self.path) # One checkpoint and four deltas
+            for _ in range(200): # A long session of per-turn saves
+                self.player.hp = self.player.max_hp - self.player.hp % 7
+                save.save(self.player)
+                self.assertLessEqual(os.path.getsize(self.path), bounded + first)
+        self.assertSamePlayer(load_player(self.path, self.data_manager), self.player)
+        self.assertEqual(os.listdir(self.temp_dir.name), ["hero.sav"])
+
+    def test_torn_tail_is_ignored(self):
+        with SaveFile(self.path, self.data_manager) as save:
+            save.save(self.player)
+            self.player.take_damage(5)
+            save.save(self.player)
+        with open(self.path, "ab") as f:
+            f.write(b"\x02\xff\x00") # Partial record from an interrupted write
+        self.assertEqual(load_player(self.path, self.data_manager).hp, self.player.hp)
+
+    def test_saves_after_a_torn_tail_are_kept(self):
+        with SaveFile(self.path, self.data_manager) as save:
+            save.save(self.player)
+        with open(self.path, "ab") as f:
+            f.write(b"\x02\xff\x00") # Partial record from a crash
+        self.player.take_damage(30)
+        with SaveFile(self.path, self.data_manager) as save:
+            save.save(self.player)
+            self.player.take_damage(5)
+            save.save(self.player)
+        self.assertSamePlayer(load_player(self.path, self.data_manager), self.player)
+
+    def test_rejects_unknown_items_and_other_data(self):
+        self.player.add_item_to_inventory(Item("Homemade Stick", "Not in the data sheets."))
+        with SaveFile(self.path, self.data_manager) as save:
+            with self.assertRaises(ValueError):
+                save.save(self.player)
+        self.player.inventory.pop()
+        with SaveFile(self.path, self.data_manager) as save:
+            save.save(self.player)
+        other_data = _build_data_manager()
+        other_data.all_items.pop("Potion")
+        other_data.build_id_tables() # Numbered from scratch, without the persisted IDs
+        with self.assertRaises(ValueError):
+            load_player(self.path, other_data)
+
+    def test_saves_survive_added_and_removed_records(self):
+        with SaveFile(self.path, self.data_manager) as save:
+            save.save(self.player)
+        edited = _build_data_manager()
+        persisted = edited.id_tables()
+        edited.all_items["Axe"] = Item("Axe", "Sorts first, but gets the next ID.")
+        del edited.all_items["Leather Cap"]
+        edited.build_id_tables(persisted)
+        self.assertEqual(edited.item_ids.id_of("Axe"), 3)
+        self.assertIsNone(edited.get_item_by_id(edited.item_ids.id_of("Leather Cap")))
+        loaded = load_player(self.path, edited)
+        self.assertEqual([item.name for item in loaded.inventory], ["Iron Sword"])
+        self.assertIs(loaded.inventory[0], edited.all_items["Iron Sword"])
+
+        self.player.add_item_to_inventory(self.data_manager.all_items["Leather Cap"])
+        with SaveFile(self.path, self.data_manager) as save:
+            save.save(self.player)
+        with self.assertRaises(ValueError): # The cap's ID is kept, but its record is gone
+            load_player(self.path, edited)
+
+    def test_ids_beyond_16_bits(self):
+        # A large modded dataset: the relics get IDs above 65535
+        self.data_manager.all_items.update({f"Relic {i:05d}": Item(f"Relic {i:05d}", "") for i in range(70000)})
+        self.data_manager.build_id_tables()
+        self.player.add_item_to_inventory(self.data_manager.all_items["Relic 69999"])
+        with SaveFile(self.path, self.data_manager) as save:
+            save.save(self.player)
+            self.player.add_item_to_inventory(self.data_manager.all_items["Relic 66000"])
+            save.save(self.player)
+            self.assertSamePlayer(save.load(), self.player)
+            self.player.inventory = [self.data_manager.all_items["Potion"]] * 70000
+            with self.assertRaises(ValueError):
+                save.save(self.player)
+
+    def test_empty_file_loads_nothing(self):
+        open(self.path, "wb").close()
+        self.assertIsNone(load_player(self.path, self.data_manager))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+import asyncio
+import os
+
+try:
+    from rpg_game.core.enemy import Enemy
+    from rpg_game.core.enemy_scaling import EnemyScalingTable
+    from rpg_game.core.item import Item
+    from rpg_game.data.game_data_manager import GameDataManager
+    from rpg_game.net.server import GameServer
+    from rpg_game.net.load_test import run_load_test, percentile
+    from rpg_game.ui.game_io import PROMPT_PREFIX
+except ImportError:
+    import sys
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+    from rpg_game.core.enemy import Enemy
+    from rpg_game.core.enemy_scaling import EnemyScalingTable
+    from rpg_game.core.item import Item
+    from rpg_game.data.game_data_manager import GameDataManager
+    from rpg_game.net.server import GameServer
+    from rpg_game.net.load_test import run_load_test, percentile
+    from rpg_game.ui.game_io import PROMPT_PREFIX
+
+
+def _build_data_manager() -> GameDataManager:
+    """A small in-memory data set so the tests do not depend on the CSV sheets."""
+    data_manager = GameDataManager()
+    data_manager.enemies = {
+        "Training Dummy": Enemy(name="Training Dummy", max_hp=1, attack_power=0, defense=0,
+                                level_range="1", spawn_chance="Common", enemy_type="Physical",
+                                max_mp=0, magic_attack=0, magic_defense=0, agility=0, luck=0,
+                                has_sprite=False, abilities_spells=[], loot=[]),
+    }
+    data_manager.all_items = {"Iron Sword": Item("Iron Sword", "A basic sword.")}
+    data_manager.enemy_scaling = EnemyScalingTable(data_manager.enemies)
+    return data_manager
+
+
+async def _read_until_prompt(reader: asyncio.StreamReader) -> list:
+    lines = []
+    while True:
+        line = (await reader.readline()).decode()
+        if not line:
+            return lines
+        lines.append(line.rstrip("\n"))
+        if line.startswith(PROMPT_PREFIX):
+            return lines
+
+
+class TestGameServer(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.data_manager = _build_data_manager()
+        self.server = GameServer(self.data_manager)
+        await self.server.start()
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def test_session_menu_and_fight(self):
+        reader, writer = await asyncio.open_connection(self.server.host, self.server.port)
+        self.assertIn("name", (await _read_until_prompt(reader))[-1])
+        writer.write(b"Tester\n")
+        menu = await _read_until_prompt(reader)
+        self.assertTrue(any("Welcome, Tester" in line for line in menu))
+
+        writer.write(b"1\n")
+        stats = await _read_until_prompt(reader)
+        self.assertIn("Name: Tester", stats)
+
+        writer.write(b"4\n")
+        await _read_until_prompt(reader) # Enemy list
+        writer.write(b"1\n")
+        await _read_until_prompt(reader) # Combat action prompt
+        writer.write(b"1\n")
+        after_fight = await _read_until_prompt(reader)
+        self.assertIn("--- Victory! ---", after_fight)
+        self.assertEqual(self.data_manager.enemies["Training Dummy"].hp, 1) # Template untouched
+
+        writer.write(b"5\n")
+        goodbye = await _read_until_prompt(reader)
+        self.assertTrue(any("Thank you for playing" in line for line in goodbye))
+        writer.close()
+        await writer.wait_closed()
+
+    async def test_concurrent_sessions_share_data_manager(self):
+        report = await run_load_test(self.server.host, self.server.port,
+                                     idle_sessions=100, active_sessions=10, commands_per_session=5)
+        self.assertEqual(report["idle_sessions"], 100)
+        self.assertEqual(report["commands"], 50)
+        self.assertGreater(report["p99_ms"], 0.0)
+        self.assertGreaterEqual(self.server.total_sessions, 110)
+
+    def test_percentile(self):
+        values = [float(v) for v in range(1, 101)]
+        self.assertEqual(percentile(values, 50), 50.0)
+        self.assertEqual(percentile(values, 99), 99.0)
+        self.assertEqual(percentile([], 99), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
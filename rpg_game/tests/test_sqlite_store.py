@@ -0,0 +1,111 @@
+import unittest
+import os
+import sqlite3
+import tempfile
+
+try:
+    from rpg_game.data.game_data_manager import GameDataManager
+    from rpg_game.data.sqlite_store import SqliteGameDataManager, export_sqlite, parse_recipe
+    from rpg_game.utils.output import NullSink, use_sink
+except ImportError:
+    import sys
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+    from rpg_game.data.game_data_manager import GameDataManager
+    from rpg_game.data.sqlite_store import SqliteGameDataManager, export_sqlite, parse_recipe
+    from rpg_game.utils.output import NullSink, use_sink
+
+DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..', "Game Csv Data"))
+
+
+def _attributes(entity) -> dict:
+    """An entity's attributes, with linked entities replaced by their names."""
+    return {name: [linked.name for linked in value] if isinstance(value, list) and value and hasattr(value[0], "name")
+            else value for name, value in vars(entity).items()}
+
+
+class TestParseRecipe(unittest.TestCase):
+
+    def test_recipe_cells(self):
+        self.assertEqual(parse_recipe("3x Bark Fragments 1x Chomper Tooth 1x Iron Ingot"),
+                         [(3, "Bark Fragments"), (1, "Chomper Tooth"), (1, "Iron Ingot")])
+        self.assertEqual(parse_recipe("1x Raw Meat, 1x Salt"), [(1, "Raw Meat"), (1, "Salt")])
+        self.assertEqual(parse_recipe(""), [])
+
+
+@unittest.skipUnless(os.path.isdir(DATA_DIR), "game data not available")
+class TestSqliteGameDataManager(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.temp_dir.name, "game.sqlite")
+        with use_sink(NullSink()):
+            cls.data_manager = GameDataManager()
+            cls.data_manager.load_all_data(DATA_DIR)
+        export_sqlite(cls.data_manager, cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+
+    def setUp(self):
+        self.database = SqliteGameDataManager(self.path, cache_size=32)
+
+    def tearDown(self):
+        self.database.close()
+
+    def test_every_entity_round_trips(self):
+        for collection in ("enemies", "all_items", "equipment", "weapons", "consumables", "materials",
+                           "skills", "status_effects", "zones"):
+            loaded, stored = getattr(self.data_manager, collection), getattr(self.database, collection)
+            self.assertEqual(sorted(loaded), list(stored), collection)
+            for name, entity in loaded.items():
+                self.assertIs(type(stored[name]), type(entity))
+                self.assertEqual(_attributes(stored[name]), _attributes(entity), name)
+
+    def test_lru_cache_is_bounded(self):
+        names = list(self.database.enemies)
+        for name in names:
+            self.database.get_enemy(name)
+        self.assertLessEqual(len(self.database._cache), 32)
+        hits = self.database.cache_hits
+        self.assertIs(self.database.get_enemy(names[-1]), self.database.get_enemy(names[-1]))
+        self.assertEqual(self.database.cache_hits, hits + 2)
+
+    def test_getters_and_queries(self):
+        enemy_name = next(iter(self.data_manager.enemies))
+        enemy_id = self.data_manager.enemy_ids.id_of(enemy_name)
+        self.assertEqual(self.database.get_enemy_by_id(enemy_id).name, enemy_name)
+        self.assertIsNone(self.database.get_item("No Such Item"))
+        self.assertNotIn("No Such Item", self.database.weapons)
+        weapon = next(iter(self.data_manager.weapons))
+        self.assertIn(weapon, self.database.weapons)
+        self.assertNotIn(weapon, self.database.equipment)
+
+        zone = next(iter(self.data_manager.zones.values()))
+        expected = sorted(name for name, enemy in self.data_manager.enemies.items() if enemy.zone_name == zone.name)
+        self.assertEqual([enemy.name for enemy in self.database.enemies_in_zone(zone.name)], expected)
+        droppers = {name for name, enemy in self.data_manager.enemies.items()
+                    if any(item.name == "Rusty Knife" for item in enemy.loot)}
+        self.assertEqual({enemy.name for enemy in self.database.enemies_dropping("Rusty Knife")}, droppers)
+        (count,), = self.database.query("SELECT COUNT(*) FROM items WHERE kind = ?", ("weapon",))
+        self.assertEqual(count, len(self.data_manager.weapons))
+
+        spawned = self.database.spawn_enemy(enemy_name, level=5)
+        self.assertEqual(spawned.max_hp, self.data_manager.spawn_enemy(enemy_name, level=5).max_hp)
+
+    def test_database_is_read_only(self):
+        with self.assertRaises(sqlite3.OperationalError):
+            self.database.query("DELETE FROM enemies")
+        with self.assertRaises(TypeError):
+            self.database.load_all_data(DATA_DIR)
+
+    def test_other_files_are_rejected(self):
+        other = os.path.join(self.temp_dir.name, "other.sqlite")
+        sqlite3.connect(other).close()
+        with self.assertRaises(ValueError):
+            SqliteGameDataManager(other)
+
+
+if __name__ == '__main__':
+    unittest.main()
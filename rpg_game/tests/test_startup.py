@@ -0,0 +1,83 @@
+import unittest
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+# Startup budgets, in seconds, for a fresh interpreter. They are several times
+# what a developer machine needs so slow CI runners do not flake.
+IMPORT_BUDGET = 0.25
+FIRST_PROMPT_BUDGET = 1.0
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+DATA_DIR = os.path.join(REPO_ROOT, "Game Csv Data")
+
+# Runs the entry point in a fresh interpreter until the first prompt and reports timings.
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+path_before = list(sys.path)
+import rpg_game.__main__ as entry
+imported = time.perf_counter()
+from rpg_game.ui.game_io import GameIO, SessionClosed
+from rpg_game.utils.output import NullSink
+
+class FirstPrompt(GameIO):
+    sink = NullSink()
+    prompted = None
+
+    async def read_line(self, prompt=""):
+        FirstPrompt.prompted = time.perf_counter()
+        raise SessionClosed("probe done")
+
+code = entry.main(["--data", sys.argv[1]], io=FirstPrompt())
+print(json.dumps({"code": code, "import": imported - started, "first_prompt": FirstPrompt.prompted - started,
+                  "parsed_csv": "rpg_game.data.enemy_loader" in sys.modules, "sys_path_changed": sys.path != path_before}))
+"""
+
+
+def _probe(data_dir: str) -> dict:
+    output = subprocess.run([sys.executable, "-c", _PROBE, data_dir], cwd=REPO_ROOT, capture_output=True,
+                            text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+@unittest.skipUnless(os.path.isdir(DATA_DIR), "game data not available")
+class TestStartup(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_dir = os.path.join(self.temp_dir.name, "data")
+        shutil.copytree(DATA_DIR, self.data_dir, ignore=shutil.ignore_patterns("__datacache__"))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_first_prompt_from_the_compiled_data_cache_is_within_budget(self):
+        cold = _probe(self.data_dir) # Parses the CSVs and writes the cache
+        self.assertEqual(cold["code"], 0)
+        self.assertTrue(cold["parsed_csv"])
+        warm = min((_probe(self.data_dir) for _ in range(3)), key=lambda run: run["first_prompt"])
+        self.assertFalse(warm["parsed_csv"]) # Loaded from the cache, so the CSV loaders were never imported
+        self.assertFalse(warm["sys_path_changed"])
+        self.assertLess(warm["import"], IMPORT_BUDGET)
+        self.assertLess(warm["first_prompt"], FIRST_PROMPT_BUDGET)
+
+    def test_stale_cache_is_rebuilt(self):
+        _probe(self.data_dir)
+        with open(os.path.join(self.data_dir, "Enemy's Sheet.csv"), 'a', encoding='utf-8') as f:
+            f.write("\n")
+        self.assertTrue(_probe(self.data_dir)["parsed_csv"])
+
+    def test_package_import_is_lazy(self):
+        code = ("import sys, rpg_game; loaded = 'rpg_game.core' in sys.modules; "
+                "rpg_game.Player; print(loaded, 'rpg_game.core.player' in sys.modules)")
+        output = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True,
+                                text=True, check=True).stdout
+        self.assertEqual(output.split(), ["False", "True"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import unittest
+import csv
+import os
+import tempfile
+import tracemalloc
+import types
+
+try:
+    from rpg_game.core.enemy import Enemy
+    from rpg_game.data.game_data_manager import DATA_FILES
+    from rpg_game.data.enemy_loader import iter_enemies, iter_enemy_sheet, load_enemies_from_csv
+    from rpg_game.data.item_loader import (iter_consumables_and_materials, iter_equipment, iter_weapons,
+                                           load_consumables_and_materials_from_csv, load_equipment_from_csv,
+                                           load_weapons_from_csv)
+    from rpg_game.data.skill_loader import iter_skills, load_skills_from_csv
+    from rpg_game.data.status_effect_loader import iter_status_effects, load_status_effects_from_csv
+    from rpg_game.utils.output import NullSink, use_sink
+    from rpg_game.world.zone import Zone
+except ImportError:
+    import sys
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+    from rpg_game.core.enemy import Enemy
+    from rpg_game.data.game_data_manager import DATA_FILES
+    from rpg_game.data.enemy_loader import iter_enemies, iter_enemy_sheet, load_enemies_from_csv
+    from rpg_game.data.item_loader import (iter_consumables_and_materials, iter_equipment, iter_weapons,
+                                           load_consumables_and_materials_from_csv, load_equipment_from_csv,
+                                           load_weapons_from_csv)
+    from rpg_game.data.skill_loader import iter_skills, load_skills_from_csv
+    from rpg_game.data.status_effect_loader import iter_status_effects, load_status_effects_from_csv
+    from rpg_game.utils.output import NullSink, use_sink
+    from rpg_game.world.zone import Zone
+
+DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..', "Game Csv Data"))
+
+SHEETS = (
+    (DATA_FILES["equipment"], iter_equipment, load_equipment_from_csv),
+    (DATA_FILES["consumables_materials"], iter_consumables_and_materials, load_consumables_and_materials_from_csv),
+    (DATA_FILES["weapons"], iter_weapons, load_weapons_from_csv),
+    (DATA_FILES["skills"], iter_skills, load_skills_from_csv),
+    (DATA_FILES["status_effects"], iter_status_effects, load_status_effects_from_csv),
+)
+
+WEAPON_HEADER = ["Swords Level 1-50", "Level Range", "Source", "Tier", "Attack Type", "Attack", "Defense"]
+
+
+@unittest.skipUnless(os.path.isdir(DATA_DIR), "game data not available")
+class TestStreamingMatchesDictLoaders(unittest.TestCase):
+
+    def test_sheet_iterators(self):
+        for file_name, iterate, load in SHEETS:
+            path = os.path.join(DATA_DIR, file_name)
+            streamed = iterate(path)
+            self.assertIsInstance(streamed, types.GeneratorType)
+            streamed = list(streamed)
+            loaded = load(path)
+            self.assertEqual({entity.name: vars(entity) for entity in streamed},
+                             {name: vars(entity) for name, entity in loaded.items()}, file_name)
+
+    def test_enemy_sheet_yields_zones_then_their_enemies(self):
+        path = os.path.join(DATA_DIR, DATA_FILES["enemies"])
+        with use_sink(NullSink()):
+            enemies, zones = load_enemies_from_csv(path, {}, {})
+            records = list(iter_enemy_sheet(path, {}, {}))
+            streamed = list(iter_enemies(path, {}, {}))
+        # The sheet repeats some zone markers; the dict loader keeps one zone per name
+        self.assertEqual(list(dict.fromkeys(record.name for record in records if isinstance(record, Zone))), list(zones))
+        self.assertTrue(all(isinstance(enemy, Enemy) for enemy in streamed))
+        self.assertEqual({enemy.name: vars(enemy) for enemy in streamed},
+                         {name: vars(enemy) for name, enemy in enemies.items()})
+        current_zone = None
+        for record in records:
+            if isinstance(record, Zone):
+                current_zone = record.name
+            else:
+                self.assertEqual(record.zone_name, current_zone)
+
+
+class TestStreamingMemory(unittest.TestCase):
+
+    ROWS = 20000
+
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.temp_dir.name, "weapons.csv")
+        with open(cls.path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(WEAPON_HEADER)
+            for index in range(cls.ROWS):
+                writer.writerow([f"Sword {index}", "1-3", "Crafted", "Common", "Physical", str(index % 50), "1"])
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+
+    def _peak(self, consume) -> int:
+        tracemalloc.start()
+        try:
+            consume()
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    def test_iterating_does_not_grow_with_the_sheet(self):
+        def count():
+            self.count = sum(1 for _weapon in iter_weapons(self.path))
+        streamed_peak = self._peak(count)
+        loaded_peak = self._peak(lambda: load_weapons_from_csv(self.path))
+        self.assertEqual(self.count, self.ROWS)
+        self.assertLess(streamed_peak * 20, loaded_peak)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+import os
+import random
+
+try:
+    from rpg_game.core.player import Player
+    from rpg_game.core.ttk_estimator import (CombatProfile, TTKEstimator, estimate_fight, estimate_profiles, hit_chance,
+                                             player_profile, simulate_rolled_fight, survival_curve)
+    from rpg_game.data.game_data_manager import GameDataManager
+    from rpg_game.utils.output import NullSink, use_sink
+except ImportError:
+    import sys
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+    from rpg_game.core.player import Player
+    from rpg_game.core.ttk_estimator import (CombatProfile, TTKEstimator, estimate_fight, estimate_profiles, hit_chance,
+                                             player_profile, simulate_rolled_fight, survival_curve)
+    from rpg_game.data.game_data_manager import GameDataManager
+    from rpg_game.utils.output import NullSink, use_sink
+
+DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..', "Game Csv Data"))
+
+FIGHTS = 5000
+DEATH_TOLERANCE = 0.03
+TTK_TOLERANCE = 0.05 # Relative
+
+MATCHUPS = (
+    # (player, enemy): an easy fight, a close one and one the player usually loses
+    (CombatProfile(100, 20, 15, 75.0, 5.0, 25.0), CombatProfile(60, 12, 4, 70.0, 2.0, 1.0)),
+    (CombatProfile(100, 20, 15, 75.0, 5.0, 25.0), CombatProfile(180, 28, 8, 80.0, 10.0, 5.0)),
+    (CombatProfile(80, 14, 5, 60.0, 0.0, 0.0), CombatProfile(150, 25, 6, 90.0, 20.0, 30.0)),
+)
+
+
+class TestHitModel(unittest.TestCase):
+
+    def test_hit_chance_is_clamped(self):
+        self.assertAlmostEqual(hit_chance(75.0, 5.0), 0.70)
+        self.assertAlmostEqual(hit_chance(200.0, 0.0), 0.95)
+        self.assertAlmostEqual(hit_chance(10.0, 50.0), 0.05)
+
+    def test_sure_hits_kill_on_schedule(self):
+        self.assertEqual(survival_curve(25, 10, 1.0, 0.0, 100), [1.0, 1.0, 1.0, 0.0])
+        # Every hit a crit: 15 damage, so 2 attacks
+        self.assertEqual(survival_curve(25, 10, 1.0, 1.0, 100), [1.0, 1.0, 0.0])
+        self.assertEqual(survival_curve(25, 0, 1.0, 0.5, 10), [1.0] * 11)
+
+    def test_estimates_agree_with_rolled_fights(self):
+        rng = random.Random(7)
+        for player, enemy in MATCHUPS:
+            estimate = estimate_profiles(player, enemy)
+            wins = sum(simulate_rolled_fight(player, enemy, rng)[0] for _ in range(FIGHTS))
+            self.assertAlmostEqual(estimate.death_chance, 1 - wins / FIGHTS, delta=DEATH_TOLERANCE)
+            # Turns to kill ignore the player's death, so measure them against an unkillable player
+            immortal = player._replace(hp=10 ** 9)
+            turns = sum(simulate_rolled_fight(immortal, enemy, rng)[1] for _ in range(FIGHTS)) / FIGHTS
+            self.assertAlmostEqual(estimate.expected_ttk, turns, delta=TTK_TOLERANCE * turns)
+
+    def test_harmless_sides(self):
+        player = CombatProfile(100, 5, 50, 75.0, 5.0, 0.0)
+        enemy = CombatProfile(50, 10, 10, 75.0, 5.0, 0.0)
+        estimate = estimate_profiles(player, enemy, max_turns=50)
+        self.assertEqual(estimate.death_chance, 1.0) # Nobody can hurt anybody: the fight times out
+        self.assertEqual(estimate.expected_ttk, 50)
+        self.assertEqual(estimate.expected_ttd, 50)
+
+
+@unittest.skipUnless(os.path.isdir(DATA_DIR), "game data not available")
+class TestTTKEstimator(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        with use_sink(NullSink()):
+            cls.data_manager = GameDataManager()
+            cls.data_manager.load_all_data(DATA_DIR)
+        cls.player = Player("Tester")
+
+    def test_estimates_are_cached(self):
+        estimator = TTKEstimator(self.data_manager, cache_size=8)
+        names = list(self.data_manager.enemies)[:12]
+        for name in names:
+            estimate = estimator.estimate(self.player, name, level=1)
+            self.assertEqual(estimate, estimate_fight(self.player, self.data_manager.spawn_enemy(name, 1)))
+        self.assertEqual((estimator.cache_hits, estimator.cache_misses), (0, 12))
+        self.assertLessEqual(len(estimator._cache), 8)
+        estimator.estimate(self.player, names[-1], level=1)
+        self.assertEqual(estimator.cache_hits, 1)
+        estimator.estimate(self.player, names[-1], level=2)
+        self.assertEqual(estimator.cache_misses, 13)
+
+    def test_build_changes_miss_the_cache(self):
+        estimator = TTKEstimator(self.data_manager)
+        name = next(iter(self.data_manager.enemies))
+        estimator.estimate(self.player, name)
+        stronger = Player("Tester")
+        stronger.stats['strength'] += 5
+        stronger._calculate_derived_stats()
+        self.assertNotEqual(player_profile(stronger), player_profile(self.player))
+        estimator.estimate(stronger, name)
+        self.assertEqual(estimator.cache_misses, 2)
+        self.assertIsNone(estimator.estimate(self.player, "No Such Enemy"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+from typing import TYPE_CHECKING, Optional
+
+try:
+    from ..utils.output import OutputSink, MemorySink, console_sink
+except ImportError: # Fallback when 'ui' is imported as a top-level package (e.g. from Game.py)
+    from utils.output import OutputSink, MemorySink, console_sink
+
+if TYPE_CHECKING: # Only StreamIO needs asyncio, and it is handed ready-made streams
+    import asyncio
+
+
+# Every prompt sent over a network session starts with this marker so line-based
+# clients know the server is waiting for input.
+PROMPT_PREFIX = ">>> "
+
+
+class SessionClosed(ConnectionError):
+    """Raised by an IO adapter when the other side of a session went away."""
+
+
+class GameIO:
+    """
+    Non-blocking input adapter used by the menu and combat loops.
+
+    Output does not go through the adapter directly: game code emits events to the
+    active output sink, and `sink` is the one this session's events should reach.
+    Waiting for input is a turn boundary, so adapters send pending output first.
+    """
+    sink: OutputSink
+
+    async def read_line(self, prompt: str = "") -> str:
+        """Flushes pending output, shows the prompt and waits for one line of input."""
+        raise NotImplementedError
+
+    async def flush(self) -> None:
+        """Sends any pending output."""
+        self.sink.flush()
+
+
+class ConsoleIO(GameIO):
+    """
+    Adapter for the local single-player console game.
+    Reading uses input() directly since there is nothing else for the loop to run.
+    """
+    def __init__(self, sink: Optional[OutputSink] = None):
+        self.sink = sink if sink is not None else console_sink
+
+    async def read_line(self, prompt: str = "") -> str:
+        self.sink.flush()
+        try:
+            return input(prompt)
+        except EOFError:
+            raise SessionClosed("Console input closed.")
+
+
+class StreamIO(GameIO):
+    """
+    Adapter for a line-based TCP session on top of asyncio streams.
+    Events are collected in a MemorySink and sent in one write per prompt.
+    """
+    def __init__(self, reader: "asyncio.StreamReader", writer: "asyncio.StreamWriter",
+                 encoding: str = "utf-8"):
+        self.reader: "asyncio.StreamReader" = reader
+        self.writer: "asyncio.StreamWriter" = writer
+        self.encoding: str = encoding
+        self.sink: MemorySink = MemorySink()
+
+    async def _send(self, prompt: Optional[str] = None) -> None:
+        lines = [event.text for event in self.sink.drain()]
+        if prompt is not None:
+            lines.append(PROMPT_PREFIX + prompt.strip())
+        if not lines:
+            return
+        self.writer.write(("\n".join(lines) + "\n").encode(self.encoding))
+        try:
+            await self.writer.drain()
+        except ConnectionError as e:
+            raise SessionClosed(str(e))
+
+    async def flush(self) -> None:
+        await self._send()
+
+    async def read_line(self, prompt: str = "") -> str:
+        await self._send(prompt)
+        line = await self.reader.readline()
+        if not line:
+            raise SessionClosed("Client disconnected.")
+        return line.decode(self.encoding, errors="replace").rstrip("\r\n")
@@ -0,0 +1,166 @@
+from typing import List, Optional
+
+try:
+    from ..core.player import Player
+    from ..core.combat import run_combat
+    from .game_io import GameIO, SessionClosed
+    from ..utils.output import emit, use_sink
+except ImportError: # Fallback when 'core' and 'ui' are top-level packages (e.g. from Game.py)
+    from core.player import Player
+    from core.combat import run_combat
+    from ui.game_io import GameIO, SessionClosed
+    from utils.output import emit, use_sink
+
+
+# How many enemies the fight menu lists at once.
+ENEMY_DISPLAY_LIMIT = 10
+
+
+def stats_lines(player: Player) -> List[str]:
+    """Returns the lines of the "View Stats" screen."""
+    lines = [
+        "\n--- Your Stats ---",
+        f"Name: {player.name}",
+        f"Level: {player.level}",
+        f"XP: {player.xp}/{player.xp_to_next_level}",
+        f"HP: {player.hp}/{player.max_hp}",
+        f"MP: {player.mp}/{player.max_mp}",
+        "\nPrimary Stats:",
+    ]
+    for stat, value in player.stats.items():
+        lines.append(f"  {stat.capitalize()}: {value}")
+    lines.append("\nDerived Stats:")
+    for stat, value in player.derived_stats.items():
+        if isinstance(value, float):
+            lines.append(f"  {stat.replace('_', ' ').capitalize()}: {value:.2%}") # Format percentages
+        else:
+            lines.append(f"  {stat.replace('_', ' ').capitalize()}: {value}")
+    lines.append("--- End Stats ---")
+    return lines
+
+
+def grant_starting_kit(player: Player, data_manager) -> None:
+    """Gives a new player the starting weapon, armor, skills and spell."""
+    emit("\n--- Granting Starting Equipment and Skills ---", "menu")
+    starting_weapon = data_manager.get_item("Iron Sword")
+    if starting_weapon:
+        player.add_item_to_inventory(starting_weapon)
+        emit(f"{player.name} starts with an {starting_weapon.name}!", "menu")
+    else:
+        emit("Warning: Starting weapon 'Iron Sword' not found in game data.", "menu")
+
+    starting_armor = data_manager.get_item("Leather Cap")
+    if starting_armor:
+        player.add_item_to_inventory(starting_armor)
+        emit(f"{player.name} equipped with a {starting_armor.name}!", "menu")
+    else:
+        emit("Warning: Starting armor 'Leather Cap' not found.", "menu")
+
+    for skill_name, label in (("Attack (Base Attack)", "Basic attack skill"),
+                              ("Power Strike", "Skill"),
+                              ("Heal", "Spell")):
+        skill = data_manager.get_skill(skill_name)
+        if skill:
+            player.learn_skill(skill)
+        else:
+            emit(f"Warning: {label} '{skill_name}' not found.", "menu")
+    emit("--- Starting Setup Complete ---", "menu")
+
+
+async def choose_and_fight(player: Player, data_manager, io: GameIO) -> None:
+    """Lists the first enemies, asks which one to fight and runs the combat."""
+    available_enemy_names = list(data_manager.enemies.keys())
+    if not available_enemy_names:
+        emit("No enemies loaded! Perhaps check the CSV files or loading paths.", "menu")
+        return
+
+    emit("\nChoose an enemy to fight:", "menu")
+    display_limit = min(ENEMY_DISPLAY_LIMIT, len(available_enemy_names))
+    for i, name in enumerate(available_enemy_names[:display_limit]):
+        enemy_obj_preview = data_manager.get_enemy(name)
+        zone_display = enemy_obj_preview.zone_name if enemy_obj_preview.zone_name else 'N/A'
+        emit(f"{i + 1}. {name} (Lvl: {enemy_obj_preview.level_range}, Zone: {zone_display})", "menu")
+
+    enemy_choice_str = (await io.read_line(f"Enter your choice (1-{display_limit}), or 0 to cancel: ")).strip()
+    if not enemy_choice_str: # Empty input
+        emit("No choice made, returning to menu.", "menu")
+        return
+
+    try:
+        enemy_choice_num = int(enemy_choice_str)
+    except ValueError:
+        emit("Invalid input. Please enter a number.", "menu")
+        return
+    if enemy_choice_num == 0:
+        emit("Fight cancelled.", "menu")
+        return
+    if not (1 <= enemy_choice_num <= display_limit):
+        emit("Invalid choice. Please enter a number from the list.", "menu")
+        return
+
+    chosen_enemy_name = available_enemy_names[enemy_choice_num - 1]
+    # Fight a fresh, level-scaled instance so the shared template is never damaged
+    enemy_to_fight = data_manager.spawn_enemy(chosen_enemy_name)
+    if enemy_to_fight:
+        emit(f"\nYou encounter a level {enemy_to_fight.level} {enemy_to_fight.name}!", "menu")
+        await run_combat(player, enemy_to_fight, io, affinities=data_manager.affinities, initiative=True)
+    else:
+        emit(f"Error: Could not find enemy data for {chosen_enemy_name}.", "menu")
+
+
+async def run_game_session(io: GameIO, data_manager, player_name: Optional[str] = None) -> Optional[Player]:
+    """
+    Runs one player's whole game (character creation and main menu) over an IO adapter.
+
+    The data manager is only read, so any number of sessions can share one instance.
+
+    Args:
+        io: The adapter for this session's input and output.
+        data_manager: A loaded GameDataManager.
+        player_name: Skips the name prompt when given.
+
+    Returns:
+        The session's Player, or None if the session closed before one was created.
+    """
+    player: Optional[Player] = None
+    with use_sink(io.sink):
+        try:
+            if player_name is None:
+                player_name = (await io.read_line("Enter your character's name: ")).strip() or "Hero"
+            player = Player(player_name)
+            emit(f"\nWelcome, {player.name}, to this basic RPG adventure!", "menu")
+            grant_starting_kit(player, data_manager)
+
+            while True:
+                emit("\n" + "="*30, "menu")
+                emit(f"HP: {player.hp}/{player.max_hp} | MP: {player.mp}/{player.max_mp} | Level: {player.level}", "menu")
+                emit("="*30, "menu")
+                emit("\nChoose an action:", "menu")
+                emit("1. View Stats", "menu")
+                emit("2. View Inventory", "menu")
+                emit("3. View Skills", "menu")
+                emit("4. Fight an Enemy", "menu")
+                emit("5. Quit", "menu")
+
+                choice = (await io.read_line("Enter your choice (1-5): ")).strip()
+
+                if choice == "1":
+                    emit("\n".join(stats_lines(player)), "menu")
+                elif choice == "2":
+                    player.view_inventory()
+                elif choice == "3":
+                    player.view_skills()
+                elif choice == "4":
+                    await choose_and_fight(player, data_manager, io)
+                    if player.hp <= 0:
+                        emit("\nGame Over. Thank you for playing!", "menu")
+                        break
+                elif choice == "5":
+                    emit("\nThank you for playing!", "menu")
+                    break
+                else:
+                    emit("\nInvalid choice. Please enter a number between 1 and 5.", "menu")
+            await io.flush()
+        except SessionClosed:
+            pass
+    return player
@@ -0,0 +1,242 @@
+"""
+Bounded caches for derived game values.
+
+A Cache is an LRU cache of at most `max_entries` entries whose entries may also
+expire after `ttl` seconds, so it never grows without bound in a long-running
+server. Entries can carry invalidation tags; tags are hierarchical on ":", so
+invalidating "player:42" also drops entries tagged "player:42:equipment".
+Conventional tags are "data:<collection>" (e.g. "data:weapons"),
+"enemy:<name>" and "player:<id>:<aspect>".
+
+invalidate() drops a tag from every live cache of the process, which is how
+code that changes game data tells caches it does not know about. memoize()
+turns a function into a cached one.
+
+Each cache counts its hits, misses and evictions; while metrics are enabled they
+are also recorded as rpg_cache_requests_total and rpg_cache_evictions_total,
+labelled with the cache's name.
+"""
+import functools
+import time
+import weakref
+from collections import OrderedDict
+from typing import (Any, Callable, Dict, Hashable, Iterable, NamedTuple, Optional, Set, Tuple, Union)
+
+try:
+    from .metrics import registry as metrics
+except ImportError: # Fallback when 'utils' is imported as a top-level package
+    from metrics import registry as metrics
+
+
+DEFAULT_MAX_ENTRIES = 1024
+_MISSING = object()
+
+_REQUESTS_HELP = "Cache lookups by result."
+_EVICTIONS_HELP = "Cache entries dropped, by reason."
+
+# Every live cache, for invalidate(); caches that are garbage collected drop out.
+_caches: "weakref.WeakSet[Cache]" = weakref.WeakSet()
+
+
+class CacheStats(NamedTuple):
+    """A snapshot of a cache's counters."""
+    name: str
+    size: int
+    max_entries: int
+    hits: int
+    misses: int
+    evictions: int # Dropped to stay within max_entries
+    expirations: int # Dropped because their TTL ran out
+    invalidations: int # Dropped by invalidate()/invalidate_tag()
+
+    @property
+    def hit_rate(self) -> float:
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0.0
+
+
+class Cache:
+    """
+    A size-bounded LRU cache with optional TTL expiry and invalidation tags.
+    """
+    def __init__(self, name: str, max_entries: int = DEFAULT_MAX_ENTRIES, ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initializes an empty cache.
+
+        Args:
+            name: Identifies the cache in metrics and stats.
+            max_entries: The least recently used entry is dropped beyond this many.
+            ttl: Seconds after which an entry expires; None keeps entries until they are evicted.
+            clock: Returns the current time in seconds (for tests).
+        """
+        if max_entries < 1:
+            raise ValueError(f"Cache {name!r} needs room for at least one entry, got {max_entries}.")
+        self.name: str = name
+        self.max_entries: int = max_entries
+        self.ttl: Optional[float] = ttl
+        self.clock: Callable[[], float] = clock
+        self._entries: "OrderedDict[Hashable, Tuple[Any, Optional[float], Tuple[str, ...]]]" = OrderedDict()
+        self._tagged: Dict[str, Set[Hashable]] = {} # Tag -> keys of the entries that carry it
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.expirations: int = 0
+        self.invalidations: int = 0
+        self._hit_counter = metrics.counter("rpg_cache_requests_total", _REQUESTS_HELP, cache=name, result="hit")
+        self._miss_counter = metrics.counter("rpg_cache_requests_total", _REQUESTS_HELP, cache=name, result="miss")
+        self._dropped = {reason: metrics.counter("rpg_cache_evictions_total", _EVICTIONS_HELP, cache=name, reason=reason)
+                         for reason in ("size", "ttl", "invalidation")}
+        _caches.add(self)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Returns a cached value (marking it recently used), or default on a miss."""
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= self.clock():
+            self._remove(key, "ttl")
+            entry = None
+        if entry is None:
+            self.misses += 1
+            if metrics.enabled:
+                self._miss_counter.inc()
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        if metrics.enabled:
+            self._hit_counter.inc()
+        return entry[0]
+
+    def put(self, key: Hashable, value: Any, tags: Iterable[str] = ()) -> None:
+        """Caches a value under a key, replacing any entry the key had."""
+        if key in self._entries:
+            self._remove(key, None)
+        tags = tuple(tags)
+        expires = self.clock() + self.ttl if self.ttl is not None else None
+        self._entries[key] = (value, expires, tags)
+        for tag in tags:
+            self._tagged.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)), "size")
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any], tags: Iterable[str] = ()) -> Any:
+        """Returns the cached value of a key, computing and caching it on a miss."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value, tags)
+        return value
+
+    def invalidate(self, key: Hashable) -> bool:
+        """Drops one entry. Returns whether there was one."""
+        if key not in self._entries:
+            return False
+        self._remove(key, "invalidation")
+        return True
+
+    def invalidate_tag(self, tag: str) -> int:
+        """Drops the entries tagged with a tag or any tag below it. Returns how many were dropped."""
+        prefix = tag + ":"
+        keys: Set[Hashable] = set()
+        for entry_tag in [entry_tag for entry_tag in self._tagged if entry_tag == tag or entry_tag.startswith(prefix)]:
+            keys |= self._tagged[entry_tag]
+        for key in keys:
+            self._remove(key, "invalidation")
+        return len(keys)
+
+    def purge_expired(self) -> int:
+        """Drops every expired entry now rather than when it is next looked up. Returns how many were dropped."""
+        if self.ttl is None:
+            return 0
+        now = self.clock()
+        expired = [key for key, (_, expires, _) in self._entries.items() if expires <= now]
+        for key in expired:
+            self._remove(key, "ttl")
+        return len(expired)
+
+    def clear(self) -> None:
+        """Drops every entry; the counters are kept."""
+        self._entries.clear()
+        self._tagged.clear()
+
+    def stats(self) -> CacheStats:
+        return CacheStats(self.name, len(self._entries), self.max_entries, self.hits, self.misses,
+                          self.evictions, self.expirations, self.invalidations)
+
+    def _remove(self, key: Hashable, reason: Optional[str]) -> None:
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tagged[tag]
+            keys.discard(key)
+            if not keys:
+                del self._tagged[tag]
+        if reason == "size":
+            self.evictions += 1
+        elif reason == "ttl":
+            self.expirations += 1
+        elif reason == "invalidation":
+            self.invalidations += 1
+        if reason is not None and metrics.enabled:
+            self._dropped[reason].inc()
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Whether a key has an entry (expired entries included); does not count as a lookup."""
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"Cache({self.name!r}, {len(self._entries)}/{self.max_entries} entries, ttl={self.ttl})"
+
+
+def invalidate(*tags: str) -> int:
+    """Drops the entries tagged with any of the tags (or tags below them) from every live cache."""
+    return sum(cache.invalidate_tag(tag) for cache in list(_caches) for tag in tags)
+
+
+def all_stats() -> Dict[str, CacheStats]:
+    """Returns the stats of every live cache by name (a later cache with the same name wins)."""
+    return {cache.name: cache.stats() for cache in list(_caches)}
+
+
+def _call_key(args: Tuple, kwargs: Dict[str, Any]) -> Hashable:
+    return (args, tuple(sorted(kwargs.items()))) if kwargs else args
+
+
+def memoize(cache: Union[Cache, str, None] = None, max_entries: int = DEFAULT_MAX_ENTRIES, ttl: Optional[float] = None,
+            key: Optional[Callable[..., Hashable]] = None, tags: Optional[Callable[..., Iterable[str]]] = None):
+    """
+    Caches a function's results in a Cache.
+
+    Args:
+        cache: The cache to use, or the name of a new one (default: the function's qualified name).
+        max_entries: Size of a new cache.
+        ttl: TTL of a new cache.
+        key: Builds the cache key from the call's arguments (default: the arguments themselves,
+             which must then be hashable).
+        tags: Returns the invalidation tags of a call's result, from the same arguments.
+
+    The wrapper has the cache as `.cache` and a `.cache_clear()` method. Keys hold
+    strong references to the arguments until their entry is dropped, so memoized
+    methods should pass a `key` that leaves out `self` when instances are short-lived.
+
+    Example:
+        @memoize(max_entries=256, tags=lambda name, level: [f"enemy:{name}"])
+        def scaled_stats(name, level): ...
+    """
+    def decorate(function: Callable) -> Callable:
+        store = cache if isinstance(cache, Cache) else Cache(cache or function.__qualname__, max_entries, ttl)
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            call_key = key(*args, **kwargs) if key is not None else _call_key(args, kwargs)
+            value = store.get(call_key, _MISSING)
+            if value is _MISSING:
+                value = function(*args, **kwargs)
+                store.put(call_key, value, tags(*args, **kwargs) if tags is not None else ())
+            return value
+
+        wrapper.cache = store
+        wrapper.cache_clear = store.clear
+        return wrapper
+    return decorate
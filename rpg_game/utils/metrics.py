@@ -0,0 +1,167 @@
+import json
+import os
+import time
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+
+# Bucket upper bounds for durations in seconds (1 microsecond .. 5 seconds).
+TIME_BUCKETS: Tuple[float, ...] = (1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+# Bucket upper bounds for turns per fight.
+TURN_BUCKETS: Tuple[float, ...] = (1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in pairs) + "}"
+
+
+class Counter:
+    """A monotonically increasing count."""
+    kind = "counter"
+
+    def __init__(self, name: str, labels: Labels = ()):
+        self.name: str = name
+        self.labels: Labels = labels
+        self.value: float = 0
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+    def reset(self) -> None:
+        self.value = 0
+
+    def to_dict(self) -> Dict:
+        return {"labels": dict(self.labels), "value": self.value}
+
+    def prometheus_lines(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labels)} {self.value}"]
+
+
+class Histogram:
+    """Counts observations per bucket and keeps their sum, like a Prometheus histogram."""
+    kind = "histogram"
+
+    def __init__(self, name: str, buckets: Sequence[float], labels: Labels = ()):
+        self.name: str = name
+        self.labels: Labels = labels
+        self.buckets: Tuple[float, ...] = tuple(buckets)
+        self.counts: List[int] = [0] * (len(self.buckets) + 1) # Last slot is +Inf
+        self.count: int = 0
+        self.sum: float = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def reset(self) -> None:
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def to_dict(self) -> Dict:
+        return {"labels": dict(self.labels), "count": self.count, "sum": self.sum,
+                "buckets": {str(bound): count for bound, count in zip(self.buckets + ("+Inf",), self.counts)}}
+
+    def prometheus_lines(self) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + ("+Inf",), self.counts):
+            cumulative += count
+            lines.append(f"{self.name}_bucket{_format_labels(self.labels, ('le', str(bound)))} {cumulative}")
+        lines.append(f"{self.name}_sum{_format_labels(self.labels)} {self.sum}")
+        lines.append(f"{self.name}_count{_format_labels(self.labels)} {self.count}")
+        return lines
+
+
+Metric = Union[Counter, Histogram]
+
+
+class MetricsRegistry:
+    """
+    Holds every metric of the process and the switch that turns recording on or off.
+
+    Hot paths check `enabled` (or use start()/stop_and_observe()) before doing any
+    work, so a disabled registry costs one attribute lookup per call site.
+    """
+    def __init__(self, enabled: bool = False):
+        self.enabled: bool = enabled
+        self._metrics: Dict[Tuple[str, Labels], Metric] = {}
+        self._help: Dict[str, str] = {}
+
+    def _get(self, cls, name: str, help_text: str, labels: Dict[str, str], **kwargs) -> Metric:
+        key = (name, tuple(sorted(labels.items())))
+        metric = self._metrics.get(key)
+        if metric is None:
+            metric = cls(name, labels=key[1], **kwargs)
+            self._metrics[key] = metric
+            self._help.setdefault(name, help_text)
+        return metric
+
+    def counter(self, name: str, help_text: str = "", **labels: str) -> Counter:
+        """Returns the counter with this name and labels, creating it on first use."""
+        return self._get(Counter, name, help_text, labels)
+
+    def histogram(self, name: str, help_text: str = "", buckets: Sequence[float] = TIME_BUCKETS,
+                  **labels: str) -> Histogram:
+        """Returns the histogram with this name and labels, creating it on first use."""
+        return self._get(Histogram, name, help_text, labels, buckets=buckets)
+
+    def start(self) -> Optional[float]:
+        """Returns a start timestamp, or None when recording is disabled."""
+        return time.perf_counter() if self.enabled else None
+
+    def stop_and_observe(self, histogram: Histogram, started: Optional[float]) -> None:
+        """Records the time since a start() timestamp; does nothing for None."""
+        if started is not None:
+            histogram.observe(time.perf_counter() - started)
+
+    def reset(self) -> None:
+        """Zeroes every metric; metric objects cached by call sites stay registered."""
+        for metric in self._metrics.values():
+            metric.reset()
+
+    def to_dict(self) -> Dict:
+        """Returns a JSON-serializable snapshot of every metric."""
+        snapshot: Dict[str, Dict] = {}
+        for (name, _), metric in sorted(self._metrics.items()):
+            entry = snapshot.setdefault(name, {"type": metric.kind, "help": self._help.get(name, ""), "series": []})
+            entry["series"].append(metric.to_dict())
+        return snapshot
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def to_prometheus(self) -> str:
+        """Returns the snapshot in the Prometheus text exposition format."""
+        lines: List[str] = []
+        last_name = None
+        for (name, _), metric in sorted(self._metrics.items()):
+            if name != last_name:
+                if self._help.get(name):
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} {metric.kind}")
+                last_name = name
+            lines.extend(metric.prometheus_lines())
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry; set RPG_METRICS=1 to record from startup.
+registry = MetricsRegistry(enabled=os.environ.get("RPG_METRICS", "") not in ("", "0"))
+
+
+def enable() -> None:
+    registry.enabled = True
+
+
+def disable() -> None:
+    registry.enabled = False
+
+
+def is_enabled() -> bool:
+    return registry.enabled
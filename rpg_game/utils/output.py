@@ -0,0 +1,124 @@
+import atexit
+import sys
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, TextIO
+
+
+class OutputEvent(NamedTuple):
+    """One piece of game output: a kind tag, the display text and structured fields."""
+    kind: str
+    text: str
+    data: Dict[str, Any]
+
+
+class OutputSink:
+    """
+    Destination for everything the game and the loaders report.
+
+    Game code calls emit() instead of print(); the active sink decides whether the
+    text is buffered for the console, recorded for a server session or dropped.
+    """
+    def emit(self, text: str = "", kind: str = "message", **data: Any) -> None:
+        """Records one output event."""
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        """Pushes buffered output to its destination (called at turn boundaries)."""
+
+
+class BufferedConsoleSink(OutputSink):
+    """
+    Writes event text to a stream, batching lines so a whole turn costs one write.
+    """
+    def __init__(self, stream: Optional[TextIO] = None, max_buffered_lines: int = 256):
+        """
+        Initializes the sink.
+
+        Args:
+            stream: Target stream. None means whatever sys.stdout is at flush time.
+            max_buffered_lines: Buffered lines that force an early flush.
+        """
+        self.stream: Optional[TextIO] = stream
+        self.max_buffered_lines: int = max_buffered_lines
+        self._lines: List[str] = []
+
+    def emit(self, text: str = "", kind: str = "message", **data: Any) -> None:
+        self._lines.append(text)
+        if len(self._lines) >= self.max_buffered_lines:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._lines:
+            return
+        stream = self.stream if self.stream is not None else sys.stdout
+        stream.write("\n".join(self._lines) + "\n")
+        stream.flush()
+        self._lines.clear()
+
+
+class NullSink(OutputSink):
+    """Discards all output; used by simulations and benchmarks."""
+    def emit(self, text: str = "", kind: str = "message", **data: Any) -> None:
+        pass
+
+
+class MemorySink(OutputSink):
+    """
+    Keeps structured events in memory until drained; used by server sessions.
+    """
+    def __init__(self):
+        self.events: List[OutputEvent] = []
+
+    def emit(self, text: str = "", kind: str = "message", **data: Any) -> None:
+        self.events.append(OutputEvent(kind, text, data))
+
+    def drain(self) -> List[OutputEvent]:
+        """Returns all recorded events and clears the buffer."""
+        events = self.events
+        self.events = []
+        return events
+
+    def lines(self) -> List[str]:
+        """Returns the text of the recorded events without clearing them."""
+        return [event.text for event in self.events]
+
+
+# Process-wide default; flushed on exit so nothing buffered is lost.
+console_sink = BufferedConsoleSink()
+atexit.register(console_sink.flush)
+
+# The active sink is context-local, so every asyncio task (e.g. a server session)
+# can route output to its own sink.
+_current_sink: ContextVar[OutputSink] = ContextVar("rpg_output_sink", default=console_sink)
+
+
+def get_sink() -> OutputSink:
+    """Returns the sink active in the current context."""
+    return _current_sink.get()
+
+
+def set_sink(sink: OutputSink) -> None:
+    """Replaces the sink for the current context (and tasks started from it)."""
+    _current_sink.set(sink)
+
+
+@contextmanager
+def use_sink(sink: OutputSink) -> Iterator[OutputSink]:
+    """Temporarily routes all output in this context to `sink`, flushing it on exit."""
+    token = _current_sink.set(sink)
+    try:
+        yield sink
+    finally:
+        sink.flush()
+        _current_sink.reset(token)
+
+
+def emit(text: str = "", kind: str = "message", **data: Any) -> None:
+    """Sends one output event to the active sink."""
+    _current_sink.get().emit(text, kind, **data)
+
+
+def flush() -> None:
+    """Flushes the active sink."""
+    _current_sink.get().flush()
@@ -17,6 +17,7 @@ class Zone:
         """
         self.name: str = name
         self.enemy_names: List[str] = enemy_names if enemy_names is not None else []
+        self.enemy_ids: List[int] = [] # Filled in by GameDataManager.build_id_tables()
 
     def add_enemy_name(self, enemy_name: str) -> None:
         """